@@ -0,0 +1,123 @@
+"""Report the resident cost of hydrated imaged-moment entries per moment."""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from vars_localize.models import ImagedMomentEntry  # noqa: E402
+
+
+def _box_association(image_reference_uuid: str, index: int) -> Dict[str, Any]:
+    return {
+        "uuid": str(uuid.uuid4()),
+        "link_name": "bounding box",
+        "to_concept": "self",
+        "link_value": json.dumps(
+            {
+                "x": 10 * index,
+                "y": 20 * index,
+                "width": 120,
+                "height": 80,
+                "image_reference_uuid": image_reference_uuid,
+                "observer": "benchmark",
+                "generator": "vars-localize",
+            }
+        ),
+        "mime_type": "application/json",
+    }
+
+
+def make_moment_payload(observations: int, boxes: int) -> Dict[str, Any]:
+    """Build a synthetic Annosaurus imaged-moment payload."""
+    image_reference_uuid = str(uuid.uuid4())
+    return {
+        "uuid": str(uuid.uuid4()),
+        "video_reference_uuid": str(uuid.uuid4()),
+        "recorded_timestamp": "2024-05-01T12:34:56Z",
+        "timecode": "01:02:03:04",
+        "elapsed_time_millis": 3723000,
+        "ancillary_data": {"depth_meters": 812.4, "latitude": 36.7, "longitude": -122},
+        "image_references": [
+            {
+                "uuid": image_reference_uuid,
+                "url": "https://example.org/{}.png".format(image_reference_uuid),
+                "format": "image/png",
+            }
+        ],
+        "observations": [
+            {
+                "uuid": str(uuid.uuid4()),
+                "concept": "Aegina",
+                "observer": "benchmark",
+                "associations": [
+                    _box_association(image_reference_uuid, index)
+                    for index in range(boxes)
+                ],
+            }
+            for _ in range(observations)
+        ],
+    }
+
+
+def measure(moments: int, observations: int, boxes: int) -> Dict[str, float]:
+    """Return payload and entry allocation sizes for ``moments`` hydrations."""
+    gc.collect()
+    tracemalloc.start()
+    payloads: List[Dict[str, Any]] = [
+        make_moment_payload(observations, boxes) for _ in range(moments)
+    ]
+    gc.collect()
+    payload_bytes, _ = tracemalloc.get_traced_memory()
+
+    started = time.perf_counter()
+    entries = [ImagedMomentEntry.from_dict(payload) for payload in payloads]
+    hydrate_secs = time.perf_counter() - started
+    gc.collect()
+    total_bytes, _ = tracemalloc.get_traced_memory()
+
+    for entry in entries:
+        for observation in entry.observations:
+            observation.boxes
+    gc.collect()
+    materialized_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del entries
+    return {
+        "moments": float(moments),
+        "payload_bytes_per_moment": payload_bytes / moments,
+        "entry_bytes_per_moment": (total_bytes - payload_bytes) / moments,
+        "materialized_bytes_per_moment": (materialized_bytes - payload_bytes) / moments,
+        "hydrate_usecs_per_moment": hydrate_secs * 1e6 / moments,
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--moments", type=int, default=2000)
+    parser.add_argument("--observations", type=int, default=3)
+    parser.add_argument("--boxes", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    result = measure(args.moments, args.observations, args.boxes)
+    print(
+        "{moments:.0f} moments: payload {payload_bytes_per_moment:,.0f} B/moment, "
+        "entries {entry_bytes_per_moment:,.0f} B/moment "
+        "({materialized_bytes_per_moment:,.0f} B/moment once opened), "
+        "from_dict {hydrate_usecs_per_moment:,.1f} us/moment".format(**result)
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,89 @@
+"""Time SAM mask-to-box conversion and RLE encoding on full-resolution masks."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from vars_localize.util.masks import mask_boxes, masks_to_rle  # noqa: E402
+
+
+def per_mask_boxes(masks: np.ndarray) -> List[tuple]:
+    """The previous conversion: one ``np.where`` per mask."""
+    boxes = []
+    for mask in masks:
+        ys, xs = np.where(mask > 0)
+        if xs.size == 0 or ys.size == 0:
+            continue
+        x1, y1 = int(xs.min()), int(ys.min())
+        w, h = int(xs.max()) - x1 + 1, int(ys.max()) - y1 + 1
+        if w > 1 and h > 1:
+            boxes.append((x1, y1, w, h))
+    return boxes
+
+
+def make_masks(count: int, height: int, width: int, seed: int = 0) -> np.ndarray:
+    """``count`` boolean masks, each an ellipse of random size and position."""
+    rng = np.random.default_rng(seed)
+    masks = np.zeros((count, height, width), dtype=bool)
+    ys = np.arange(height)[:, None]
+    xs = np.arange(width)[None, :]
+    for mask in masks:
+        cy, cx = rng.integers(0, height), rng.integers(0, width)
+        ry, rx = rng.integers(20, height // 4), rng.integers(20, width // 4)
+        top, bottom = max(0, cy - ry), min(height, cy + ry + 1)
+        left, right = max(0, cx - rx), min(width, cx + rx + 1)
+        mask[top:bottom, left:right] = (
+            ((ys[top:bottom] - cy) / ry) ** 2 + ((xs[:, left:right] - cx) / rx) ** 2
+        ) <= 1
+    return masks
+
+
+def best_ms(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000.0
+
+
+def measure(count: int, height: int, width: int, repeat: int) -> Dict[str, float]:
+    masks = make_masks(count, height, width)
+    assert mask_boxes(masks) == per_mask_boxes(masks)
+    return {
+        "masks": float(count),
+        "per_mask_ms": best_ms(lambda: per_mask_boxes(masks), repeat),
+        "vectorised_ms": best_ms(lambda: mask_boxes(masks), repeat),
+        "rle_ms": best_ms(lambda: masks_to_rle(masks), repeat),
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--counts", default="1,10,100")
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    for count in (int(value) for value in args.counts.split(",")):
+        result = measure(count, args.height, args.width, args.repeat)
+        print(
+            "{masks:.0f} mask(s) at {h}x{w}: per-mask {per_mask_ms:,.1f} ms, "
+            "vectorised {vectorised_ms:,.1f} ms, RLE {rle_ms:,.1f} ms".format(
+                h=args.height, w=args.width, **result
+            )
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
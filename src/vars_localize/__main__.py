@@ -3,10 +3,12 @@ Main entry point for the VARS Localize application.
 """
 
 import argparse
+import getpass
+import os
 import sys
 from typing import Optional, Sequence
 
-from PyQt6.QtCore import QSize
+from PyQt6.QtCore import QCoreApplication, QSize
 from PyQt6.QtGui import QIcon
 from PyQt6.QtWidgets import QApplication
 
@@ -17,9 +19,13 @@ from vars_localize.util.desktop_entry import (
     uninstall_desktop_entry,
 )
 from vars_localize.util.logging import configure_logging, get_logger
+from vars_localize.util.paths import sam_feature_dir
+from vars_localize.util.tracing import start_tracing, stop_tracing
 
 logger = get_logger("Main")
 
+APP_NAME = "VARS Localize"
+
 
 def _build_app_icon() -> QIcon:
     """Build a multi-resolution app icon from packaged PNG assets."""
@@ -45,6 +51,29 @@ def _build_arg_parser() -> argparse.ArgumentParser:
         "uninstall-desktop",
         help="Remove user-level Linux desktop entry and icons.",
     )
+    precompute = subparsers.add_parser(
+        "precompute-sam",
+        help=(
+            "Encode SAM3 features for the images of a concept's results into "
+            "the embedding disk store, using the model and image size from "
+            "Settings."
+        ),
+    )
+    precompute.add_argument("concept", help="Concept whose results to encode.")
+    precompute.add_argument(
+        "--username",
+        required=True,
+        help="M3 username (password from VARS_LOCALIZE_PASSWORD or a prompt).",
+    )
+    precompute.add_argument("--m3-url", help="M3 URL (default: from Settings).")
+    precompute.add_argument(
+        "--limit", type=int, default=0, help="Encode at most this many moments."
+    )
+    precompute.add_argument(
+        "--store-mb",
+        type=int,
+        help="Disk store size in MB (default: from Settings).",
+    )
 
     parser.add_argument(
         "--debug-input",
@@ -55,10 +84,88 @@ def _build_arg_parser() -> argparse.ArgumentParser:
             "very noisy, logs on every mouse move)."
         ),
     )
+    parser.add_argument(
+        "--perf-log",
+        metavar="FILE",
+        help=(
+            "Write sampled, rate-limited JSON-lines records of network, image "
+            "decode and SAM durations to FILE (see VARS_LOCALIZE_PERF_SAMPLE "
+            "and VARS_LOCALIZE_PERF_RATE_LIMIT)."
+        ),
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help=(
+            "Record service calls, background tasks, image decoding and SAM "
+            "calls to FILE as Chrome trace-event JSON, written on exit. Open "
+            "it in https://ui.perfetto.dev."
+        ),
+    )
 
     return parser
 
 
+def _precompute_sam(args: argparse.Namespace) -> int:
+    from vars_localize.services import M3Service, SAM3Service
+    from vars_localize.services.sam_features import FeatureStore
+    from vars_localize.services.sam_precompute import precompute_features
+    from vars_localize.state import AppSettings
+    from vars_localize.util.images import decode_image_rgb
+
+    # Names the app data folder the same way as the GUI.
+    app = QCoreApplication([sys.argv[0]])
+    app.setApplicationName(APP_NAME)
+
+    settings = AppSettings()
+    store_mb = settings.sam3_feature_store_mb
+    if args.store_mb is not None:
+        store_mb = args.store_mb
+    if store_mb <= 0:
+        logger.error(
+            "The SAM embedding disk store is disabled; enable it in Settings "
+            "or pass --store-mb."
+        )
+        return 2
+
+    password = os.getenv("VARS_LOCALIZE_PASSWORD") or getpass.getpass()
+    m3 = M3Service(args.m3_url or settings.m3_url)
+    sam = SAM3Service(
+        model_path=settings.sam3_model_path,
+        conf=settings.sam3_confidence,
+        imgsz=settings.sam3_image_size,
+        feature_cache_mb=0,
+        feature_store=FeatureStore(sam_feature_dir(), store_mb),
+    )
+    try:
+        m3.configure(args.username, password)
+        sam.ensure_loaded(
+            semantic_enabled=settings.sam3_semantic_enabled,
+            point_enabled=settings.sam3_point_enabled,
+        )
+        uuids = m3.get_imaged_moment_uuids(m3.get_concept_name(args.concept))
+    except Exception as exc:
+        logger.error("{}", exc)
+        return 1
+    if args.limit > 0:
+        uuids = uuids[: args.limit]
+
+    def _progress(done: int, total: int) -> None:
+        print("\r{}/{}".format(done, total), end="", file=sys.stderr, flush=True)
+
+    summary = precompute_features(m3, sam, uuids, decode_image_rgb, _progress)
+    print(file=sys.stderr)
+    logger.info(
+        "Encoded {}, already stored {}, without image {}, failed {} (store: {})",
+        summary.encoded,
+        summary.already_stored,
+        summary.no_image,
+        summary.failed,
+        sam.feature_store.root,
+    )
+    return 1 if summary.failed else 0
+
+
 def main(argv: Optional[Sequence[str]] = None):
     """
     Main entry point for the VARS Localize application.
@@ -72,10 +179,17 @@ def main(argv: Optional[Sequence[str]] = None):
     if args.command == "uninstall-desktop":
         return uninstall_desktop_entry()
 
-    configure_logging(debug_input=getattr(args, "debug_input", False))
+    configure_logging(
+        debug_input=getattr(args, "debug_input", False),
+        perf_log=args.perf_log,
+    )
+    if args.command == "precompute-sam":
+        return _precompute_sam(args)
+    if args.trace:
+        start_tracing(args.trace)
     app = QApplication([sys.argv[0], *qt_args])
-    app.setApplicationName("VARS Localize")
-    app.setApplicationDisplayName("VARS Localize")
+    app.setApplicationName(APP_NAME)
+    app.setApplicationDisplayName(APP_NAME)
     app.setDesktopFileName("vars-localize")
     app.setWindowIcon(_build_app_icon())
 
@@ -88,7 +202,10 @@ def main(argv: Optional[Sequence[str]] = None):
     window.setWindowIcon(app.windowIcon())
     window.show()
 
-    return app.exec()
+    try:
+        return app.exec()
+    finally:
+        stop_tracing()
 
 
 if __name__ == "__main__":
@@ -2,16 +2,20 @@
 
 from vars_localize.models.entries import (
     AssociationEntry,
+    BoxEntry,
     EntryPayload,
     ImagedMomentEntry,
     ObservationEntry,
     PlaceholderEntry,
 )
+from vars_localize.models.results import ResultSet
 
 __all__ = [
     "AssociationEntry",
+    "BoxEntry",
     "EntryPayload",
     "ImagedMomentEntry",
     "ObservationEntry",
     "PlaceholderEntry",
+    "ResultSet",
 ]
@@ -3,19 +3,77 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Union
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Union
 
 from vars_localize.util.utils import extract_bounding_boxes
 
+_EMPTY_RAW: Mapping[str, Any] = MappingProxyType({})
 
-@dataclass
+
+def _empty_raw() -> Mapping[str, Any]:
+    """Return the shared read-only empty payload used by hand-built entries."""
+    return _EMPTY_RAW
+
+
+def _raw_view(data: Dict[str, Any]) -> Mapping[str, Any]:
+    """Wrap a decoded payload in a read-only view instead of copying it."""
+    return MappingProxyType(data)
+
+
+@dataclass(slots=True)
+class BoxEntry:
+    """Compact bounding-box record parsed from a ``bounding box`` association."""
+
+    x: int
+    y: int
+    width: int
+    height: int
+    image_reference_uuid: Optional[str] = None
+    observer: Optional[str] = None
+    observation_uuid: Optional[str] = None
+    association_uuid: Optional[str] = None
+    part: Optional[str] = None
+    concept: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "BoxEntry":
+        return cls(
+            x=int(data.get("x", 0)),
+            y=int(data.get("y", 0)),
+            width=int(data.get("width", 0)),
+            height=int(data.get("height", 0)),
+            image_reference_uuid=data.get("image_reference_uuid"),
+            observer=data.get("observer"),
+            observation_uuid=data.get("observation_uuid"),
+            association_uuid=data.get("association_uuid"),
+            part=data.get("part"),
+            concept=data.get("concept"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "x": self.x,
+            "y": self.y,
+            "width": self.width,
+            "height": self.height,
+            "image_reference_uuid": self.image_reference_uuid,
+            "observer": self.observer,
+            "observation_uuid": self.observation_uuid,
+            "association_uuid": self.association_uuid,
+            "part": self.part,
+            "concept": self.concept,
+        }
+
+
+@dataclass(slots=True)
 class AssociationEntry:
     uuid: str
     link_name: str
     to_concept: Optional[str]
     link_value: str
     mime_type: Optional[str]
-    raw: Dict[str, Any] = field(default_factory=dict)
+    raw: Mapping[str, Any] = field(default_factory=_empty_raw)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "AssociationEntry":
@@ -25,7 +83,7 @@ class AssociationEntry:
             to_concept=data.get("to_concept"),
             link_value=str(data.get("link_value", "")),
             mime_type=data.get("mime_type"),
-            raw=dict(data),
+            raw=_raw_view(data),
         )
 
     def to_dict(self) -> Dict[str, Any]:
@@ -42,55 +100,174 @@ class AssociationEntry:
         )
 
 
-@dataclass
+def _count_box_hints(
+    data: Mapping[str, Any], image_reference_uuid: Optional[str]
+) -> Optional[int]:
+    """Estimate the boxes an observation has on an image without parsing JSON.
+
+    Counts ``bounding box`` associations whose ``link_value`` mentions the image
+    reference UUID. Returns None when no image reference is known, since video
+    boxes then match as well and only a full parse can tell them apart.
+    """
+    if image_reference_uuid is None:
+        return None
+    count = 0
+    for assoc in data.get("associations") or ():
+        if not isinstance(assoc, dict) or assoc.get("link_name") != "bounding box":
+            continue
+        link_value = assoc.get("link_value")
+        if isinstance(link_value, str) and image_reference_uuid in link_value:
+            count += 1
+    return count
+
+
 class ObservationEntry:
-    uuid: str
-    concept: str
-    observer: str
-    associations: List[AssociationEntry] = field(default_factory=list)
-    boxes: List[Dict[str, Any]] = field(default_factory=list)
-    video_boxes: List[Dict[str, Any]] = field(default_factory=list)
-    status: int = 0
-    raw: Dict[str, Any] = field(default_factory=dict)
-    box_manager: Any = None
+    """Observation row whose associations and boxes are parsed on first access."""
+
+    __slots__ = (
+        "uuid",
+        "concept",
+        "observer",
+        "status",
+        "raw",
+        "box_manager",
+        "_associations",
+        "_boxes",
+        "_video_boxes",
+        "_image_reference_uuid",
+        "_parsed",
+    )
+
+    def __init__(
+        self,
+        uuid: str,
+        concept: str,
+        observer: str,
+        associations: Optional[List[AssociationEntry]] = None,
+        boxes: Optional[List[Any]] = None,
+        video_boxes: Optional[List[Any]] = None,
+        status: int = 0,
+        raw: Optional[Mapping[str, Any]] = None,
+        box_manager: Any = None,
+    ):
+        self.uuid = uuid
+        self.concept = concept
+        self.observer = observer
+        self.status = status
+        self.raw: Mapping[str, Any] = _EMPTY_RAW if raw is None else raw
+        self.box_manager = box_manager
+        self._associations: List[AssociationEntry] = list(associations or [])
+        self._boxes: List[Any] = list(boxes or [])
+        self._video_boxes: List[Any] = list(video_boxes or [])
+        self._image_reference_uuid: Optional[str] = None
+        self._parsed = True
+
+    def __repr__(self) -> str:
+        return "ObservationEntry(uuid={!r}, concept={!r}, observer={!r})".format(
+            self.uuid, self.concept, self.observer
+        )
 
     @classmethod
     def from_dict(
         cls, data: Dict[str, Any], image_reference_uuid: Optional[str]
     ) -> "ObservationEntry":
-        uuid = str(data.get("uuid", ""))
-        concept = str(data.get("concept", ""))
-        associations = [
+        entry = cls(
+            uuid=str(data.get("uuid", "")),
+            concept=str(data.get("concept", "")),
+            observer=str(data.get("observer", "")),
+            raw=_raw_view(data),
+        )
+        entry._image_reference_uuid = image_reference_uuid
+        entry._parsed = False
+        hint = _count_box_hints(data, image_reference_uuid)
+        entry.status = hint if hint is not None else len(entry.boxes)
+        return entry
+
+    def _materialize(self) -> None:
+        if self._parsed:
+            return
+        self._parsed = True
+        self._associations = [
             AssociationEntry.from_dict(assoc)
-            for assoc in data.get("associations", [])
+            for assoc in self.raw.get("associations") or ()
             if isinstance(assoc, dict)
         ]
-        source_boxes = list(
-            extract_bounding_boxes(
-                [assoc.to_dict() for assoc in associations],
-                concept,
-                uuid,
+        source_boxes = [
+            BoxEntry.from_dict(box)
+            for box in extract_bounding_boxes(
+                [assoc.raw for assoc in self._associations],
+                self.concept,
+                self.uuid,
             )
-        )
-        boxes = [
+        ]
+        self._boxes = [
             box
             for box in source_boxes
-            if box.get("image_reference_uuid") == image_reference_uuid
+            if box.image_reference_uuid == self._image_reference_uuid
         ]
-        video_boxes = [
-            box for box in source_boxes if box.get("image_reference_uuid") is None
+        self._video_boxes = [
+            box for box in source_boxes if box.image_reference_uuid is None
         ]
+        self.status = len(self._boxes)
 
-        return cls(
-            uuid=uuid,
-            concept=concept,
-            observer=str(data.get("observer", "")),
-            associations=associations,
-            boxes=boxes,
-            video_boxes=video_boxes,
-            status=len(boxes),
-            raw=dict(data),
-        )
+    @property
+    def is_materialized(self) -> bool:
+        return self._parsed
+
+    @property
+    def associations(self) -> List[AssociationEntry]:
+        self._materialize()
+        return self._associations
+
+    @associations.setter
+    def associations(self, value: List[AssociationEntry]) -> None:
+        self._materialize()
+        self._associations = value
+
+    @property
+    def boxes(self) -> List[Any]:
+        self._materialize()
+        return self._boxes
+
+    @boxes.setter
+    def boxes(self, value: List[Any]) -> None:
+        self._materialize()
+        self._boxes = value
+
+    @property
+    def video_boxes(self) -> List[Any]:
+        self._materialize()
+        return self._video_boxes
+
+    @video_boxes.setter
+    def video_boxes(self, value: List[Any]) -> None:
+        self._materialize()
+        self._video_boxes = value
+
+    @property
+    def box_count(self) -> int:
+        """Boxes on the moment image, from the pre-scan until parsed."""
+        return len(self._boxes) if self._parsed else self.status
+
+    def upsert_association(
+        self, association: AssociationEntry
+    ) -> Optional[AssociationEntry]:
+        """Insert or replace an association by UUID, returning the replaced one."""
+        associations = self.associations
+        for idx, existing in enumerate(associations):
+            if existing.uuid == association.uuid:
+                associations[idx] = association
+                return existing
+        associations.append(association)
+        return None
+
+    def remove_association(self, association_uuid: str) -> Optional[AssociationEntry]:
+        """Remove an association by UUID, returning it if it was present."""
+        associations = self.associations
+        for idx, existing in enumerate(associations):
+            if existing.uuid == association_uuid:
+                return associations.pop(idx)
+        return None
 
     def to_dict(self) -> Dict[str, Any]:
         data = dict(self.raw)
@@ -101,22 +278,70 @@ class ObservationEntry:
         return data
 
 
-@dataclass
 class ImagedMomentEntry:
-    uuid: str
-    observations: List[ObservationEntry]
-    image_reference_uuid: Optional[str]
-    image_url: Optional[str]
-    video_reference_uuid: Optional[str]
-    recorded_timestamp: Optional[str] = None
-    timecode: Optional[str] = None
-    elapsed_time_millis: Optional[int] = None
-    ancillary_data: Dict[str, Any] = field(default_factory=dict)
-    video_sequence_name: Optional[str] = None
-    status: str = "unknown"
-    raw: Dict[str, Any] = field(default_factory=dict)
-    cached_image: Any = None
-    video_data: Optional[Dict[str, Any]] = None
+    """Imaged moment whose observations are built on first access.
+
+    ``observation_count`` and ``localized_count`` come from a pre-scan of the
+    payload, so table rows can render without materializing observations.
+    """
+
+    __slots__ = (
+        "uuid",
+        "image_reference_uuid",
+        "image_url",
+        "video_reference_uuid",
+        "recorded_timestamp",
+        "timecode",
+        "elapsed_time_millis",
+        "ancillary_data",
+        "video_sequence_name",
+        "status",
+        "raw",
+        "cached_image",
+        "video_data",
+        "_observations",
+        "_observation_hint",
+    )
+
+    def __init__(
+        self,
+        uuid: str,
+        observations: Optional[List[ObservationEntry]],
+        image_reference_uuid: Optional[str],
+        image_url: Optional[str],
+        video_reference_uuid: Optional[str],
+        recorded_timestamp: Optional[str] = None,
+        timecode: Optional[str] = None,
+        elapsed_time_millis: Optional[int] = None,
+        ancillary_data: Optional[Mapping[str, Any]] = None,
+        video_sequence_name: Optional[str] = None,
+        status: str = "unknown",
+        raw: Optional[Mapping[str, Any]] = None,
+        cached_image: Any = None,
+        video_data: Optional[Dict[str, Any]] = None,
+    ):
+        self.uuid = uuid
+        self.image_reference_uuid = image_reference_uuid
+        self.image_url = image_url
+        self.video_reference_uuid = video_reference_uuid
+        self.recorded_timestamp = recorded_timestamp
+        self.timecode = timecode
+        self.elapsed_time_millis = elapsed_time_millis
+        self.ancillary_data: Mapping[str, Any] = ancillary_data or _EMPTY_RAW
+        self.video_sequence_name = video_sequence_name
+        self.status = status
+        self.raw: Mapping[str, Any] = _EMPTY_RAW if raw is None else raw
+        self.cached_image = cached_image
+        self.video_data = video_data
+        self._observations: Optional[List[ObservationEntry]] = (
+            None if observations is None else list(observations)
+        )
+        self._observation_hint = (0, 0)
+
+    def __repr__(self) -> str:
+        return "ImagedMomentEntry(uuid={!r}, image_reference_uuid={!r})".format(
+            self.uuid, self.image_reference_uuid
+        )
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ImagedMomentEntry":
@@ -139,32 +364,76 @@ class ImagedMomentEntry:
             image_reference_uuid = valid_image_references[0].get("uuid")
             image_url = valid_image_references[0].get("url")
 
-        observations = [
-            ObservationEntry.from_dict(obs, image_reference_uuid)
-            for obs in data.get("observations", [])
-            if isinstance(obs, dict)
-        ]
-
         elapsed_millis = data.get("elapsed_time_millis")
         try:
             elapsed_millis = int(elapsed_millis) if elapsed_millis is not None else None
         except (TypeError, ValueError):
             elapsed_millis = None
 
-        return cls(
+        entry = cls(
             uuid=uuid,
-            observations=observations,
+            observations=None,
             image_reference_uuid=image_reference_uuid,
             image_url=image_url,
             video_reference_uuid=data.get("video_reference_uuid"),
             recorded_timestamp=data.get("recorded_timestamp"),
             timecode=data.get("timecode"),
             elapsed_time_millis=elapsed_millis,
-            ancillary_data=data.get("ancillary_data") or {},
+            ancillary_data=data.get("ancillary_data") or _EMPTY_RAW,
             video_sequence_name=data.get("video_sequence_name"),
-            raw=dict(data),
+            raw=_raw_view(data),
         )
 
+        if image_reference_uuid is None:
+            # Without an image reference only a full parse separates image boxes
+            # from video boxes, so skip the pre-scan.
+            entry._materialize()
+            return entry
+
+        total = 0
+        localized = 0
+        for obs in data.get("observations") or ():
+            if not isinstance(obs, dict):
+                continue
+            total += 1
+            if _count_box_hints(obs, image_reference_uuid):
+                localized += 1
+        entry._observation_hint = (total, localized)
+        return entry
+
+    def _materialize(self) -> List[ObservationEntry]:
+        if self._observations is None:
+            self._observations = [
+                ObservationEntry.from_dict(obs, self.image_reference_uuid)
+                for obs in self.raw.get("observations") or ()
+                if isinstance(obs, dict)
+            ]
+        return self._observations
+
+    @property
+    def is_materialized(self) -> bool:
+        return self._observations is not None
+
+    @property
+    def observations(self) -> List[ObservationEntry]:
+        return self._materialize()
+
+    @observations.setter
+    def observations(self, value: List[ObservationEntry]) -> None:
+        self._observations = value
+
+    @property
+    def observation_count(self) -> int:
+        if self._observations is None:
+            return self._observation_hint[0]
+        return len(self._observations)
+
+    @property
+    def localized_count(self) -> int:
+        if self._observations is None:
+            return self._observation_hint[1]
+        return sum(1 for obs in self._observations if obs.box_count)
+
     def to_dict(self) -> Dict[str, Any]:
         data = dict(self.raw)
         data["uuid"] = self.uuid
@@ -0,0 +1,149 @@
+"""Compact, shareable result sets of imaged moment UUIDs."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator, List, Optional, Sequence, Union, overload
+from uuid import UUID
+
+_UUID_WIDTH = 16
+
+
+def _pack_uuid(value: object) -> Optional[bytes]:
+    """Return the 16-byte form of a canonical UUID string, else None."""
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = UUID(value)
+    except ValueError:
+        return None
+    # Only pack values that round-trip exactly, so lookups by the original
+    # string keep working for upper-case or brace-wrapped input.
+    if str(parsed) != value:
+        return None
+    return parsed.bytes
+
+
+class ResultSet(Sequence[str]):
+    """Immutable sequence of imaged moment UUIDs for a search.
+
+    Canonical UUIDs are stored as a contiguous array of 16-byte values. A
+    sorted position index is built on the first membership test. Result sets
+    never change after construction, so state stores and panels share one
+    instance by reference. If any value is not a canonical UUID string, the
+    set keeps a tuple of strings instead and behaves the same.
+    """
+
+    __slots__ = ("_packed", "_strings", "_order")
+
+    def __init__(self, uuids: Iterable[str] = ()):
+        packed = bytearray()
+        strings: Optional[tuple] = None
+        values = uuids if isinstance(uuids, (list, tuple)) else list(uuids)
+        for value in values:
+            key = _pack_uuid(value)
+            if key is None:
+                strings = tuple(str(item) for item in values)
+                packed = bytearray()
+                break
+            packed += key
+
+        self._packed = bytes(packed)
+        self._strings = strings
+        self._order: Optional[array] = None
+
+    @classmethod
+    def coerce(cls, values: Union["ResultSet", Iterable[str], None]) -> "ResultSet":
+        """Return ``values`` unchanged when already a ResultSet, else wrap it."""
+        if isinstance(values, ResultSet):
+            return values
+        return cls(values or ())
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate storage used by the UUID data and index."""
+        index_bytes = 0 if self._order is None else len(self._order) * 4
+        if self._strings is not None:
+            return sum(len(value) for value in self._strings) + index_bytes
+        return len(self._packed) + index_bytes
+
+    def __len__(self) -> int:
+        if self._strings is not None:
+            return len(self._strings)
+        return len(self._packed) // _UUID_WIDTH
+
+    def _string_at(self, index: int) -> str:
+        if self._strings is not None:
+            return self._strings[index]
+        start = index * _UUID_WIDTH
+        return str(UUID(bytes=self._packed[start : start + _UUID_WIDTH]))
+
+    def _key_at(self, index: int) -> Union[bytes, str]:
+        if self._strings is not None:
+            return self._strings[index]
+        start = index * _UUID_WIDTH
+        return self._packed[start : start + _UUID_WIDTH]
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._string_at(i) for i in range(*index.indices(len(self)))]
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("ResultSet index out of range")
+        return self._string_at(index)
+
+    def __iter__(self) -> Iterator[str]:
+        if self._strings is not None:
+            return iter(self._strings)
+        return (self._string_at(i) for i in range(len(self)))
+
+    def _sorted_positions(self) -> array:
+        if self._order is None:
+            self._order = array("I", sorted(range(len(self)), key=self._key_at))
+        return self._order
+
+    def _find(self, value: object) -> int:
+        if self._strings is not None:
+            if not isinstance(value, str):
+                return -1
+            target: Union[bytes, str, None] = value
+        else:
+            target = _pack_uuid(value)
+        if target is None:
+            return -1
+        order = self._sorted_positions()
+        pos = bisect_left(order, target, key=self._key_at)
+        if pos < len(order) and self._key_at(order[pos]) == target:
+            return order[pos]
+        return -1
+
+    def __contains__(self, value: object) -> bool:
+        return self._find(value) >= 0
+
+    def index(self, value: object, start: int = 0, stop: Optional[int] = None) -> int:
+        position = self._find(value)
+        if position < 0:
+            raise ValueError("{!r} is not in result set".format(value))
+        if position < start or (stop is not None and position >= stop):
+            # Duplicates are rare; fall back to a scan for bounded lookups.
+            return super().index(value, start, len(self) if stop is None else stop)
+        return position
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ResultSet):
+            return NotImplemented
+        return self._packed == other._packed and self._strings == other._strings
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return "ResultSet(len={})".format(len(self))
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 from base64 import b64encode
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypeVar, Union
 
 import requests
 
@@ -14,12 +15,46 @@ from vars_localize.services.clients import (
 )
 from vars_localize.services.errors import (
     ServiceAuthError,
+    ServiceError,
     ServiceNotConfiguredError,
     ServiceRequestError,
+    ServiceValidationError,
 )
 from vars_localize.services.http import request_with_policy
+from vars_localize.util.cancellation import bind_token, current_token
+from vars_localize.util.logging import get_logger
+from vars_localize.util.tracing import traced
 
 DEFAULT_M3_URL = "https://m3.shore.mbari.org/config"
+DEFAULT_BATCH_WORKERS = 4
+
+logger = get_logger("M3Service")
+
+_T = TypeVar("_T")
+
+
+def _run_batch(
+    fn: Callable[[_T], Any], items: Sequence[_T], max_workers: int
+) -> List[Any]:
+    """Call ``fn`` for each item on a small pool, keeping input order.
+
+    Service errors are returned in place of the result for that item. The
+    caller's cancellation token is carried over to the pool threads.
+    """
+    token = current_token()
+
+    def _call(item: _T) -> Any:
+        try:
+            with bind_token(token):
+                return fn(item)
+        except ServiceError as exc:
+            return exc
+
+    if not items:
+        return []
+    workers = max(1, min(int(max_workers), len(items)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="m3-batch") as pool:
+        return list(pool.map(_call, items))
 
 
 class M3Service:
@@ -76,6 +111,18 @@ class M3Service:
             "get", "/health", timeout_secs=max(1, int(timeout_secs)), retries=1
         )
 
+    def check_annotation_service(self, timeout_secs: int = 3) -> None:
+        """Ensure annosaurus, which annotation writes go to, responds to /health.
+
+        Args:
+            timeout_secs: Timeout in seconds.
+
+        Raises:
+            ServiceNotConfiguredError: If clients are not initialized.
+            ServiceRequestError: If health check fails after retries.
+        """
+        self._annosaurus_client().check_health(timeout_secs)
+
     def _fetch_endpoints(self, username: str, password: str) -> None:
         """Authenticate with Raziel and populate endpoint metadata.
 
@@ -229,6 +276,7 @@ class M3Service:
         assert self._vampire_squid is not None
         return self._vampire_squid
 
+    @traced(category="m3")
     def get_all_users(self) -> List[Dict[str, Any]]:
         """Compatibility wrapper for OniClient.get_all_users.
 
@@ -237,6 +285,7 @@ class M3Service:
         """
         return self._oni_client().get_all_users()
 
+    @traced(category="m3")
     def get_all_concepts(self) -> List[str]:
         """Compatibility wrapper for OniClient.get_all_concepts.
 
@@ -245,6 +294,7 @@ class M3Service:
         """
         return self._oni_client().get_all_concepts()
 
+    @traced(category="m3")
     def get_concept_name(self, concept: str) -> str:
         """Resolve concept to its primary/canonical name.
 
@@ -256,6 +306,7 @@ class M3Service:
         """
         return self._oni_client().get_concept_name(concept)
 
+    @traced(category="m3")
     def get_imaged_moment_uuids(self, concept: str) -> List[str]:
         """Compatibility wrapper for AnnosaurusClient.get_imaged_moment_uuids.
 
@@ -267,6 +318,7 @@ class M3Service:
         """
         return self._annosaurus_client().get_imaged_moment_uuids(concept)
 
+    @traced(category="m3")
     def get_imaged_moment(self, imaged_moment_uuid: str) -> Dict[str, Any]:
         """Compatibility wrapper for AnnosaurusClient.get_imaged_moment.
 
@@ -278,6 +330,7 @@ class M3Service:
         """
         return self._annosaurus_client().get_imaged_moment(imaged_moment_uuid)
 
+    @traced(category="m3")
     def get_imaged_moments_by_image_reference(
         self, image_reference_uuid: str
     ) -> List[Dict[str, Any]]:
@@ -293,6 +346,7 @@ class M3Service:
             image_reference_uuid
         )
 
+    @traced(category="m3")
     def get_annotations_by_video_reference(
         self, video_reference_uuid: str
     ) -> List[Dict[str, Any]]:
@@ -308,6 +362,7 @@ class M3Service:
             video_reference_uuid
         )
 
+    @traced(category="m3")
     def get_imaged_moments_by_video_reference(
         self, video_reference_uuid: str
     ) -> List[Dict[str, Any]]:
@@ -323,6 +378,7 @@ class M3Service:
             video_reference_uuid
         )
 
+    @traced(category="m3")
     def get_all_video_sequence_names(self) -> List[str]:
         """Compatibility wrapper for all video sequence names.
 
@@ -331,6 +387,7 @@ class M3Service:
         """
         return self._vampire_squid_client().get_all_video_sequence_names()
 
+    @traced(category="m3")
     def get_media_by_video_sequence_name(
         self, video_sequence_name: str
     ) -> List[Dict[str, Any]]:
@@ -346,6 +403,31 @@ class M3Service:
             video_sequence_name
         )
 
+    @traced(category="m3")
+    def get_observation(self, observation_uuid: str) -> Dict[str, Any]:
+        """Return observation details by UUID.
+
+        Args:
+            observation_uuid: Observation UUID.
+
+        Returns:
+            Parsed payload.
+        """
+        return self._annosaurus_client().get_observation(observation_uuid)
+
+    @traced(category="m3")
+    def get_association(self, association_uuid: str) -> Dict[str, Any]:
+        """Return association details by UUID.
+
+        Args:
+            association_uuid: Association UUID.
+
+        Returns:
+            Parsed payload.
+        """
+        return self._annosaurus_client().get_association(association_uuid)
+
+    @traced(category="m3")
     def delete_observation(self, observation_uuid: str) -> requests.Response:
         """Compatibility wrapper for observation deletion.
 
@@ -357,6 +439,7 @@ class M3Service:
         """
         return self._annosaurus_client().delete_observation(observation_uuid)
 
+    @traced(category="m3")
     def rename_observation(
         self, observation_uuid: str, new_concept: str, observer: str
     ) -> Dict[str, Any]:
@@ -374,6 +457,7 @@ class M3Service:
             observation_uuid, new_concept, observer
         )
 
+    @traced(category="m3")
     def create_observation(
         self,
         video_reference_uuid: str,
@@ -405,6 +489,7 @@ class M3Service:
             recorded_timestamp,
         )
 
+    @traced(category="m3")
     def create_box(
         self,
         box_json: Dict[str, Any],
@@ -425,6 +510,7 @@ class M3Service:
             box_json, observation_uuid, to_concept
         )
 
+    @traced(category="m3")
     def modify_box(
         self,
         box_json: Dict[str, Any],
@@ -447,6 +533,7 @@ class M3Service:
             box_json, observation_uuid, association_uuid, to_concept
         )
 
+    @traced(category="m3")
     def delete_box(self, association_uuid: str) -> requests.Response:
         """Compatibility wrapper for bounding-box deletion.
 
@@ -458,6 +545,122 @@ class M3Service:
         """
         return self._annosaurus_client().delete_box(association_uuid)
 
+    @traced(category="m3")
+    def create_boxed_observations(
+        self,
+        video_reference_uuid: str,
+        concept: str,
+        observer: str,
+        box_jsons: Sequence[Dict[str, Any]],
+        to_concept: Optional[str] = "self",
+        timecode: Optional[str] = None,
+        elapsed_time_millis: Optional[int] = None,
+        recorded_timestamp: Optional[str] = None,
+        max_workers: int = DEFAULT_BATCH_WORKERS,
+    ) -> List[Union[Dict[str, Any], ServiceError]]:
+        """Create one observation with one box for each box payload.
+
+        Annosaurus has no bulk endpoint, so each observation/box pair is
+        created with two calls. Pairs run concurrently on a small pool. If a
+        box is rejected, its new observation is deleted again so no empty
+        observation is left behind.
+
+        Args:
+            video_reference_uuid: Video reference UUID.
+            concept: Concept for every new observation.
+            observer: Observer identifier.
+            box_jsons: Bounding box payloads.
+            to_concept: Target concept for the box associations.
+            timecode: Optional SMPTE-like timecode.
+            elapsed_time_millis: Optional elapsed time in milliseconds.
+            recorded_timestamp: Optional recorded timestamp.
+            max_workers: Number of pairs created at once.
+
+        Returns:
+            One entry per box payload, in order: the created association with
+            an added ``observation_uuid``, or the error for that pair.
+        """
+        client = self._annosaurus_client()
+
+        def _create(box_json: Dict[str, Any]) -> Dict[str, Any]:
+            observation = client.create_observation(
+                video_reference_uuid,
+                concept,
+                observer,
+                timecode,
+                elapsed_time_millis,
+                recorded_timestamp,
+            )
+            observation_uuid = observation.get("observation_uuid") or observation.get(
+                "uuid"
+            )
+            if not observation_uuid:
+                raise ServiceValidationError("Observation response is missing its UUID")
+            try:
+                association = client.create_box(box_json, observation_uuid, to_concept)
+                if not association.get("uuid"):
+                    raise ServiceValidationError(
+                        "Box association response is missing its UUID"
+                    )
+            except ServiceError:
+                try:
+                    client.delete_observation(observation_uuid)
+                except ServiceError as cleanup_exc:
+                    logger.warning(
+                        "Could not remove observation {} after its box failed: {}",
+                        observation_uuid,
+                        cleanup_exc,
+                    )
+                raise
+            return dict(association, observation_uuid=observation_uuid)
+
+        return _run_batch(_create, box_jsons, max_workers)
+
+    @traced(category="m3")
+    def delete_observations(
+        self,
+        observation_uuids: Sequence[str],
+        max_workers: int = DEFAULT_BATCH_WORKERS,
+    ) -> List[Union[requests.Response, ServiceError]]:
+        """Delete several observations concurrently.
+
+        Args:
+            observation_uuids: Observation UUIDs.
+            max_workers: Number of deletions run at once.
+
+        Returns:
+            One response or error per UUID, in order.
+        """
+        client = self._annosaurus_client()
+        return _run_batch(client.delete_observation, observation_uuids, max_workers)
+
+    @traced(category="m3")
+    def rename_observations(
+        self,
+        observation_uuids: Sequence[str],
+        new_concept: str,
+        observer: str,
+        max_workers: int = DEFAULT_BATCH_WORKERS,
+    ) -> List[Union[Dict[str, Any], ServiceError]]:
+        """Rename several observations to one concept concurrently.
+
+        Args:
+            observation_uuids: Observation UUIDs.
+            new_concept: New concept name.
+            observer: Observer identifier.
+            max_workers: Number of renames run at once.
+
+        Returns:
+            One payload or error per UUID, in order.
+        """
+        client = self._annosaurus_client()
+        return _run_batch(
+            lambda uuid: client.rename_observation(uuid, new_concept, observer),
+            observation_uuids,
+            max_workers,
+        )
+
+    @traced(category="m3")
     def fetch_image_bytes(self, url: str) -> bytes:
         """Fetch image bytes from a URL.
 
@@ -470,6 +673,7 @@ class M3Service:
         response = request_with_policy(self._default_session, "get", url)
         return response.content
 
+    @traced(category="m3")
     def get_all_parts(self) -> List[str]:
         """Compatibility wrapper for OniClient.get_all_parts.
 
@@ -478,6 +682,7 @@ class M3Service:
         """
         return self._oni_client().get_all_parts()
 
+    @traced(category="m3")
     def get_video_data(self, video_reference_uuid: str) -> Dict[str, Any]:
         """Compatibility wrapper for VampireSquidClient.get_video_data.
 
@@ -489,6 +694,7 @@ class M3Service:
         """
         return self._vampire_squid_client().get_video_data(video_reference_uuid)
 
+    @traced(category="m3")
     def get_video_by_video_reference_uuid(
         self, video_reference_uuid: str
     ) -> Dict[str, Any]:
@@ -504,6 +710,7 @@ class M3Service:
             video_reference_uuid
         )
 
+    @traced(category="m3")
     def get_media_by_video_reference_uuid(
         self, video_reference_uuid: str
     ) -> Dict[str, Any]:
@@ -5,9 +5,21 @@ from __future__ import annotations
 import gc
 import os
 import threading
-from typing import Any, Iterable, List, Optional, Sequence, Tuple, cast
-
-from vars_localize.util.logging import get_logger
+from contextlib import contextmanager, nullcontext
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple, cast
+
+from vars_localize.services.sam_features import (
+    DEFAULT_FEATURE_CACHE_MB,
+    CachedFeatures,
+    FeatureCache,
+    FeatureStore,
+    feature_store_key,
+)
+from vars_localize.services.sam_point_cache import PointResultCache
+from vars_localize.util.cancellation import raise_if_cancelled
+from vars_localize.util.logging import PERF_KIND_SAM, get_logger, perf_timed
+from vars_localize.util.masks import mask_boxes
+from vars_localize.util.tracing import traced
 
 logger = get_logger("SAM3Service")
 
@@ -18,7 +30,14 @@ class SAM3Service:
     The class is import-safe when the optional sam extra is not installed.
     """
 
-    def __init__(self, model_path: str, conf: float = 0.35, imgsz: int = 644):
+    def __init__(
+        self,
+        model_path: str,
+        conf: float = 0.35,
+        imgsz: int = 644,
+        feature_cache_mb: int = DEFAULT_FEATURE_CACHE_MB,
+        feature_store: Optional[FeatureStore] = None,
+    ):
         self._model = (model_path or "").strip()
         self._conf = conf
         self._imgsz = max(64, int(imgsz))
@@ -36,11 +55,19 @@ class SAM3Service:
         self._semantic_predictor = None
         self._point_predictor = None
         self._predictor_lock = threading.RLock()
+        self._waiters_lock = threading.Lock()
+        self._interactive_waiters = 0
         self._predictor_ready = False
-        self._image_rgb = None
+        self._image_key: Optional[str] = None
         self._semantic_features = None
         self._point_features = None
+        self._point_stretch_size: Optional[int] = None
         self._src_shape = None
+        self._share_image_encoder = True
+        self._feature_cache = FeatureCache(feature_cache_mb)
+        self._feature_store = feature_store
+        self._point_results = PointResultCache()
+        self._model_id: Optional[str] = None
         self._import_error = None
         self._missing_dependency_reported = False
         self._semantic_mode_enabled = True
@@ -62,13 +89,23 @@ class SAM3Service:
         model_path: Optional[str] = None,
         conf: Optional[float] = None,
         imgsz: Optional[int] = None,
+        feature_cache_mb: Optional[int] = None,
     ):
+        previous = (self._model, self._imgsz)
         if model_path is not None:
             self._model = (model_path or "").strip()
         if conf is not None:
             self._conf = max(0.0, min(1.0, float(conf)))
         if imgsz is not None:
             self._imgsz = max(64, int(imgsz))
+        if feature_cache_mb is not None:
+            self._feature_cache.set_budget_mb(feature_cache_mb)
+        if (self._model, self._imgsz) != previous:
+            # Cached features belong to the old encoder/input size.
+            self._feature_cache.clear()
+            self._point_results.clear()
+            self._image_key = None
+            self._model_id = None
 
         self._base_overrides["model"] = self._model
         self._base_overrides["conf"] = self._conf
@@ -173,6 +210,11 @@ class SAM3Service:
         self._predictor_ready = False
         self._device = device
 
+    def shutdown(self) -> None:
+        """Release the predictors and their cached features."""
+        with self._predictor_lock:
+            self._cleanup_predictors()
+
     def _make_overrides(self, device: str) -> dict:
         overrides = dict(self._base_overrides)
         overrides["device"] = device
@@ -184,8 +226,11 @@ class SAM3Service:
         self._predictor_ready = False
         self._semantic_features = None
         self._point_features = None
+        self._point_stretch_size = None
         self._src_shape = None
-        self._image_rgb = None
+        self._image_key = None
+        self._feature_cache.clear()
+        self._point_results.clear()
         gc.collect()
         try:
             import torch
@@ -267,55 +312,105 @@ class SAM3Service:
             return "ready"
         return "loading"
 
+    @property
+    def image_key(self) -> Optional[str]:
+        """Key of the image whose features are loaded, if it was given one."""
+        return self._image_key
+
+    @property
+    def feature_cache(self) -> FeatureCache:
+        return self._feature_cache
+
+    @property
+    def feature_store(self) -> Optional[FeatureStore]:
+        return self._feature_store
+
+    def set_feature_store(self, store: Optional[FeatureStore]) -> None:
+        """Persist features to ``store`` (None keeps them in memory only)."""
+        self._feature_store = store
+
+    def has_cached_features(self, image_key: Optional[str]) -> bool:
+        if not image_key:
+            return False
+        if image_key in self._feature_cache:
+            return True
+        store = self._feature_store
+        return store is not None and store.contains(self._store_key(image_key))
+
+    def _store_key(self, image_key: str) -> str:
+        """Disk key; includes the model file identity and input size."""
+        if self._model_id is None:
+            try:
+                from importlib.metadata import version
+
+                runtime = "ultralytics {}".format(version("ultralytics"))
+            except Exception:
+                runtime = "ultralytics unknown"
+            path = os.path.abspath(self._model) if self._model else ""
+            try:
+                stat = os.stat(path)
+                file_id = "{}:{}".format(stat.st_size, int(stat.st_mtime))
+            except OSError:
+                file_id = "missing"
+            self._model_id = "|".join((path, file_id, runtime))
+        # Entries hold features only for the predictors that were loaded.
+        modes = "semantic={:d},point={:d}".format(
+            self.semantic_available, self.point_available
+        )
+        return feature_store_key(
+            image_key, "|".join((self._model_id, modes)), self._imgsz
+        )
+
+    def _torch_device(self) -> str:
+        # ultralytics takes a bare CUDA index ("0"); torch needs "cuda:0".
+        return (
+            "cuda:{}".format(self._device) if self._device.isdigit() else self._device
+        )
+
+    @traced(category="sam")
+    def restore_image(self, image_key: Optional[str]) -> bool:
+        """Load cached features for ``image_key`` without running the encoder.
+
+        The in-memory cache is checked first, then the disk store if one is
+        set. Returns False when neither has the image.
+        """
+        if not image_key:
+            return False
+        with self._interactive():
+            raise_if_cancelled()
+            if not self.available:
+                raise RuntimeError("SAM3 service is unavailable")
+            if self._image_key == image_key and self._predictor_ready:
+                return True
+            entry = self._feature_cache.get(image_key)
+            if entry is None and self._feature_store is not None:
+                entry = self._feature_store.load(
+                    self._store_key(image_key), device=self._torch_device()
+                )
+                if entry is not None:
+                    self._feature_cache.put(image_key, entry)
+            if entry is None:
+                return False
+            self._activate_features(image_key, entry)
+            return True
+
+    @traced(category="sam")
+    @perf_timed(PERF_KIND_SAM)
     def set_image(self, image_rgb, image_key: Optional[str] = None):
-        with self._predictor_lock:
+        """Encode ``image_rgb``, reusing cached features when ``image_key`` hits."""
+        if self.restore_image(image_key):
+            return
+        with self._interactive():
+            # Checked after taking the lock, since a superseded request may
+            # have waited here behind an embedding or another query.
+            raise_if_cancelled()
             if not self.available:
                 raise RuntimeError("SAM3 service is unavailable")
-            _ = image_key
 
-            semantic_predictor = cast(Any, self._semantic_predictor)
-            point_predictor = cast(Any, self._point_predictor)
-            try:
-                if semantic_predictor is not None:
-                    semantic_predictor.set_image(image_rgb)
-                if point_predictor is not None:
-                    point_predictor.set_image(image_rgb)
-            except Exception as exc:
-                message = str(exc)
-                if self._device != "cpu" and (
-                    "Invalid CUDA" in message or "device=" in message
-                ):
-                    logger.warning(
-                        "Device {} failed during set_image; retrying on CPU".format(
-                            self._device
-                        )
-                    )
-                    self._recreate_predictor("cpu")
-                    semantic_predictor = cast(Any, self._semantic_predictor)
-                    point_predictor = cast(Any, self._point_predictor)
-                    if semantic_predictor is not None:
-                        semantic_predictor.set_image(image_rgb)
-                    if point_predictor is not None:
-                        point_predictor.set_image(image_rgb)
-                else:
-                    raise
-
-            self._predictor_ready = True
-            self._image_rgb = image_rgb
-
-            self._semantic_features = (
-                semantic_predictor.features if semantic_predictor is not None else None
-            )
-            self._point_features = (
-                point_predictor.features if point_predictor is not None else None
-            )
-            self._src_shape = image_rgb.shape[:2]
-            if semantic_predictor is not None:
-                self._reset_semantic_prompt_state(semantic_predictor)
-                try:
-                    self._prime_point_prompt_context(semantic_predictor)
-                except Exception as exc:
-                    logger.warning("Neutral point context init failed: {}", exc)
+            entry = self._encode(image_rgb)
+            self._activate_features(image_key, entry)
+            if image_key:
+                self._remember_features(image_key, entry)
 
             # log(
             #     "[SAM3] set_image complete: src_shape={} feature_ready={}".format(
@@ -325,6 +420,172 @@ class SAM3Service:
             #     level=1,
             # )
 
+    @traced(category="sam")
+    @perf_timed(PERF_KIND_SAM)
+    def encode_to_cache(self, image_rgb, image_key: str) -> bool:
+        """Encode an upcoming image into the caches, leaving the active image as is.
+
+        Gives way to interactive calls: returns False without encoding when
+        one is running or waiting for the predictors.
+        """
+        if self.has_cached_features(image_key):
+            return True
+        if self._interactive_waiters:
+            return False
+        with self._predictor_lock:
+            raise_if_cancelled()
+            if self._interactive_waiters:
+                return False
+            if not self.available:
+                raise RuntimeError("SAM3 service is unavailable")
+            self._remember_features(image_key, self._encode(image_rgb))
+            return True
+
+    @contextmanager
+    def _interactive(self) -> Iterator[None]:
+        """Hold the predictor lock, flagging the wait so pre-encoding yields."""
+        with self._waiters_lock:
+            self._interactive_waiters += 1
+        try:
+            with self._predictor_lock:
+                yield
+        finally:
+            with self._waiters_lock:
+                self._interactive_waiters -= 1
+
+    def _encode(self, image_rgb) -> CachedFeatures:
+        """Run the image encoders for both prompt modes."""
+        try:
+            return self._run_encoders(image_rgb)
+        except Exception as exc:
+            message = str(exc)
+            if self._device != "cpu" and (
+                "Invalid CUDA" in message or "device=" in message
+            ):
+                logger.warning(
+                    "Device {} failed during set_image; retrying on CPU".format(
+                        self._device
+                    )
+                )
+                self._recreate_predictor("cpu")
+                return self._run_encoders(image_rgb)
+            raise
+
+    def _run_encoders(self, image_rgb) -> CachedFeatures:
+        semantic_predictor = cast(Any, self._semantic_predictor)
+        point_predictor = cast(Any, self._point_predictor)
+        src_shape = tuple(image_rgb.shape[:2])
+        semantic_features = None
+        if semantic_predictor is not None:
+            semantic_predictor.set_image(image_rgb)
+            semantic_features = semantic_predictor.features
+        if point_predictor is None:
+            return CachedFeatures.create(semantic_features, None, src_shape)
+        if semantic_features is not None and self._share_image_encoder:
+            point_features = self._shared_point_features(
+                point_predictor, image_rgb, semantic_features
+            )
+            if point_features is not None:
+                return CachedFeatures.create(
+                    semantic_features,
+                    point_features,
+                    src_shape,
+                    point_stretch_size=self._predictor_size(semantic_predictor),
+                )
+        point_predictor.set_image(image_rgb)
+        return CachedFeatures.create(
+            semantic_features, point_predictor.features, src_shape
+        )
+
+    def _shared_point_features(
+        self, point_predictor: Any, image_rgb, semantic_features: Any
+    ) -> Any:
+        """Point features built from the semantic pass's backbone output.
+
+        Both SAM3 models carry the same vision backbone, and the semantic
+        backbone already returns the SAM2-style levels the interactive model
+        uses. Handing those to the point predictor skips its own backbone
+        run. The semantic pass stretches the image to a square rather than
+        letterboxing it, so ``query_point`` maps prompts and boxes to match.
+        Returns None, and stops trying, when the model does not allow it.
+        """
+        backbone_out = None
+        if isinstance(semantic_features, dict):
+            backbone_out = semantic_features.get("sam2_backbone_out")
+        if not isinstance(backbone_out, dict):
+            self._disable_encoder_sharing("no SAM2 backbone output")
+            return None
+        try:
+            if point_predictor.model is None:
+                point_predictor.setup_model()
+            encoder = point_predictor.model.image_encoder
+            if not callable(getattr(encoder, "forward_image_sam2", None)):
+                self._disable_encoder_sharing("no forward_image_sam2")
+                return None
+
+            def _reuse_backbone(_samples):
+                # The interactive model overwrites FPN levels in place, so
+                # hand it fresh lists and keep the semantic features intact.
+                return {
+                    "vision_features": backbone_out["vision_features"],
+                    "vision_pos_enc": list(backbone_out["vision_pos_enc"]),
+                    "backbone_fpn": list(backbone_out["backbone_fpn"]),
+                }
+
+            encoder.forward_image_sam2 = _reuse_backbone
+            try:
+                with self._inference_mode():
+                    point_predictor.set_image(image_rgb)
+            finally:
+                del encoder.forward_image_sam2
+        except Exception as exc:
+            self._disable_encoder_sharing(exc)
+            return None
+        return point_predictor.features
+
+    def _disable_encoder_sharing(self, reason: object) -> None:
+        self._share_image_encoder = False
+        logger.warning("SAM3 point features need their own encoder pass ({})", reason)
+
+    @staticmethod
+    def _inference_mode():
+        try:
+            import torch
+        except ModuleNotFoundError:
+            return nullcontext()
+        return torch.inference_mode()
+
+    def _predictor_size(self, predictor: Any) -> int:
+        """Square input size the predictor resized the image to."""
+        imgsz = getattr(predictor, "imgsz", None)
+        if isinstance(imgsz, (list, tuple)) and imgsz:
+            return int(imgsz[0])
+        if isinstance(imgsz, int):
+            return imgsz
+        return self._imgsz
+
+    def _remember_features(self, image_key: str, entry: CachedFeatures) -> None:
+        self._feature_cache.put(image_key, entry)
+        if self._feature_store is not None:
+            self._feature_store.save_async(self._store_key(image_key), entry)
+
+    def _activate_features(
+        self, image_key: Optional[str], entry: CachedFeatures
+    ) -> None:
+        self._predictor_ready = True
+        self._image_key = image_key
+        self._semantic_features = entry.semantic
+        self._point_features = entry.point
+        self._point_stretch_size = entry.point_stretch_size
+        self._src_shape = entry.src_shape
+        semantic_predictor = self._semantic_predictor
+        if semantic_predictor is not None:
+            self._reset_semantic_prompt_state(semantic_predictor)
+            try:
+                self._prime_point_prompt_context(semantic_predictor)
+            except Exception as exc:
+                logger.warning("Neutral point context init failed: {}", exc)
+
     def _reset_semantic_prompt_state(self, predictor: Optional[Any] = None) -> bool:
         """Clear semantic/text state so point prompting stays prompt-independent."""
         changed = False
@@ -350,8 +611,11 @@ class SAM3Service:
 
         return changed
 
+    @traced(category="sam")
+    @perf_timed(PERF_KIND_SAM)
     def query_text(self, text: str) -> List[Tuple[int, int, int, int]]:
-        with self._predictor_lock:
+        with self._interactive():
+            raise_if_cancelled()
             if not self.semantic_available:
                 raise RuntimeError("SAM3 semantic mode is unavailable")
             if self._semantic_features is None or self._src_shape is None:
@@ -374,16 +638,20 @@ class SAM3Service:
                 except Exception as exc:
                     logger.warning("Neutral point context reset failed: {}", exc)
 
+            raise_if_cancelled()
             normalized = self._normalize_mask_boxes(masks)
             if normalized:
                 return normalized
             return self._normalize_boxes(boxes)
 
+    @traced(category="sam")
+    @perf_timed(PERF_KIND_SAM)
     def query_boxes(
         self, boxes_xyxy: Sequence[Tuple[float, float, float, float]]
     ) -> List[Tuple[int, int, int, int]]:
         """Use existing boxes as positive visual exemplars to find similar instances."""
-        with self._predictor_lock:
+        with self._interactive():
+            raise_if_cancelled()
             if not self.semantic_available:
                 raise RuntimeError("SAM3 semantic mode is unavailable")
             if self._semantic_features is None or self._src_shape is None:
@@ -407,32 +675,52 @@ class SAM3Service:
                 except Exception as exc:
                     logger.warning("Neutral point context reset failed: {}", exc)
 
+            raise_if_cancelled()
             normalized = self._normalize_mask_boxes(masks)
             if normalized:
                 return normalized
             return self._normalize_boxes(boxes)
 
+    @traced(category="sam")
+    @perf_timed(PERF_KIND_SAM)
     def query_point(self, x: int, y: int) -> List[Tuple[int, int, int, int]]:
-        with self._predictor_lock:
+        """Boxes for the object under ``(x, y)``.
+
+        A point inside the mask of an earlier query on the same image returns
+        that query's boxes without running the decoder.
+        """
+        cached = self._point_results.lookup(self._image_key, x, y)
+        if cached is not None:
+            return cached
+        with self._interactive():
+            raise_if_cancelled()
             if not self.point_available:
                 raise RuntimeError("SAM3 point mode is unavailable")
             if self._src_shape is None:
                 logger.warning("query_point skipped: src_shape not ready")
                 return []
-            if self._image_rgb is None:
-                logger.warning("query_point skipped: image not loaded")
-                return []
             if self._point_features is None:
                 logger.warning("query_point skipped: point features not ready")
                 return []
 
             predictor = cast(Any, self._point_predictor)
             # log("[SAM3] query_point at ({}, {})".format(x, y), level=1)
+            src_shape = self._src_shape
+            image_key = self._image_key
+            points = [[x, y]]
+            stretch = self._point_stretch_size
+            if stretch:
+                # Features of the stretched square image: prompt and decode
+                # in that square, then scale the boxes back.
+                height, width = src_shape
+                src_shape = (stretch, stretch)
+                points = [[x * stretch / width, y * stretch / height]]
             try:
                 masks, boxes = predictor.inference_features(
                     self._point_features,
-                    src_shape=self._src_shape,
-                    points=[[x, y]],
+                    src_shape=src_shape,
+                    dst_shape=src_shape if stretch else None,
+                    points=points,
                     labels=[1],
                     multimask_output=False,
                 )
@@ -440,18 +728,41 @@ class SAM3Service:
                 logger.exception("Point query failed: {}", exc)
                 return []
 
-            normalized = self._normalize_mask_boxes(masks)
-            if normalized:
-                # log("[SAM3] query_point mask boxes: {}".format(len(normalized)), level=1)
-                return normalized
-            normalized_boxes = self._normalize_boxes(boxes)
-            # log("[SAM3] query_point bbox boxes: {}".format(len(normalized_boxes)), level=1)
-            return normalized_boxes
+            raise_if_cancelled()
+            mask_array = self._masks_array(masks)
+            normalized = self._normalize_mask_boxes(mask_array)
+            if not normalized:
+                normalized = self._normalize_boxes(boxes)
+            if stretch:
+                normalized = self._scale_boxes(
+                    normalized, width / stretch, height / stretch
+                )
+            if mask_array is not None and normalized:
+                scale = (stretch / width, stretch / height) if stretch else (1.0, 1.0)
+                self._point_results.add(
+                    image_key, mask_array.any(axis=0), normalized, scale
+                )
+            return normalized
 
     @staticmethod
-    def _normalize_mask_boxes(masks: object) -> List[Tuple[int, int, int, int]]:
+    def _scale_boxes(
+        boxes: List[Tuple[int, int, int, int]], scale_x: float, scale_y: float
+    ) -> List[Tuple[int, int, int, int]]:
+        return [
+            (
+                int(round(x * scale_x)),
+                int(round(y * scale_y)),
+                int(round(w * scale_x)),
+                int(round(h * scale_y)),
+            )
+            for x, y, w, h in boxes
+        ]
+
+    @staticmethod
+    def _masks_array(masks: object):
+        """Predictor masks as an ``(N, H, W)`` boolean array; None if unusable."""
         if masks is None:
-            return []
+            return None
 
         arr = cast(Any, masks)
         cpu_attr = getattr(arr, "cpu", None)
@@ -464,32 +775,18 @@ class SAM3Service:
         try:
             import numpy as np
         except Exception:
-            return []
+            return None
 
         np_arr = np.asarray(arr)
         if np_arr.ndim == 2:
             np_arr = np_arr[None, ...]
         elif np_arr.ndim != 3:
-            return []
-
-        normalized: List[Tuple[int, int, int, int]] = []
-        for mask in np_arr:
-            ys, xs = np.where(mask > 0)
-            if xs.size == 0 or ys.size == 0:
-                continue
-
-            x1 = int(xs.min())
-            y1 = int(ys.min())
-            x2 = int(xs.max())
-            y2 = int(ys.max())
-
-            w = x2 - x1 + 1
-            h = y2 - y1 + 1
-            if w <= 1 or h <= 1:
-                continue
-            normalized.append((x1, y1, w, h))
+            return None
+        return np_arr > 0
 
-        return normalized
+    @staticmethod
+    def _normalize_mask_boxes(masks: object) -> List[Tuple[int, int, int, int]]:
+        return mask_boxes(masks)
 
     @staticmethod
     def _normalize_boxes(boxes: object) -> List[Tuple[int, int, int, int]]:
@@ -2,5 +2,6 @@
 
 from vars_localize.services.M3Service import M3Service
 from vars_localize.services.SAM3Service import SAM3Service
+from vars_localize.services.sam_worker import SAM3WorkerService
 
-__all__ = ["M3Service", "SAM3Service"]
+__all__ = ["M3Service", "SAM3Service", "SAM3WorkerService"]
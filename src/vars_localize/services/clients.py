@@ -28,7 +28,8 @@ class AnnosaurusClient:
     OBSERVATION = "/annotations"
     ASSOCIATION = "/associations"
     IMAGED_MOMENT = "/imagedmoments"
-    DELETE_OBSERVATION = "/observations"
+    OBSERVATIONS = "/observations"
+    HEALTH = "/health"
     IMAGED_MOMENTS_BY_CONCEPT = "/fast/imagedmoments/concept/images"
     IMAGED_MOMENTS_BY_IMAGE_REFERENCE = "/annotations/imagereference"
     ANNOTATIONS_BY_VIDEO_REFERENCE = "/fast/videoreference"
@@ -81,6 +82,19 @@ class AnnosaurusClient:
             raise ServiceAuthError("Annosaurus auth response missing access_token")
         self._session.headers.update({"Authorization": "BEARER " + token})
 
+    def check_health(self, timeout_secs: int = 3) -> None:
+        """Ensure annosaurus responds to /health.
+
+        Args:
+            timeout_secs: Timeout in seconds.
+
+        Raises:
+            ServiceRequestError: If health check fails after retries.
+        """
+        self._request(
+            "get", self.HEALTH, timeout_secs=max(1, int(timeout_secs)), retries=1
+        )
+
     def _require_auth(self) -> None:
         """Guard methods that require annosaurus JWT auth.
 
@@ -118,6 +132,34 @@ class AnnosaurusClient:
         payload = response.json()
         return payload if isinstance(payload, dict) else {}
 
+    def get_observation(self, observation_uuid: str) -> Dict[str, Any]:
+        """Return an observation by UUID.
+
+        Args:
+            observation_uuid: Observation UUID.
+
+        Returns:
+            Parsed JSON payload.
+        """
+        self._require_auth()
+        response = self._request("get", self.OBSERVATIONS + "/" + observation_uuid)
+        payload = response.json()
+        return payload if isinstance(payload, dict) else {}
+
+    def get_association(self, association_uuid: str) -> Dict[str, Any]:
+        """Return an association by UUID.
+
+        Args:
+            association_uuid: Association UUID.
+
+        Returns:
+            Parsed JSON payload.
+        """
+        self._require_auth()
+        response = self._request("get", self.ASSOCIATION + "/" + association_uuid)
+        payload = response.json()
+        return payload if isinstance(payload, dict) else {}
+
     def get_imaged_moments_by_image_reference(
         self, image_reference_uuid: str
     ) -> List[Dict[str, Any]]:
@@ -186,7 +228,7 @@ class AnnosaurusClient:
             Response on success.
         """
         self._require_auth()
-        return self._request("delete", self.DELETE_OBSERVATION + "/" + observation_uuid)
+        return self._request("delete", self.OBSERVATIONS + "/" + observation_uuid)
 
     def rename_observation(
         self, observation_uuid: str, new_concept: str, observer: str
@@ -2,17 +2,36 @@
 
 from __future__ import annotations
 
-import time
+import functools
+import re
 from typing import Optional
+from urllib.parse import urlsplit
 
 import requests
 
 from vars_localize.services.errors import ServiceRequestError
+from vars_localize.util import cancellation, tracing
+from vars_localize.util.logging import PERF_KIND_NETWORK, perf_enabled, perf_timer
 
 DEFAULT_TIMEOUT_SECS = 8
 DEFAULT_RETRIES = 2
 DEFAULT_BACKOFF_SECS = 0.2
 
+# Responses to these may be dropped when the task is cancelled mid-request.
+# For writes the server may already have applied, the response is returned.
+_IDEMPOTENT_METHODS = frozenset({"get", "head", "options"})
+
+_UUID_SEGMENT = re.compile(
+    r"/[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}(?=/|$)"
+)
+
+
+def _operation_name(method: str, url: str) -> str:
+    """``GET /anno/v1/fast/{uuid}``: one name per endpoint, for aggregation."""
+    return "{} {}".format(
+        method.upper(), _UUID_SEGMENT.sub("/{uuid}", urlsplit(url).path)
+    )
+
 
 def _status_code_from_exception(exc: Exception) -> Optional[int]:
     response = getattr(exc, "response", None)
@@ -40,14 +59,58 @@ def request_with_policy(
     backoff_secs: float = DEFAULT_BACKOFF_SECS,
     **kwargs,
 ) -> requests.Response:
-    """Execute an HTTP request with consistent timeout/retry/backoff behavior."""
+    """Execute an HTTP request with consistent timeout/retry/backoff behavior.
+
+    Inside a cancellable task, raises ``TaskCancelledError`` before each
+    attempt, during backoff, and once a response arrives for a cancelled task.
+    """
+    send = functools.partial(
+        _request_with_retries,
+        session,
+        method,
+        url,
+        timeout_secs=timeout_secs,
+        retries=retries,
+        backoff_secs=backoff_secs,
+        **kwargs,
+    )
+    if not tracing.tracing_enabled() and not perf_enabled():
+        return send()
+    op = _operation_name(method, url)
+    with (
+        tracing.span(op, "http", url=url) as trace_args,
+        perf_timer(PERF_KIND_NETWORK, op) as perf_fields,
+    ):
+        response = send()
+        measured = {
+            "status": response.status_code,
+            "bytes": len(response.content or b""),
+        }
+        trace_args.update(measured)
+        perf_fields.update(measured)
+        return response
+
+
+def _request_with_retries(
+    session: requests.Session,
+    method: str,
+    url: str,
+    *,
+    timeout_secs: int,
+    retries: int,
+    backoff_secs: float,
+    **kwargs,
+) -> requests.Response:
     last_exc: Optional[Exception] = None
     timeout = max(1, int(timeout_secs))
     max_retries = max(0, int(retries))
 
     for attempt in range(max_retries + 1):
+        cancellation.raise_if_cancelled()
         try:
             response = session.request(method, url, timeout=timeout, **kwargs)
+            if method.lower() in _IDEMPOTENT_METHODS:
+                cancellation.raise_if_cancelled()
             response.raise_for_status()
             return response
         except requests.RequestException as exc:
@@ -55,7 +118,7 @@ def request_with_policy(
             should_retry = attempt < max_retries and _is_retryable_exception(exc)
             if not should_retry:
                 break
-            time.sleep(backoff_secs * (2**attempt))
+            cancellation.sleep(backoff_secs * (2**attempt))
 
     status_code = _status_code_from_exception(last_exc) if last_exc else None
     message = str(last_exc) if last_exc is not None else "HTTP request failed"
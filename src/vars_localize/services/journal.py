@@ -0,0 +1,162 @@
+"""Durable SQLite journal for queued annotation mutations.
+
+Each mutation submitted to a ``MutationQueue`` is written here before it runs
+and updated when it completes or fails. After a crash or an offline session,
+the queue restores the rows that are still pending and replays them in
+order. Results of completed mutations are kept while a pending mutation still
+references them through a ``ResultRef``, so placeholder UUIDs for objects
+created offline resolve after a restart too.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from vars_localize.services.errors import ServiceError
+from vars_localize.services.mutations import Mutation
+from vars_localize.util.logging import get_logger
+
+logger = get_logger("MutationJournal")
+
+STATE_PENDING = "pending"
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mutations (
+    id INTEGER PRIMARY KEY,
+    state TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+def _encode_result(result: Any) -> Optional[str]:
+    """Keep JSON results; responses from delete calls are stored as null."""
+    if not isinstance(result, (dict, list)):
+        return None
+    try:
+        return json.dumps(result)
+    except (TypeError, ValueError):
+        return None
+
+
+class MutationJournal:
+    """Append-and-update log of mutations stored in a SQLite file.
+
+    Args:
+        path: Database file, created with its parent directory if missing.
+            ``":memory:"`` keeps the journal in memory, for tests.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self._path = str(path)
+        if self._path != ":memory:":
+            Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = sqlite3.connect(
+            self._path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Edits arrive at human pace, so pay for an fsync per write.
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute(_SCHEMA)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def _execute(self, sql: str, params: Iterable[Any] = ()) -> List[Tuple]:
+        with self._lock:
+            if self._conn is None:
+                raise ServiceError("Mutation journal is closed")
+            return self._conn.execute(sql, tuple(params)).fetchall()
+
+    def record(self, mutation: Mutation) -> None:
+        """Insert or update a mutation as pending."""
+        self._execute(
+            "INSERT INTO mutations (id, state, payload, result, error, updated_at) "
+            "VALUES (?, ?, ?, NULL, NULL, ?) "
+            "ON CONFLICT(id) DO UPDATE SET state = excluded.state, "
+            "payload = excluded.payload, error = NULL, "
+            "updated_at = excluded.updated_at",
+            (mutation.id, STATE_PENDING, json.dumps(mutation.to_dict()), time.time()),
+        )
+
+    def complete(self, mutation_id: int, result: Any) -> None:
+        self._execute(
+            "UPDATE mutations SET state = ?, result = ?, error = NULL, updated_at = ? "
+            "WHERE id = ?",
+            (STATE_DONE, _encode_result(result), time.time(), mutation_id),
+        )
+
+    def fail(self, mutation_id: int, error: str) -> None:
+        self._execute(
+            "UPDATE mutations SET state = ?, error = ?, updated_at = ? WHERE id = ?",
+            (STATE_FAILED, error, time.time(), mutation_id),
+        )
+
+    def remove(self, mutation_ids: Iterable[int]) -> None:
+        for mutation_id in mutation_ids:
+            self._execute("DELETE FROM mutations WHERE id = ?", (mutation_id,))
+
+    def last_id(self) -> int:
+        rows = self._execute("SELECT MAX(id) FROM mutations")
+        return int(rows[0][0] or 0)
+
+    def load(self) -> Tuple[List[Mutation], List[Mutation], Dict[int, Any]]:
+        """Return pending mutations, failed mutations and referenced results.
+
+        Rows that cannot be decoded are logged and skipped.
+        """
+        pending: List[Mutation] = []
+        failed: List[Mutation] = []
+        results: Dict[int, Any] = {}
+        rows = self._execute(
+            "SELECT id, state, payload, result, error FROM mutations ORDER BY id"
+        )
+        for row_id, state, payload, result, error in rows:
+            if state == STATE_DONE:
+                results[int(row_id)] = json.loads(result) if result else None
+                continue
+            try:
+                mutation = Mutation.from_dict(json.loads(payload))
+            except (KeyError, TypeError, ValueError) as exc:
+                logger.error("Skipping unreadable journal entry {}: {}", row_id, exc)
+                continue
+            if state == STATE_FAILED:
+                mutation.error = ServiceError(error or "Failed in a previous session")
+                failed.append(mutation)
+            else:
+                pending.append(mutation)
+        return pending, failed, results
+
+    def prune(self) -> int:
+        """Delete completed rows that no unfinished mutation refers to."""
+        referenced = set()
+        rows = self._execute(
+            "SELECT payload FROM mutations WHERE state != ?", (STATE_DONE,)
+        )
+        for (payload,) in rows:
+            try:
+                referenced |= Mutation.from_dict(json.loads(payload)).depends_on
+            except (KeyError, TypeError, ValueError):
+                continue
+        done = self._execute("SELECT id FROM mutations WHERE state = ?", (STATE_DONE,))
+        stale = [row_id for (row_id,) in done if row_id not in referenced]
+        self.remove(stale)
+        return len(stale)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,723 @@
+"""Write-behind queue for annotation mutations.
+
+UI handlers submit named M3Service write operations and return immediately.
+The queue runs them on a small worker pool. Mutations that share a key
+(usually an observation UUID) run one at a time in submission order.
+Mutations with different keys run concurrently. A mutation can take values
+from another mutation's result through ``ResultRef`` placeholders, for
+example a box created for an observation that is still being created.
+Transient failures are retried with backoff. Listeners are told the
+pending and failed counts whenever they change.
+
+With a connectivity ``probe`` the queue can also work offline. When
+transient failures persist, the queue stops dispatching and keeps the
+mutations pending. It calls the probe periodically and replays the
+mutations in order once the probe succeeds. A ``MutationJournal`` keeps
+pending mutations across restarts. Before a deferred or restored edit
+runs, it is checked against the server copy it was based on. A
+concurrent change is reported as a ``MutationConflictError`` instead of
+being overwritten.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
+
+from vars_localize.services.errors import (
+    ServiceError,
+    ServiceRequestError,
+    ServiceValidationError,
+)
+from vars_localize.util.logging import get_logger
+
+if TYPE_CHECKING:
+    from vars_localize.services.journal import MutationJournal
+
+logger = get_logger("MutationQueue")
+
+MUTATION_OPS = frozenset(
+    {
+        "create_observation",
+        "rename_observation",
+        "delete_observation",
+        "create_box",
+        "modify_box",
+        "delete_box",
+    }
+)
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_SECS = 0.5
+DEFAULT_PROBE_INTERVAL_SECS = 5.0
+# Completed results kept for ResultRefs, beyond those still referenced.
+_COMPLETED_HISTORY = 512
+
+
+class MutationDependencyError(ServiceError):
+    """Raised for a mutation whose prerequisite mutation failed."""
+
+
+class MutationConflictError(ServiceError):
+    """Raised when a replayed edit's target changed on the server meanwhile."""
+
+
+# op -> (M3Service getter, kwarg holding the target UUID, compared field)
+_PRECONDITIONS: Dict[str, Tuple[str, str, str]] = {
+    "modify_box": ("get_association", "association_uuid", "link_value"),
+    "delete_box": ("get_association", "association_uuid", "link_value"),
+    "rename_observation": ("get_observation", "observation_uuid", "concept"),
+    "delete_observation": ("get_observation", "observation_uuid", "concept"),
+}
+
+# op -> kwarg holding the value the edit writes to the compared field
+_WRITTEN_VALUES: Dict[str, str] = {
+    "modify_box": "box_json",
+    "rename_observation": "new_concept",
+}
+
+
+@dataclass(frozen=True)
+class ResultRef:
+    """Placeholder for a field of another mutation's result.
+
+    The first of ``fields`` present in the result is used. An empty
+    ``fields`` tuple stands for the whole result.
+    """
+
+    mutation_id: int
+    fields: Tuple[str, ...] = ("uuid",)
+
+    def resolve(self, result: Any) -> Any:
+        if not self.fields:
+            return result
+        if isinstance(result, dict):
+            for name in self.fields:
+                value = result.get(name)
+                if value:
+                    return str(value)
+        raise ServiceValidationError(
+            "Mutation {} result has none of {}".format(
+                self.mutation_id, ", ".join(self.fields)
+            )
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"$ref": self.mutation_id, "fields": list(self.fields)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ResultRef":
+        return cls(int(data["$ref"]), tuple(data.get("fields") or ()))
+
+
+@dataclass(eq=False)
+class Mutation:
+    """One queued M3Service write call."""
+
+    id: int
+    op: str
+    kwargs: Dict[str, Any]
+    key: Optional[str] = None
+    coalesce_key: Optional[str] = None
+    expected: Optional[str] = None
+    attempts: int = 0
+    deferred: bool = False
+    error: Optional[BaseException] = None
+    future: Future = field(default_factory=Future, repr=False)
+
+    @property
+    def depends_on(self) -> Set[int]:
+        return {
+            value.mutation_id
+            for value in self.kwargs.values()
+            if isinstance(value, ResultRef)
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the call so it can be stored and replayed."""
+        return {
+            "id": self.id,
+            "op": self.op,
+            "key": self.key,
+            "coalesce_key": self.coalesce_key,
+            "expected": self.expected,
+            "kwargs": {
+                name: value.to_dict() if isinstance(value, ResultRef) else value
+                for name, value in self.kwargs.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Mutation":
+        return cls(
+            id=int(data["id"]),
+            op=str(data["op"]),
+            key=data.get("key"),
+            coalesce_key=data.get("coalesce_key"),
+            expected=data.get("expected"),
+            kwargs={
+                name: (
+                    ResultRef.from_dict(value)
+                    if isinstance(value, dict) and "$ref" in value
+                    else value
+                )
+                for name, value in (data.get("kwargs") or {}).items()
+            },
+        )
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Return True for failures worth retrying: transport errors, 5xx and 429."""
+    if not isinstance(exc, ServiceRequestError):
+        return False
+    status = exc.status_code
+    return status is None or status >= 500 or status == 429
+
+
+def _comparable(value: Any) -> Any:
+    """Decode JSON text so formatting differences do not count as changes."""
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _is_not_found(exc: BaseException) -> bool:
+    return isinstance(exc, ServiceRequestError) and exc.status_code == 404
+
+
+MutationListener = Callable[[int, int], None]
+
+
+class MutationQueue:
+    """Run annotation writes in the background with ordering and retries.
+
+    Args:
+        service: Object exposing the M3Service write methods.
+        max_workers: Number of writes allowed in flight at once.
+        retries: Extra attempts for transient failures.
+        backoff_secs: Base delay between attempts, doubled each retry.
+        journal: Optional durable store. Pending mutations from a previous
+            session are loaded on construction and run on ``replay()``.
+        probe: Optional connectivity check that raises while the services
+            are unreachable. Enables offline mode.
+        probe_interval_secs: Delay between probes while offline.
+    """
+
+    def __init__(
+        self,
+        service: Any,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        retries: int = DEFAULT_RETRIES,
+        backoff_secs: float = DEFAULT_BACKOFF_SECS,
+        is_transient: Callable[[BaseException], bool] = is_transient_error,
+        journal: Optional["MutationJournal"] = None,
+        probe: Optional[Callable[[], Any]] = None,
+        probe_interval_secs: float = DEFAULT_PROBE_INTERVAL_SECS,
+    ):
+        self._service = service
+        self._retries = max(0, int(retries))
+        self._backoff_secs = max(0.0, float(backoff_secs))
+        self._is_transient = is_transient
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, int(max_workers)),
+            thread_name_prefix="mutations",
+        )
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._pending: "OrderedDict[int, Mutation]" = OrderedDict()
+        self._running: Dict[int, Mutation] = {}
+        self._busy_keys: Set[str] = set()
+        self._completed: "OrderedDict[int, Any]" = OrderedDict()
+        self._failed: "OrderedDict[int, Mutation]" = OrderedDict()
+        self._listeners: List[MutationListener] = []
+        self._closed = False
+        self._journal = journal
+        self._probe = probe
+        self._probe_interval_secs = max(0.01, float(probe_interval_secs))
+        self._probe_timer: Optional[threading.Timer] = None
+        self._offline = False
+        self._forced_offline = False
+        if journal is not None:
+            self._restore(journal)
+
+    # --- Public API ---------------------------------------------------------
+
+    def submit(
+        self,
+        op: str,
+        *,
+        key: Optional[str] = None,
+        coalesce_key: Optional[str] = None,
+        expected: Optional[str] = None,
+        **kwargs,
+    ) -> Mutation:
+        """Queue an M3Service write and return its handle.
+
+        Args:
+            op: Name of the M3Service method to call.
+            key: Mutations with the same key run one at a time, in order.
+            coalesce_key: A queued, not yet started mutation with the same
+                coalesce key is updated in place instead of adding a new one.
+            expected: Server value of the edited field (box ``link_value`` or
+                observation ``concept``) the edit was based on. Used for
+                conflict detection when the edit is replayed.
+            **kwargs: Keyword arguments for the call. ``ResultRef`` values are
+                replaced with fields of earlier mutation results.
+
+        Returns:
+            Mutation: Handle whose ``future`` resolves with the call result.
+        """
+        if op not in MUTATION_OPS:
+            raise ServiceValidationError("Unsupported mutation: {}".format(op))
+
+        with self._lock:
+            if self._closed:
+                raise ServiceValidationError("Mutation queue is closed")
+            kwargs = self._bind_completed(kwargs)
+            mutation = self._coalesce(op, coalesce_key, kwargs)
+            if mutation is None:
+                mutation = Mutation(
+                    id=next(self._ids),
+                    op=op,
+                    kwargs=dict(kwargs),
+                    key=key,
+                    coalesce_key=coalesce_key,
+                    expected=expected,
+                )
+                self._pending[mutation.id] = mutation
+            self._journal_call("record", mutation)
+            ready = self._take_ready()
+        self._start(ready)
+        self._notify()
+        return mutation
+
+    @property
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending) + len(self._running)
+
+    @property
+    def failed_count(self) -> int:
+        with self._lock:
+            return len(self._failed)
+
+    @property
+    def offline(self) -> bool:
+        with self._lock:
+            return self._offline
+
+    def failed(self) -> List[Mutation]:
+        with self._lock:
+            return list(self._failed.values())
+
+    def retry_failed(self) -> int:
+        """Re-queue failed mutations, including dependents that were skipped.
+
+        Retrying a conflicted edit applies it over the server's version.
+        """
+        with self._lock:
+            retried = list(self._failed.values())
+            self._failed.clear()
+            for mutation in retried:
+                if isinstance(mutation.error, MutationConflictError):
+                    mutation.deferred = False
+                mutation.attempts = 0
+                mutation.error = None
+                mutation.future = Future()
+                self._pending[mutation.id] = mutation
+                self._journal_call("record", mutation)
+            self._pending = OrderedDict(sorted(self._pending.items()))
+            ready = self._take_ready()
+        self._start(ready)
+        self._notify()
+        return len(retried)
+
+    def discard_failed(self) -> int:
+        with self._lock:
+            discarded = list(self._failed)
+            self._failed.clear()
+            self._journal_call("remove", discarded)
+        self._notify()
+        return len(discarded)
+
+    def replay(self) -> int:
+        """Start mutations restored from the journal and return how many."""
+        with self._lock:
+            count = len(self._pending)
+            ready = self._take_ready()
+        self._start(ready)
+        self._notify()
+        return count
+
+    def set_offline(self, offline: bool) -> None:
+        """Pause or resume dispatching, e.g. for a "work offline" toggle.
+
+        While forced offline, the probe does not bring the queue back online.
+        """
+        with self._lock:
+            self._forced_offline = bool(offline)
+            self._offline = bool(offline)
+            ready = [] if offline else self._take_ready()
+        self._start(ready)
+        self._notify()
+
+    def add_listener(self, listener: MutationListener) -> None:
+        """Register ``listener(pending, failed)``; it may run on any thread."""
+        self._listeners.append(listener)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until nothing is pending or running. Intended for tests/shutdown."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if not self._pending and not self._running:
+                    return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+
+    def close(self, wait: bool = True) -> None:
+        """Stop accepting mutations.
+
+        The journal is closed only with ``wait``. Otherwise writes still in
+        flight can record their outcome before the process exits.
+        """
+        with self._lock:
+            self._closed = True
+            timer, self._probe_timer = self._probe_timer, None
+        if timer is not None:
+            timer.cancel()
+        self._executor.shutdown(wait=wait)
+        if wait and self._journal is not None:
+            with self._lock:
+                self._journal_call("prune")
+            self._journal.close()
+
+    # --- Journal / offline --------------------------------------------------
+
+    def _journal_call(self, method: str, *args) -> None:
+        """Update the journal, logging instead of failing the edit."""
+        if self._journal is None:
+            return
+        try:
+            getattr(self._journal, method)(*args)
+        except Exception as exc:
+            logger.error("Mutation journal {} failed: {}", method, exc)
+
+    def _restore(self, journal: "MutationJournal") -> None:
+        journal.prune()
+        pending, failed, results = journal.load()
+        self._ids = itertools.count(journal.last_id() + 1)
+        self._completed.update(results)
+        for mutation in pending:
+            mutation.deferred = True
+            self._pending[mutation.id] = mutation
+        for mutation in failed:
+            mutation.deferred = True
+            self._failed[mutation.id] = mutation
+        if pending or failed:
+            logger.info(
+                "Restored {} pending and {} failed edit(s) from the journal",
+                len(pending),
+                len(failed),
+            )
+
+    def _defer(self, mutation: Mutation, error: BaseException) -> None:
+        """Keep a mutation pending and go offline. Caller holds the lock."""
+        mutation.attempts = 0
+        mutation.deferred = True
+        self._pending[mutation.id] = mutation
+        self._pending = OrderedDict(sorted(self._pending.items()))
+        if not self._offline:
+            logger.warning("Services unreachable, working offline: {}", error)
+        self._offline = True
+        self._schedule_probe()
+
+    def _schedule_probe(self) -> None:
+        """Caller holds the lock."""
+        if self._probe_timer is not None or self._closed or self._forced_offline:
+            return
+        timer = threading.Timer(self._probe_interval_secs, self._run_probe)
+        timer.daemon = True
+        self._probe_timer = timer
+        timer.start()
+
+    def _run_probe(self) -> None:
+        probe = self._probe
+        try:
+            if probe is not None:
+                probe()
+        except Exception as exc:
+            logger.debug("Connectivity probe failed: {}", exc)
+            with self._lock:
+                self._probe_timer = None
+                if self._offline:
+                    self._schedule_probe()
+            return
+        with self._lock:
+            self._probe_timer = None
+            if self._forced_offline or not self._offline:
+                return
+            self._offline = False
+            logger.info(
+                "Services reachable again, replaying {} edit(s)", len(self._pending)
+            )
+            ready = self._take_ready()
+        self._start(ready)
+        self._notify()
+
+    def _check_conflict(self, mutation: Mutation, kwargs: Dict[str, Any]) -> bool:
+        """Compare a replayed edit's target with the value it was based on.
+
+        Returns:
+            bool: False when a delete's target is already gone and the call
+            can be skipped.
+
+        Raises:
+            MutationConflictError: If the target changed or was deleted.
+        """
+        getter, uuid_arg, field_name = _PRECONDITIONS[mutation.op]
+        target_uuid = kwargs.get(uuid_arg)
+        try:
+            current = getattr(self._service, getter)(target_uuid)
+        except Exception as exc:
+            if not _is_not_found(exc):
+                raise
+            if mutation.op.startswith("delete_"):
+                return False
+            raise MutationConflictError(
+                "{} {} was deleted on the server".format(uuid_arg, target_uuid)
+            ) from exc
+
+        current_value = _comparable((current or {}).get(field_name))
+        if current_value == _comparable(mutation.expected):
+            return True
+        written_arg = _WRITTEN_VALUES.get(mutation.op)
+        if written_arg is not None and current_value == _comparable(
+            kwargs.get(written_arg)
+        ):
+            # The edit already landed, e.g. before a crash.
+            return True
+        raise MutationConflictError(
+            "{} {} was changed on the server since this edit was made".format(
+                uuid_arg, target_uuid
+            )
+        )
+
+    # --- Scheduling ---------------------------------------------------------
+
+    def _coalesce(
+        self, op: str, coalesce_key: Optional[str], kwargs: Dict[str, Any]
+    ) -> Optional[Mutation]:
+        if coalesce_key is None:
+            return None
+        for mutation in reversed(self._pending.values()):
+            if mutation.coalesce_key == coalesce_key:
+                if mutation.op != op:
+                    return None
+                if any(
+                    mutation.id in other.depends_on for other in self._pending.values()
+                ):
+                    return None
+                mutation.kwargs.update(kwargs)
+                return mutation
+        return None
+
+    def _bind_completed(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace refs to already completed mutations with their values.
+
+        Caller holds the lock. Refs whose result lacks the field are kept, so
+        the mutation fails when it runs.
+        """
+        bound = dict(kwargs)
+        for name, value in kwargs.items():
+            if isinstance(value, ResultRef) and value.mutation_id in self._completed:
+                try:
+                    bound[name] = value.resolve(self._completed[value.mutation_id])
+                except ServiceValidationError:
+                    continue
+        return bound
+
+    def _trim_completed(self) -> None:
+        """Drop the oldest results past the history limit. Caller holds the lock.
+
+        Results that a pending, running or failed (retryable) mutation still
+        refers to are kept regardless of age.
+        """
+        excess = len(self._completed) - _COMPLETED_HISTORY
+        if excess <= 0:
+            return
+        referenced: Set[int] = set()
+        for queued in (self._pending, self._running, self._failed):
+            for mutation in queued.values():
+                referenced |= mutation.depends_on
+        for mutation_id in list(self._completed):
+            if excess <= 0:
+                break
+            if mutation_id in referenced:
+                continue
+            del self._completed[mutation_id]
+            excess -= 1
+
+    def _is_known(self, mutation_id: int) -> bool:
+        return (
+            mutation_id in self._pending
+            or mutation_id in self._running
+            or mutation_id in self._completed
+        )
+
+    def _take_ready(self) -> List[Mutation]:
+        """Move runnable mutations from pending to running. Caller holds the lock.
+
+        Mutations whose prerequisites failed are moved to the failed set; the
+        caller settles their futures via ``_settle_skipped`` after unlocking.
+        """
+        if self._offline:
+            return []
+        ready: List[Mutation] = []
+        blocked_keys: Set[str] = set(self._busy_keys)
+        for mutation in list(self._pending.values()):
+            deps = mutation.depends_on
+            failed_dep = next((dep for dep in deps if not self._is_known(dep)), None)
+            if failed_dep is not None:
+                del self._pending[mutation.id]
+                mutation.error = MutationDependencyError(
+                    "Mutation {} depends on failed mutation {}".format(
+                        mutation.id, failed_dep
+                    )
+                )
+                self._failed[mutation.id] = mutation
+                self._journal_call("fail", mutation.id, str(mutation.error))
+                continue
+            waiting = any(dep not in self._completed for dep in deps)
+            if mutation.key is not None and mutation.key in blocked_keys:
+                continue
+            if mutation.key is not None:
+                # Later mutations with this key wait for this one, in order.
+                blocked_keys.add(mutation.key)
+            if waiting:
+                continue
+            del self._pending[mutation.id]
+            self._running[mutation.id] = mutation
+            if mutation.key is not None:
+                self._busy_keys.add(mutation.key)
+            ready.append(mutation)
+        return ready
+
+    def _start(self, mutations: List[Mutation]) -> None:
+        self._settle_skipped()
+        for mutation in mutations:
+            self._executor.submit(self._run, mutation)
+
+    def _settle_skipped(self) -> None:
+        with self._lock:
+            skipped = [
+                mutation
+                for mutation in self._failed.values()
+                if mutation.error is not None and not mutation.future.done()
+            ]
+        for mutation in skipped:
+            if not mutation.future.done():
+                mutation.future.set_exception(mutation.error)
+
+    def _resolve_kwargs(self, mutation: Mutation) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                name: (
+                    value.resolve(self._completed[value.mutation_id])
+                    if isinstance(value, ResultRef)
+                    else value
+                )
+                for name, value in mutation.kwargs.items()
+            }
+
+    def _call(self, mutation: Mutation, kwargs: Dict[str, Any]) -> Any:
+        if (
+            mutation.deferred
+            and mutation.expected is not None
+            and mutation.op in _PRECONDITIONS
+            and not self._check_conflict(mutation, kwargs)
+        ):
+            return None
+        return getattr(self._service, mutation.op)(**kwargs)
+
+    def _run(self, mutation: Mutation) -> None:
+        result: Any = None
+        error: Optional[BaseException] = None
+        unreachable: Optional[BaseException] = None
+        try:
+            kwargs = self._resolve_kwargs(mutation)
+            while True:
+                mutation.attempts += 1
+                try:
+                    result = self._call(mutation, kwargs)
+                    break
+                except Exception as exc:
+                    transient = self._is_transient(exc)
+                    if (
+                        transient
+                        and self._probe is not None
+                        and (self._offline or mutation.attempts > self._retries)
+                    ):
+                        unreachable = exc
+                        break
+                    if mutation.attempts > self._retries or not transient:
+                        raise
+                    delay = self._backoff_secs * (2 ** (mutation.attempts - 1))
+                    logger.warning(
+                        "Mutation {} {} failed (attempt {}), retrying in {:.2f}s: {}",
+                        mutation.id,
+                        mutation.op,
+                        mutation.attempts,
+                        delay,
+                        exc,
+                    )
+                    time.sleep(delay)
+        except Exception as exc:
+            error = exc
+            logger.error("Mutation {} {} failed: {}", mutation.id, mutation.op, exc)
+
+        with self._lock:
+            self._running.pop(mutation.id, None)
+            if mutation.key is not None:
+                self._busy_keys.discard(mutation.key)
+            if unreachable is not None:
+                self._defer(mutation, unreachable)
+            elif error is None:
+                self._completed[mutation.id] = result
+                self._trim_completed()
+                self._journal_call("complete", mutation.id, result)
+            else:
+                mutation.error = error
+                self._failed[mutation.id] = mutation
+                self._journal_call("fail", mutation.id, str(error))
+            ready = self._take_ready()
+
+        # Deferred mutations keep their future open until they are replayed.
+        if unreachable is None:
+            if error is None:
+                mutation.future.set_result(result)
+            else:
+                mutation.future.set_exception(error)
+        self._start(ready)
+        self._notify()
+
+    def _notify(self) -> None:
+        with self._lock:
+            pending = len(self._pending) + len(self._running)
+            failed = len(self._failed)
+        for listener in list(self._listeners):
+            try:
+                listener(pending, failed)
+            except Exception as exc:
+                logger.warning("Mutation listener failed: {}", exc)
@@ -0,0 +1,414 @@
+"""Caching of SAM3 image features so revisited images skip the encoder.
+
+``FeatureCache`` keeps recent features in memory. ``FeatureStore`` persists
+them on disk so another session, or another annotator sharing the folder,
+can load them instead of encoding the image again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from vars_localize.util.logging import get_logger
+
+logger = get_logger("SAMFeatures")
+
+DEFAULT_FEATURE_CACHE_MB = 512
+DEFAULT_FEATURE_STORE_MB = 0
+
+# Bump when the on-disk layout or the meaning of stored features changes.
+FEATURE_STORE_VERSION = 1
+
+_META_FILE = "meta.json"
+
+# Queued writes keep their features alive, possibly on the GPU, until they
+# are written, so callers wait once this many are pending.
+DEFAULT_PENDING_SAVES = 2
+
+
+def image_cache_key(moment: Any) -> str:
+    """Identify a moment's image: reference UUID, else URL, else moment UUID."""
+    return moment.image_reference_uuid or moment.image_url or moment.uuid
+
+
+def feature_nbytes(value: Any) -> int:
+    """Bytes held by the arrays/tensors in a (nested) feature structure."""
+    if value is None:
+        return 0
+    if isinstance(value, dict):
+        return sum(feature_nbytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(feature_nbytes(item) for item in value)
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    element_size = getattr(value, "element_size", None)
+    numel = getattr(value, "nelement", None)
+    if callable(element_size) and callable(numel):
+        return int(element_size()) * int(numel())
+    return 0
+
+
+@dataclass(frozen=True)
+class CachedFeatures:
+    """Encoder output for one image, for both prompt modes.
+
+    ``point_stretch_size`` is set when the point features were derived from
+    the semantic encoder pass, which stretches the image to a square of that
+    size instead of letterboxing it.
+    """
+
+    semantic: Any
+    point: Any
+    src_shape: Tuple[int, int]
+    nbytes: int
+    point_stretch_size: Optional[int] = None
+
+    @classmethod
+    def create(
+        cls,
+        semantic: Any,
+        point: Any,
+        src_shape: Tuple[int, int],
+        point_stretch_size: Optional[int] = None,
+    ) -> "CachedFeatures":
+        nbytes = feature_nbytes(semantic)
+        if point is not semantic:
+            nbytes += feature_nbytes(point)
+        return cls(semantic, point, tuple(src_shape), nbytes, point_stretch_size)
+
+
+class FeatureCache:
+    """LRU cache of image features bounded by total size.
+
+    Args:
+        budget_mb: Size limit in MiB. Zero disables caching.
+    """
+
+    def __init__(self, budget_mb: int = DEFAULT_FEATURE_CACHE_MB):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CachedFeatures]" = OrderedDict()
+        self._nbytes = 0
+        self._budget = 0
+        self.set_budget_mb(budget_mb)
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    @property
+    def budget_bytes(self) -> int:
+        return self._budget
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def keys(self) -> List[str]:
+        """Cached keys, least recently used first."""
+        with self._lock:
+            return list(self._entries)
+
+    def set_budget_mb(self, budget_mb: int) -> None:
+        with self._lock:
+            self._budget = max(0, int(budget_mb)) * 1024 * 1024
+            self._evict()
+
+    def get(self, key: str) -> Optional[CachedFeatures]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CachedFeatures) -> bool:
+        """Store ``entry``; return False when it is larger than the budget."""
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._nbytes -= previous.nbytes
+            if entry.nbytes > self._budget:
+                return False
+            self._entries[key] = entry
+            self._nbytes += entry.nbytes
+            self._evict()
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def _evict(self) -> None:
+        while self._entries and self._nbytes > self._budget:
+            _key, entry = self._entries.popitem(last=False)
+            self._nbytes -= entry.nbytes
+
+
+def feature_store_key(image_key: str, model_id: str, imgsz: int) -> str:
+    """Digest naming the stored features of one image for one encoder setup."""
+    payload = json.dumps(
+        [FEATURE_STORE_VERSION, image_key, model_id, int(imgsz)],
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _is_tensor(value: Any) -> bool:
+    return type(value).__module__.startswith("torch") and hasattr(value, "detach")
+
+
+def _flatten(value: Any, arrays: List[np.ndarray]) -> Dict[str, Any]:
+    """Describe ``value`` as JSON, moving its arrays/tensors into ``arrays``."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return {"value": value}
+    if isinstance(value, dict):
+        return {"dict": {str(k): _flatten(v, arrays) for k, v in value.items()}}
+    if isinstance(value, (list, tuple)):
+        kind = "list" if isinstance(value, list) else "tuple"
+        return {kind: [_flatten(item, arrays) for item in value]}
+    if isinstance(value, np.ndarray):
+        arrays.append(value)
+        return {"array": len(arrays) - 1}
+    if _is_tensor(value):
+        import torch
+
+        tensor = value.detach().cpu()
+        dtype = str(tensor.dtype).replace("torch.", "")
+        if tensor.dtype == torch.bfloat16:
+            # numpy has no bfloat16; keep the raw bits.
+            tensor = tensor.view(torch.int16)
+        arrays.append(tensor.contiguous().numpy())
+        return {"tensor": len(arrays) - 1, "dtype": dtype}
+    raise TypeError("Cannot store feature value of type {}".format(type(value)))
+
+
+def _unflatten(node: Dict[str, Any], arrays: List[np.ndarray], device: str) -> Any:
+    if "value" in node:
+        return node["value"]
+    if "dict" in node:
+        return {k: _unflatten(v, arrays, device) for k, v in node["dict"].items()}
+    if "list" in node:
+        return [_unflatten(item, arrays, device) for item in node["list"]]
+    if "tuple" in node:
+        return tuple(_unflatten(item, arrays, device) for item in node["tuple"])
+    if "array" in node:
+        return arrays[node["array"]]
+    import torch
+
+    tensor = torch.from_numpy(arrays[node["tensor"]])
+    if node["dtype"] == "bfloat16":
+        tensor = tensor.view(torch.bfloat16)
+    if device != "cpu":
+        tensor = tensor.to(device)
+    return tensor
+
+
+class FeatureStore:
+    """Directory of encoded image features, bounded by total size.
+
+    Each entry is a folder of ``.npy`` files plus a JSON description of the
+    feature structure. Arrays are memory-mapped when loaded, so restoring an
+    entry on CPU reads only the pages the decoder touches. When the folder
+    grows past the budget, the least recently used entries are removed.
+
+    Args:
+        root: Store directory. Several sessions may share it.
+        budget_mb: Size limit in MiB.
+        max_pending: Queued writes allowed before ``save_async`` blocks.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        budget_mb: int,
+        max_pending: int = DEFAULT_PENDING_SAVES,
+    ):
+        self._root = Path(root)
+        self._budget = max(0, int(budget_mb)) * 1024 * 1024
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, Tuple[int, float]]] = None
+        self._pending = threading.BoundedSemaphore(max(1, int(max_pending)))
+        self._writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="sam-feature-store"
+        )
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    @property
+    def budget_bytes(self) -> int:
+        return self._budget
+
+    def set_budget_mb(self, budget_mb: int) -> None:
+        with self._lock:
+            self._budget = max(0, int(budget_mb)) * 1024 * 1024
+            self._evict()
+
+    @property
+    def nbytes(self) -> int:
+        with self._lock:
+            return sum(size for size, _ in self._entries().values())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries())
+
+    def _path(self, key: str) -> Path:
+        return self._root / key[:2] / key
+
+    def contains(self, key: str) -> bool:
+        return (self._path(key) / _META_FILE).is_file()
+
+    def load(self, key: str, device: str = "cpu") -> Optional[CachedFeatures]:
+        """Load an entry, memory-mapped; None when missing or unreadable."""
+        path = self._path(key)
+        meta_path = path / _META_FILE
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            arrays = [
+                np.load(path / "{}.npy".format(idx), mmap_mode="c")
+                for idx in range(int(meta["arrays"]))
+            ]
+            semantic = _unflatten(meta["semantic"], arrays, device)
+            point = (
+                semantic
+                if meta["point"].get("same")
+                else _unflatten(meta["point"], arrays, device)
+            )
+            entry = CachedFeatures(
+                semantic,
+                point,
+                tuple(meta["src_shape"]),
+                int(meta["nbytes"]),
+                meta.get("point_stretch_size"),
+            )
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            logger.warning("Discarding unreadable SAM features {}: {}", path, exc)
+            self.remove(key)
+            return None
+        now = time.time()
+        try:
+            os.utime(meta_path, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            entries = self._entries()
+            if key in entries:
+                entries[key] = (entries[key][0], now)
+        return entry
+
+    def save(self, key: str, entry: CachedFeatures) -> bool:
+        """Write an entry; return False when it cannot be stored."""
+        arrays: List[np.ndarray] = []
+        try:
+            meta = {
+                "version": FEATURE_STORE_VERSION,
+                "semantic": _flatten(entry.semantic, arrays),
+                "point": (
+                    {"same": True}
+                    if entry.point is entry.semantic
+                    else _flatten(entry.point, arrays)
+                ),
+                "src_shape": list(entry.src_shape),
+                "nbytes": entry.nbytes,
+                "point_stretch_size": entry.point_stretch_size,
+                "arrays": len(arrays),
+            }
+        except TypeError as exc:
+            logger.debug("SAM features not stored: {}", exc)
+            return False
+        size = sum(int(array.nbytes) for array in arrays)
+        if size > self._budget:
+            return False
+
+        final = self._path(key)
+        staging = self._root / ".staging-{}".format(uuid.uuid4().hex)
+        try:
+            staging.mkdir(parents=True)
+            for idx, array in enumerate(arrays):
+                np.save(staging / "{}.npy".format(idx), np.ascontiguousarray(array))
+            (staging / _META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+            final.parent.mkdir(parents=True, exist_ok=True)
+            if final.exists():
+                shutil.rmtree(final, ignore_errors=True)
+            os.replace(staging, final)
+        except OSError as exc:
+            logger.warning("Could not store SAM features in {}: {}", final, exc)
+            shutil.rmtree(staging, ignore_errors=True)
+            return False
+
+        with self._lock:
+            self._entries()[key] = (size, time.time())
+            self._evict()
+        return True
+
+    def save_async(self, key: str, entry: CachedFeatures) -> Future:
+        """Queue ``save`` on the store's writer thread.
+
+        Blocks while ``max_pending`` writes are already queued, so encoding
+        faster than the disk can write does not pile up features in memory.
+        """
+        self._pending.acquire()
+        try:
+            future = self._writer.submit(self.save, key, entry)
+        except BaseException:
+            self._pending.release()
+            raise
+        future.add_done_callback(lambda _future: self._pending.release())
+        return future
+
+    def flush(self) -> None:
+        """Wait for queued writes to finish."""
+        self._writer.submit(lambda: None).result()
+
+    def remove(self, key: str) -> None:
+        shutil.rmtree(self._path(key), ignore_errors=True)
+        with self._lock:
+            if self._index is not None:
+                self._index.pop(key, None)
+
+    def _entries(self) -> Dict[str, Tuple[int, float]]:
+        """Size and last-use time per key, scanned from disk on first use."""
+        if self._index is None:
+            index: Dict[str, Tuple[int, float]] = {}
+            for meta_path in self._root.glob("*/*/" + _META_FILE):
+                try:
+                    size = sum(
+                        item.stat().st_size
+                        for item in meta_path.parent.iterdir()
+                        if item.suffix == ".npy"
+                    )
+                    index[meta_path.parent.name] = (size, meta_path.stat().st_mtime)
+                except OSError:
+                    continue
+            self._index = index
+        return self._index
+
+    def _evict(self) -> None:
+        entries = self._entries()
+        total = sum(size for size, _ in entries.values())
+        for key, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+            if total <= self._budget:
+                break
+            shutil.rmtree(self._path(key), ignore_errors=True)
+            del entries[key]
+            total -= size
@@ -0,0 +1,131 @@
+"""Reuse of SAM3 point-prompt results for points inside an earlier mask.
+
+Hovering back and forth over the same object asks SAM3 the same question
+from slightly different points. A point that falls inside the mask SAM3
+returned for an earlier point of the same image gets that earlier answer
+back without running the decoder.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional, Tuple
+
+import numpy as np
+
+Box = Tuple[int, int, int, int]
+
+DEFAULT_POINT_CACHE_IMAGES = 8
+DEFAULT_POINT_CACHE_RESULTS = 64
+
+
+@dataclass(frozen=True)
+class _PointResult:
+    """One query's boxes and its mask, cropped to the mask's extent and bit-packed.
+
+    ``scale`` maps image coordinates to the mask's coordinates, which differ
+    when the query ran on a resized copy of the image.
+    """
+
+    left: int
+    top: int
+    width: int
+    height: int
+    bits: np.ndarray
+    scale: Tuple[float, float]
+    boxes: Tuple[Box, ...]
+
+    @classmethod
+    def create(
+        cls, mask: np.ndarray, boxes: List[Box], scale: Tuple[float, float]
+    ) -> Optional["_PointResult"]:
+        rows = np.flatnonzero(mask.any(axis=1))
+        cols = np.flatnonzero(mask.any(axis=0))
+        if rows.size == 0:
+            return None
+        top, bottom = int(rows[0]), int(rows[-1]) + 1
+        left, right = int(cols[0]), int(cols[-1]) + 1
+        crop = mask[top:bottom, left:right]
+        return cls(
+            left,
+            top,
+            right - left,
+            bottom - top,
+            np.packbits(crop, axis=1),
+            scale,
+            tuple(boxes),
+        )
+
+    def contains(self, x: int, y: int) -> bool:
+        col = int(x * self.scale[0]) - self.left
+        row = int(y * self.scale[1]) - self.top
+        if not (0 <= col < self.width and 0 <= row < self.height):
+            return False
+        return bool(self.bits[row, col >> 3] & (0x80 >> (col & 7)))
+
+
+class PointResultCache:
+    """Point-query results per image, looked up by mask membership.
+
+    When masks overlap, the most recent result containing the point wins.
+
+    Args:
+        max_images: Images kept; the least recently used is dropped first.
+        max_results: Results kept per image; the oldest is dropped first.
+    """
+
+    def __init__(
+        self,
+        max_images: int = DEFAULT_POINT_CACHE_IMAGES,
+        max_results: int = DEFAULT_POINT_CACHE_RESULTS,
+    ):
+        self._lock = threading.Lock()
+        self._images: "OrderedDict[str, Deque[_PointResult]]" = OrderedDict()
+        self._max_images = max(1, int(max_images))
+        self._max_results = max(1, int(max_results))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(results) for results in self._images.values())
+
+    def lookup(self, image_key: Optional[str], x: int, y: int) -> Optional[List[Box]]:
+        """Boxes of an earlier result whose mask covers ``(x, y)``, else None."""
+        if not image_key:
+            return None
+        with self._lock:
+            results = self._images.get(image_key)
+            if not results:
+                return None
+            self._images.move_to_end(image_key)
+            for result in reversed(results):
+                if result.contains(x, y):
+                    return list(result.boxes)
+        return None
+
+    def add(
+        self,
+        image_key: Optional[str],
+        mask: np.ndarray,
+        boxes: List[Box],
+        scale: Tuple[float, float] = (1.0, 1.0),
+    ) -> None:
+        """Remember ``boxes`` for points inside the 2-D boolean ``mask``."""
+        if not image_key or not boxes:
+            return
+        result = _PointResult.create(mask, boxes, scale)
+        if result is None:
+            return
+        with self._lock:
+            results = self._images.get(image_key)
+            if results is None:
+                results = self._images[image_key] = deque(maxlen=self._max_results)
+            results.append(result)
+            self._images.move_to_end(image_key)
+            while len(self._images) > self._max_images:
+                self._images.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._images.clear()
@@ -0,0 +1,72 @@
+"""Encode SAM features for a result set ahead of annotation."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Sequence
+
+from vars_localize.models import ImagedMomentEntry
+from vars_localize.services.M3Service import M3Service
+from vars_localize.services.SAM3Service import SAM3Service
+from vars_localize.services.sam_features import image_cache_key
+from vars_localize.util.logging import get_logger
+
+logger = get_logger("SAMPrecompute")
+
+
+@dataclass
+class PrecomputeSummary:
+    encoded: int = 0
+    already_stored: int = 0
+    no_image: int = 0
+    failed: int = 0
+
+
+def precompute_features(
+    m3: M3Service,
+    sam: SAM3Service,
+    imaged_moment_uuids: Sequence[str],
+    decode: Callable[[bytes], Any],
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> PrecomputeSummary:
+    """Encode each moment's image into ``sam``'s feature store.
+
+    Images whose features are already stored are skipped, so an interrupted
+    run can be resumed with the same arguments.
+
+    Args:
+        m3: Configured M3 service.
+        sam: Loaded SAM3 service with a feature store.
+        imaged_moment_uuids: The result set.
+        decode: Turns image bytes into an RGB array, or None if undecodable.
+        progress: Called with (done, total) after each moment.
+
+    Returns:
+        Per-outcome counts.
+    """
+    store = sam.feature_store
+    if store is None:
+        raise RuntimeError("SAM3 service has no feature store")
+    summary = PrecomputeSummary()
+    total = len(imaged_moment_uuids)
+    for done, moment_uuid in enumerate(imaged_moment_uuids, start=1):
+        try:
+            moment = ImagedMomentEntry.from_dict(m3.get_imaged_moment(moment_uuid))
+            key = image_cache_key(moment)
+            if not moment.image_url:
+                summary.no_image += 1
+            elif sam.has_cached_features(key):
+                summary.already_stored += 1
+            else:
+                image_rgb = decode(m3.fetch_image_bytes(moment.image_url))
+                if image_rgb is None:
+                    raise ValueError("undecodable image {}".format(moment.image_url))
+                sam.set_image(image_rgb, image_key=key)
+                summary.encoded += 1
+        except Exception as exc:
+            summary.failed += 1
+            logger.warning("Could not precompute {}: {}", moment_uuid, exc)
+        if progress is not None:
+            progress(done, total)
+    store.flush()
+    return summary
@@ -0,0 +1,439 @@
+"""Run SAM3 inference in a separate worker process.
+
+``SAM3WorkerService`` has the ``SAM3Service`` interface but forwards each
+call to a ``SAM3Service`` living in a child process. A model crash or an
+out-of-memory kill then ends only the worker, and the predictors' Python
+pre/post-processing no longer competes with the UI for the GIL.
+
+Protocol: the client puts ``(call_id, method, args, kwargs)`` on a request
+queue and the worker answers ``(call_id, ok, value, state)`` on a response
+queue, where ``value`` is the result or an error message and ``state`` is a
+snapshot of the worker service's availability and in-memory feature cache
+keys. Images are not pickled: the
+client copies them into a reusable shared-memory block and sends a
+``SharedImage`` reference instead. Calls are serialized, so the block is
+never rewritten while the worker reads it.
+"""
+
+from __future__ import annotations
+
+import itertools
+import multiprocessing
+import queue
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from vars_localize.services.SAM3Service import SAM3Service
+from vars_localize.services.sam_features import (
+    DEFAULT_FEATURE_CACHE_MB,
+    FeatureStore,
+)
+from vars_localize.util.cancellation import raise_if_cancelled
+from vars_localize.util.logging import PERF_KIND_SAM, get_logger, perf_timed
+from vars_localize.util.tracing import traced
+
+logger = get_logger("SAM3Worker")
+
+# How often a waiting call checks that the worker is still alive.
+_POLL_SECS = 0.5
+_SHUTDOWN_SECS = 5.0
+
+_FORWARDED_METHODS = frozenset(
+    {
+        "configure_runtime",
+        "ensure_loaded",
+        "has_cached_features",
+        "restore_image",
+        "set_image",
+        "encode_to_cache",
+        "query_text",
+        "query_boxes",
+        "query_point",
+    }
+)
+
+
+class SAMWorkerError(RuntimeError):
+    """A call failed in the worker, or the worker process died."""
+
+
+@dataclass(frozen=True)
+class SharedImage:
+    """Reference to an image placed in a shared-memory block."""
+
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+class SharedImageBuffer:
+    """Shared-memory block the client reuses for every image it sends."""
+
+    def __init__(self):
+        self._block: Optional[shared_memory.SharedMemory] = None
+
+    def put(self, image: np.ndarray) -> SharedImage:
+        # Strided views (e.g. padded QImage scanlines) are packed while
+        # copying into the block.
+        image = np.asarray(image)
+        if self._block is None or self._block.size < image.nbytes:
+            self.close()
+            self._block = shared_memory.SharedMemory(
+                create=True, size=max(1, image.nbytes)
+            )
+        target = np.ndarray(image.shape, image.dtype, buffer=self._block.buf)
+        target[...] = image
+        # Drop the view so the block can be closed later.
+        del target
+        return SharedImage(self._block.name, tuple(image.shape), image.dtype.str)
+
+    def close(self) -> None:
+        if self._block is None:
+            return
+        self._block.close()
+        try:
+            self._block.unlink()
+        except FileNotFoundError:
+            pass
+        self._block = None
+
+
+def read_shared_image(ref: SharedImage) -> np.ndarray:
+    """Copy the referenced image out of shared memory."""
+    block = shared_memory.SharedMemory(name=ref.name)
+    try:
+        view = np.ndarray(ref.shape, np.dtype(ref.dtype), buffer=block.buf)
+        image = view.copy()
+        del view
+    finally:
+        block.close()
+    return image
+
+
+def _worker_state(service: SAM3Service) -> Dict[str, Any]:
+    return {
+        "semantic": service.semantic_available,
+        "point": service.point_available,
+        "ready": service.point_predictor_ready,
+        "image_key": service.image_key,
+        "error": service.availability_error,
+        "cached": service.feature_cache.keys(),
+    }
+
+
+def _apply_feature_store(
+    service: SAM3Service, config: Optional[Tuple[str, int]]
+) -> None:
+    if config is None:
+        service.set_feature_store(None)
+        return
+    root, budget_mb = config
+    store = service.feature_store
+    if store is not None and str(store.root) == root:
+        store.set_budget_mb(budget_mb)
+    else:
+        service.set_feature_store(FeatureStore(root, budget_mb))
+
+
+def handle_request(
+    service: SAM3Service, method: str, args: Sequence[Any], kwargs: Dict[str, Any]
+) -> Any:
+    """Run one forwarded call against the worker's service."""
+    if method == "set_feature_store":
+        _apply_feature_store(service, args[0])
+        return None
+    if method not in _FORWARDED_METHODS:
+        raise ValueError("Unknown SAM3 worker method: {}".format(method))
+    args = [read_shared_image(a) if isinstance(a, SharedImage) else a for a in args]
+    return getattr(service, method)(*args, **kwargs)
+
+
+def _worker_main(requests: Any, responses: Any) -> None:
+    """Worker process loop; a None request stops it."""
+    service = SAM3Service(model_path="")
+    while True:
+        message = requests.get()
+        if message is None:
+            break
+        call_id, method, args, kwargs = message
+        try:
+            value = handle_request(service, method, args, kwargs)
+        except Exception as exc:
+            logger.debug("SAM3 worker call {} failed: {}", method, exc)
+            responses.put((call_id, False, str(exc), _worker_state(service)))
+        else:
+            responses.put((call_id, True, value, _worker_state(service)))
+    store = service.feature_store
+    if store is not None:
+        store.flush()
+
+
+class SAM3WorkerService(SAM3Service):
+    """SAM3Service that runs the predictors in a worker process.
+
+    The worker starts on the first call and is restarted, with the current
+    settings and load options, if it has died since the previous call. A
+    call that is running when the worker dies raises ``SAMWorkerError``.
+    Availability properties and ``has_cached_features`` read the state
+    returned with the last reply, so they never wait for the worker and can
+    be called from the UI thread.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        conf: float = 0.35,
+        imgsz: int = 644,
+        feature_cache_mb: int = DEFAULT_FEATURE_CACHE_MB,
+        feature_store: Optional[FeatureStore] = None,
+    ):
+        super().__init__(
+            model_path,
+            conf=conf,
+            imgsz=imgsz,
+            feature_cache_mb=feature_cache_mb,
+            feature_store=feature_store,
+        )
+        self._state: Dict[str, Any] = {"semantic": False, "point": False}
+        # Keys in the worker's memory cache, and keys it encoded while a
+        # feature store was set (those survive eviction and restarts).
+        self._cached_keys: FrozenSet[str] = frozenset()
+        self._stored_keys: FrozenSet[str] = frozenset()
+        self._load_args: Optional[Dict[str, bool]] = None
+        self._process: Optional[Any] = None
+        self._requests: Optional[Any] = None
+        self._responses: Optional[Any] = None
+        self._image_buffer = SharedImageBuffer()
+        self._call_ids = itertools.count(1)
+        self._starts = 0
+        self._closed = False
+
+    @property
+    def semantic_available(self) -> bool:
+        return bool(self._state.get("semantic"))
+
+    @property
+    def point_available(self) -> bool:
+        return bool(self._state.get("point"))
+
+    @property
+    def worker_running(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def configure_runtime(
+        self,
+        model_path: Optional[str] = None,
+        conf: Optional[float] = None,
+        imgsz: Optional[int] = None,
+        feature_cache_mb: Optional[int] = None,
+    ):
+        super().configure_runtime(
+            model_path=model_path,
+            conf=conf,
+            imgsz=imgsz,
+            feature_cache_mb=feature_cache_mb,
+        )
+        if model_path is not None or imgsz is not None:
+            self._stored_keys = frozenset()
+        if self.worker_running:
+            self._call("configure_runtime", **self._runtime_config())
+
+    def ensure_loaded(
+        self,
+        semantic_enabled: bool = True,
+        point_enabled: bool = True,
+    ) -> None:
+        load_args = dict(
+            semantic_enabled=bool(semantic_enabled),
+            point_enabled=bool(point_enabled),
+        )
+        if load_args != self._load_args:
+            # Store keys depend on which predictors are loaded.
+            self._stored_keys = frozenset()
+        self._load_args = load_args
+        self._call("ensure_loaded", **self._load_args)
+
+    def set_feature_store(self, store: Optional[FeatureStore]) -> None:
+        super().set_feature_store(store)
+        self._stored_keys = frozenset()
+        if self.worker_running:
+            self._call("set_feature_store", self._store_config())
+
+    def has_cached_features(self, image_key: Optional[str]) -> bool:
+        if not image_key:
+            return False
+        return image_key in self._cached_keys or image_key in self._stored_keys
+
+    @traced(category="sam")
+    def restore_image(self, image_key: Optional[str]) -> bool:
+        if not image_key:
+            return False
+        with self._interactive():
+            raise_if_cancelled()
+            return bool(self._call("restore_image", image_key))
+
+    @traced(category="sam")
+    @perf_timed(PERF_KIND_SAM)
+    def set_image(self, image_rgb, image_key: Optional[str] = None):
+        with self._interactive():
+            raise_if_cancelled()
+            self._call("set_image", image_rgb, image_key=image_key)
+            if image_key:
+                self._mark_stored(image_key)
+
+    @traced(category="sam")
+    @perf_timed(PERF_KIND_SAM)
+    def encode_to_cache(self, image_rgb, image_key: str) -> bool:
+        if self._interactive_waiters:
+            return False
+        with self._predictor_lock:
+            raise_if_cancelled()
+            if self._interactive_waiters:
+                return False
+            encoded = bool(self._call("encode_to_cache", image_rgb, image_key))
+            if encoded:
+                self._mark_stored(image_key)
+            return encoded
+
+    @traced(category="sam")
+    @perf_timed(PERF_KIND_SAM)
+    def query_text(self, text: str) -> List[Tuple[int, int, int, int]]:
+        return self._query("query_text", text)
+
+    @traced(category="sam")
+    @perf_timed(PERF_KIND_SAM)
+    def query_boxes(
+        self, boxes_xyxy: Sequence[Tuple[float, float, float, float]]
+    ) -> List[Tuple[int, int, int, int]]:
+        return self._query("query_boxes", list(boxes_xyxy))
+
+    @traced(category="sam")
+    @perf_timed(PERF_KIND_SAM)
+    def query_point(self, x: int, y: int) -> List[Tuple[int, int, int, int]]:
+        return self._query("query_point", x, y)
+
+    def shutdown(self) -> None:
+        """Stop the worker; later calls raise ``SAMWorkerError``."""
+        with self._predictor_lock:
+            self._closed = True
+            self._stop_worker()
+            self._image_buffer.close()
+
+    def _query(self, method: str, *args: Any) -> List[Tuple[int, int, int, int]]:
+        with self._interactive():
+            raise_if_cancelled()
+            result = self._call(method, *args)
+            raise_if_cancelled()
+            return result
+
+    def _runtime_config(self) -> Dict[str, Any]:
+        return dict(
+            model_path=self._model,
+            conf=self._conf,
+            imgsz=self._imgsz,
+            feature_cache_mb=self._feature_cache.budget_bytes // (1024 * 1024),
+        )
+
+    def _store_config(self) -> Optional[Tuple[str, int]]:
+        store = self._feature_store
+        if store is None:
+            return None
+        return (str(store.root), store.budget_bytes // (1024 * 1024))
+
+    def _mark_stored(self, image_key: str) -> None:
+        if self._feature_store is not None:
+            self._stored_keys = self._stored_keys | {image_key}
+
+    def _call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        with self._predictor_lock:
+            if self._closed:
+                raise SAMWorkerError("SAM3 worker is shut down")
+            if not self.worker_running:
+                self._start_worker()
+            return self._send(method, args, kwargs)
+
+    def _start_worker(self) -> None:
+        self._stop_worker()
+        context = multiprocessing.get_context("spawn")
+        self._requests = context.Queue()
+        self._responses = context.Queue()
+        self._process = context.Process(
+            target=_worker_main,
+            args=(self._requests, self._responses),
+            name="sam3-worker",
+            daemon=True,
+        )
+        self._process.start()
+        self._starts += 1
+        if self._starts > 1:
+            logger.warning("Restarted the SAM3 worker process")
+        self._send("configure_runtime", (), self._runtime_config())
+        self._send("set_feature_store", (self._store_config(),), {})
+        if self._load_args is not None:
+            try:
+                self._send("ensure_loaded", (), self._load_args)
+            except SAMWorkerError as exc:
+                logger.warning("SAM3 worker could not reload the model: {}", exc)
+
+    def _stop_worker(self) -> None:
+        process = self._process
+        if process is None:
+            return
+        if process.is_alive():
+            try:
+                if self._requests is not None:
+                    self._requests.put(None)
+                process.join(_SHUTDOWN_SECS)
+            except Exception as exc:
+                logger.debug("SAM3 worker shutdown request failed: {}", exc)
+            if process.is_alive():
+                process.terminate()
+                process.join(_SHUTDOWN_SECS)
+        self._process = None
+        self._requests = None
+        self._responses = None
+        self._apply_state({"semantic": False, "point": False})
+
+    def _send(self, method: str, args: Sequence[Any], kwargs: Dict[str, Any]) -> Any:
+        process = self._process
+        requests = self._requests
+        responses = self._responses
+        assert process is not None and requests is not None and responses is not None
+        call_id = next(self._call_ids)
+        args = tuple(
+            self._image_buffer.put(a) if isinstance(a, np.ndarray) else a for a in args
+        )
+        requests.put((call_id, method, args, kwargs))
+        while True:
+            try:
+                reply_id, ok, value, state = responses.get(timeout=_POLL_SECS)
+            except queue.Empty:
+                if process.is_alive():
+                    continue
+                exitcode = process.exitcode
+                self._stop_worker()
+                message = "SAM3 worker exited with code {} during {}".format(
+                    exitcode, method
+                )
+                self._apply_state({"error": message})
+                raise SAMWorkerError(message)
+            if reply_id != call_id:
+                continue
+            self._apply_state(state)
+            if not ok:
+                raise SAMWorkerError(value)
+            return value
+
+    def _apply_state(self, state: Dict[str, Any]) -> None:
+        self._state = {
+            "semantic": bool(state.get("semantic")),
+            "point": bool(state.get("point")),
+        }
+        self._predictor_ready = bool(state.get("ready"))
+        self._image_key = state.get("image_key")
+        self._cached_keys = frozenset(state.get("cached") or ())
+        error = state.get("error")
+        self._import_error = SAMWorkerError(error) if error else None
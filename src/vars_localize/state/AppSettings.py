@@ -3,10 +3,22 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Dict
 
 from PyQt6.QtCore import QSettings
 
 from vars_localize.services.M3Service import DEFAULT_M3_URL
+from vars_localize.services.sam_features import (
+    DEFAULT_FEATURE_CACHE_MB,
+    DEFAULT_FEATURE_STORE_MB,
+)
+from vars_localize.util.qt_async import (
+    DEFAULT_LANE_LIMITS,
+    LANE_BACKGROUND,
+    LANE_INTERACTIVE,
+    LANE_PREFETCH,
+    LANE_VISIBLE,
+)
 
 
 @dataclass(frozen=True)
@@ -14,6 +26,12 @@ class AppSettingsSnapshot:
     m3_url: str
     connection_timeout_secs: int
     search_page_size: int
+    optimistic_box_updates: bool
+    offline_journal: bool
+    interactive_threads: int
+    visible_threads: int
+    prefetch_threads: int
+    background_threads: int
     focus_search_shortcut: str
     clear_results_shortcut: str
     open_settings_shortcut: str
@@ -25,6 +43,12 @@ class AppSettingsSnapshot:
     sam3_image_size: int
     sam3_min_area: int
     sam3_overlap_iou: float
+    sam3_candidate_nms_iou: float
+    sam3_feature_cache_mb: int
+    sam3_feature_store_mb: int
+    sam3_prefetch_images: int
+    sam3_out_of_process: bool
+    sam3_hover_debounce_ms: int
 
 
 class AppSettings:
@@ -36,6 +60,14 @@ class AppSettings:
 
     KEY_SEARCH_PAGE_SIZE = "search/page_size"
 
+    KEY_OPTIMISTIC_BOX_UPDATES = "editing/optimistic_box_updates"
+    KEY_OFFLINE_JOURNAL = "editing/offline_journal"
+
+    KEY_INTERACTIVE_THREADS = "performance/interactive_threads"
+    KEY_VISIBLE_THREADS = "performance/visible_threads"
+    KEY_PREFETCH_THREADS = "performance/prefetch_threads"
+    KEY_BACKGROUND_THREADS = "performance/background_threads"
+
     KEY_SHORTCUT_FOCUS_SEARCH = "shortcuts/focus_search"
     KEY_SHORTCUT_CLEAR_RESULTS = "shortcuts/clear_results"
     KEY_SHORTCUT_OPEN_SETTINGS = "shortcuts/open_settings"
@@ -48,9 +80,22 @@ class AppSettings:
     KEY_SAM3_IMAGE_SIZE = "ai/sam3_image_size"
     KEY_SAM3_MIN_AREA = "ai/sam3_min_area"
     KEY_SAM3_OVERLAP_IOU = "ai/sam3_overlap_iou"
+    KEY_SAM3_CANDIDATE_NMS_IOU = "ai/sam3_candidate_nms_iou"
+    KEY_SAM3_FEATURE_CACHE_MB = "ai/sam3_feature_cache_mb"
+    KEY_SAM3_FEATURE_STORE_MB = "ai/sam3_feature_store_mb"
+    KEY_SAM3_PREFETCH_IMAGES = "ai/sam3_prefetch_images"
+    KEY_SAM3_OUT_OF_PROCESS = "ai/sam3_out_of_process"
+    KEY_SAM3_HOVER_DEBOUNCE_MS = "ai/sam3_hover_debounce_ms"
 
     DEFAULT_CONNECTION_TIMEOUT = 3
     DEFAULT_SEARCH_PAGE_SIZE = 25
+    DEFAULT_OPTIMISTIC_BOX_UPDATES = True
+    DEFAULT_OFFLINE_JOURNAL = True
+
+    DEFAULT_INTERACTIVE_THREADS = DEFAULT_LANE_LIMITS[LANE_INTERACTIVE]
+    DEFAULT_VISIBLE_THREADS = DEFAULT_LANE_LIMITS[LANE_VISIBLE]
+    DEFAULT_PREFETCH_THREADS = DEFAULT_LANE_LIMITS[LANE_PREFETCH]
+    DEFAULT_BACKGROUND_THREADS = DEFAULT_LANE_LIMITS[LANE_BACKGROUND]
 
     DEFAULT_SHORTCUT_FOCUS_SEARCH = "Ctrl+F"
     DEFAULT_SHORTCUT_CLEAR_RESULTS = "Ctrl+L"
@@ -64,6 +109,12 @@ class AppSettings:
     DEFAULT_SAM3_IMAGE_SIZE = 644
     DEFAULT_SAM3_MIN_AREA = 100
     DEFAULT_SAM3_OVERLAP_IOU = 0.2
+    DEFAULT_SAM3_CANDIDATE_NMS_IOU = 0.0
+    DEFAULT_SAM3_FEATURE_CACHE_MB = DEFAULT_FEATURE_CACHE_MB
+    DEFAULT_SAM3_FEATURE_STORE_MB = DEFAULT_FEATURE_STORE_MB
+    DEFAULT_SAM3_PREFETCH_IMAGES = 2
+    DEFAULT_SAM3_OUT_OF_PROCESS = False
+    DEFAULT_SAM3_HOVER_DEBOUNCE_MS = 30
 
     def __init__(self):
         self._settings = QSettings(self.ORG, self.APP)
@@ -73,6 +124,12 @@ class AppSettings:
             m3_url=self.m3_url,
             connection_timeout_secs=self.connection_timeout_secs,
             search_page_size=self.search_page_size,
+            optimistic_box_updates=self.optimistic_box_updates,
+            offline_journal=self.offline_journal,
+            interactive_threads=self.interactive_threads,
+            visible_threads=self.visible_threads,
+            prefetch_threads=self.prefetch_threads,
+            background_threads=self.background_threads,
             focus_search_shortcut=self.focus_search_shortcut,
             clear_results_shortcut=self.clear_results_shortcut,
             open_settings_shortcut=self.open_settings_shortcut,
@@ -84,6 +141,12 @@ class AppSettings:
             sam3_image_size=self.sam3_image_size,
             sam3_min_area=self.sam3_min_area,
             sam3_overlap_iou=self.sam3_overlap_iou,
+            sam3_candidate_nms_iou=self.sam3_candidate_nms_iou,
+            sam3_feature_cache_mb=self.sam3_feature_cache_mb,
+            sam3_feature_store_mb=self.sam3_feature_store_mb,
+            sam3_prefetch_images=self.sam3_prefetch_images,
+            sam3_out_of_process=self.sam3_out_of_process,
+            sam3_hover_debounce_ms=self.sam3_hover_debounce_ms,
         )
 
     @property
@@ -131,6 +194,112 @@ class AppSettings:
     def search_page_size(self, value: int):
         self._settings.setValue(self.KEY_SEARCH_PAGE_SIZE, max(1, int(value)))
 
+    @property
+    def optimistic_box_updates(self) -> bool:
+        return bool(
+            self._settings.value(
+                self.KEY_OPTIMISTIC_BOX_UPDATES,
+                self.DEFAULT_OPTIMISTIC_BOX_UPDATES,
+                type=bool,
+            )
+        )
+
+    @optimistic_box_updates.setter
+    def optimistic_box_updates(self, value: bool):
+        self._settings.setValue(self.KEY_OPTIMISTIC_BOX_UPDATES, bool(value))
+
+    @property
+    def offline_journal(self) -> bool:
+        return bool(
+            self._settings.value(
+                self.KEY_OFFLINE_JOURNAL,
+                self.DEFAULT_OFFLINE_JOURNAL,
+                type=bool,
+            )
+        )
+
+    @offline_journal.setter
+    def offline_journal(self, value: bool):
+        self._settings.setValue(self.KEY_OFFLINE_JOURNAL, bool(value))
+
+    @property
+    def interactive_threads(self) -> int:
+        return max(
+            1,
+            int(
+                self._settings.value(
+                    self.KEY_INTERACTIVE_THREADS,
+                    self.DEFAULT_INTERACTIVE_THREADS,
+                    type=int,
+                )
+            ),
+        )
+
+    @interactive_threads.setter
+    def interactive_threads(self, value: int):
+        self._settings.setValue(self.KEY_INTERACTIVE_THREADS, max(1, int(value)))
+
+    @property
+    def visible_threads(self) -> int:
+        return max(
+            1,
+            int(
+                self._settings.value(
+                    self.KEY_VISIBLE_THREADS,
+                    self.DEFAULT_VISIBLE_THREADS,
+                    type=int,
+                )
+            ),
+        )
+
+    @visible_threads.setter
+    def visible_threads(self, value: int):
+        self._settings.setValue(self.KEY_VISIBLE_THREADS, max(1, int(value)))
+
+    @property
+    def prefetch_threads(self) -> int:
+        return max(
+            1,
+            int(
+                self._settings.value(
+                    self.KEY_PREFETCH_THREADS,
+                    self.DEFAULT_PREFETCH_THREADS,
+                    type=int,
+                )
+            ),
+        )
+
+    @prefetch_threads.setter
+    def prefetch_threads(self, value: int):
+        self._settings.setValue(self.KEY_PREFETCH_THREADS, max(1, int(value)))
+
+    @property
+    def background_threads(self) -> int:
+        return max(
+            1,
+            int(
+                self._settings.value(
+                    self.KEY_BACKGROUND_THREADS,
+                    self.DEFAULT_BACKGROUND_THREADS,
+                    type=int,
+                )
+            ),
+        )
+
+    @background_threads.setter
+    def background_threads(self, value: int):
+        self._settings.setValue(self.KEY_BACKGROUND_THREADS, max(1, int(value)))
+
+    @property
+    def lane_limits(self) -> Dict[str, int]:
+        """Thread limits per task lane, as accepted by ``configure_lanes``."""
+        return {
+            LANE_INTERACTIVE: self.interactive_threads,
+            LANE_VISIBLE: self.visible_threads,
+            LANE_PREFETCH: self.prefetch_threads,
+            LANE_BACKGROUND: self.background_threads,
+        }
+
     @property
     def focus_search_shortcut(self) -> str:
         return str(
@@ -302,3 +471,101 @@ class AppSettings:
     def sam3_overlap_iou(self, value: float):
         bounded = max(0.0, min(1.0, float(value)))
         self._settings.setValue(self.KEY_SAM3_OVERLAP_IOU, bounded)
+
+    @property
+    def sam3_candidate_nms_iou(self) -> float:
+        value = float(
+            self._settings.value(
+                self.KEY_SAM3_CANDIDATE_NMS_IOU,
+                self.DEFAULT_SAM3_CANDIDATE_NMS_IOU,
+                type=float,
+            )
+        )
+        return max(0.0, min(1.0, value))
+
+    @sam3_candidate_nms_iou.setter
+    def sam3_candidate_nms_iou(self, value: float):
+        bounded = max(0.0, min(1.0, float(value)))
+        self._settings.setValue(self.KEY_SAM3_CANDIDATE_NMS_IOU, bounded)
+
+    @property
+    def sam3_feature_cache_mb(self) -> int:
+        return max(
+            0,
+            int(
+                self._settings.value(
+                    self.KEY_SAM3_FEATURE_CACHE_MB,
+                    self.DEFAULT_SAM3_FEATURE_CACHE_MB,
+                    type=int,
+                )
+            ),
+        )
+
+    @sam3_feature_cache_mb.setter
+    def sam3_feature_cache_mb(self, value: int):
+        self._settings.setValue(self.KEY_SAM3_FEATURE_CACHE_MB, max(0, int(value)))
+
+    @property
+    def sam3_feature_store_mb(self) -> int:
+        return max(
+            0,
+            int(
+                self._settings.value(
+                    self.KEY_SAM3_FEATURE_STORE_MB,
+                    self.DEFAULT_SAM3_FEATURE_STORE_MB,
+                    type=int,
+                )
+            ),
+        )
+
+    @sam3_feature_store_mb.setter
+    def sam3_feature_store_mb(self, value: int):
+        self._settings.setValue(self.KEY_SAM3_FEATURE_STORE_MB, max(0, int(value)))
+
+    @property
+    def sam3_prefetch_images(self) -> int:
+        return max(
+            0,
+            int(
+                self._settings.value(
+                    self.KEY_SAM3_PREFETCH_IMAGES,
+                    self.DEFAULT_SAM3_PREFETCH_IMAGES,
+                    type=int,
+                )
+            ),
+        )
+
+    @sam3_prefetch_images.setter
+    def sam3_prefetch_images(self, value: int):
+        self._settings.setValue(self.KEY_SAM3_PREFETCH_IMAGES, max(0, int(value)))
+
+    @property
+    def sam3_out_of_process(self) -> bool:
+        return bool(
+            self._settings.value(
+                self.KEY_SAM3_OUT_OF_PROCESS,
+                self.DEFAULT_SAM3_OUT_OF_PROCESS,
+                type=bool,
+            )
+        )
+
+    @sam3_out_of_process.setter
+    def sam3_out_of_process(self, value: bool):
+        self._settings.setValue(self.KEY_SAM3_OUT_OF_PROCESS, bool(value))
+
+    @property
+    def sam3_hover_debounce_ms(self) -> int:
+        return max(
+            0,
+            int(
+                self._settings.value(
+                    self.KEY_SAM3_HOVER_DEBOUNCE_MS,
+                    self.DEFAULT_SAM3_HOVER_DEBOUNCE_MS,
+                    type=int,
+                )
+            ),
+        )
+
+    @sam3_hover_debounce_ms.setter
+    def sam3_hover_debounce_ms(self, value: int):
+        self._settings.setValue(self.KEY_SAM3_HOVER_DEBOUNCE_MS, max(0, int(value)))
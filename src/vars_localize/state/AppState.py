@@ -1,9 +1,11 @@
 """Centralized UI state for Qt widgets."""
 
-from typing import List
+from typing import Iterable, List, Union
 
 from PyQt6.QtCore import QObject, pyqtSignal
 
+from vars_localize.models import ResultSet
+
 
 class AppStateStore(QObject):
     """Shared state store with Qt signals for reactive UI updates."""
@@ -13,7 +15,7 @@ class AppStateStore(QObject):
     adminModeChanged = pyqtSignal(bool)
     conceptChanged = pyqtSignal(str)
     conceptsChanged = pyqtSignal(list)
-    uuidsChanged = pyqtSignal(list)
+    uuidsChanged = pyqtSignal(object)
     loadingChanged = pyqtSignal(bool)
 
     def __init__(self, parent=None):
@@ -23,7 +25,7 @@ class AppStateStore(QObject):
         self._admin_mode = False
         self._concept = ""
         self._concepts: List[str] = []
-        self._uuids: List[str] = []
+        self._uuids = ResultSet()
         self._loading = False
 
     @property
@@ -78,15 +80,17 @@ class AppStateStore(QObject):
             self.conceptsChanged.emit(list(normalized))
 
     @property
-    def uuids(self) -> List[str]:
-        return list(self._uuids)
+    def uuids(self) -> ResultSet:
+        # Result sets are immutable, so the same instance is shared with
+        # listeners instead of being copied.
+        return self._uuids
 
     @uuids.setter
-    def uuids(self, values: List[str]):
-        normalized = list(values) if values else []
-        if normalized != self._uuids:
+    def uuids(self, values: Union[ResultSet, Iterable[str], None]):
+        normalized = ResultSet.coerce(values)
+        if normalized is not self._uuids and normalized != self._uuids:
             self._uuids = normalized
-            self.uuidsChanged.emit(list(normalized))
+            self.uuidsChanged.emit(normalized)
 
     @property
     def loading(self) -> bool:
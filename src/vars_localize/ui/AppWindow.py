@@ -2,7 +2,8 @@
 Main application window.
 """
 
-from typing import Any, Optional, cast
+import sqlite3
+from typing import Any, Optional, Sequence, cast
 
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QAction, QKeySequence, QShortcut
@@ -20,11 +21,17 @@ from vars_localize.ui.LoginDialog import LoginDialog
 from vars_localize.ui.DisplayPanel import DisplayPanel
 from vars_localize.ui.SettingsDialog import SettingsDialog
 from vars_localize.ui.SearchPanel import SearchPanel
+from vars_localize.ui.TaskMetricsDock import TaskMetricsDock
 from vars_localize.ui.theme import app_stylesheet
-from vars_localize.services import M3Service, SAM3Service
+from vars_localize.services import M3Service, SAM3Service, SAM3WorkerService
 from vars_localize.services.M3Service import DEFAULT_M3_URL
+from vars_localize.services.journal import MutationJournal
+from vars_localize.services.mutations import MutationQueue
+from vars_localize.services.sam_features import FeatureStore
 from vars_localize.state import AppSettings, AppStateStore
 from vars_localize.util.logging import get_logger
+from vars_localize.util.paths import journal_path, sam_feature_dir
+from vars_localize.util.qt_async import MainThreadRelay, configure_lanes
 from vars_localize.util.utils import center_window
 
 logger = get_logger("AppWindow")
@@ -35,14 +42,17 @@ class AppWindow(QMainWindow):
         super(AppWindow, self).__init__(parent)
         self._has_centered_on_show = False
         self._settings = AppSettings()
+        configure_lanes(self._settings.lane_limits)
         self._m3_url = self._settings.m3_url.rstrip("/")
         self._state = AppStateStore(self)
         self._m3: Optional[M3Service] = None
-        self._sam3 = SAM3Service(
-            model_path=self._settings.sam3_model_path,
-            conf=self._settings.sam3_confidence,
-            imgsz=self._settings.sam3_image_size,
-        )
+        self._mutations: Optional[MutationQueue] = None
+        self._mutation_relay = MainThreadRelay(self)
+        self._retry_writes_action = None
+        self._work_offline_action = None
+        self._reload_after_retry = False
+        self._sam3 = self._create_sam_service()
+        self._apply_sam_feature_store(self._settings.sam3_feature_store_mb)
         self._sam_enabled = self._settings.sam3_enabled
         self._sam_semantic_enabled = self._settings.sam3_semantic_enabled
         self._sam_point_enabled = self._settings.sam3_point_enabled
@@ -57,6 +67,7 @@ class AppWindow(QMainWindow):
         self._mode_label = None
         self._concept_label = None
         self._result_label = None
+        self._writes_label = None
 
         self.setWindowTitle("VARS Localize")
         self.setStyleSheet(app_stylesheet())
@@ -87,6 +98,12 @@ class AppWindow(QMainWindow):
         )
         self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.search_panel)
 
+        self.task_metrics_dock = TaskMetricsDock(parent=self)
+        self.addDockWidget(
+            Qt.DockWidgetArea.BottomDockWidgetArea, self.task_metrics_dock
+        )
+        self.task_metrics_dock.hide()
+
         self.display_panel = DisplayPanel(parent=self)
         container_layout.addWidget(self.display_panel)
 
@@ -98,9 +115,33 @@ class AppWindow(QMainWindow):
 
         self.display_panel.image_view.observer = self.observer
         self.display_panel.image_view.m3_service = self._require_m3_service()
+        self._mutations = self._create_mutation_queue()
+        self._mutations.add_listener(
+            lambda pending, failed: self._mutation_relay.post(
+                self._sync_write_counts, pending, failed
+            )
+        )
+        self.display_panel.image_view.mutation_queue = self._mutations
+        self.search_panel.entry_tree.mutation_queue = self._mutations
+        if self._mutations.replay():
+            # Show edits restored from the last session once they are saved.
+            self._reload_after_retry = True
+        self.display_panel.image_view.set_optimistic_box_updates(
+            self._settings.optimistic_box_updates
+        )
+        self.search_panel.entry_tree.set_optimistic_updates(
+            self._settings.optimistic_box_updates
+        )
         self.display_panel.image_view.configure_sam_params(
             self._settings.sam3_min_area,
             self._settings.sam3_overlap_iou,
+            self._settings.sam3_candidate_nms_iou,
+        )
+        self.display_panel.image_view.set_sam_prefetch_count(
+            self._settings.sam3_prefetch_images
+        )
+        self.display_panel.image_view.set_sam_hover_debounce_ms(
+            self._settings.sam3_hover_debounce_ms
         )
         self._refresh_sam_service()
         self.display_panel.image_view.set_sam_prompt_modes(
@@ -143,9 +184,66 @@ class AppWindow(QMainWindow):
         if self._concept_label is not None:
             self._concept_label.setText("Concept: {}".format(concept or "-"))
 
-    def _sync_result_count(self, uuids: list):
+    def _sync_result_count(self, uuids: Sequence[str]):
         if self._result_label is not None:
-            self._result_label.setText("Results: {}".format(len(uuids or [])))
+            self._result_label.setText("Results: {}".format(len(uuids or ())))
+
+    def _create_mutation_queue(self) -> MutationQueue:
+        m3 = self._require_m3_service()
+        journal = None
+        if self._settings.offline_journal:
+            path = journal_path()
+            try:
+                journal = MutationJournal(path)
+            except (OSError, sqlite3.Error) as exc:
+                logger.error("Could not open edit journal {}: {}", path, exc)
+        timeout_secs = self._settings.connection_timeout_secs
+        return MutationQueue(
+            m3,
+            journal=journal,
+            probe=lambda: m3.check_annotation_service(timeout_secs),
+        )
+
+    def _sync_write_counts(self, pending: int, failed: int):
+        offline = self._mutations is not None and self._mutations.offline
+        if self._writes_label is not None:
+            parts = []
+            if offline:
+                parts.append("offline")
+            if pending:
+                parts.append(
+                    "{} queued".format(pending)
+                    if offline
+                    else "Saving {}".format(pending)
+                )
+            if failed:
+                parts.append("{} failed".format(failed))
+            self._writes_label.setText(
+                "Edits: {}".format(", ".join(parts) if parts else "saved")
+            )
+        if self._retry_writes_action is not None:
+            self._retry_writes_action.setEnabled(failed > 0)
+        if self._work_offline_action is not None:
+            self._work_offline_action.setChecked(offline)
+        if pending == 0 and self._reload_after_retry:
+            # Failed edits were rolled back locally; show them again once saved.
+            self._reload_after_retry = False
+            image_view = self.display_panel.image_view
+            if image_view.moment is not None:
+                image_view.reload_moment(preserve_sam_state=True)
+
+    def _set_work_offline(self, offline: bool):
+        if self._mutations is None:
+            return
+        self._mutations.set_offline(offline)
+        logger.info("Working {}", "offline" if offline else "online")
+
+    def _retry_failed_writes(self):
+        if self._mutations is None:
+            return
+        self._reload_after_retry = True
+        count = self._mutations.retry_failed()
+        logger.info("Retrying {} failed edit(s)", count)
 
     def _init_status_bar(self):
         status = QStatusBar(self)
@@ -157,6 +255,7 @@ class AppWindow(QMainWindow):
         self._mode_label = QLabel(f"Mode: {self.admin_mode and 'Admin' or 'Standard'}")
         self._concept_label = QLabel("Concept: -")
         self._result_label = QLabel("Results: 0")
+        self._writes_label = QLabel("Edits: saved")
 
         status.addWidget(self._activity_label, 1)
         status.addPermanentWidget(self._observer_label)
@@ -164,6 +263,7 @@ class AppWindow(QMainWindow):
         status.addPermanentWidget(self._mode_label)
         status.addPermanentWidget(self._concept_label)
         status.addPermanentWidget(self._result_label)
+        status.addPermanentWidget(self._writes_label)
 
         self._configure_shortcuts()
 
@@ -287,6 +387,19 @@ class AppWindow(QMainWindow):
         self._settings_action.triggered.connect(self._open_settings)
         options_menu.addAction(self._settings_action)
 
+        self._retry_writes_action = QAction("Retry Failed Edits", self)
+        self._retry_writes_action.setEnabled(False)
+        self._retry_writes_action.triggered.connect(self._retry_failed_writes)
+        options_menu.addAction(self._retry_writes_action)
+
+        self._work_offline_action = QAction("Work Offline", self)
+        self._work_offline_action.setCheckable(True)
+        self._work_offline_action.triggered.connect(self._set_work_offline)
+        options_menu.addAction(self._work_offline_action)
+
+        options_menu.addSeparator()
+        options_menu.addAction(self.task_metrics_dock.toggleViewAction())
+
         # Add admin mode only for privileged roles.
         if self.observer_role not in ("Maint", "Admin"):
             return
@@ -306,16 +419,46 @@ class AppWindow(QMainWindow):
         self._admin_mode_action.toggled.connect(set_admin_mode)
         options_menu.addAction(self._admin_mode_action)
 
+    def _create_sam_service(self) -> SAM3Service:
+        service_cls = (
+            SAM3WorkerService if self._settings.sam3_out_of_process else SAM3Service
+        )
+        return service_cls(
+            model_path=self._settings.sam3_model_path,
+            conf=self._settings.sam3_confidence,
+            imgsz=self._settings.sam3_image_size,
+            feature_cache_mb=self._settings.sam3_feature_cache_mb,
+        )
+
+    def _apply_sam_feature_store(self, budget_mb: int) -> None:
+        store = self._sam3.feature_store
+        if budget_mb <= 0:
+            self._sam3.set_feature_store(None)
+        elif store is None:
+            self._sam3.set_feature_store(FeatureStore(sam_feature_dir(), budget_mb))
+        else:
+            store.set_budget_mb(budget_mb)
+            # Lets a worker process pick up the new budget.
+            self._sam3.set_feature_store(store)
+
     def _refresh_sam_service(self) -> None:
         self._sam3.configure_runtime(
             model_path=self._settings.sam3_model_path,
             conf=self._settings.sam3_confidence,
             imgsz=self._settings.sam3_image_size,
+            feature_cache_mb=self._settings.sam3_feature_cache_mb,
         )
         self.display_panel.image_view.sam3_service = self._sam3
         self.display_panel.image_view.configure_sam_params(
             self._settings.sam3_min_area,
             self._settings.sam3_overlap_iou,
+            self._settings.sam3_candidate_nms_iou,
+        )
+        self.display_panel.image_view.set_sam_prefetch_count(
+            self._settings.sam3_prefetch_images
+        )
+        self.display_panel.image_view.set_sam_hover_debounce_ms(
+            self._settings.sam3_hover_debounce_ms
         )
         try:
             self._sam3.ensure_loaded(
@@ -336,7 +479,14 @@ class AppWindow(QMainWindow):
 
         current = self._settings.snapshot()
 
+        configure_lanes(self._settings.lane_limits)
         self.search_panel.set_page_size(current.search_page_size)
+        self.display_panel.image_view.set_optimistic_box_updates(
+            current.optimistic_box_updates
+        )
+        self.search_panel.entry_tree.set_optimistic_updates(
+            current.optimistic_box_updates
+        )
         self._configure_shortcuts()
 
         if self._settings_action is not None:
@@ -347,14 +497,27 @@ class AppWindow(QMainWindow):
         self._sam_enabled = current.sam3_enabled
         self._sam_semantic_enabled = current.sam3_semantic_enabled
         self._sam_point_enabled = current.sam3_point_enabled
+        if previous.sam3_out_of_process != current.sam3_out_of_process:
+            self._sam3.shutdown()
+            self._sam3 = self._create_sam_service()
+            self.display_panel.image_view.set_sam_service(self._sam3)
         self._sam3.configure_runtime(
             model_path=current.sam3_model_path,
             conf=current.sam3_confidence,
             imgsz=current.sam3_image_size,
+            feature_cache_mb=current.sam3_feature_cache_mb,
         )
+        self._apply_sam_feature_store(current.sam3_feature_store_mb)
         self.display_panel.image_view.configure_sam_params(
             current.sam3_min_area,
             current.sam3_overlap_iou,
+            current.sam3_candidate_nms_iou,
+        )
+        self.display_panel.image_view.set_sam_prefetch_count(
+            current.sam3_prefetch_images
+        )
+        self.display_panel.image_view.set_sam_hover_debounce_ms(
+            current.sam3_hover_debounce_ms
         )
 
         if self._sam_enabled and not self._sam3.available:
@@ -395,6 +558,16 @@ class AppWindow(QMainWindow):
         Args:
             a0: Close event payload.
         """
+        if self._mutations is not None:
+            idle = self._mutations.wait_idle(
+                timeout=0 if self._mutations.offline else 10
+            )
+            if not idle:
+                logger.warning(
+                    "Closing with {} unsaved edit(s)", self._mutations.pending_count
+                )
+            self._mutations.close(wait=idle)
+        self._sam3.shutdown()
         self.deleteLater()
         super().closeEvent(a0)
 
@@ -55,6 +55,23 @@ class DisplayPanel(QWidget):
         self.sam_reject.hoverEntered.connect(self._preview_sam_candidate)
         self.sam_reject.hoverLeft.connect(self._clear_sam_candidate_preview)
 
+        self.sam_select = QPushButton("Select")
+        self.sam_select.setCheckable(True)
+        self.sam_select.setToolTip("Mark the current SAM candidate for Accept Selected")
+        self.sam_select.clicked.connect(self._toggle_sam_candidate_selected)
+
+        self.sam_accept_selected = QPushButton("Accept Selected")
+        self.sam_accept_selected.setToolTip(
+            "Create an observation and box for each selected SAM candidate"
+        )
+        self.sam_accept_selected.clicked.connect(self._accept_selected_sam_candidates)
+
+        self.sam_accept_all = QPushButton("Accept All")
+        self.sam_accept_all.setToolTip(
+            "Create an observation and box for every SAM candidate"
+        )
+        self.sam_accept_all.clicked.connect(self._accept_all_sam_candidates)
+
         self.sam_find_similar = QPushButton("Find Similar")
         self.sam_find_similar.setToolTip(
             "Find more instances of the active annotation concept using its "
@@ -66,6 +83,9 @@ class DisplayPanel(QWidget):
         self.sam_controls.layout().addWidget(self.sam_label)
         self.sam_controls.layout().addWidget(self.sam_accept)
         self.sam_controls.layout().addWidget(self.sam_reject)
+        self.sam_controls.layout().addWidget(self.sam_select)
+        self.sam_controls.layout().addWidget(self.sam_accept_selected)
+        self.sam_controls.layout().addWidget(self.sam_accept_all)
         self.sam_controls.layout().addWidget(self.sam_find_similar)
         self.sam_controls.layout().addStretch(1)
 
@@ -84,8 +104,19 @@ class DisplayPanel(QWidget):
         self.sam_reject.setVisible(visible)
         self.sam_accept.setEnabled(visible)
         self.sam_reject.setEnabled(visible)
+        selected, current_selected = (
+            self.image_view.sam_candidate_selection() if visible else (0, False)
+        )
+        for button in (self.sam_select, self.sam_accept_selected, self.sam_accept_all):
+            button.setVisible(visible)
+        self.sam_select.setChecked(current_selected)
+        self.sam_accept_selected.setEnabled(selected > 0)
+        self.sam_accept_all.setEnabled(visible)
         if visible:
-            self.sam_label.setText("SAM candidate {}/{}".format(index + 1, total))
+            text = "SAM candidate {}/{}".format(index + 1, total)
+            if selected:
+                text += " ({} selected)".format(selected)
+            self.sam_label.setText(text)
         else:
             self.sam_label.setText("SAM candidates")
         self.sam_find_similar.setEnabled(self.image_view.can_find_similar())
@@ -104,6 +135,16 @@ class DisplayPanel(QWidget):
         self.image_view.reject_sam_candidate()
         self.image_view.preview_focus_on_sam_candidate()
 
+    def _toggle_sam_candidate_selected(self):
+        self.image_view.toggle_sam_candidate_selected()
+
+    def _accept_selected_sam_candidates(self):
+        self.image_view.accept_selected_sam_candidates()
+        self.image_view.preview_focus_on_sam_candidate()
+
+    def _accept_all_sam_candidates(self):
+        self.image_view.accept_all_sam_candidates()
+
     def _preview_sam_candidate(self):
         self.image_view.preview_focus_on_sam_candidate()
 
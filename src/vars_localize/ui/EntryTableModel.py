@@ -0,0 +1,407 @@
+"""Table models backing the imaged moment, observation, and association browsers."""
+
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtWidgets import QTableView
+
+from vars_localize.models import AssociationEntry, ImagedMomentEntry, ObservationEntry
+from vars_localize.ui.theme import status_brush
+
+PayloadRole = Qt.ItemDataRole.UserRole
+
+_ALIGN_CENTER = Qt.AlignmentFlag.AlignCenter
+_ALIGN_RIGHT = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+_ALIGN_LEFT = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+
+
+class StatusRole(str, Enum):
+    UNKNOWN = "unknown"
+    EMPTY = "empty"
+    UNLOCALIZED = "unlocalized"
+    PARTIAL = "partial"
+    LOCALIZED = "localized"
+
+
+def moment_status(moment: ImagedMomentEntry) -> tuple[str, str, StatusRole]:
+    total = moment.observation_count
+    localized = moment.localized_count
+    if total <= 0:
+        return ("Empty", "No observations in this imaged moment", StatusRole.EMPTY)
+    if localized <= 0:
+        return (
+            "Unlocalized (0/{})".format(total),
+            "None of {} observations are localized".format(total),
+            StatusRole.UNLOCALIZED,
+        )
+    if localized < total:
+        return (
+            "Partial ({}/{})".format(localized, total),
+            "{} of {} observations are localized".format(localized, total),
+            StatusRole.PARTIAL,
+        )
+    return (
+        "Localized ({}/{})".format(localized, total),
+        "All {} observations are localized".format(total),
+        StatusRole.LOCALIZED,
+    )
+
+
+def observation_status(obs: ObservationEntry) -> tuple[str, str, StatusRole]:
+    box_count = len(obs.boxes)
+    if box_count <= 0:
+        return ("Open", "No localized bounding boxes yet", StatusRole.UNLOCALIZED)
+    return (
+        "Localized ({})".format(box_count),
+        "Observation has {} localized bounding box(es)".format(box_count),
+        StatusRole.LOCALIZED,
+    )
+
+
+def format_recorded_timestamp(recorded_timestamp: Optional[str]) -> str:
+    if not recorded_timestamp:
+        return "-"
+
+    for fmt in ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ"):
+        try:
+            dt = datetime.strptime(recorded_timestamp, fmt)
+            return dt.strftime("%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            continue
+    return recorded_timestamp.replace("T", " ").replace("Z", "")
+
+
+def extract_video_sequence_name(moment: ImagedMomentEntry) -> str:
+    if isinstance(moment.video_sequence_name, str) and moment.video_sequence_name:
+        return moment.video_sequence_name
+
+    if isinstance(moment.raw, Mapping):
+        value = moment.raw.get("video_sequence_name")
+        if isinstance(value, str) and value:
+            return value
+
+    return "-"
+
+
+def summarize_association(assoc: AssociationEntry) -> str:
+    if assoc.link_name == "bounding box":
+        try:
+            parsed = json.loads(assoc.link_value or "{}")
+        except json.JSONDecodeError:
+            parsed = {}
+        if not isinstance(parsed, dict):
+            parsed = {}
+        return "{}x{} @ ({},{})".format(
+            parsed.get("width", "?"),
+            parsed.get("height", "?"),
+            parsed.get("x", "?"),
+            parsed.get("y", "?"),
+        )
+    summary = assoc.link_value or ""
+    if len(summary) > 80:
+        summary = summary[:77] + "..."
+    return summary
+
+
+class AssociationRow:
+    """Association table row payload with its owning observation UUID."""
+
+    __slots__ = ("association", "observation_uuid")
+
+    def __init__(self, association: AssociationEntry, observation_uuid: str):
+        self.association = association
+        self.observation_uuid = observation_uuid
+
+    @property
+    def uuid(self) -> str:
+        return self.association.uuid
+
+    @property
+    def is_box(self) -> bool:
+        return self.association.link_name == "bounding box"
+
+
+class EntryTableModel(QAbstractTableModel):
+    """Read-only table model over a list of row payloads.
+
+    Rows are indexed by ``row_key`` (payload identity by default), so finding
+    the row of a payload is O(1). Cell values are computed on demand by
+    ``cell_text`` and friends, which means only rows the view actually paints
+    are formatted. ``patch_rows`` applies a new row list as inserts, removals,
+    and per-row updates so selection and scroll position survive refreshes.
+    """
+
+    def __init__(self, headers: List[str], alignments: List[Any], parent=None):
+        super().__init__(parent)
+        self._headers = list(headers)
+        self._alignments = list(alignments)
+        self._rows: List[Any] = []
+        self._row_index: Dict[int, int] = {}
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._headers)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (
+            orientation == Qt.Orientation.Horizontal
+            and role == Qt.ItemDataRole.DisplayRole
+            and 0 <= section < len(self._headers)
+        ):
+            return self._headers[section]
+        return None
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if not 0 <= row < len(self._rows):
+            return None
+        payload = self._rows[row]
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return str(row + 1)
+            return self.cell_text(payload, column)
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return int(self._alignments[column])
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self.cell_tooltip(payload, column)
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self.cell_foreground(payload, column)
+        if role == PayloadRole:
+            return payload
+        return None
+
+    def cell_text(self, payload: Any, column: int) -> Optional[str]:
+        return None
+
+    def cell_tooltip(self, payload: Any, column: int) -> Optional[str]:
+        return None
+
+    def cell_foreground(self, payload: Any, column: int):
+        return None
+
+    def set_rows(self, rows: List[Any]) -> None:
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._reindex()
+        self.endResetModel()
+
+    def clear(self) -> None:
+        if self._rows:
+            self.set_rows([])
+
+    def patch_rows(self, rows: List[Any]) -> None:
+        """Update rows in place, signalling only the rows that changed."""
+        new_rows = list(rows)
+        new_keys = [self.row_key(payload) for payload in new_rows]
+        keep = set(new_keys)
+        first_shift: Optional[int] = None
+
+        for row in range(len(self._rows) - 1, -1, -1):
+            if self.row_key(self._rows[row]) not in keep:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._rows[row]
+                self.endRemoveRows()
+                first_shift = row
+
+        for row, payload in enumerate(new_rows):
+            key = new_keys[row]
+            if row < len(self._rows) and self.row_key(self._rows[row]) == key:
+                previous = self._rows[row]
+                self._rows[row] = payload
+                if self.row_changed(previous, payload):
+                    self.refresh_row(row)
+                continue
+
+            source = next(
+                (
+                    idx
+                    for idx in range(row + 1, len(self._rows))
+                    if self.row_key(self._rows[idx]) == key
+                ),
+                -1,
+            )
+            if source >= 0:
+                self.beginMoveRows(QModelIndex(), source, source, QModelIndex(), row)
+                self._rows.pop(source)
+                self._rows.insert(row, payload)
+                self.endMoveRows()
+                self.refresh_row(row)
+            else:
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._rows.insert(row, payload)
+                self.endInsertRows()
+            first_shift = row if first_shift is None else min(first_shift, row)
+
+        self._reindex()
+        if first_shift is not None and first_shift < len(self._rows):
+            # Row numbers below an insert or removal moved.
+            self.dataChanged.emit(
+                self.index(first_shift, 0), self.index(len(self._rows) - 1, 0)
+            )
+
+    def row_key(self, payload: Any) -> Any:
+        return id(payload)
+
+    def row_changed(self, previous: Any, payload: Any) -> bool:
+        return previous is not payload
+
+    def rows(self) -> List[Any]:
+        return list(self._rows)
+
+    def row_payload(self, row: int) -> Any:
+        if 0 <= row < len(self._rows):
+            return self._rows[row]
+        return None
+
+    def row_of(self, payload: Any) -> int:
+        return self._row_index.get(self.row_key(payload), -1)
+
+    def refresh_row(self, row: int) -> None:
+        if 0 <= row < len(self._rows):
+            self.dataChanged.emit(
+                self.index(row, 0), self.index(row, len(self._headers) - 1)
+            )
+
+    def refresh_payload(self, payload: Any) -> None:
+        self.refresh_row(self.row_of(payload))
+
+    def _reindex(self) -> None:
+        self._row_index = {
+            self.row_key(payload): row for row, payload in enumerate(self._rows)
+        }
+
+
+class MomentTableModel(EntryTableModel):
+    HEADERS = ["#", "Observations", "Recorded", "Video Sequence", "Status"]
+
+    def __init__(self, parent=None):
+        super().__init__(
+            self.HEADERS,
+            [_ALIGN_CENTER, _ALIGN_CENTER, _ALIGN_CENTER, _ALIGN_RIGHT, _ALIGN_RIGHT],
+            parent,
+        )
+
+    def cell_text(self, payload: Any, column: int) -> Optional[str]:
+        moment: ImagedMomentEntry = payload.imaged_moment
+        if column == 1:
+            return "{}".format(moment.observation_count)
+        if column == 2:
+            return format_recorded_timestamp(moment.recorded_timestamp)
+        if column == 3:
+            return extract_video_sequence_name(moment)
+        if column == 4:
+            return moment_status(moment)[0]
+        return None
+
+    def cell_tooltip(self, payload: Any, column: int) -> Optional[str]:
+        if column == 4:
+            return moment_status(payload.imaged_moment)[1]
+        return None
+
+    def cell_foreground(self, payload: Any, column: int):
+        if column == 4:
+            return status_brush(moment_status(payload.imaged_moment)[2].value)
+        return None
+
+
+class ObservationTableModel(EntryTableModel):
+    HEADERS = ["#", "Concept", "Observer", "Status"]
+
+    def __init__(self, is_editable: Callable[[str], bool], parent=None):
+        super().__init__(
+            self.HEADERS,
+            [_ALIGN_CENTER, _ALIGN_LEFT, _ALIGN_LEFT, _ALIGN_RIGHT],
+            parent,
+        )
+        self._is_editable = is_editable
+
+    def cell_text(self, payload: Any, column: int) -> Optional[str]:
+        obs: ObservationEntry = payload.observation
+        if column == 1:
+            return obs.concept
+        if column == 2:
+            return obs.observer
+        if column == 3:
+            return observation_status(obs)[0]
+        return None
+
+    def cell_tooltip(self, payload: Any, column: int) -> Optional[str]:
+        if column == 3:
+            return observation_status(payload.observation)[1]
+        return None
+
+    def cell_foreground(self, payload: Any, column: int):
+        obs: ObservationEntry = payload.observation
+        if column == 1 and self._is_editable(obs.uuid):
+            return status_brush("editable")
+        if column == 3:
+            return status_brush(observation_status(obs)[2].value)
+        return None
+
+
+class AssociationTableModel(EntryTableModel):
+    HEADERS = ["#", "Name", "To Concept", "Value"]
+
+    def __init__(self, parent=None):
+        super().__init__(
+            self.HEADERS,
+            [_ALIGN_CENTER, _ALIGN_LEFT, _ALIGN_LEFT, _ALIGN_LEFT],
+            parent,
+        )
+
+    def row_key(self, payload: Any) -> Any:
+        return payload.uuid
+
+    def row_changed(self, previous: Any, payload: Any) -> bool:
+        old = previous.association
+        new = payload.association
+        return (old.link_name, old.to_concept, old.link_value) != (
+            new.link_name,
+            new.to_concept,
+            new.link_value,
+        )
+
+    def cell_text(self, payload: Any, column: int) -> Optional[str]:
+        assoc: AssociationEntry = payload.association
+        if column == 1:
+            return "Bounding Box" if payload.is_box else assoc.link_name
+        if column == 2:
+            return assoc.to_concept or "-"
+        if column == 3:
+            return summarize_association(assoc)
+        return None
+
+    def cell_tooltip(self, payload: Any, column: int) -> Optional[str]:
+        if column == 3:
+            return payload.association.link_value or ""
+        return None
+
+
+class EntryTableView(QTableView):
+    """Table view with the row helpers the entry browser expects."""
+
+    def entry_model(self) -> EntryTableModel:
+        model = self.model()
+        if not isinstance(model, EntryTableModel):
+            raise RuntimeError("EntryTableView requires an EntryTableModel")
+        return model
+
+    def rowCount(self) -> int:
+        return self.entry_model().rowCount()
+
+    def currentRow(self) -> int:
+        return self.currentIndex().row()
+
+    def row_payload(self, row: int) -> Any:
+        return self.entry_model().row_payload(row)
+
+    def clearCurrent(self) -> None:
+        self.setCurrentIndex(QModelIndex())
@@ -1,13 +1,11 @@
 """Unified browser for imaged moments, observations, and associations."""
 
-import json
 import webbrowser
 from datetime import datetime, timedelta
-from enum import Enum
 from http.client import HTTPException
-from typing import Any, List, Optional, cast
+from typing import Any, Callable, Dict, List, Optional, cast
 
-from PyQt6.QtCore import QSettings, Qt, pyqtSignal
+from PyQt6.QtCore import QModelIndex, QSettings, Qt, pyqtSignal
 from PyQt6.QtGui import QAction, QKeySequence, QShortcut
 from PyQt6.QtWidgets import (
     QAbstractItemView,
@@ -22,30 +20,33 @@ from PyQt6.QtWidgets import (
     QMessageBox,
     QPushButton,
     QSplitter,
-    QTableWidget,
-    QTableWidgetItem,
     QVBoxLayout,
     QWidget,
 )
 
 from vars_localize.models import ImagedMomentEntry, ObservationEntry
 from vars_localize.services import M3Service
+from vars_localize.services.mutations import MutationQueue
 from vars_localize.ui.ConceptSearchbar import ConceptSearchbar
-from vars_localize.ui.theme import status_brush
+from vars_localize.ui.EntryTableModel import (
+    AssociationRow,
+    AssociationTableModel,
+    EntryTableModel,
+    EntryTableView,
+    MomentTableModel,
+    ObservationTableModel,
+)
 from vars_localize.util.logging import get_logger
-from vars_localize.util.qt_async import run_async
+from vars_localize.util.qt_async import (
+    LANE_BACKGROUND,
+    LANE_VISIBLE,
+    MainThreadRelay,
+    run_async,
+)
 
 logger = get_logger("EntryTree")
 
 
-class StatusRole(str, Enum):
-    UNKNOWN = "unknown"
-    EMPTY = "empty"
-    UNLOCALIZED = "unlocalized"
-    PARTIAL = "partial"
-    LOCALIZED = "localized"
-
-
 class EntryTreeItem:
     """Lightweight payload wrapper retained for compatibility with existing flows."""
 
@@ -59,7 +60,9 @@ class EntryTreeItem:
     ):
         self.payload = payload
         self._parent = parent
-        self._children: List[EntryTreeItem] = []
+        # Observation children are built on first access so moment rows can be
+        # listed without materializing their observations.
+        self._children: Optional[List[EntryTreeItem]] = None
         self._tree = tree
 
     @property
@@ -85,17 +88,35 @@ class EntryTreeItem:
     def parent(self) -> Optional["EntryTreeItem"]:
         return self._parent
 
+    def children(self) -> List["EntryTreeItem"]:
+        if self._children is None:
+            observations = (
+                self.payload.observations
+                if isinstance(self.payload, ImagedMomentEntry)
+                else []
+            )
+            self._children = [
+                EntryTreeItem(obs, parent=self, tree=self._tree) for obs in observations
+            ]
+        return self._children
+
     def child(self, idx: int) -> "EntryTreeItem":
-        return self._children[idx]
+        return self.children()[idx]
 
     def childCount(self) -> int:
-        return len(self._children)
+        return len(self.children())
 
     def add_child(self, child: "EntryTreeItem"):
-        self._children.append(child)
+        self.children().append(child)
 
     def clear_children(self):
-        self._children.clear()
+        self._children = []
+
+    def set_children(self, children: List["EntryTreeItem"]):
+        self._children = list(children)
+
+    def has_loaded_children(self) -> bool:
+        return self._children is not None
 
     def treeWidget(self) -> "ImagedMomentTree":
         return self._tree
@@ -118,11 +139,17 @@ class ImagedMomentTree(QWidget):
     associationActivated = pyqtSignal(str, str)
     annotationFocusChanged = pyqtSignal(object, object)
 
+    # Injected by the app window; observation edits go through it when set
+    # and optimistic updates are on.
+    mutation_queue: Optional[MutationQueue] = None
+    optimistic_updates = True
+
     def __init__(self, m3_service: M3Service, parent=None):
         super(ImagedMomentTree, self).__init__(parent)
 
         self._m3 = m3_service
         self._settings = QSettings("MBARI", "VARSLocalize")
+        self._write_relay = MainThreadRelay(self)
 
         self.uuids: List[str] = []
         self.editable_uuids = set()
@@ -176,16 +203,22 @@ class ImagedMomentTree(QWidget):
         self.clear_concept_button.setEnabled(False)
         self.clear_observation_button.setEnabled(False)
 
+        self.moments_model = MomentTableModel(self)
+        self.observations_model = ObservationTableModel(
+            lambda uuid: uuid in self.editable_uuids, self
+        )
+        self.associations_model = AssociationTableModel(self)
+
         self.moments_table = self._build_table(
-            ["#", "Observations", "Recorded", "Video Sequence", "Status"],
+            self.moments_model,
             QAbstractItemView.SelectionMode.SingleSelection,
         )
         self.observations_table = self._build_table(
-            ["#", "Concept", "Observer", "Status"],
+            self.observations_model,
             QAbstractItemView.SelectionMode.ExtendedSelection,
         )
         self.associations_table = self._build_table(
-            ["#", "Name", "To Concept", "Value"],
+            self.associations_model,
             QAbstractItemView.SelectionMode.SingleSelection,
         )
 
@@ -228,17 +261,15 @@ class ImagedMomentTree(QWidget):
         self._restore_splitter_sizes()
         self.stacked_splitter.splitterMoved.connect(self._persist_splitter_sizes)
 
-        self.moments_table.itemSelectionChanged.connect(
-            self._on_moment_selection_changed
+        self._connect_selection(self.moments_table, self._on_moment_selection_changed)
+        self._connect_selection(
+            self.observations_table, self._on_observation_selection_changed
         )
-        self.observations_table.itemSelectionChanged.connect(
-            self._on_observation_selection_changed
-        )
-        self.observations_table.itemDoubleClicked.connect(
+        self.observations_table.doubleClicked.connect(
             self._on_observation_double_clicked
         )
-        self.associations_table.itemSelectionChanged.connect(
-            self._on_association_selection_changed
+        self._connect_selection(
+            self.associations_table, self._on_association_selection_changed
         )
 
         self._attach_context_copy_menu(self.moments_table)
@@ -255,9 +286,9 @@ class ImagedMomentTree(QWidget):
         )
         self._rename_shortcut.activated.connect(self._handle_rename_shortcut)
 
-    def _build_table(self, headers: List[str], selection_mode) -> QTableWidget:
-        table = QTableWidget(0, len(headers))
-        table.setHorizontalHeaderLabels(headers)
+    def _build_table(self, model: EntryTableModel, selection_mode) -> EntryTableView:
+        table = EntryTableView()
+        table.setModel(model)
         table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         table.setSelectionMode(selection_mode)
         table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
@@ -265,18 +296,28 @@ class ImagedMomentTree(QWidget):
         vheader = table.verticalHeader()
         if vheader is not None:
             vheader.setVisible(False)
+            # Uniform row heights let the view skip measuring off-screen rows.
+            vheader.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         return table
 
     def _set_resize_modes(
-        self, table: QTableWidget, modes: List[QHeaderView.ResizeMode]
+        self, table: EntryTableView, modes: List[QHeaderView.ResizeMode]
     ):
         header = table.horizontalHeader()
         if header is None:
             return
+        # Size content-fitted columns from the visible rows only.
+        header.setResizeContentsPrecision(0)
         for idx, mode in enumerate(modes):
             header.setSectionResizeMode(idx, mode)
 
-    def _attach_context_copy_menu(self, table: QTableWidget):
+    @staticmethod
+    def _connect_selection(table: EntryTableView, handler):
+        selection_model = table.selectionModel()
+        if selection_model is not None:
+            selection_model.selectionChanged.connect(lambda *_: handler())
+
+    def _attach_context_copy_menu(self, table: EntryTableView):
         table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         table.customContextMenuRequested.connect(
             lambda point, t=table: self._show_copy_uuid_menu(t, point)
@@ -297,24 +338,20 @@ class ImagedMomentTree(QWidget):
             "ui/entry_browser_splitter_sizes", self.stacked_splitter.sizes()
         )
 
-    def _show_copy_uuid_menu(self, table: QTableWidget, point):
-        item = table.itemAt(point)
-        if item is None:
-            return
-
-        row = item.row()
+    def _show_copy_uuid_menu(self, table: EntryTableView, point):
+        row = table.indexAt(point).row()
         if row < 0:
             return
 
-        payload = self._row_payload(table, row)
+        payload = table.row_payload(row)
         if payload is None:
             return
 
         uuid = None
         if isinstance(payload, EntryTreeItem):
             uuid = _uuid_from_payload(payload.payload)
-        elif isinstance(payload, dict):
-            uuid = payload.get("uuid")
+        elif isinstance(payload, AssociationRow):
+            uuid = payload.uuid
 
         if not uuid:
             return
@@ -334,97 +371,6 @@ class ImagedMomentTree(QWidget):
         if viewport is not None:
             menu.exec(viewport.mapToGlobal(point))
 
-    def _set_row_payload(self, table: QTableWidget, row: int, payload: object):
-        key_item = table.item(row, 0)
-        if key_item is None:
-            key_item = QTableWidgetItem()
-            table.setItem(row, 0, key_item)
-        key_item.setData(Qt.ItemDataRole.UserRole, payload)
-
-    def _row_payload(self, table: QTableWidget, row: int):
-        key_item = table.item(row, 0)
-        if key_item is None:
-            return None
-        return key_item.data(Qt.ItemDataRole.UserRole)
-
-    def _moment_status(self, moment: ImagedMomentEntry) -> tuple[str, str, StatusRole]:
-        total = len(moment.observations)
-        localized = sum(1 for obs in moment.observations if obs.boxes)
-        if total <= 0:
-            return ("Empty", "No observations in this imaged moment", StatusRole.EMPTY)
-        if localized <= 0:
-            return (
-                "Unlocalized (0/{})".format(total),
-                "None of {} observations are localized".format(total),
-                StatusRole.UNLOCALIZED,
-            )
-        if localized < total:
-            return (
-                "Partial ({}/{})".format(localized, total),
-                "{} of {} observations are localized".format(localized, total),
-                StatusRole.PARTIAL,
-            )
-        return (
-            "Localized ({}/{})".format(localized, total),
-            "All {} observations are localized".format(total),
-            StatusRole.LOCALIZED,
-        )
-
-    @staticmethod
-    def _format_recorded_timestamp(recorded_timestamp: Optional[str]) -> str:
-        if not recorded_timestamp:
-            return "-"
-
-        for fmt in ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ"):
-            try:
-                dt = datetime.strptime(recorded_timestamp, fmt)
-                return dt.strftime("%Y-%m-%d %H:%M:%S")
-            except ValueError:
-                continue
-        return recorded_timestamp.replace("T", " ").replace("Z", "")
-
-    @staticmethod
-    def _extract_video_sequence_name(moment: ImagedMomentEntry) -> str:
-        if isinstance(moment.video_sequence_name, str) and moment.video_sequence_name:
-            return moment.video_sequence_name
-
-        if isinstance(moment.raw, dict):
-            value = moment.raw.get("video_sequence_name")
-            if isinstance(value, str) and value:
-                return value
-
-        return "-"
-
-    def _observation_status(self, obs: ObservationEntry) -> tuple[str, str, StatusRole]:
-        box_count = len(obs.boxes)
-        if box_count <= 0:
-            return ("Open", "No localized bounding boxes yet", StatusRole.UNLOCALIZED)
-        return (
-            "Localized ({})".format(box_count),
-            "Observation has {} localized bounding box(es)".format(box_count),
-            StatusRole.LOCALIZED,
-        )
-
-    def _set_status_cell(
-        self,
-        table: QTableWidget,
-        row: int,
-        col: int,
-        text: str,
-        tooltip: str,
-        role: StatusRole,
-    ):
-        item = table.item(row, col)
-        if item is None:
-            item = QTableWidgetItem()
-            table.setItem(row, col, item)
-        item.setText(text)
-        item.setToolTip(tooltip)
-        item.setForeground(status_brush(role.value))
-        item.setTextAlignment(
-            int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-        )
-
     def clear(self, reset_concept_filter: bool = True):
         self._moment_items = []
         self._selected_moment = None
@@ -433,9 +379,9 @@ class ImagedMomentTree(QWidget):
         if reset_concept_filter:
             self._active_concept_filter = None
         self._set_current_item(None)
-        self.moments_table.setRowCount(0)
-        self.observations_table.setRowCount(0)
-        self.associations_table.setRowCount(0)
+        self.moments_model.clear()
+        self.observations_model.clear()
+        self.associations_model.clear()
         if reset_concept_filter:
             self._populate_concept_filter_options([])
             self.clear_concept_button.setEnabled(False)
@@ -458,11 +404,9 @@ class ImagedMomentTree(QWidget):
             parent = item.parent()
             if parent is not None:
                 self._select_moment_item(parent)
-                for row in range(self.observations_table.rowCount()):
-                    row_payload = self._row_payload(self.observations_table, row)
-                    if row_payload is item:
-                        self.observations_table.selectRow(row)
-                        break
+                row = self.observations_model.row_of(item)
+                if row >= 0:
+                    self.observations_table.selectRow(row)
 
     def selectedItems(self) -> List[EntryTreeItem]:
         selection_model = self.observations_table.selectionModel()
@@ -472,7 +416,7 @@ class ImagedMomentTree(QWidget):
         rows = sorted({idx.row() for idx in selection_model.selectedRows()})
         selected: List[EntryTreeItem] = []
         for row in rows:
-            payload = self._row_payload(self.observations_table, row)
+            payload = self.observations_model.row_payload(row)
             if isinstance(payload, EntryTreeItem):
                 selected.append(payload)
         return selected
@@ -507,6 +451,13 @@ class ImagedMomentTree(QWidget):
         if row > 0:
             self.moments_table.selectRow(row - 1)
 
+    def upcoming_moments(self, item: EntryTreeItem, count: int) -> List[EntryTreeItem]:
+        """Moment items after ``item`` on the current page, nearest first."""
+        for idx, moment_item in enumerate(self._moment_items):
+            if moment_item is item:
+                return self._moment_items[idx + 1 : idx + 1 + max(0, count)]
+        return []
+
     def load_page_data(self, imaged_moment_data: List[ImagedMomentEntry]):
         # Preserve annotate-concept focus across page flips; it will be validated
         # against the newly selected moment in _refresh_concept_filter_options.
@@ -516,154 +467,69 @@ class ImagedMomentTree(QWidget):
 
         for metadata in imaged_moment_data:
             self._add_moment(metadata)
+        self.moments_model.set_rows(self._moment_items)
 
         if self.moments_table.rowCount() > 0:
             self.moments_table.selectRow(0)
 
-    def _add_moment(self, metadata: ImagedMomentEntry):
+    def _add_moment(self, metadata: ImagedMomentEntry) -> EntryTreeItem:
         moment_item = EntryTreeItem(metadata, parent=None, tree=self)
-        for obs in metadata.observations:
-            moment_item.add_child(EntryTreeItem(obs, parent=moment_item, tree=self))
-
         self._moment_items.append(moment_item)
-
-        row = self.moments_table.rowCount()
-        self.moments_table.insertRow(row)
-
-        self.moments_table.setItem(row, 0, QTableWidgetItem(str(row + 1)))
-        idx_item = self.moments_table.item(row, 0)
-        if idx_item is not None:
-            idx_item.setTextAlignment(int(Qt.AlignmentFlag.AlignCenter))
-        self._set_row_payload(self.moments_table, row, moment_item)
-
-        obs_count_text = "{}".format(len(metadata.observations))
-        self.moments_table.setItem(row, 1, QTableWidgetItem(obs_count_text))
-        obs_count_item = self.moments_table.item(row, 1)
-        if obs_count_item is not None:
-            obs_count_item.setTextAlignment(int(Qt.AlignmentFlag.AlignCenter))
-
-        recorded_text = self._format_recorded_timestamp(metadata.recorded_timestamp)
-        self.moments_table.setItem(row, 2, QTableWidgetItem(recorded_text))
-        recorded_item = self.moments_table.item(row, 2)
-        if recorded_item is not None:
-            recorded_item.setTextAlignment(int(Qt.AlignmentFlag.AlignCenter))
-
-        video_text = self._extract_video_sequence_name(metadata)
-        self.moments_table.setItem(row, 3, QTableWidgetItem(video_text))
-        video_item = self.moments_table.item(row, 3)
-        if video_item is not None:
-            video_item.setTextAlignment(
-                int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            )
-
-        status_text, tooltip, role = self._moment_status(metadata)
-        self._set_status_cell(self.moments_table, row, 4, status_text, tooltip, role)
+        return moment_item
 
     def _select_moment_item(self, moment_item: EntryTreeItem):
         self._selected_moment = moment_item
         self._selected_observation = None
         self._refresh_concept_filter_options(moment_item)
         self._populate_observations(moment_item)
-        self.associations_table.setRowCount(0)
+        self.associations_model.clear()
         self._set_current_item(moment_item)
         self.clear_observation_button.setEnabled(False)
         self._emit_annotation_focus_changed()
 
-        for row in range(self.moments_table.rowCount()):
-            row_payload = self._row_payload(self.moments_table, row)
-            if row_payload is moment_item:
-                self.moments_table.selectRow(row)
-                break
+        row = self.moments_model.row_of(moment_item)
+        if row >= 0 and self.moments_table.currentRow() != row:
+            self.moments_table.selectRow(row)
 
     def _populate_observations(self, moment_item: EntryTreeItem):
-        self.observations_table.setRowCount(0)
-        self._observation_rows = []
-
-        visible_observations = [
+        self._observation_rows = [
             child
-            for child in moment_item._children
+            for child in moment_item.children()
             if child.is_observation
             and (
                 self._active_concept_filter is None
                 or child.observation.concept == self._active_concept_filter
             )
         ]
+        self.observations_model.set_rows(self._observation_rows)
 
-        for row, obs_item in enumerate(visible_observations):
-            obs = obs_item.observation
-            self.observations_table.insertRow(row)
-            self._observation_rows.append(obs_item)
-
-            self.observations_table.setItem(row, 0, QTableWidgetItem(str(row + 1)))
-            idx_item = self.observations_table.item(row, 0)
-            if idx_item is not None:
-                idx_item.setTextAlignment(int(Qt.AlignmentFlag.AlignCenter))
-            self._set_row_payload(self.observations_table, row, obs_item)
-
-            concept_item = QTableWidgetItem(obs.concept)
-            if obs.uuid in self.editable_uuids:
-                concept_item.setForeground(status_brush("editable"))
-            self.observations_table.setItem(row, 1, concept_item)
-
-            self.observations_table.setItem(row, 2, QTableWidgetItem(obs.observer))
-
-            status_text, tooltip, role = self._observation_status(obs)
-            self._set_status_cell(
-                self.observations_table, row, 3, status_text, tooltip, role
-            )
+    @staticmethod
+    def _select_row_silently(table: EntryTableView, row: int):
+        """Restore a row highlight without re-running selection handlers."""
+        selection_model = table.selectionModel()
+        if selection_model is None or row < 0:
+            return
+        selection_model.blockSignals(True)
+        try:
+            table.selectRow(row)
+        finally:
+            selection_model.blockSignals(False)
 
     def _populate_associations(self, obs_item: EntryTreeItem):
-        self.associations_table.setRowCount(0)
         observation = obs_item.observation
-
-        for row, assoc in enumerate(observation.associations):
-            self.associations_table.insertRow(row)
-            self.associations_table.setItem(row, 0, QTableWidgetItem(str(row + 1)))
-            idx_item = self.associations_table.item(row, 0)
-            if idx_item is not None:
-                idx_item.setTextAlignment(int(Qt.AlignmentFlag.AlignCenter))
-
-            is_box = assoc.link_name == "bounding box"
-            assoc_type = "Bounding Box" if is_box else assoc.link_name
-            target = assoc.to_concept or "-"
-
-            summary = assoc.link_value
-            if is_box:
-                try:
-                    parsed = json.loads(assoc.link_value or "{}")
-                except json.JSONDecodeError:
-                    parsed = {}
-                x = parsed.get("x", "?")
-                y = parsed.get("y", "?")
-                w = parsed.get("width", "?")
-                h = parsed.get("height", "?")
-                summary = "{}x{} @ ({},{})".format(w, h, x, y)
-            elif len(summary or "") > 80:
-                summary = (summary or "")[:77] + "..."
-
-            self.associations_table.setItem(row, 1, QTableWidgetItem(assoc_type))
-            self.associations_table.setItem(row, 2, QTableWidgetItem(target))
-
-            summary_item = QTableWidgetItem(summary or "")
-            summary_item.setToolTip(assoc.link_value or "")
-            self.associations_table.setItem(row, 3, summary_item)
-
-            self._set_row_payload(
-                self.associations_table,
-                row,
-                {
-                    "uuid": assoc.uuid,
-                    "observation_uuid": observation.uuid,
-                    "is_box": is_box,
-                },
-            )
+        self.associations_model.set_rows(
+            [
+                AssociationRow(assoc, observation.uuid)
+                for assoc in observation.associations
+            ]
+        )
 
     def _on_moment_selection_changed(self):
         row = self.moments_table.currentRow()
         if row < 0:
             return
 
-        payload = self._row_payload(self.moments_table, row)
+        payload = self.moments_model.row_payload(row)
         if not isinstance(payload, EntryTreeItem):
             return
 
@@ -673,7 +539,7 @@ class ImagedMomentTree(QWidget):
         row = self.observations_table.currentRow()
         if row < 0:
             self._selected_observation = None
-            self.associations_table.setRowCount(0)
+            self.associations_model.clear()
             if self._selected_moment is not None:
                 self._set_current_item(self._selected_moment)
             self.clear_observation_button.setEnabled(False)
@@ -706,7 +572,7 @@ class ImagedMomentTree(QWidget):
     def _refresh_concept_filter_options(self, moment_item: EntryTreeItem):
         concepts = [
             child.observation.concept
-            for child in moment_item._children
+            for child in moment_item.children()
             if child.is_observation
         ]
         previous_filter = self._active_concept_filter
@@ -752,9 +618,9 @@ class ImagedMomentTree(QWidget):
     def clear_observation_selection(self):
         if self.observations_table.selectionModel() is not None:
             self.observations_table.clearSelection()
-        self.observations_table.setCurrentCell(-1, -1)
+        self.observations_table.clearCurrent()
         self._selected_observation = None
-        self.associations_table.setRowCount(0)
+        self.associations_model.clear()
         self.clear_observation_button.setEnabled(False)
         if self._selected_moment is not None:
             self._set_current_item(self._selected_moment)
@@ -771,21 +637,20 @@ class ImagedMomentTree(QWidget):
         if row < 0:
             return
 
-        payload = self._row_payload(self.associations_table, row)
-        if not isinstance(payload, dict):
+        payload = self.associations_model.row_payload(row)
+        if not isinstance(payload, AssociationRow):
             return
 
-        if bool(payload.get("is_box")):
-            obs_uuid = str(payload.get("observation_uuid", ""))
-            assoc_uuid = str(payload.get("uuid", ""))
+        if payload.is_box:
+            obs_uuid = str(payload.observation_uuid or "")
+            assoc_uuid = str(payload.uuid or "")
             if obs_uuid and assoc_uuid:
                 self.associationActivated.emit(obs_uuid, assoc_uuid)
 
-    def _on_observation_double_clicked(self, table_item: QTableWidgetItem):
-        row = table_item.row()
-        payload = self._row_payload(self.observations_table, row)
+    def _on_observation_double_clicked(self, index: QModelIndex):
+        payload = self.observations_model.row_payload(index.row())
         if isinstance(payload, EntryTreeItem):
-            self.itemDoubleClicked.emit(payload, table_item.column())
+            self.itemDoubleClicked.emit(payload, index.column())
 
     def load_imaged_moment_entry(self, entry: EntryTreeItem):
         """Synchronously refresh an imaged moment entry."""
@@ -816,14 +681,12 @@ class ImagedMomentTree(QWidget):
         meta: ImagedMomentEntry,
         selected_observation_uuid: Optional[str] = None,
     ):
+        changed_items = self._merge_observation_children(entry, meta)
         entry.payload = meta
-        entry.clear_children()
-        for obs in meta.observations:
-            entry.add_child(EntryTreeItem(obs, parent=entry, tree=self))
 
         self._selected_observation = None
         if selected_observation_uuid is not None:
-            for child in entry._children:
+            for child in entry.children():
                 if (
                     child.is_observation
                     and child.observation.uuid == selected_observation_uuid
@@ -834,15 +697,110 @@ class ImagedMomentTree(QWidget):
         self._refresh_moment_row(entry)
         if self._selected_moment is entry:
             self._refresh_concept_filter_options(entry)
-            self._populate_observations(entry)
+            self._patch_observation_rows(entry, changed_items)
             if self._selected_observation is not None:
-                self._populate_associations(self._selected_observation)
+                self._select_row_silently(
+                    self.observations_table,
+                    self.observations_model.row_of(self._selected_observation),
+                )
+                self._patch_association_rows(self._selected_observation)
                 self.clear_observation_button.setEnabled(True)
             else:
-                self.associations_table.setRowCount(0)
+                self._clear_observation_rows_selection()
+                self.associations_model.clear()
                 self.clear_observation_button.setEnabled(False)
             self._emit_annotation_focus_changed()
 
+    def _merge_observation_children(
+        self, entry: EntryTreeItem, meta: ImagedMomentEntry
+    ) -> List[EntryTreeItem]:
+        """Reuse observation items by UUID and return those whose rows changed."""
+        if not entry.has_loaded_children():
+            # Never opened: children are built lazily from the new payload.
+            return []
+
+        previous = {
+            child.observation.uuid: child
+            for child in entry.children()
+            if child.is_observation
+        }
+        children: List[EntryTreeItem] = []
+        changed: List[EntryTreeItem] = []
+        for obs in meta.observations:
+            item = previous.pop(obs.uuid, None)
+            if item is None:
+                item = EntryTreeItem(obs, parent=entry, tree=self)
+            else:
+                if _observation_row_changed(item.observation, obs):
+                    changed.append(item)
+                item.payload = obs
+            children.append(item)
+        entry.set_children(children)
+        return changed
+
+    def _patch_observation_rows(
+        self, moment_item: EntryTreeItem, changed_items: List[EntryTreeItem]
+    ):
+        self._observation_rows = [
+            child
+            for child in moment_item.children()
+            if child.is_observation
+            and (
+                self._active_concept_filter is None
+                or child.observation.concept == self._active_concept_filter
+            )
+        ]
+        selection_model = self.observations_table.selectionModel()
+        if selection_model is not None:
+            selection_model.blockSignals(True)
+        try:
+            self.observations_model.patch_rows(self._observation_rows)
+        finally:
+            if selection_model is not None:
+                selection_model.blockSignals(False)
+        for item in changed_items:
+            self.observations_model.refresh_payload(item)
+
+    def _patch_association_rows(self, obs_item: EntryTreeItem):
+        observation = obs_item.observation
+        selection_model = self.associations_table.selectionModel()
+        if selection_model is not None:
+            selection_model.blockSignals(True)
+        try:
+            self.associations_model.patch_rows(
+                [
+                    AssociationRow(assoc, observation.uuid)
+                    for assoc in observation.associations
+                ]
+            )
+        finally:
+            if selection_model is not None:
+                selection_model.blockSignals(False)
+
+    def _clear_observation_rows_selection(self):
+        selection_model = self.observations_table.selectionModel()
+        if selection_model is None:
+            return
+        selection_model.blockSignals(True)
+        try:
+            self.observations_table.clearSelection()
+            self.observations_table.clearCurrent()
+        finally:
+            selection_model.blockSignals(False)
+
+    def refresh_observation_item(self, obs_item: EntryTreeItem):
+        """Patch the rows for one locally edited observation and its moment."""
+        moment_item = obs_item.parent()
+        if moment_item is None or not obs_item.is_observation:
+            return
+        obs_item.observation.status = len(obs_item.observation.boxes)
+        self._refresh_moment_row(moment_item)
+        if self._selected_moment is not moment_item:
+            return
+        self.observations_model.refresh_payload(obs_item)
+        if self._selected_observation is obs_item:
+            self._patch_association_rows(obs_item)
+
     def load_imaged_moment_entry_async(
         self,
         entry: EntryTreeItem,
@@ -877,38 +835,75 @@ class ImagedMomentTree(QWidget):
             ),
             on_error=on_error,
             on_finished=on_finished,
+            lane=LANE_VISIBLE,
         )
 
-    def _refresh_moment_row(self, entry: EntryTreeItem):
-        for row in range(self.moments_table.rowCount()):
-            row_payload = self._row_payload(self.moments_table, row)
-            if row_payload is not entry:
-                continue
+    def reconcile_imaged_moment_entry_async(
+        self,
+        entry: EntryTreeItem,
+        matches: Callable[[ImagedMomentEntry], bool],
+        on_conflict=None,
+        on_error=None,
+    ):
+        """Fetch a moment and adopt the server copy only if local edits disagree.
 
-            moment = entry.imaged_moment
-            obs_count_cell = self.moments_table.item(row, 1)
-            if obs_count_cell is not None:
-                obs_count_cell.setText("{}".format(len(moment.observations)))
+        ``matches`` receives the freshly loaded moment and returns True when the
+        optimistic local state already reflects it, in which case nothing is
+        redrawn. Otherwise the server payload replaces the local one and
+        ``on_conflict`` is called.
+        """
+        uuid = _uuid_from_payload(entry.payload)
+        if not uuid:
+            return
 
-            recorded_cell = self.moments_table.item(row, 2)
-            if recorded_cell is not None:
-                recorded_cell.setText(
-                    self._format_recorded_timestamp(moment.recorded_timestamp)
-                )
-                recorded_cell.setTextAlignment(int(Qt.AlignmentFlag.AlignCenter))
+        def _on_result(meta: ImagedMomentEntry):
+            if matches(meta):
+                return
+            selected_observation_uuid = None
+            if (
+                self._selected_observation is not None
+                and self._selected_observation.parent() is entry
+            ):
+                selected_observation_uuid = self._selected_observation.observation.uuid
+            previous_payload = (
+                entry.payload if isinstance(entry.payload, ImagedMomentEntry) else None
+            )
+            self._apply_loaded_imaged_moment_entry(
+                entry,
+                _copy_payload_cache(meta, previous_payload),
+                selected_observation_uuid,
+            )
+            if on_conflict is not None:
+                on_conflict()
 
-            video_cell = self.moments_table.item(row, 3)
-            if video_cell is not None:
-                video_cell.setText(self._extract_video_sequence_name(moment))
-                video_cell.setTextAlignment(
-                    int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-                )
+        run_async(
+            self,
+            hydrate_imaged_moment_data,
+            self._m3,
+            uuid,
+            on_result=_on_result,
+            on_error=on_error,
+            lane=LANE_BACKGROUND,
+        )
 
-            status_text, tooltip, role = self._moment_status(moment)
-            self._set_status_cell(
-                self.moments_table, row, 4, status_text, tooltip, role
+    def add_observation_item(
+        self, moment_item: EntryTreeItem, observation: ObservationEntry
+    ) -> EntryTreeItem:
+        """Append a locally created observation to a moment and its table rows."""
+        moment_item.imaged_moment.observations.append(observation)
+        if moment_item.has_loaded_children():
+            moment_item.add_child(
+                EntryTreeItem(observation, parent=moment_item, tree=self)
             )
-            break
+        obs_item = moment_item.children()[-1]
+        self._refresh_moment_row(moment_item)
+        if self._selected_moment is moment_item:
+            self._refresh_concept_filter_options(moment_item)
+            self._patch_observation_rows(moment_item, [])
+        return obs_item
+
+    def _refresh_moment_row(self, entry: EntryTreeItem):
+        self.moments_model.refresh_payload(entry)
 
     def open_video_for_item(self, item: EntryTreeItem) -> None:
         if item.is_imaged_moment:
@@ -1009,9 +1004,7 @@ class ImagedMomentTree(QWidget):
             buttons=QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.Cancel,
         )
         if res == QMessageBox.StandardButton.Yes:
-            for observation_uuid in observation_uuids:
-                self._m3.delete_observation(observation_uuid)
-            cast(Any, root).display_panel.image_view.reload_moment()
+            self.delete_observation_items(observations_to_delete)
 
     def _handle_rename_shortcut(self):
         root = self.window()
@@ -1065,24 +1058,233 @@ class ImagedMomentTree(QWidget):
         if result != QDialog.DialogCode.Accepted or concept_to_set is None:
             return
 
-        # Resolve synonym / common name → primary concept name.
-        concept_to_set = self._m3.get_concept_name(concept_to_set)
+        def _confirm_rename(primary_concept: str):
+            confirmed = QMessageBox.warning(
+                self,
+                "Confirm Observation Bulk Rename",
+                f"Are you sure you want to rename the following observation(s) to {primary_concept}?\n\t"
+                + "\n\t".join(observation_uuids),
+                buttons=QMessageBox.StandardButton.Yes
+                | QMessageBox.StandardButton.Cancel,
+            )
+            if confirmed == QMessageBox.StandardButton.Yes:
+                self.rename_observation_items(
+                    observations_to_rename,
+                    primary_concept,
+                    cast(Any, root).observer,
+                )
 
-        confirmed = QMessageBox.warning(
+        # Resolve synonym / common name → primary concept name.
+        run_async(
             self,
-            "Confirm Observation Bulk Rename",
-            f"Are you sure you want to rename the following observation(s) to {concept_to_set}?\n\t"
-            + "\n\t".join(observation_uuids),
-            buttons=QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.Cancel,
+            self._m3.get_concept_name,
+            concept_to_set,
+            on_result=_confirm_rename,
+            on_error=lambda err: QMessageBox.warning(
+                self,
+                "Rename failed",
+                "Could not resolve the concept name.\n\n{}".format(err),
+            ),
         )
-        if confirmed == QMessageBox.StandardButton.Yes:
+
+    # --- Observation batch edits --------------------------------------------
+
+    def delete_observation_items(self, obs_items: List[EntryTreeItem]):
+        """Remove observations from the browser at once and delete them in the background.
+
+        The deletions run concurrently. If any fail, the affected moments are
+        reloaded from the server.
+        """
+        if not obs_items:
+            return
+        expected = {
+            item.observation.uuid: item.observation.concept for item in obs_items
+        }
+        moments = self._remove_observation_items(obs_items)
+        self._sync_image_view(moments)
+        self._run_observation_batch(
+            "delete_observation",
+            expected,
+            moments,
+            "delete",
+            lambda uuids: self._m3.delete_observations(uuids),
+        )
+
+    def rename_observation_items(
+        self, obs_items: List[EntryTreeItem], new_concept: str, observer: str
+    ):
+        """Show the new concept at once and rename the observations in the background."""
+        if not obs_items:
+            return
+        expected = {
+            item.observation.uuid: item.observation.concept for item in obs_items
+        }
+        moments = self._unique_moments(obs_items)
+        for item in obs_items:
+            item.observation.concept = new_concept
+        for moment_item in moments:
+            self._refresh_moment_row(moment_item)
+            if self._selected_moment is moment_item:
+                self._refresh_concept_filter_options(moment_item)
+                self._patch_observation_rows(
+                    moment_item,
+                    [item for item in obs_items if item.parent() is moment_item],
+                )
+        self._sync_image_view(moments)
+        self._run_observation_batch(
+            "rename_observation",
+            expected,
+            moments,
+            "rename",
+            lambda uuids: self._m3.rename_observations(uuids, new_concept, observer),
+            new_concept=new_concept,
+            observer=observer,
+        )
+
+    @staticmethod
+    def _unique_moments(obs_items: List[EntryTreeItem]) -> List[EntryTreeItem]:
+        moments: List[EntryTreeItem] = []
+        for item in obs_items:
+            parent = item.parent()
+            if parent is not None and not any(parent is m for m in moments):
+                moments.append(parent)
+        return moments
+
+    def _remove_observation_items(
+        self, obs_items: List[EntryTreeItem]
+    ) -> List[EntryTreeItem]:
+        """Drop observation rows locally and return the moments they belonged to."""
+        moments = self._unique_moments(obs_items)
+        removed = {id(item) for item in obs_items}
+        for moment_item in moments:
+            moment_item.set_children(
+                [child for child in moment_item.children() if id(child) not in removed]
+            )
+            update_imaged_moment_entry(moment_item)
+            self._refresh_moment_row(moment_item)
+            if self._selected_moment is moment_item:
+                self._refresh_concept_filter_options(moment_item)
+                self._patch_observation_rows(moment_item, [])
+        if (
+            self._selected_observation is not None
+            and id(self._selected_observation) in removed
+        ):
+            self.clear_observation_selection()
+        return moments
+
+    def _image_view(self) -> Any:
+        display_panel = getattr(self.window(), "display_panel", None)
+        return getattr(display_panel, "image_view", None)
+
+    def _sync_image_view(self, moments: List[EntryTreeItem]):
+        """Redraw the image view if it shows one of the edited moments."""
+        image_view = self._image_view()
+        if image_view is None or image_view.moment is None:
+            return
+        if any(image_view.moment is moment_item for moment_item in moments):
+            image_view.load_moment(image_view.moment, preserve_sam_state=True)
+
+    def _run_observation_batch(
+        self,
+        op: str,
+        expected: Dict[str, str],
+        moments: List[EntryTreeItem],
+        verb: str,
+        batch_call: Callable[[List[str]], List[Any]],
+        **kwargs,
+    ):
+        """Send one write per observation and report failures once, at the end.
+
+        Args:
+            op: Mutation queue operation for each observation.
+            expected: Observation UUID to the concept the edit was based on.
+            moments: Moments reloaded if any write fails.
+            verb: Action name for messages.
+            batch_call: Concurrent M3Service call used without a queue.
+            **kwargs: Extra arguments for each queued write.
+        """
+        observation_uuids = list(expected)
+
+        def _finish(errors: List[BaseException]):
+            if not errors:
+                return
+            for err in errors:
+                logger.error("Observation {} failed: {}", verb, err)
+            QMessageBox.warning(
+                self,
+                "Observation {} failed".format(verb),
+                "{} of {} observation(s) could not be {}d and were restored.\n\n{}".format(
+                    len(errors), len(observation_uuids), verb, errors[0]
+                ),
+            )
+            self._reload_moments(moments)
+
+        queue = self.mutation_queue if self._use_write_queue else None
+        if queue is not None:
+            remaining = len(observation_uuids)
+            errors: List[BaseException] = []
+
+            def _one_done(error: Optional[BaseException]):
+                nonlocal remaining
+                remaining -= 1
+                if error is not None:
+                    errors.append(error)
+                if remaining == 0:
+                    _finish(errors)
+
             for observation_uuid in observation_uuids:
-                self._m3.rename_observation(
-                    observation_uuid,
-                    concept_to_set,
-                    cast(Any, root).observer,
+                mutation = queue.submit(
+                    op,
+                    key=observation_uuid,
+                    expected=expected.get(observation_uuid),
+                    observation_uuid=observation_uuid,
+                    **kwargs,
                 )
-            cast(Any, root).display_panel.image_view.reload_moment()
+                mutation.future.add_done_callback(
+                    lambda future: self._write_relay.post(_one_done, future.exception())
+                )
+            return
+
+        run_async(
+            self,
+            batch_call,
+            observation_uuids,
+            on_result=lambda results: _finish(
+                [result for result in results if isinstance(result, Exception)]
+            ),
+            on_error=lambda err: _finish([err]),
+        )
+
+    def set_optimistic_updates(self, enabled: bool):
+        """Queue observation writes in the background instead of waiting for them."""
+        self.optimistic_updates = bool(enabled)
+
+    @property
+    def _use_write_queue(self) -> bool:
+        return self.mutation_queue is not None and self.optimistic_updates
+
+    def _reload_moments(self, moments: List[EntryTreeItem]):
+        image_view = self._image_view()
+        for moment_item in moments:
+            if image_view is not None and image_view.moment is moment_item:
+                image_view.reload_moment(preserve_sam_state=True)
+            else:
+                self.load_imaged_moment_entry_async(moment_item)
+
+
+def _association_signature(obs: ObservationEntry) -> tuple:
+    return tuple(
+        (assoc.uuid, assoc.link_name, assoc.to_concept, assoc.link_value)
+        for assoc in obs.associations
+    )
+
+
+def _observation_row_changed(old: ObservationEntry, new: ObservationEntry) -> bool:
+    return (
+        old.concept != new.concept
+        or old.observer != new.observer
+        or _association_signature(old) != _association_signature(new)
+    )
 
 
 def update_imaged_moment_entry(entry: EntryTreeItem):
@@ -1120,7 +1322,7 @@ def update_imaged_moment_entry(entry: EntryTreeItem):
     if tree is not None:
         tree._refresh_moment_row(entry)
         if tree._selected_moment is entry:
-            tree._populate_observations(entry)
+            tree._patch_observation_rows(entry, entry.children())
 
 
 def _copy_payload_cache(
@@ -1156,8 +1358,6 @@ def hydrate_imaged_moment_data(
             video_sequence_name = media.get("video_sequence_name")
             if isinstance(video_sequence_name, str) and video_sequence_name:
                 moment.video_sequence_name = video_sequence_name
-                if isinstance(moment.raw, dict):
-                    moment.raw["video_sequence_name"] = video_sequence_name
         except Exception as exc:
             logger.warning(
                 "Could not fetch media metadata for video reference {}: {}".format(
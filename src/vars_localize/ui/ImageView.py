@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
-from typing import Callable, List, Optional, Any, cast
+import json
+import time
+from typing import Callable, Dict, List, Optional, Any, Tuple, cast
 
 from PyQt6.QtCore import Qt, QPoint, QPointF, QRectF, QLineF, QTimer
 from PyQt6.QtGui import (
     QEnterEvent,
-    QImage,
     QResizeEvent,
     QMouseEvent,
     QWheelEvent,
@@ -35,14 +36,43 @@ from PyQt6.QtWidgets import (
 
 from vars_localize.ui.ConceptSearchbar import ConceptSearchbar
 from vars_localize.ui.EntryTree import EntryTreeItem
-from vars_localize.models import ImagedMomentEntry
+from vars_localize.models import (
+    AssociationEntry,
+    BoxEntry,
+    ImagedMomentEntry,
+    ObservationEntry,
+)
 from vars_localize.ui.BoundingBox import BoundingBoxItem, SourceBoundingBox
 from vars_localize.ui.PropertiesDialog import PropertiesDialog
 from vars_localize.ui.theme import PALETTE
 from vars_localize.services import M3Service
 from vars_localize.services.errors import ServiceError
-from vars_localize.util.logging import get_logger, debug_input_enabled
-from vars_localize.util.qt_async import run_async
+from vars_localize.services.sam_features import image_cache_key
+from vars_localize.services.mutations import (
+    Mutation,
+    MutationDependencyError,
+    MutationQueue,
+    ResultRef,
+)
+from vars_localize.util import tracing
+from vars_localize.util.boxes import as_box_array, filter_candidates
+from vars_localize.util.logging import (
+    PERF_KIND_DECODE,
+    PERF_KIND_SAM,
+    debug_input_enabled,
+    get_logger,
+    log_perf,
+    perf_timer,
+)
+from vars_localize.util.qt_async import (
+    LANE_BACKGROUND,
+    LANE_PREFETCH,
+    LANE_VISIBLE,
+    MainThreadRelay,
+    cancel_tasks,
+    run_async,
+)
+from vars_localize.util.images import RGBFrame, decode_rgb_frame, qimage_to_rgb_array
 from vars_localize.util.utils import center_window
 
 logger = get_logger("ImageView")
@@ -136,12 +166,25 @@ class _MinimapView(QGraphicsView):
 class ImageView(QGraphicsView):
     SAM_MIN_AREA = 100
     SAM_OVERLAP_IOU = 0.2
+    SAM_NMS_IOU = 0.0
+    SAM_PREFETCH_COUNT = 2
+    SAM_PREFETCH_RETRY_MS = 500
+    SAM_HOVER_DEBOUNCE_MS = 30
+
+    # Decoded RGB pixels of the displayed image (moment UUID, frame), kept so
+    # SAM can encode them without converting the pixmap back.
+    _image_frame: Optional[Tuple[str, RGBFrame]] = None
+    # Created on the first hover so the view does not own an idle timer.
+    _sam_hover_timer: Optional[QTimer] = None
 
     MIN_SCALE = 0.1
     MAX_SCALE = 20.0
     ZOOM_STEP = 1.15
     CLICK_DRAG_THRESHOLD = 4
 
+    # Write-behind queue for box edits; None writes synchronously.
+    mutation_queue: Optional[MutationQueue] = None
+
     def __init__(self, parent=None):
         super(ImageView, self).__init__(parent)
 
@@ -172,6 +215,13 @@ class ImageView(QGraphicsView):
         self.moment = None
         self.observation_map = None
         self.enabled_observations = None
+        self.optimistic_box_updates = True
+        self._write_relay = MainThreadRelay(self)
+        self._placeholder_refs: Dict[str, ResultRef] = {}
+        self._inflight_writes: Dict[str, int] = {}
+        self._box_reconcile_generation = 0
+        self._pending_box_writes: Dict[str, Dict[str, Optional[AssociationEntry]]] = {}
+        self._pending_box_generation: Dict[str, int] = {}
 
         self.pixmap_src = None
         self.pixmap_item: Optional[QGraphicsPixmapItem] = None
@@ -249,6 +299,7 @@ class ImageView(QGraphicsView):
         self._sam_last_error_message: Optional[str] = None
         self._sam_candidate_boxes: List[SourceBoundingBox] = []
         self._sam_candidate_index = 0
+        self._sam_selected_candidates: List[SourceBoundingBox] = []
         self._sam_candidate_observation_uuid = None
         self._sam_candidate_concept: Optional[str] = None
         self._sam_pending_concept: Optional[str] = None
@@ -256,6 +307,13 @@ class ImageView(QGraphicsView):
         self._sam_hover_box: Optional[SourceBoundingBox] = None
         self._sam_hover_inflight = False
         self._sam_last_hover_point = None
+        # (image point, time of the mouse move) not yet sent to SAM.
+        self._sam_hover_pending: Optional[Tuple[QPoint, float]] = None
+        self._sam_hover_coalesced = 0
+        self._sam_hover_debounce_ms = self.SAM_HOVER_DEBOUNCE_MS
+        self._sam_prefetch_count = self.SAM_PREFETCH_COUNT
+        self._sam_prefetch_busy = False
+        self._sam_prefetch_skipped: set = set()
         self._sam_candidate_ui_callback: Optional[Callable[[bool, int, int], None]] = (
             None
         )
@@ -264,6 +322,7 @@ class ImageView(QGraphicsView):
 
         self._sam_min_area = self.SAM_MIN_AREA
         self._sam_overlap_iou = self.SAM_OVERLAP_IOU
+        self._sam_nms_iou = self.SAM_NMS_IOU
         self._video_data_request_uuid = None
         self._active_annotation_concept: Optional[str] = None
 
@@ -280,9 +339,28 @@ class ImageView(QGraphicsView):
             )
             self._debug_heartbeat_timer.start()
 
-    def configure_sam_params(self, min_area: int, overlap_iou: float):
+    def configure_sam_params(
+        self, min_area: int, overlap_iou: float, nms_iou: float = 0.0
+    ):
         self._sam_min_area = max(1, int(min_area))
         self._sam_overlap_iou = max(0.0, min(1.0, float(overlap_iou)))
+        self._sam_nms_iou = max(0.0, min(1.0, float(nms_iou)))
+
+    def set_sam_prefetch_count(self, count: int):
+        """Pre-encode up to ``count`` images after the current one on the page."""
+        self._sam_prefetch_count = max(0, int(count))
+        if self._sam_prefetch_count == 0:
+            cancel_tasks(self, "sam-prefetch")
+
+    def set_sam_hover_debounce_ms(self, delay_ms: int):
+        """Wait until the pointer rests this long before a point query (0 = none)."""
+        self._sam_hover_debounce_ms = max(0, int(delay_ms))
+
+    def _drop_pending_sam_hover(self):
+        self._sam_hover_pending = None
+        self._sam_hover_coalesced = 0
+        if self._sam_hover_timer is not None:
+            self._sam_hover_timer.stop()
 
     def _log_input_debug(self, context: str, event: Optional[QMouseEvent] = None):
         """Log a full snapshot of Qt-level and internal mouse/interaction
@@ -489,20 +567,33 @@ class ImageView(QGraphicsView):
         return box.observation_uuid == self.observation_uuid
 
     @staticmethod
-    def _bytes_to_pixmap(image_bytes: bytes) -> Optional[QPixmap]:
+    def _bytes_to_frame(image_bytes: bytes) -> Optional[RGBFrame]:
         if not image_bytes:
             return None
-        pixmap = QPixmap()
-        if not pixmap.loadFromData(image_bytes):
-            return None
-        return pixmap
+        with (
+            tracing.span("decode image", "decode", bytes=len(image_bytes)),
+            perf_timer(
+                PERF_KIND_DECODE, "decode image", bytes=len(image_bytes)
+            ) as perf_fields,
+        ):
+            frame = decode_rgb_frame(image_bytes)
+            if frame is None:
+                return None
+            perf_fields.update(width=frame.image.width(), height=frame.image.height())
+        return frame
+
+    def _fetch_frame(self, image_url: str) -> Optional[RGBFrame]:
+        """Fetch and decode an image off the UI thread."""
+        return self._bytes_to_frame(self._m3_fetch_image(image_url))
 
     @staticmethod
     def _as_source_box(raw_box: Any, concept: str) -> SourceBoundingBox:
         if isinstance(raw_box, SourceBoundingBox):
             return raw_box
 
-        box_dict = dict(raw_box or {})
+        box_dict = (
+            raw_box.to_dict() if isinstance(raw_box, BoxEntry) else dict(raw_box or {})
+        )
         box_json = {
             "x": int(box_dict.get("x", 0)),
             "y": int(box_dict.get("y", 0)),
@@ -555,6 +646,7 @@ class ImageView(QGraphicsView):
             moment.video_reference_uuid,
             on_result=_on_result,
             on_error=_on_error,
+            supersede_key="video-data",
         )
 
     def set_sam_status_ui_callback(self, callback: Callable[[str], None]):
@@ -621,6 +713,11 @@ class ImageView(QGraphicsView):
         self._notify_sam_status(self._build_sam_status())
         self.redraw()
 
+    def set_sam_service(self, service) -> None:
+        """Switch to ``service``; the current image is encoded again by it."""
+        self.sam3_service = service
+        self._clear_sam_state()
+
     def set_sam_prompt_modes(self, semantic_enabled: bool, point_enabled: bool):
         self._sam_semantic_enabled = bool(semantic_enabled)
         self._sam_point_enabled = bool(point_enabled)
@@ -635,6 +732,7 @@ class ImageView(QGraphicsView):
             self._sam_hover_box = None
             self._sam_hover_inflight = False
             self._sam_last_hover_point = None
+            self._drop_pending_sam_hover()
 
         self._notify_sam_candidate_state()
         self._notify_sam_status(self._build_sam_status())
@@ -653,6 +751,7 @@ class ImageView(QGraphicsView):
     def _clear_sam_state(self, reset_embedding: bool = True):
         self._sam_candidate_boxes = []
         self._sam_candidate_index = 0
+        self._sam_selected_candidates = []
         self._sam_candidate_observation_uuid = None
         self._sam_candidate_concept = None
         self._sam_pending_concept = None
@@ -660,7 +759,10 @@ class ImageView(QGraphicsView):
         self._sam_hover_box = None
         self._sam_hover_inflight = False
         self._sam_last_hover_point = None
+        self._drop_pending_sam_hover()
+        cancel_tasks(self, "sam-query")
         if reset_embedding:
+            cancel_tasks(self, "sam-embedding")
             self._sam_ready_image_uuid = None
             self._sam_embedding_request_uuid = None
             self._sam_failed_image_uuid = None
@@ -681,7 +783,7 @@ class ImageView(QGraphicsView):
             return
         try:
             had_selected_observation = bool(self.observation_uuid)
-            self.handle_new_box(
+            response_json = self.handle_new_box(
                 candidate,
                 refresh=False,
                 preserve_sam_state=True,
@@ -692,7 +794,10 @@ class ImageView(QGraphicsView):
                     concept_filter=self._active_annotation_concept,
                     observation_uuid=None,
                 )
-            self.reload_moment(preserve_sam_state=True)
+            if not self._use_write_queue:
+                self._commit_box_write(
+                    candidate, response_json, preserve_sam_state=True
+                )
         except Exception as exc:
             logger.exception("accept_sam_candidate failed: {}", exc)
             QMessageBox.warning(self, "Box creation failed", str(exc))
@@ -704,6 +809,129 @@ class ImageView(QGraphicsView):
         self._drop_current_candidate()
         self.redraw()
 
+    def _selected_sam_candidates(self) -> List[SourceBoundingBox]:
+        # Selections from an earlier candidate list no longer apply.
+        return [
+            box
+            for box in self._sam_selected_candidates
+            if any(box is candidate for candidate in self._sam_candidate_boxes)
+        ]
+
+    def sam_candidate_selection(self) -> Tuple[int, bool]:
+        """Return the number of selected candidates and whether the current one is."""
+        selected = self._selected_sam_candidates()
+        current = self._current_sam_candidate
+        return len(selected), any(box is current for box in selected)
+
+    def toggle_sam_candidate_selected(self):
+        """Mark or unmark the current candidate for `accept_selected_sam_candidates`."""
+        current = self._current_sam_candidate
+        if current is None:
+            return
+        selected = self._selected_sam_candidates()
+        if any(box is current for box in selected):
+            selected = [box for box in selected if box is not current]
+        else:
+            selected.append(current)
+        self._sam_selected_candidates = selected
+        self._notify_sam_candidate_state()
+
+    def accept_all_sam_candidates(self):
+        self._accept_sam_candidates(list(self._sam_candidate_boxes))
+
+    def accept_selected_sam_candidates(self):
+        self._accept_sam_candidates(self._selected_sam_candidates())
+
+    def _accept_sam_candidates(self, candidates: List[SourceBoundingBox]):
+        """Create one new observation with a box for each candidate.
+
+        The writes go out together, through the mutation queue or as one
+        concurrent batch, and the moment is refreshed once afterwards.
+        """
+        if not candidates or self.moment is None:
+            return
+        concept = (
+            self._sam_candidate_concept
+            or self._active_annotation_concept
+            or self.prompt_concept()
+        )
+        if not concept:
+            return
+
+        self._sam_candidate_boxes = [
+            box
+            for box in self._sam_candidate_boxes
+            if not any(box is accepted for accepted in candidates)
+        ]
+        self._sam_selected_candidates = []
+        self._sam_candidate_index = min(
+            self._sam_candidate_index, max(0, len(self._sam_candidate_boxes) - 1)
+        )
+        self._notify_sam_candidate_state()
+        for candidate in candidates:
+            candidate.set_label(concept)
+
+        try:
+            if self._use_write_queue:
+                for candidate in candidates:
+                    candidate.observation_uuid = self._queue_new_observation(
+                        concept, ordered=False
+                    )
+                    self._queue_box_create(candidate)
+            else:
+                self._create_boxed_observations_now(concept, candidates)
+        except Exception as exc:
+            logger.exception("Accepting SAM candidates failed: {}", exc)
+            QMessageBox.warning(self, "Box creation failed", str(exc))
+        self.redraw()
+
+    def _create_boxed_observations_now(
+        self, concept: str, candidates: List[SourceBoundingBox]
+    ):
+        target_entry = self.moment
+        moment = target_entry.imaged_moment
+        total = len(candidates)
+        self._notify_sam_status("Saving {} box(es)...".format(total))
+
+        def _on_result(results):
+            errors = [result for result in results if isinstance(result, Exception)]
+            tree = target_entry.treeWidget()
+            if tree is not None:
+                tree.editable_uuids.update(
+                    result["observation_uuid"]
+                    for result in results
+                    if not isinstance(result, Exception)
+                )
+            self._reload_entry(target_entry)
+            self._notify_sam_status(self._build_sam_status())
+            if errors:
+                QMessageBox.warning(
+                    self,
+                    "Box creation failed",
+                    "{} of {} boxes could not be saved.\n\n{}".format(
+                        len(errors), total, errors[0]
+                    ),
+                )
+
+        def _on_error(err):
+            logger.error("Batch box creation failed: {}", err)
+            self._reload_entry(target_entry)
+            self._notify_sam_status(self._build_sam_status())
+            QMessageBox.warning(self, "Box creation failed", str(err))
+
+        run_async(
+            self,
+            self._require_m3_service().create_boxed_observations,
+            moment.video_reference_uuid,
+            concept,
+            self.observer,
+            [candidate.get_json() for candidate in candidates],
+            on_result=_on_result,
+            on_error=_on_error,
+            lane=LANE_BACKGROUND,
+            **self._observation_time_kwargs(moment),
+        )
+
     def _drop_current_candidate(self):
         if not self._sam_candidate_boxes:
             return
@@ -714,16 +942,11 @@ class ImageView(QGraphicsView):
         self._notify_sam_candidate_state()
 
     def _pixmap_to_rgb_ndarray(self, pixmap: QPixmap):
-        import numpy as np
-
-        image = pixmap.toImage().convertToFormat(QImage.Format.Format_RGB888)
-        width = image.width()
-        height = image.height()
-        ptr = image.bits()
-        ptr.setsize(image.sizeInBytes())
-        arr = np.frombuffer(ptr, np.uint8).reshape((height, image.bytesPerLine()))
-        arr = arr[:, : width * 3].reshape((height, width, 3)).copy()
-        return arr
+        with (
+            tracing.span("pixmap to RGB array", "decode"),
+            perf_timer(PERF_KIND_DECODE, "pixmap to RGB array"),
+        ):
+            return qimage_to_rgb_array(pixmap.toImage())
 
     def _sam_query_text(self, concept: str):
         if self.sam3_service is None:
@@ -759,11 +982,28 @@ class ImageView(QGraphicsView):
         self._sam_embedding_request_uuid = moment_uuid
         self._notify_sam_status("SAM loading image embedding...")
 
+        moment = self.moment.imaged_moment
+        pixmap = self.pixmap_src
+        image_frame = self._image_frame
+        frame = (
+            image_frame[1]
+            if image_frame is not None and image_frame[0] == moment_uuid
+            else None
+        )
+
         def _embed():
             if self._sam_embedding_request_uuid != moment_uuid:
                 return None
-            image_rgb = self._pixmap_to_rgb_ndarray(self.pixmap_src)
-            self.sam3_service.set_image(image_rgb, image_key=moment_uuid)
+            image_key = image_cache_key(moment)
+            # Features cached for this image skip the encoder and the
+            # pixmap conversion entirely.
+            if self.sam3_service.restore_image(image_key):
+                return moment_uuid
+            if frame is not None:
+                image_rgb = frame.array
+            else:
+                image_rgb = self._pixmap_to_rgb_ndarray(pixmap)
+            self.sam3_service.set_image(image_rgb, image_key=image_key)
             return moment_uuid
 
         def _on_result(embedded_uuid: Optional[str]):
@@ -817,6 +1057,8 @@ class ImageView(QGraphicsView):
                 and self._sam_failed_image_uuid != current_uuid
             ):
                 self._maybe_start_sam_embedding()
+            else:
+                self._maybe_start_sam_prefetch()
 
         run_async(
             self,
@@ -824,6 +1066,91 @@ class ImageView(QGraphicsView):
             on_result=_on_result,
             on_error=_on_error,
             on_finished=_on_finished,
+            lane=LANE_VISIBLE,
+            supersede_key="sam-embedding",
+        )
+
+    def _next_sam_prefetch_moment(self) -> Optional[ImagedMomentEntry]:
+        if self.moment is None or self._sam_prefetch_count <= 0:
+            return None
+        tree = self.moment.treeWidget()
+        if tree is None:
+            return None
+        for item in tree.upcoming_moments(self.moment, self._sam_prefetch_count):
+            moment = item.imaged_moment
+            if moment.cached_image is None and not moment.image_url:
+                continue
+            image_key = image_cache_key(moment)
+            if image_key in self._sam_prefetch_skipped:
+                continue
+            if not self.sam3_service.has_cached_features(image_key):
+                return moment
+        return None
+
+    def _maybe_start_sam_prefetch(self):
+        """Encode the next upcoming image on the prefetch lane, one at a time.
+
+        Runs only while the current image is ready and no embedding is in
+        flight; the service skips the encode when an interactive call is
+        waiting, and the image is retried shortly after.
+        """
+        if not self._sam_assist_enabled or self.moment is None:
+            return
+        if self._sam_ready_image_uuid != self.moment.imaged_moment.uuid:
+            return
+        if self._sam_prefetch_busy or self._sam_embedding_busy:
+            return
+        if self.sam3_service is None or not self.sam3_service.available:
+            return
+        moment = self._next_sam_prefetch_moment()
+        if moment is None:
+            return
+
+        image_key = image_cache_key(moment)
+        pixmap = moment.cached_image
+        image_url = moment.image_url
+        self._sam_prefetch_busy = True
+
+        def _prefetch():
+            frame = None
+            if pixmap is not None:
+                image_rgb = self._pixmap_to_rgb_ndarray(pixmap)
+            else:
+                frame = self._fetch_frame(image_url)
+                if frame is None:
+                    raise ValueError("Could not decode {}".format(image_url))
+                image_rgb = frame.array
+            return frame, self.sam3_service.encode_to_cache(image_rgb, image_key)
+
+        retry = {"delay_ms": 0}
+
+        def _on_result(result):
+            frame, encoded = result
+            if frame is not None and moment.cached_image is None:
+                # Keep the pixels so the frame shows at once when selected.
+                moment.cached_image = QPixmap.fromImage(frame.image)
+            if not encoded:
+                retry["delay_ms"] = self.SAM_PREFETCH_RETRY_MS
+
+        def _on_error(err):
+            self._sam_prefetch_skipped.add(image_key)
+            logger.warning("SAM pre-encoding failed for {}: {}", image_key, err)
+
+        def _on_finished():
+            self._sam_prefetch_busy = False
+            if retry["delay_ms"]:
+                QTimer.singleShot(retry["delay_ms"], self._maybe_start_sam_prefetch)
+            else:
+                self._maybe_start_sam_prefetch()
+
+        run_async(
+            self,
+            _prefetch,
+            on_result=_on_result,
+            on_error=_on_error,
+            on_finished=_on_finished,
+            lane=LANE_PREFETCH,
+            supersede_key="sam-prefetch",
         )
 
     def _start_sam_candidates_for_concept(self, concept: str):
@@ -886,6 +1213,7 @@ class ImageView(QGraphicsView):
             concept,
             on_result=_on_result,
             on_error=_on_error,
+            supersede_key="sam-query",
         )
 
     def _sam_query_boxes(self, boxes_xyxy):
@@ -998,6 +1326,7 @@ class ImageView(QGraphicsView):
             boxes_xyxy,
             on_result=_on_result,
             on_error=_on_error,
+            supersede_key="sam-query",
         )
 
     def _make_candidate_boxes(
@@ -1007,28 +1336,41 @@ class ImageView(QGraphicsView):
         concept: str,
         apply_overlap_filter: bool = True,
     ):
+        """Turn SAM boxes into candidates, filtered once for the whole query."""
+        box_array = as_box_array(
+            (int(x), int(y), int(w), int(h)) for x, y, w, h in boxes or []
+        )
+        existing = as_box_array(
+            (box.x(), box.y(), box.width(), box.height())
+            for box in (self._all_existing_boxes() if apply_overlap_filter else [])
+        )
+        keep = filter_candidates(
+            box_array,
+            self._sam_min_area,
+            existing,
+            self._sam_overlap_iou,
+            self._sam_nms_iou,
+        )
+
+        image_reference_uuid = self.moment.imaged_moment.image_reference_uuid
         candidates: List[SourceBoundingBox] = []
-        for box in boxes or []:
-            x, y, w, h = box
+        for x, y, w, h in box_array[keep].astype(int).tolist():
             box_json = {
-                "x": int(x),
-                "y": int(y),
-                "width": int(w),
-                "height": int(h),
-                "image_reference_uuid": self.moment.imaged_moment.image_reference_uuid,
+                "x": x,
+                "y": y,
+                "width": w,
+                "height": h,
+                "image_reference_uuid": image_reference_uuid,
             }
-            candidate = SourceBoundingBox(
-                box_json,
-                concept,
-                observer=self.observer,
-                observation_uuid=observation_uuid or "",
-                part="self",
+            candidates.append(
+                SourceBoundingBox(
+                    box_json,
+                    concept,
+                    observer=self.observer,
+                    observation_uuid=observation_uuid or "",
+                    part="self",
+                )
             )
-            if candidate.width() * candidate.height() <= self._sam_min_area:
-                continue
-            if apply_overlap_filter and self._overlaps_existing(candidate):
-                continue
-            candidates.append(candidate)
         return candidates
 
     def _filter_point_prompt_boxes(self, boxes):
@@ -1057,39 +1399,6 @@ class ImageView(QGraphicsView):
             boxes.extend(list(obs.video_boxes))
         return boxes
 
-    def _iou(self, a: SourceBoundingBox, b: SourceBoundingBox) -> float:
-        ax1 = a.x()
-        ay1 = a.y()
-        ax2 = ax1 + a.width()
-        ay2 = ay1 + a.height()
-
-        bx1 = b.x()
-        by1 = b.y()
-        bx2 = bx1 + b.width()
-        by2 = by1 + b.height()
-
-        ix1 = max(ax1, bx1)
-        iy1 = max(ay1, by1)
-        ix2 = min(ax2, bx2)
-        iy2 = min(ay2, by2)
-
-        iw = max(0, ix2 - ix1)
-        ih = max(0, iy2 - iy1)
-        inter = iw * ih
-        if inter <= 0:
-            return 0.0
-
-        union = a.width() * a.height() + b.width() * b.height() - inter
-        if union <= 0:
-            return 0.0
-        return float(inter) / float(union)
-
-    def _overlaps_existing(self, candidate: SourceBoundingBox) -> bool:
-        for existing in self._all_existing_boxes():
-            if self._iou(candidate, existing) >= self._sam_overlap_iou:
-                return True
-        return False
-
     def _maybe_update_hover_candidate(self, event: QMouseEvent):
         if not self._sam_assist_enabled:
             return
@@ -1120,21 +1429,46 @@ class ImageView(QGraphicsView):
         ):
             return
 
-        if self._sam_last_hover_point is not None:
-            dx = abs(pt.x() - self._sam_last_hover_point.x())
-            dy = abs(pt.y() - self._sam_last_hover_point.y())
-            if dx < 6 and dy < 6:
-                return
+        if self._sam_hover_pending is None and pt == self._sam_last_hover_point:
+            return
+        if self._sam_hover_pending is not None:
+            self._sam_hover_coalesced += 1
+        # Latest wins: a newer point replaces any that has not been sent yet.
+        self._sam_hover_pending = (pt, time.perf_counter())
+        if self._sam_hover_debounce_ms <= 0:
+            self._dispatch_sam_hover_query()
+            return
+        if self._sam_hover_timer is None:
+            self._sam_hover_timer = QTimer(self)
+            self._sam_hover_timer.setSingleShot(True)
+            self._sam_hover_timer.timeout.connect(self._dispatch_sam_hover_query)
+        self._sam_hover_timer.start(self._sam_hover_debounce_ms)
+
+    def _dispatch_sam_hover_query(self):
+        """Send the pending hover point, unless a query is still running.
 
-        if self._sam_hover_inflight:
+        A running query dispatches the pending point when it finishes.
+        """
+        if self._sam_hover_inflight or self._sam_hover_pending is None:
+            return
+        if self.moment is None or not self._sam_assist_enabled:
+            self._sam_hover_pending = None
+            return
+        if self._sam_ready_image_uuid != self.moment.imaged_moment.uuid:
+            self._sam_hover_pending = None
             return
 
+        pt, moved_at = self._sam_hover_pending
+        coalesced = self._sam_hover_coalesced
+        self._sam_hover_pending = None
+        self._sam_hover_coalesced = 0
         self._sam_last_hover_point = pt
         self._sam_hover_inflight = True
+        dispatched_at = time.perf_counter()
         self._notify_sam_status("SAM point prompt query...")
         if debug_input_enabled():
             logger.debug(
-                "[input-debug] _maybe_update_hover_candidate: dispatching "
+                "[input-debug] _dispatch_sam_hover_query: dispatching "
                 "query_point({}, {}), inflight=True",
                 pt.x(),
                 pt.y(),
@@ -1157,6 +1491,7 @@ class ImageView(QGraphicsView):
             boxes = self._filter_point_prompt_boxes(boxes)
             if not boxes:
                 self.redraw()
+                self._log_sam_hover_latency(moved_at, dispatched_at, coalesced)
                 return
 
             observation_uuid = self.observation_uuid
@@ -1183,6 +1518,7 @@ class ImageView(QGraphicsView):
                     )
                 )
             self.redraw()
+            self._log_sam_hover_latency(moved_at, dispatched_at, coalesced)
 
         def _on_error(err):
             logger.error("SAM point prompt query failed: {}", err)
@@ -1200,6 +1536,9 @@ class ImageView(QGraphicsView):
                         self._semantic_capability_text(), self._point_capability_text()
                     )
                 )
+            timer = self._sam_hover_timer
+            if timer is None or not timer.isActive():
+                self._dispatch_sam_hover_query()
 
         run_async(
             self,
@@ -1209,6 +1548,22 @@ class ImageView(QGraphicsView):
             on_result=_on_result,
             on_error=_on_error,
             on_finished=_on_finished,
+            supersede_key="sam-point",
+        )
+
+    @staticmethod
+    def _log_sam_hover_latency(
+        moved_at: float, dispatched_at: float, coalesced: int
+    ) -> None:
+        """Record the time from the mouse move to its suggestion being shown."""
+        now = time.perf_counter()
+        log_perf(
+            PERF_KIND_SAM,
+            "hover latency",
+            (now - moved_at) * 1000.0,
+            wait_ms=round((dispatched_at - moved_at) * 1000.0, 3),
+            query_ms=round((now - dispatched_at) * 1000.0, 3),
+            coalesced=coalesced,
         )
 
     # --- Rendering ---------------------------------------------------------
@@ -1257,14 +1612,19 @@ class ImageView(QGraphicsView):
             )
 
         self.moment = entry
+        if current_uuid != next_uuid:
+            cancel_tasks(self, "image")
         if not preserve_same_image:
             self._clear_sam_state(reset_embedding=True)
         else:
             self._sam_hover_box = None
             self._sam_hover_inflight = False
             self._sam_last_hover_point = None
+            self._drop_pending_sam_hover()
 
         moment: ImagedMomentEntry = entry.imaged_moment
+        if self._image_frame is not None and self._image_frame[0] != moment.uuid:
+            self._image_frame = None
         if moment.cached_image is not None:
             self._image_loading = False
             self._image_loading_uuid = None
@@ -1280,11 +1640,15 @@ class ImageView(QGraphicsView):
 
             request_uuid = moment.uuid
 
-            def _on_result(pixmap):
+            def _on_result(frame: Optional[RGBFrame]):
                 current_moment = self.moment.imaged_moment if self.moment else None
                 if current_moment is None or current_moment.uuid != request_uuid:
                     return
 
+                pixmap = None
+                if frame is not None:
+                    pixmap = QPixmap.fromImage(frame.image)
+                    self._image_frame = (request_uuid, frame)
                 current_moment.cached_image = pixmap
                 self._image_loading = False
                 self._image_loading_uuid = None
@@ -1311,12 +1675,11 @@ class ImageView(QGraphicsView):
 
             run_async(
                 self,
-                self._m3_fetch_image,
+                self._fetch_frame,
                 moment.image_url,
-                on_result=lambda image_bytes: _on_result(
-                    self._bytes_to_pixmap(image_bytes)
-                ),
+                on_result=_on_result,
                 on_error=_on_error,
+                supersede_key="image",
             )
         else:
             self._image_loading = False
@@ -1851,24 +2214,10 @@ class ImageView(QGraphicsView):
         part_after = box.part or "self"
         if box_json_after != box_json_before or part_after != part_before:
             box.observer = self.observer  # Update observer field
-            try:
-                self._m3_modify_box(
-                    box_json_after,
-                    box.observation_uuid,
-                    box.association_uuid,
-                    to_concept=part_after,
-                )
-            except ServiceError as exc:
-                logger.exception(
-                    "show_box_properties_dialog: modify_box failed: {}", exc
-                )
-                QMessageBox.warning(
-                    self,
-                    "Update failed",
-                    "Could not update bounding box.\n\n{}".format(exc),
-                )
+            if self._use_write_queue:
+                self._queue_box_modify(box)
             else:
-                self.reload_moment()
+                self._modify_box_now(box, part_after)
 
         self.pt_1 = None
         self.pt_2 = None
@@ -1877,10 +2226,31 @@ class ImageView(QGraphicsView):
         self._clear_scene_selection()
         self.redraw()
 
+    def _modify_box_now(self, box: SourceBoundingBox, part: str):
+        try:
+            response_json = self._m3_modify_box(
+                box.get_json(),
+                box.observation_uuid,
+                box.association_uuid,
+                to_concept=part,
+            )
+        except ServiceError as exc:
+            logger.exception("show_box_properties_dialog: modify_box failed: {}", exc)
+            QMessageBox.warning(
+                self,
+                "Update failed",
+                "Could not update bounding box.\n\n{}".format(exc),
+            )
+        else:
+            self._commit_box_write(box, response_json)
+
     def _on_box_geometry_committed(self, box_item: BoundingBoxItem):
         box = box_item.source
+        if self._use_write_queue:
+            self._queue_box_modify(box)
+            return
         try:
-            self._m3_modify_box(
+            response_json = self._m3_modify_box(
                 box.get_json(),
                 box.observation_uuid,
                 box.association_uuid,
@@ -1894,7 +2264,7 @@ class ImageView(QGraphicsView):
                 "Could not persist box change.\n\n{}".format(exc),
             )
         else:
-            self.reload_moment()
+            self._commit_box_write(box, response_json)
 
     def _on_box_resize_started(self):
         self.resize_type = True
@@ -1947,9 +2317,14 @@ class ImageView(QGraphicsView):
         if not self.observation_map or box.observation_uuid not in self.observation_map:
             raise RuntimeError("Could not resolve the target observation for this box.")
 
-        observation = self.observation_map[box.observation_uuid].observation
+        observation_entry = self.observation_map[box.observation_uuid]
+        observation = observation_entry.observation
         is_last_box = self._count_bounding_box_associations(observation) <= 1
 
+        if self._use_write_queue:
+            self._queue_box_delete(box, observation_entry, is_last_box)
+            return
+
         try:
             self._m3_delete_box(box.association_uuid)  # Call deletion request
         except ServiceError as exc:
@@ -1972,6 +2347,7 @@ class ImageView(QGraphicsView):
                 if getattr(assoc, "uuid", "") != box.association_uuid
             ]
 
+        observation_deleted = False
         if is_last_box and self._is_observation_owned(observation.uuid):
             choice = QMessageBox.question(
                 self,
@@ -1983,6 +2359,7 @@ class ImageView(QGraphicsView):
             if choice == QMessageBox.StandardButton.Yes:
                 try:
                     self._m3_delete_observation(observation.uuid)
+                    observation_deleted = True
                 except ServiceError as exc:
                     logger.exception("delete_box: delete_observation failed: {}", exc)
                     QMessageBox.warning(
@@ -1993,7 +2370,12 @@ class ImageView(QGraphicsView):
                         ),
                     )
 
-        self.reload_moment()
+        if observation_deleted or not self.optimistic_box_updates:
+            self.reload_moment()
+            return
+        self._refresh_observation_item(observation_entry)
+        self._reconcile_box_writes({box.association_uuid: None})
+        self.redraw()
 
     def calc_drag_rect(self):
         """Compute the drag-selection rectangle.
@@ -2137,14 +2519,8 @@ class ImageView(QGraphicsView):
         Returns:
             dict | None: Observation response JSON, if creation succeeds.
         """
-        kwargs = dict()
         moment = self.moment.imaged_moment
-        if moment.timecode:
-            kwargs["timecode"] = moment.timecode
-        if moment.elapsed_time_millis is not None:
-            kwargs["elapsed_time_millis"] = moment.elapsed_time_millis
-        if moment.recorded_timestamp:
-            kwargs["recorded_timestamp"] = moment.recorded_timestamp
+        kwargs = self._observation_time_kwargs(moment)
 
         try:
             observation = (
@@ -2173,6 +2549,17 @@ class ImageView(QGraphicsView):
         self.moment.treeWidget().editable_uuids.add(observation["observation_uuid"])
         return observation
 
+    @staticmethod
+    def _observation_time_kwargs(moment: ImagedMomentEntry) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = dict()
+        if moment.timecode:
+            kwargs["timecode"] = moment.timecode
+        if moment.elapsed_time_millis is not None:
+            kwargs["elapsed_time_millis"] = moment.elapsed_time_millis
+        if moment.recorded_timestamp:
+            kwargs["recorded_timestamp"] = moment.recorded_timestamp
+        return kwargs
+
     def reload_moment(self, preserve_sam_state: bool = False):
         """Fully reload the current imaged moment entry."""
         if debug_input_enabled():
@@ -2223,11 +2610,15 @@ class ImageView(QGraphicsView):
         box: SourceBoundingBox,
         refresh: bool = True,
         preserve_sam_state: bool = False,
-    ) -> None:
+    ) -> Optional[Dict[str, Any]]:
         """Create a new box, creating an observation if needed.
 
         Args:
             box: Source bounding box.
+
+        Returns:
+            dict | None: The created association as returned by the server, or
+            None when the write was queued.
         """
         if debug_input_enabled():
             logger.debug(
@@ -2242,13 +2633,16 @@ class ImageView(QGraphicsView):
             new_concept = self._active_annotation_concept or self.prompt_concept()
             if not new_concept:  # No concept was specified
                 raise ValueError("Concept is required to create a new observation.")
-            observation = self.make_new_observation(new_concept)
-            if not observation or "observation_uuid" not in observation:
-                raise RuntimeError(
-                    "Could not create an observation for the selected concept."
-                )
+            if self._use_write_queue:
+                uuid = self._queue_new_observation(new_concept)
+            else:
+                observation = self.make_new_observation(new_concept)
+                if not observation or "observation_uuid" not in observation:
+                    raise RuntimeError(
+                        "Could not create an observation for the selected concept."
+                    )
+                uuid = observation["observation_uuid"]
             box.set_label(new_concept)
-            uuid = observation["observation_uuid"]
             created_new_observation = True
 
         box.observation_uuid = uuid
@@ -2268,6 +2662,12 @@ class ImageView(QGraphicsView):
                 "Delete or update the existing box instead of creating another."
             )
 
+        if self._use_write_queue:
+            self._queue_box_create(box)
+            if refresh:
+                self.redraw()
+            return None
+
         response_json = self._m3_create_box(box.get_json(), uuid, to_concept=box.part)
         if not response_json or "uuid" not in response_json:
             raise RuntimeError(
@@ -2284,8 +2684,446 @@ class ImageView(QGraphicsView):
                 refresh,
             )
         if refresh:
+            self._commit_box_write(
+                box, response_json, preserve_sam_state=preserve_sam_state
+            )
+        return response_json
+
+    # --- Optimistic box writes ---------------------------------------------
+
+    def set_optimistic_box_updates(self, enabled: bool):
+        """Apply box writes locally instead of reloading the moment after each one."""
+        self.optimistic_box_updates = bool(enabled)
+
+    @staticmethod
+    def _association_from_box_write(
+        box: SourceBoundingBox, response_json: Optional[Dict[str, Any]]
+    ) -> AssociationEntry:
+        data = dict(response_json) if isinstance(response_json, dict) else {}
+        data.setdefault("uuid", box.association_uuid)
+        data.setdefault("link_name", "bounding box")
+        data.setdefault("to_concept", box.part or "self")
+        data.setdefault("link_value", json.dumps(box.get_json()))
+        data.setdefault("mime_type", "application/json")
+        return AssociationEntry.from_dict(data)
+
+    def _commit_box_write(
+        self,
+        box: SourceBoundingBox,
+        response_json: Optional[Dict[str, Any]] = None,
+        preserve_sam_state: bool = False,
+    ):
+        """Show a persisted box write, locally when possible, else by reloading."""
+        if self._apply_box_write_locally(box, response_json):
+            self.redraw()
+        else:
             self.reload_moment(preserve_sam_state=preserve_sam_state)
 
+    def _apply_box_write_locally(
+        self,
+        box: SourceBoundingBox,
+        response_json: Optional[Dict[str, Any]],
+        reconcile: bool = True,
+    ) -> bool:
+        """Mirror a created or modified box into the loaded observation.
+
+        Returns False when the write cannot be applied in memory and the
+        caller should reload the moment instead.
+        """
+        if not getattr(box, "association_uuid", None):
+            return False
+        if not self.optimistic_box_updates or self.moment is None:
+            return False
+
+        obs_item = (self.observation_map or {}).get(box.observation_uuid)
+        if obs_item is None:
+            obs_item = self._insert_local_observation(box)
+            if obs_item is None:
+                return False
+
+        observation = obs_item.observation
+        association = self._association_from_box_write(box, response_json)
+        observation.upsert_association(association)
+        if not any(
+            existing is box
+            for existing in list(observation.boxes) + list(observation.video_boxes)
+        ):
+            observation.boxes.append(box)
+
+        self._refresh_observation_item(obs_item)
+        if reconcile:
+            self._reconcile_box_writes({association.uuid: association})
+        return True
+
+    def _insert_local_observation(
+        self, box: SourceBoundingBox
+    ) -> Optional[EntryTreeItem]:
+        tree = self.moment.treeWidget() if self.moment is not None else None
+        if tree is None or not box.observation_uuid:
+            return None
+        observation = ObservationEntry(
+            uuid=box.observation_uuid,
+            concept=box.label or "",
+            observer=self.observer or "",
+        )
+        obs_item = tree.add_observation_item(self.moment, observation)
+        if self.observation_map is None:
+            self.observation_map = {}
+        if self.enabled_observations is None:
+            self.enabled_observations = {}
+        self.observation_map[observation.uuid] = obs_item
+        self.enabled_observations[observation.uuid] = True
+        return obs_item
+
+    @staticmethod
+    def _refresh_observation_item(obs_item: EntryTreeItem):
+        tree = obs_item.treeWidget()
+        if tree is not None:
+            tree.refresh_observation_item(obs_item)
+
+    def _reconcile_box_writes(
+        self,
+        expected: Dict[str, Optional[AssociationEntry]],
+        target_entry: Optional[EntryTreeItem] = None,
+    ):
+        """Check optimistic box writes against the server in the background.
+
+        Args:
+            expected: Association UUID to the locally applied association, or
+                None when the association was deleted.
+            target_entry: Moment the writes belong to; defaults to the current one.
+        """
+        target_entry = target_entry if target_entry is not None else self.moment
+        tree = target_entry.treeWidget() if target_entry is not None else None
+        if tree is None:
+            return
+
+        moment_uuid = target_entry.imaged_moment.uuid
+        self._pending_box_writes.setdefault(moment_uuid, {}).update(expected)
+        if self._inflight_writes.get(moment_uuid):
+            # Queued writes are still in flight; the last one to land checks all.
+            return
+        self._box_reconcile_generation += 1
+        generation = self._box_reconcile_generation
+        self._pending_box_generation[moment_uuid] = generation
+
+        def _take_pending() -> Optional[Dict[str, Optional[AssociationEntry]]]:
+            # Only the newest check for a moment verifies the accumulated writes.
+            if self._pending_box_generation.get(moment_uuid) != generation:
+                return None
+            self._pending_box_generation.pop(moment_uuid, None)
+            return self._pending_box_writes.pop(moment_uuid, {})
+
+        def _matches(meta: ImagedMomentEntry) -> bool:
+            if self._inflight_writes.get(moment_uuid):
+                return True
+            pending = _take_pending()
+            return pending is None or _server_matches_box_writes(meta, pending)
+
+        def _on_conflict():
+            logger.warning(
+                "Box edits on moment {} differ from the server; using server state",
+                moment_uuid,
+            )
+            if self.moment is target_entry:
+                self.load_moment(target_entry, preserve_sam_state=True)
+
+        def _on_error(err):
+            _take_pending()
+            logger.warning("Could not reconcile box edits for {}: {}", moment_uuid, err)
+
+        tree.reconcile_imaged_moment_entry_async(
+            target_entry,
+            _matches,
+            on_conflict=_on_conflict,
+            on_error=_on_error,
+        )
+
+    # --- Queued box writes ---------------------------------------------------
+
+    @property
+    def _use_write_queue(self) -> bool:
+        return self.mutation_queue is not None and self.optimistic_box_updates
+
+    def _ref_or_uuid(self, uuid: Optional[str]) -> Any:
+        """Return a result reference for a placeholder UUID still being created."""
+        return self._placeholder_refs.get(uuid, uuid) if uuid else uuid
+
+    def _submit_write(
+        self,
+        target_entry: EntryTreeItem,
+        op: str,
+        on_result: Callable[[Any], Dict[str, Optional[AssociationEntry]]],
+        **kwargs,
+    ) -> Mutation:
+        """Queue a write for a moment and track it until it lands or fails.
+
+        ``on_result`` runs on the UI thread with the call result and returns
+        the association state to verify against the server.
+        """
+        queue = cast(MutationQueue, self.mutation_queue)
+        mutation = queue.submit(op, **kwargs)
+        moment_uuid = target_entry.imaged_moment.uuid
+        self._inflight_writes[moment_uuid] = (
+            self._inflight_writes.get(moment_uuid, 0) + 1
+        )
+
+        def _on_done(future):
+            error = future.exception()
+            if error is None:
+                self._write_relay.post(
+                    self._on_queued_write_done, target_entry, on_result, future.result()
+                )
+            else:
+                self._write_relay.post(
+                    self._on_queued_write_failed, target_entry, mutation, error
+                )
+
+        mutation.future.add_done_callback(_on_done)
+        return mutation
+
+    def _finish_queued_write(self, target_entry: EntryTreeItem) -> str:
+        moment_uuid = target_entry.imaged_moment.uuid
+        remaining = self._inflight_writes.get(moment_uuid, 0) - 1
+        if remaining > 0:
+            self._inflight_writes[moment_uuid] = remaining
+        else:
+            self._inflight_writes.pop(moment_uuid, None)
+        return moment_uuid
+
+    def _on_queued_write_done(
+        self,
+        target_entry: EntryTreeItem,
+        on_result: Callable[[Any], Dict[str, Optional[AssociationEntry]]],
+        result: Any,
+    ):
+        self._finish_queued_write(target_entry)
+        self._reconcile_box_writes(on_result(result) or {}, target_entry)
+
+    def _on_queued_write_failed(
+        self, target_entry: EntryTreeItem, mutation: Mutation, error: BaseException
+    ):
+        moment_uuid = self._finish_queued_write(target_entry)
+        self._pending_box_writes.pop(moment_uuid, None)
+        self._pending_box_generation.pop(moment_uuid, None)
+        logger.error("Queued {} failed: {}", mutation.op, error)
+        if not isinstance(error, MutationDependencyError):
+            QMessageBox.warning(
+                self,
+                "Save failed",
+                "An annotation change could not be saved and was rolled back.\n\n{}".format(
+                    error
+                ),
+            )
+        # Roll back to the server copy of the moment.
+        self._reload_entry(target_entry)
+
+    def _reload_entry(self, target_entry: EntryTreeItem):
+        """Reload a moment from the server, whether or not it is displayed."""
+        if self.moment is target_entry:
+            self.reload_moment(preserve_sam_state=True)
+        else:
+            tree = target_entry.treeWidget()
+            if tree is not None:
+                tree.load_imaged_moment_entry_async(target_entry)
+
+    @staticmethod
+    def _find_observation_item(
+        target_entry: EntryTreeItem, observation_uuid: Optional[str]
+    ) -> Optional[EntryTreeItem]:
+        for child in target_entry.children():
+            if child.is_observation and child.observation.uuid == observation_uuid:
+                return child
+        return None
+
+    def _queue_new_observation(self, concept: str, ordered: bool = True) -> str:
+        """Queue observation creation and return a placeholder UUID for it.
+
+        With ``ordered`` False the creation may run alongside other creations
+        for the same moment, e.g. when accepting a batch of candidates.
+        """
+        target_entry = self.moment
+        moment = target_entry.imaged_moment
+        placeholder_ref: Dict[str, str] = {}
+
+        def _on_created(result) -> Dict[str, Optional[AssociationEntry]]:
+            self._resolve_observation_placeholder(
+                target_entry, placeholder_ref["uuid"], result
+            )
+            return {}
+
+        mutation = self._submit_write(
+            target_entry,
+            "create_observation",
+            _on_created,
+            key=moment.uuid if ordered else None,
+            video_reference_uuid=moment.video_reference_uuid,
+            concept=concept,
+            observer=self.observer,
+            **self._observation_time_kwargs(moment),
+        )
+        placeholder = "pending-observation-{}".format(mutation.id)
+        placeholder_ref["uuid"] = placeholder
+        self._placeholder_refs[placeholder] = ResultRef(
+            mutation.id, ("observation_uuid", "uuid")
+        )
+        target_entry.treeWidget().editable_uuids.add(placeholder)
+        return placeholder
+
+    def _resolve_observation_placeholder(
+        self, target_entry: EntryTreeItem, placeholder: str, result: Any
+    ):
+        ref = self._placeholder_refs.pop(placeholder, None)
+        if ref is None:
+            return
+        real_uuid = ref.resolve(result)
+        tree = target_entry.treeWidget()
+        if tree is not None:
+            tree.editable_uuids.discard(placeholder)
+            tree.editable_uuids.add(real_uuid)
+
+        obs_item = self._find_observation_item(target_entry, placeholder)
+        if obs_item is not None:
+            observation = obs_item.observation
+            observation.uuid = real_uuid
+            for box in list(observation.boxes) + list(observation.video_boxes):
+                if getattr(box, "observation_uuid", None) == placeholder:
+                    box.observation_uuid = real_uuid
+            self._refresh_observation_item(obs_item)
+
+        if self.moment is target_entry:
+            if self.observation_map and placeholder in self.observation_map:
+                self.observation_map[real_uuid] = self.observation_map.pop(placeholder)
+            if self.enabled_observations and placeholder in self.enabled_observations:
+                self.enabled_observations[real_uuid] = self.enabled_observations.pop(
+                    placeholder
+                )
+            if self.observation_uuid == placeholder:
+                self.observation_uuid = real_uuid
+
+    def _queue_box_create(self, box: SourceBoundingBox):
+        target_entry = self.moment
+        placeholder_ref: Dict[str, str] = {}
+
+        def _on_created(result) -> Dict[str, Optional[AssociationEntry]]:
+            placeholder = placeholder_ref["uuid"]
+            self._placeholder_refs.pop(placeholder, None)
+            real_uuid = str((result or {}).get("uuid") or "")
+            if real_uuid and box.association_uuid == placeholder:
+                box.association_uuid = real_uuid
+                obs_item = self._find_observation_item(
+                    target_entry, box.observation_uuid
+                )
+                if obs_item is not None:
+                    for association in obs_item.observation.associations:
+                        if association.uuid == placeholder:
+                            association.uuid = real_uuid
+                    self._refresh_observation_item(obs_item)
+            return self._expected_box_state(box)
+
+        mutation = self._submit_write(
+            target_entry,
+            "create_box",
+            _on_created,
+            key=box.observation_uuid,
+            box_json=box.get_json(),
+            observation_uuid=self._ref_or_uuid(box.observation_uuid),
+            to_concept=box.part,
+        )
+        placeholder = "pending-association-{}".format(mutation.id)
+        placeholder_ref["uuid"] = placeholder
+        self._placeholder_refs[placeholder] = ResultRef(mutation.id, ("uuid",))
+        box.association_uuid = placeholder
+        self._apply_box_write_locally(box, None, reconcile=False)
+
+    def _queue_box_modify(self, box: SourceBoundingBox):
+        self._submit_write(
+            self.moment,
+            "modify_box",
+            lambda _result: self._expected_box_state(box),
+            key=box.observation_uuid,
+            coalesce_key=box.association_uuid,
+            expected=self._server_link_value(box),
+            box_json=box.get_json(),
+            observation_uuid=self._ref_or_uuid(box.observation_uuid),
+            association_uuid=self._ref_or_uuid(box.association_uuid),
+            to_concept=box.part or "self",
+        )
+        self._apply_box_write_locally(box, None, reconcile=False)
+        self.redraw()
+
+    def _queue_box_delete(
+        self,
+        box: SourceBoundingBox,
+        observation_entry: EntryTreeItem,
+        is_last_box: bool,
+    ):
+        target_entry = self.moment
+        observation = observation_entry.observation
+        association_uuid = box.association_uuid
+
+        def _on_deleted(_result) -> Dict[str, Optional[AssociationEntry]]:
+            if association_uuid in self._placeholder_refs:
+                return {}
+            return {association_uuid: None}
+
+        self._submit_write(
+            target_entry,
+            "delete_box",
+            _on_deleted,
+            key=box.observation_uuid,
+            expected=self._server_link_value(box),
+            association_uuid=self._ref_or_uuid(association_uuid),
+        )
+        observation.boxes = [b for b in observation.boxes if b is not box]
+        observation.video_boxes = [b for b in observation.video_boxes if b is not box]
+        observation.remove_association(association_uuid)
+        self._refresh_observation_item(observation_entry)
+        self.redraw()
+
+        if not (is_last_box and self._is_observation_owned(observation.uuid)):
+            return
+        choice = QMessageBox.question(
+            self,
+            "Delete Observation?",
+            "This was the last bounding box for this observation. Delete the observation as well?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No,
+        )
+        if choice != QMessageBox.StandardButton.Yes:
+            return
+
+        def _on_observation_deleted(_result) -> Dict[str, Optional[AssociationEntry]]:
+            self._reload_entry(target_entry)
+            return {}
+
+        self._submit_write(
+            target_entry,
+            "delete_observation",
+            _on_observation_deleted,
+            key=observation.uuid,
+            observation_uuid=self._ref_or_uuid(observation.uuid),
+        )
+
+    def _server_link_value(self, box: SourceBoundingBox) -> Optional[str]:
+        """Return the box's last known server ``link_value`` for conflict checks."""
+        if not box.association_uuid or box.association_uuid in self._placeholder_refs:
+            return None
+        obs_item = self._find_observation_item(self.moment, box.observation_uuid)
+        if obs_item is None:
+            return None
+        for association in obs_item.observation.associations:
+            if association.uuid == box.association_uuid:
+                return association.link_value
+        return None
+
+    def _expected_box_state(
+        self, box: SourceBoundingBox
+    ) -> Dict[str, Optional[AssociationEntry]]:
+        if not box.association_uuid or box.association_uuid in self._placeholder_refs:
+            return {}
+        return {box.association_uuid: self._association_from_box_write(box, None)}
+
     # --- Mouse / keyboard / view events -------------------------------------
 
     def wheelEvent(self, event: QWheelEvent) -> None:
@@ -2601,6 +3439,7 @@ class ImageView(QGraphicsView):
         self._mouse_in_view = False
         self._sam_hover_box = None
         self._sam_last_hover_point = None
+        self._drop_pending_sam_hover()
         self.viewport().setCursor(Qt.CursorShape.ArrowCursor)
         self._current_cursor_shape = Qt.CursorShape.ArrowCursor
         self._update_crosshair(None)
@@ -2642,3 +3481,41 @@ class ImageView(QGraphicsView):
                 super().keyPressEvent(event)
         else:
             super().keyPressEvent(event)
+
+
+def _box_link_signature(association: AssociationEntry) -> tuple:
+    part = association.to_concept or "self"
+    try:
+        value = json.loads(association.link_value)
+    except (TypeError, ValueError):
+        return (part, association.link_value)
+    if not isinstance(value, dict):
+        return (part, association.link_value)
+    return (
+        part,
+        tuple(
+            value.get(key)
+            for key in ("x", "y", "width", "height", "image_reference_uuid")
+        ),
+    )
+
+
+def _server_matches_box_writes(
+    meta: ImagedMomentEntry, expected: Dict[str, Optional[AssociationEntry]]
+) -> bool:
+    """Return True when the server moment agrees with locally applied box writes."""
+    if not expected:
+        return True
+    server = {
+        assoc.uuid: assoc for obs in meta.observations for assoc in obs.associations
+    }
+    for association_uuid, local in expected.items():
+        remote = server.get(association_uuid)
+        if local is None:
+            if remote is not None:
+                return False
+        elif remote is None or _box_link_signature(remote) != _box_link_signature(
+            local
+        ):
+            return False
+    return True
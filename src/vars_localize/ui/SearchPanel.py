@@ -20,7 +20,7 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
-from vars_localize.models import ObservationEntry
+from vars_localize.models import ObservationEntry, ResultSet
 from vars_localize.ui.ConceptSearchbar import ConceptSearchbar
 from vars_localize.ui.EntryTree import (
     EntryTreeItem,
@@ -29,7 +29,7 @@ from vars_localize.ui.EntryTree import (
 )
 from vars_localize.ui.JSONTree import JSONTree
 from vars_localize.ui.Paginator import Paginator
-from vars_localize.util.qt_async import run_async
+from vars_localize.util.qt_async import LANE_BACKGROUND, LANE_VISIBLE, run_async
 from vars_localize.util.utils import center_window
 
 
@@ -92,7 +92,7 @@ class SearchPanel(QDockWidget):
         self.setWidget(self.contents)
 
         self.concept = None
-        self.uuids = []
+        self.uuids = ResultSet()
         self.search_mode = "concept"
         self.active_query = ""
         self._loading_ops = 0
@@ -405,20 +405,24 @@ class SearchPanel(QDockWidget):
 
         return [item[1] for item in sorted(timestamp_uuid_tuples)]
 
-    def _resolve_uuids(self, mode: str, query: str):
+    def _resolve_uuids(self, mode: str, query: str) -> ResultSet:
         values = self._parse_query_values(query)
         if not values:
-            return []
+            return ResultSet()
 
         if mode == "imaged_moment_uuid":
-            return values
+            return ResultSet(values)
         if mode == "image_reference_uuid":
-            return self._resolve_imaged_moments_by_image_reference(values)
+            return ResultSet(self._resolve_imaged_moments_by_image_reference(values))
         if mode == "video_reference_uuid":
-            return self._resolve_imaged_moments_by_video_reference(values)
+            return ResultSet(self._resolve_imaged_moments_by_video_reference(values))
         if mode == "video_sequence_name":
-            return self._resolve_imaged_moments_by_video_sequence(values)
-        return []
+            return ResultSet(self._resolve_imaged_moments_by_video_sequence(values))
+        return ResultSet()
+
+    def _fetch_concept_results(self, concept: str) -> ResultSet:
+        # Pack on the worker so the UI thread only receives the compact set.
+        return ResultSet(self._m3.get_imaged_moment_uuids(concept))
 
     def _set_search_results(self, mode: str, query: str, uuids):
         self.active_query = query
@@ -466,6 +470,7 @@ class SearchPanel(QDockWidget):
             if request_id == self._active_search_request_id
             else None,
             on_finished=self._end_loading,
+            supersede_key="search",
         )
 
     def _clear_results(self):
@@ -477,7 +482,7 @@ class SearchPanel(QDockWidget):
         root = cast(Any, self.parent())
         root.display_panel.image_view.set_pixmap(None)
         root.display_panel.image_view.redraw()
-        self.set_uuids([])
+        self.set_uuids(ResultSet())
         self._sync_video_button_state(None)
         self._update_results_label()
 
@@ -495,6 +500,7 @@ class SearchPanel(QDockWidget):
                 "Failed to load concepts from M3.\n\n{}".format(err)
             ),
             on_finished=self._end_loading,
+            lane=LANE_BACKGROUND,
         )
 
     def _load_video_sequence_names_async(self):
@@ -513,6 +519,7 @@ class SearchPanel(QDockWidget):
                 "Failed to load video sequence names from VAM.\n\n{}".format(err)
             ),
             on_finished=self._end_loading,
+            lane=LANE_BACKGROUND,
         )
 
     def concept_selected(self, concept):
@@ -523,11 +530,12 @@ class SearchPanel(QDockWidget):
         self.load_concept(concept)
 
     def set_uuids(self, uuids):
-        self.uuids = uuids
-        self._state.uuids = uuids
+        result_set = ResultSet.coerce(uuids)
+        self.uuids = result_set
+        self._state.uuids = result_set
 
         self.paginator.set_offset(0)
-        self.paginator.set_count(len(uuids))
+        self.paginator.set_count(len(result_set))
         self._sync_video_button_state(self.entry_tree.currentItem())
         self._update_results_label()
 
@@ -565,7 +573,7 @@ class SearchPanel(QDockWidget):
 
         run_async(
             self,
-            self._m3.get_imaged_moment_uuids,
+            self._fetch_concept_results,
             concept,
             on_result=_on_result,
             on_error=lambda err: self._show_error(
@@ -576,6 +584,7 @@ class SearchPanel(QDockWidget):
             if request_id == self._active_search_request_id
             else None,
             on_finished=self._end_loading,
+            supersede_key="search",
         )
 
     def load_page(self):
@@ -600,6 +609,8 @@ class SearchPanel(QDockWidget):
             if request_id == self._active_page_request_id
             else None,
             on_finished=self._end_loading,
+            lane=LANE_VISIBLE,
+            supersede_key="page",
         )
 
     def select_next(self):
@@ -94,12 +94,59 @@ class SettingsDialog(QDialog):
             raise RuntimeError("Unexpected layout type")
 
         self.search_page_size = QSpinBox()
-        self.search_page_size.setRange(1, 500)
+        self.search_page_size.setRange(1, 2000)
         self.search_page_size.setSingleStep(5)
         search_form.addRow("Results per page", self.search_page_size)
 
+        editing_group = QGroupBox("Editing")
+        editing_group.setLayout(QFormLayout())
+        editing_form = editing_group.layout()
+        if not isinstance(editing_form, QFormLayout):
+            raise RuntimeError("Unexpected layout type")
+
+        self.optimistic_box_updates = QCheckBox(
+            "Show edits immediately and verify with the server in the background"
+        )
+        editing_form.addRow(self.optimistic_box_updates)
+
+        self.offline_journal = QCheckBox(
+            "Keep unsaved edits in a local journal and replay them when the server is reachable"
+        )
+        self.offline_journal.setToolTip("Applied the next time the application starts.")
+        editing_form.addRow(self.offline_journal)
+
+        performance_group = QGroupBox("Background Tasks")
+        performance_group.setLayout(QFormLayout())
+        performance_form = performance_group.layout()
+        if not isinstance(performance_form, QFormLayout):
+            raise RuntimeError("Unexpected layout type")
+
+        self.interactive_threads = QSpinBox()
+        self.visible_threads = QSpinBox()
+        self.prefetch_threads = QSpinBox()
+        self.background_threads = QSpinBox()
+        for spin in (
+            self.interactive_threads,
+            self.visible_threads,
+            self.prefetch_threads,
+            self.background_threads,
+        ):
+            spin.setRange(1, 32)
+
+        self.interactive_threads.setToolTip(
+            "Image loads, SAM queries and other direct responses to input."
+        )
+        self.visible_threads.setToolTip("Result pages and on-screen content.")
+        self.prefetch_threads.setToolTip("Work for images you are likely to open next.")
+        self.background_threads.setToolTip("Reconciles and reference data lookups.")
+
+        performance_form.addRow("Interactive threads", self.interactive_threads)
+        performance_form.addRow("Visible content threads", self.visible_threads)
+        performance_form.addRow("Prefetch threads", self.prefetch_threads)
+        performance_form.addRow("Background threads", self.background_threads)
+
         note = QLabel(
-            "Shortcuts and page size changes are applied immediately after saving."
+            "Shortcuts, page size and thread limits are applied immediately after saving."
         )
         note.setObjectName("secondaryText")
         note.setWordWrap(True)
@@ -110,6 +157,8 @@ class SettingsDialog(QDialog):
 
         tab_layout.addWidget(shortcuts_group)
         tab_layout.addWidget(search_group)
+        tab_layout.addWidget(editing_group)
+        tab_layout.addWidget(performance_group)
         tab_layout.addWidget(note)
         tab_layout.addStretch(1)
         return tab
@@ -197,6 +246,55 @@ class SettingsDialog(QDialog):
         self.sam_overlap_iou.setDecimals(3)
         self.sam_overlap_iou.setSingleStep(0.05)
 
+        self.sam_candidate_nms_iou = QDoubleSpinBox()
+        self.sam_candidate_nms_iou.setRange(0.0, 1.0)
+        self.sam_candidate_nms_iou.setDecimals(3)
+        self.sam_candidate_nms_iou.setSingleStep(0.05)
+        self.sam_candidate_nms_iou.setToolTip(
+            "Drop a candidate that overlaps an earlier candidate at least this "
+            "much. 0 keeps duplicates."
+        )
+
+        self.sam_feature_cache_mb = QSpinBox()
+        self.sam_feature_cache_mb.setRange(0, 65536)
+        self.sam_feature_cache_mb.setSingleStep(128)
+        self.sam_feature_cache_mb.setSuffix(" MB")
+        self.sam_feature_cache_mb.setToolTip(
+            "Memory for image embeddings kept for recently viewed images. "
+            "0 disables the cache."
+        )
+
+        self.sam_feature_store_mb = QSpinBox()
+        self.sam_feature_store_mb.setRange(0, 1048576)
+        self.sam_feature_store_mb.setSingleStep(1024)
+        self.sam_feature_store_mb.setSuffix(" MB")
+        self.sam_feature_store_mb.setToolTip(
+            "Disk space for image embeddings kept between sessions. "
+            "0 disables the store."
+        )
+
+        self.sam_prefetch_images = QSpinBox()
+        self.sam_prefetch_images.setRange(0, 10)
+        self.sam_prefetch_images.setToolTip(
+            "Encode this many images after the current one on the page in "
+            "the background. 0 disables pre-encoding."
+        )
+
+        self.sam_hover_debounce_ms = QSpinBox()
+        self.sam_hover_debounce_ms.setRange(0, 1000)
+        self.sam_hover_debounce_ms.setSingleStep(10)
+        self.sam_hover_debounce_ms.setSuffix(" ms")
+        self.sam_hover_debounce_ms.setToolTip(
+            "How long the pointer must rest before a point suggestion is "
+            "requested. 0 queries on every move."
+        )
+
+        self.sam_out_of_process = QCheckBox("Run SAM3 in a separate process")
+        self.sam_out_of_process.setToolTip(
+            "Keeps the model in its own process, so a crash or out-of-memory "
+            "error there does not close the application."
+        )
+
         sam_form.addRow(self.sam_enabled)
         sam_form.addRow(self.sam_semantic_enabled)
         sam_form.addRow(self.sam_point_enabled)
@@ -205,6 +303,12 @@ class SettingsDialog(QDialog):
         sam_form.addRow("Image size", self.sam_image_size)
         sam_form.addRow("Candidate min area", self.sam_min_area)
         sam_form.addRow("Overlap IoU filter", self.sam_overlap_iou)
+        sam_form.addRow("Duplicate candidate IoU", self.sam_candidate_nms_iou)
+        sam_form.addRow("Embedding cache", self.sam_feature_cache_mb)
+        sam_form.addRow("Embedding disk store", self.sam_feature_store_mb)
+        sam_form.addRow("Pre-encode next images", self.sam_prefetch_images)
+        sam_form.addRow("Point hover delay", self.sam_hover_debounce_ms)
+        sam_form.addRow(self.sam_out_of_process)
 
         note = QLabel(
             "SAM3 model files are not downloaded automatically. "
@@ -224,6 +328,12 @@ class SettingsDialog(QDialog):
 
     def _load_from_settings(self):
         self.search_page_size.setValue(self._settings.search_page_size)
+        self.optimistic_box_updates.setChecked(self._settings.optimistic_box_updates)
+        self.offline_journal.setChecked(self._settings.offline_journal)
+        self.interactive_threads.setValue(self._settings.interactive_threads)
+        self.visible_threads.setValue(self._settings.visible_threads)
+        self.prefetch_threads.setValue(self._settings.prefetch_threads)
+        self.background_threads.setValue(self._settings.background_threads)
 
         self.focus_search_shortcut.setText(self._settings.focus_search_shortcut)
         self.clear_results_shortcut.setText(self._settings.clear_results_shortcut)
@@ -240,6 +350,12 @@ class SettingsDialog(QDialog):
         self.sam_image_size.setValue(self._settings.sam3_image_size)
         self.sam_min_area.setValue(self._settings.sam3_min_area)
         self.sam_overlap_iou.setValue(self._settings.sam3_overlap_iou)
+        self.sam_candidate_nms_iou.setValue(self._settings.sam3_candidate_nms_iou)
+        self.sam_feature_cache_mb.setValue(self._settings.sam3_feature_cache_mb)
+        self.sam_feature_store_mb.setValue(self._settings.sam3_feature_store_mb)
+        self.sam_prefetch_images.setValue(self._settings.sam3_prefetch_images)
+        self.sam_hover_debounce_ms.setValue(self._settings.sam3_hover_debounce_ms)
+        self.sam_out_of_process.setChecked(self._settings.sam3_out_of_process)
 
     def _browse_sam_model(self):
         model_path, _ = QFileDialog.getOpenFileName(
@@ -293,6 +409,12 @@ class SettingsDialog(QDialog):
             return
 
         self._settings.search_page_size = self.search_page_size.value()
+        self._settings.optimistic_box_updates = self.optimistic_box_updates.isChecked()
+        self._settings.offline_journal = self.offline_journal.isChecked()
+        self._settings.interactive_threads = self.interactive_threads.value()
+        self._settings.visible_threads = self.visible_threads.value()
+        self._settings.prefetch_threads = self.prefetch_threads.value()
+        self._settings.background_threads = self.background_threads.value()
         self._settings.focus_search_shortcut = self.focus_search_shortcut.text().strip()
         self._settings.clear_results_shortcut = (
             self.clear_results_shortcut.text().strip()
@@ -312,5 +434,11 @@ class SettingsDialog(QDialog):
         self._settings.sam3_image_size = self.sam_image_size.value()
         self._settings.sam3_min_area = self.sam_min_area.value()
         self._settings.sam3_overlap_iou = self.sam_overlap_iou.value()
+        self._settings.sam3_candidate_nms_iou = self.sam_candidate_nms_iou.value()
+        self._settings.sam3_feature_cache_mb = self.sam_feature_cache_mb.value()
+        self._settings.sam3_feature_store_mb = self.sam_feature_store_mb.value()
+        self._settings.sam3_prefetch_images = self.sam_prefetch_images.value()
+        self._settings.sam3_hover_debounce_ms = self.sam_hover_debounce_ms.value()
+        self._settings.sam3_out_of_process = self.sam_out_of_process.isChecked()
 
         self.accept()
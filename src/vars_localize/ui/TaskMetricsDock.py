@@ -0,0 +1,157 @@
+"""Debug dock showing queue, run and delivery times of background tasks."""
+
+from typing import Optional
+
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import (
+    QDockWidget,
+    QFileDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QMessageBox,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from vars_localize.util.logging import get_logger
+from vars_localize.util.qt_async import task_scheduler
+from vars_localize.util.task_metrics import TaskMetrics, task_metrics
+
+logger = get_logger("TaskMetricsDock")
+
+REFRESH_INTERVAL_MS = 1000
+
+_COLUMNS = (
+    "Task",
+    "Lane",
+    "Count",
+    "Errors",
+    "Cancelled",
+    "Queue avg (ms)",
+    "Queue max (ms)",
+    "Run avg (ms)",
+    "Run max (ms)",
+    "Delivery avg (ms)",
+    "Delivery max (ms)",
+)
+
+
+def _ms(secs: float) -> str:
+    return "{:.1f}".format(secs * 1000.0)
+
+
+class TaskMetricsDock(QDockWidget):
+    """Table of per-task timings, refreshed while the dock is visible."""
+
+    def __init__(self, metrics: Optional[TaskMetrics] = None, parent=None):
+        super(TaskMetricsDock, self).__init__("Task Metrics", parent)
+        self._metrics = metrics or task_metrics()
+        self.setObjectName("taskMetricsDock")
+
+        content = QWidget(self)
+        content.setLayout(QVBoxLayout())
+        layout = content.layout()
+        if not isinstance(layout, QVBoxLayout):
+            raise RuntimeError("Unexpected layout type")
+
+        self.lanes_label = QLabel()
+        self.lanes_label.setObjectName("secondaryText")
+
+        self.table = QTableWidget(0, len(_COLUMNS), content)
+        self.table.setHorizontalHeaderLabels(list(_COLUMNS))
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+
+        buttons = QWidget(content)
+        buttons.setLayout(QHBoxLayout())
+        buttons_layout = buttons.layout()
+        if not isinstance(buttons_layout, QHBoxLayout):
+            raise RuntimeError("Unexpected layout type")
+        buttons_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.reset_button = QPushButton("Reset")
+        self.reset_button.clicked.connect(self._reset)
+        self.export_button = QPushButton("Export...")
+        self.export_button.clicked.connect(self._export)
+        buttons_layout.addStretch(1)
+        buttons_layout.addWidget(self.reset_button)
+        buttons_layout.addWidget(self.export_button)
+
+        layout.addWidget(self.lanes_label)
+        layout.addWidget(self.table, 1)
+        layout.addWidget(buttons)
+        self.setWidget(content)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(REFRESH_INTERVAL_MS)
+        self._timer.timeout.connect(self.refresh)
+        self.visibilityChanged.connect(self._on_visibility_changed)
+
+    def _on_visibility_changed(self, visible: bool):
+        if visible:
+            self.refresh()
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+    def refresh(self):
+        scheduler = task_scheduler()
+        active = scheduler.active_counts()
+        limits = scheduler.limits()
+        self.lanes_label.setText(
+            "Active threads: "
+            + ", ".join(
+                "{} {}/{}".format(lane, active[lane], limits[lane]) for lane in limits
+            )
+        )
+
+        summary = self._metrics.summary()
+        self.table.setRowCount(len(summary))
+        for row, stats in enumerate(summary):
+            values = (
+                stats.name,
+                stats.lane,
+                str(stats.count),
+                str(stats.errors),
+                str(stats.cancelled),
+                _ms(stats.queue_mean_secs),
+                _ms(stats.queue_max_secs),
+                _ms(stats.run_mean_secs),
+                _ms(stats.run_max_secs),
+                _ms(stats.delivery_mean_secs),
+                _ms(stats.delivery_max_secs),
+            )
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column >= 2:
+                    item.setTextAlignment(
+                        Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+                    )
+                self.table.setItem(row, column, item)
+
+    def _reset(self):
+        self._metrics.reset()
+        self.refresh()
+
+    def _export(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Task Metrics",
+            "task-metrics.json",
+            "JSON (*.json);;CSV (*.csv)",
+        )
+        if not path:
+            return
+        try:
+            self._metrics.dump(path)
+        except OSError as exc:
+            logger.error("Could not export task metrics to {}: {}", path, exc)
+            QMessageBox.warning(self, "Export failed", str(exc))
+            return
+        logger.info("Exported task metrics to {}", path)
@@ -0,0 +1,88 @@
+"""Vectorised bounding-box geometry for filtering SAM candidates.
+
+Boxes are ``(x, y, width, height)`` rows of an ``(N, 4)`` array.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+import numpy as np
+
+
+def as_box_array(boxes: Iterable[Any]) -> np.ndarray:
+    """Stack ``(x, y, width, height)`` boxes into an ``(N, 4)`` float array."""
+    arr = np.asarray(list(boxes), dtype=np.float64)
+    return arr.reshape(-1, 4)
+
+
+def box_areas(boxes: np.ndarray) -> np.ndarray:
+    return boxes[:, 2] * boxes[:, 3]
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Intersection over union of every box in ``a`` with every box in ``b``.
+
+    Pairs that do not overlap, or whose union is empty, score 0.
+    """
+    ax1, ay1 = a[:, 0, None], a[:, 1, None]
+    ax2, ay2 = ax1 + a[:, 2, None], ay1 + a[:, 3, None]
+    bx1, by1 = b[None, :, 0], b[None, :, 1]
+    bx2, by2 = bx1 + b[None, :, 2], by1 + b[None, :, 3]
+
+    inter_w = np.clip(np.minimum(ax2, bx2) - np.maximum(ax1, bx1), 0, None)
+    inter_h = np.clip(np.minimum(ay2, by2) - np.maximum(ay1, by1), 0, None)
+    inter = inter_w * inter_h
+    union = box_areas(a)[:, None] + box_areas(b)[None, :] - inter
+    with np.errstate(divide="ignore", invalid="ignore"):
+        iou = np.where((inter > 0) & (union > 0), inter / union, 0.0)
+    return iou
+
+
+def overlaps_any(
+    boxes: np.ndarray, others: np.ndarray, iou_threshold: float
+) -> np.ndarray:
+    """Per box in ``boxes``, whether any box in ``others`` reaches ``iou_threshold``."""
+    if len(boxes) == 0 or len(others) == 0:
+        return np.zeros(len(boxes), dtype=bool)
+    return (iou_matrix(boxes, others) >= iou_threshold).any(axis=1)
+
+
+def nms(boxes: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """Indices of the boxes kept by greedy non-maximum suppression.
+
+    Boxes are taken in the given order, so pass them best first. A box is
+    dropped when it reaches ``iou_threshold`` with a box already kept.
+    """
+    count = len(boxes)
+    if count == 0:
+        return np.zeros(0, dtype=np.intp)
+    suppressed_by = iou_matrix(boxes, boxes) >= iou_threshold
+    suppressed = np.zeros(count, dtype=bool)
+    keep = []
+    for idx in range(count):
+        if suppressed[idx]:
+            continue
+        keep.append(idx)
+        suppressed |= suppressed_by[idx]
+    return np.asarray(keep, dtype=np.intp)
+
+
+def filter_candidates(
+    boxes: np.ndarray,
+    min_area: float,
+    existing: np.ndarray,
+    overlap_iou: float,
+    nms_iou: float = 0.0,
+) -> np.ndarray:
+    """Indices of candidate ``boxes`` worth suggesting, in their original order.
+
+    Drops boxes with an area of ``min_area`` or less, boxes reaching
+    ``overlap_iou`` with an ``existing`` box, and, when ``nms_iou`` is above
+    0, boxes duplicating an earlier candidate.
+    """
+    keep = np.flatnonzero(box_areas(boxes) > min_area)
+    keep = keep[~overlaps_any(boxes[keep], existing, overlap_iou)]
+    if nms_iou > 0 and len(keep) > 1:
+        keep = keep[nms(boxes[keep], nms_iou)]
+    return keep
@@ -0,0 +1,78 @@
+"""Cooperative cancellation for background tasks.
+
+``run_async`` binds a ``CancelToken`` to the worker thread while a task runs.
+Long-running code (HTTP retries, SAM inference) calls ``raise_if_cancelled``
+at safe points so superseded work stops early instead of running to the end.
+Code running outside a task sees no token and is never cancelled.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class TaskCancelledError(Exception):
+    """Raised inside a task after its handle was cancelled."""
+
+
+class CancelToken:
+    """Thread-safe flag shared by a task and whoever may cancel it."""
+
+    __slots__ = ("_event",)
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise TaskCancelledError()
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep up to ``timeout`` seconds; return True if cancelled meanwhile."""
+        return self._event.wait(timeout)
+
+
+_local = threading.local()
+
+
+def current_token() -> Optional[CancelToken]:
+    """Return the token bound to this thread, if any."""
+    return getattr(_local, "token", None)
+
+
+@contextmanager
+def bind_token(token: Optional[CancelToken]) -> Iterator[None]:
+    """Make ``token`` the current token for this thread within the block."""
+    previous = current_token()
+    _local.token = token
+    try:
+        yield
+    finally:
+        _local.token = previous
+
+
+def raise_if_cancelled() -> None:
+    """Raise ``TaskCancelledError`` if the current task was cancelled."""
+    token = current_token()
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+def sleep(secs: float) -> None:
+    """Sleep like ``time.sleep`` but wake up and raise when cancelled."""
+    token = current_token()
+    if token is None:
+        time.sleep(secs)
+        return
+    if token.wait(secs):
+        raise TaskCancelledError()
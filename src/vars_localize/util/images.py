@@ -0,0 +1,70 @@
+"""Image conversion helpers shared by the viewer and SAM tooling."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+from PyQt6.QtGui import QImage
+
+
+class _QImageArray(np.ndarray):
+    """Array over a QImage's pixels; holds the QImage so the memory stays valid."""
+
+    _qimage: Optional[QImage] = None
+
+
+def _rgb888_view(image: QImage) -> Tuple[QImage, np.ndarray]:
+    image = image.convertToFormat(QImage.Format.Format_RGB888)
+    ptr = image.constBits()
+    ptr.setsize(image.sizeInBytes())
+    array = np.ndarray(
+        (image.height(), image.width(), 3),
+        np.uint8,
+        buffer=ptr,
+        strides=(image.bytesPerLine(), 3, 1),
+    ).view(_QImageArray)
+    array._qimage = image
+    array.flags.writeable = False
+    return image, array
+
+
+def qimage_to_rgb_array(image: QImage) -> np.ndarray:
+    """View ``image`` as a read-only ``(height, width, 3)`` uint8 RGB array.
+
+    Only the conversion to RGB888 copies pixels, and none for an image
+    already in that format. Scanlines may be padded, so the array is not
+    necessarily C-contiguous.
+    """
+    return _rgb888_view(image)[1]
+
+
+@dataclass(frozen=True)
+class RGBFrame:
+    """A decoded image held once in RGB888.
+
+    ``image`` is what the viewer turns into a pixmap and ``array`` is what
+    SAM encodes; both share the same pixel buffer.
+    """
+
+    image: QImage
+    array: np.ndarray
+
+    @classmethod
+    def from_qimage(cls, image: QImage) -> "RGBFrame":
+        return cls(*_rgb888_view(image))
+
+
+def decode_rgb_frame(image_bytes: bytes) -> Optional[RGBFrame]:
+    """Decode encoded image bytes into an RGB frame; None if undecodable."""
+    image = QImage()
+    if not image_bytes or not image.loadFromData(image_bytes):
+        return None
+    return RGBFrame.from_qimage(image)
+
+
+def decode_image_rgb(image_bytes: bytes) -> Optional[np.ndarray]:
+    """Decode encoded image bytes to an RGB array; None if undecodable."""
+    frame = decode_rgb_frame(image_bytes)
+    return frame.array if frame is not None else None
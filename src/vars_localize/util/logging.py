@@ -2,23 +2,125 @@
 
 from __future__ import annotations
 
+import functools
+import json
 import os
+import random
+import socket
 import sys
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TypeVar, Union
 
 from loguru import logger
 
 _DEBUG_INPUT_ENABLED = False
 
+PERF_KIND_NETWORK = "network"
+PERF_KIND_DECODE = "decode"
+PERF_KIND_SAM = "sam"
 
-def configure_logging(debug_input: bool = False) -> None:
+DEFAULT_PERF_SAMPLE_RATE = 1.0
+DEFAULT_PERF_RATE_LIMIT = 20.0  # records per second, with bursts up to 1 s
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+class _PerfChannel:
+    """Sampling and token-bucket rate limiting for performance records.
+
+    ``rate_limit`` is records per second; 0 or less means no limit. The
+    bucket holds at least one token, so limits below 1 admit a record every
+    ``1 / rate_limit`` seconds rather than none at all.
+    """
+
+    def __init__(self, sample_rate: float, rate_limit: float):
+        self.sample_rate = max(0.0, min(1.0, float(sample_rate)))
+        self.rate_limit = max(0.0, float(rate_limit))
+        self._capacity = max(1.0, self.rate_limit)
+        self._lock = threading.Lock()
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._dropped = 0
+        self._host = socket.gethostname()
+        self._pid = os.getpid()
+
+    def _admit(self) -> Optional[int]:
+        """Return the number of records dropped since the last one, or None."""
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return None
+        if self.rate_limit <= 0:
+            return 0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._capacity,
+                self._tokens + (now - self._updated) * self.rate_limit,
+            )
+            self._updated = now
+            if self._tokens < 1.0:
+                self._dropped += 1
+                return None
+            self._tokens -= 1.0
+            dropped, self._dropped = self._dropped, 0
+            return dropped
+
+    def emit(self, kind: str, op: str, duration_ms: float, fields: Dict[str, Any]):
+        dropped = self._admit()
+        if dropped is None:
+            return
+        record = {
+            "ts": round(time.time(), 6),
+            "kind": kind,
+            "op": op,
+            "ms": round(duration_ms, 3),
+            "host": self._host,
+            "pid": self._pid,
+            "sample_rate": self.sample_rate,
+        }
+        if dropped:
+            record["rate_limited"] = dropped
+        record.update(fields)
+        logger.bind(module="Perf", perf_json=json.dumps(record, default=str)).info(
+            "{} {} {:.1f} ms", kind, op, duration_ms
+        )
+
+
+_PERF: Optional[_PerfChannel] = None
+
+
+def _is_perf_record(record) -> bool:
+    return "perf_json" in record["extra"]
+
+
+def _is_regular_record(record) -> bool:
+    return "perf_json" not in record["extra"]
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def configure_logging(
+    debug_input: bool = False, perf_log: Optional[Union[str, Path]] = None
+) -> None:
     """Configure Loguru sinks and formatting for the application.
 
     Args:
         debug_input: Enable verbose mouse/dialog/SAM-async lifecycle
             diagnostics (see `debug_input_enabled`) and force DEBUG-level
             logging for this run, regardless of VARS_LOCALIZE_LOG_LEVEL.
+        perf_log: JSON-lines file for performance records (see `log_perf`),
+            or VARS_LOCALIZE_PERF_LOG. Records are sampled at
+            VARS_LOCALIZE_PERF_SAMPLE (0-1) and limited to
+            VARS_LOCALIZE_PERF_RATE_LIMIT per second (0 for no limit).
     """
+    global _PERF
     global _DEBUG_INPUT_ENABLED
     _DEBUG_INPUT_ENABLED = (
         bool(debug_input) or os.getenv("VARS_LOCALIZE_DEBUG_INPUT") == "1"
@@ -34,6 +136,7 @@ def configure_logging(debug_input: bool = False) -> None:
     logger.add(
         sys.stderr,
         level=log_level,
+        filter=_is_regular_record,
         format=(
             "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> "
             "| <level>{level: <8}</level> "
@@ -51,11 +154,29 @@ def configure_logging(debug_input: bool = False) -> None:
         rotation="5 MB",
         retention=5,
         enqueue=True,
+        filter=_is_regular_record,
         format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {extra[module]} | {message}",
         backtrace=True,
         diagnose=False,
     )
 
+    perf_path = perf_log or os.getenv("VARS_LOCALIZE_PERF_LOG")
+    _PERF = None
+    if perf_path:
+        logger.add(
+            Path(perf_path),
+            level="INFO",
+            rotation="20 MB",
+            retention=5,
+            enqueue=True,
+            filter=_is_perf_record,
+            format="{extra[perf_json]}",
+        )
+        _PERF = _PerfChannel(
+            _env_float("VARS_LOCALIZE_PERF_SAMPLE", DEFAULT_PERF_SAMPLE_RATE),
+            _env_float("VARS_LOCALIZE_PERF_RATE_LIMIT", DEFAULT_PERF_RATE_LIMIT),
+        )
+
     # Qt (and PyQt6 in particular) swallows exceptions raised inside a Python
     # override of a C++ virtual method (event handlers, slots, paint(), etc.):
     # by default it prints to stderr via sys.excepthook and returns control to
@@ -94,6 +215,81 @@ def debug_input_enabled() -> bool:
     return _DEBUG_INPUT_ENABLED
 
 
+def perf_enabled() -> bool:
+    """Whether a performance log sink is configured."""
+    return _PERF is not None
+
+
+def log_perf(kind: str, op: str, duration_ms: float, **fields: Any) -> None:
+    """Write one performance record, subject to sampling and rate limiting.
+
+    Args:
+        kind: Record family, e.g. `PERF_KIND_NETWORK`.
+        op: Operation name, e.g. ``"GET /anno/v1/fast"``.
+        duration_ms: Wall time of the operation.
+        **fields: Extra JSON values such as sizes or status codes.
+    """
+    channel = _PERF
+    if channel is not None:
+        channel.emit(kind, op, duration_ms, fields)
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> Dict[str, Any]:
+        return {}
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+
+_NOOP_TIMER = _NoopTimer()
+
+
+@contextmanager
+def _timed(channel: _PerfChannel, kind: str, op: str, fields: Dict[str, Any]):
+    start = time.perf_counter()
+    try:
+        yield fields
+    except BaseException as exc:
+        fields["error"] = type(exc).__name__
+        raise
+    finally:
+        channel.emit(kind, op, (time.perf_counter() - start) * 1000.0, fields)
+
+
+def perf_timer(kind: str, op: str, **fields: Any):
+    """Context manager that logs the duration of the block as a perf record.
+
+    The yielded dict can be filled with sizes or counts before the block ends.
+    Costs a single check when no perf log is configured.
+    """
+    channel = _PERF
+    if channel is None:
+        return _NOOP_TIMER
+    return _timed(channel, kind, op, fields)
+
+
+def perf_timed(kind: str, op: Optional[str] = None) -> Callable[[_F], _F]:
+    """Decorator form of `perf_timer`."""
+
+    def _decorate(fn: _F) -> _F:
+        label = op or fn.__qualname__
+
+        @functools.wraps(fn)
+        def _wrapper(*args, **kwargs):
+            channel = _PERF
+            if channel is None:
+                return fn(*args, **kwargs)
+            with _timed(channel, kind, label, {}):
+                return fn(*args, **kwargs)
+
+        return _wrapper  # type: ignore[return-value]
+
+    return _decorate
+
+
 def get_logger(module: str):
     """Return a logger bound to a module name.
 
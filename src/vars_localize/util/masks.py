@@ -0,0 +1,111 @@
+"""Segmentation mask helpers: bounding boxes and run-length encoding."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+Box = Tuple[int, int, int, int]
+
+
+def _is_tensor(value: Any) -> bool:
+    return type(value).__module__.startswith("torch") and hasattr(value, "dim")
+
+
+def mask_extents(masks: Any) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Rows and columns each mask covers, as ``(N, H)`` and ``(N, W)`` bool arrays.
+
+    ``masks`` is one ``(H, W)`` mask or an ``(N, H, W)`` stack, as a numpy
+    array or a torch tensor; pixels above zero belong to the mask. Tensors
+    are reduced on their own device, so only the two small arrays are copied
+    to the host. Returns None for any other shape.
+    """
+    if masks is None:
+        return None
+    if _is_tensor(masks):
+        if masks.dim() == 2:
+            masks = masks.unsqueeze(0)
+        if masks.dim() != 3:
+            return None
+        if masks.dtype.is_floating_point or masks.dtype.is_signed:
+            rows, cols = masks.amax(dim=2) > 0, masks.amax(dim=1) > 0
+        else:
+            rows, cols = masks.bool().any(dim=2), masks.bool().any(dim=1)
+        return rows.cpu().numpy(), cols.cpu().numpy()
+
+    numpy_attr = getattr(masks, "numpy", None)
+    if callable(numpy_attr):
+        masks = numpy_attr()
+    arr = np.asarray(masks)
+    if arr.ndim == 2:
+        arr = arr[None, ...]
+    elif arr.ndim != 3:
+        return None
+    if arr.dtype == np.bool_:
+        return arr.any(axis=2), arr.any(axis=1)
+    # max then compare avoids a full-size boolean copy of every mask.
+    return arr.max(axis=2) > 0, arr.max(axis=1) > 0
+
+
+def mask_boxes(masks: Any) -> List[Box]:
+    """``(x, y, width, height)`` of each mask, in order.
+
+    Empty masks and masks only one pixel wide or tall are left out.
+    """
+    extents = mask_extents(masks)
+    if extents is None:
+        return []
+    rows, cols = extents
+    if rows.shape[0] == 0 or rows.shape[1] == 0 or cols.shape[1] == 0:
+        return []
+    y1 = rows.argmax(axis=1)
+    y2 = rows.shape[1] - 1 - rows[:, ::-1].argmax(axis=1)
+    x1 = cols.argmax(axis=1)
+    x2 = cols.shape[1] - 1 - cols[:, ::-1].argmax(axis=1)
+    widths = x2 - x1 + 1
+    heights = y2 - y1 + 1
+    keep = rows.any(axis=1) & (widths > 1) & (heights > 1)
+    return [
+        (int(x1[i]), int(y1[i]), int(widths[i]), int(heights[i]))
+        for i in np.flatnonzero(keep)
+    ]
+
+
+def mask_to_rle(mask: Any) -> Dict[str, Any]:
+    """Run-length encode one ``(H, W)`` mask, COCO style.
+
+    Runs are counted in column-major order and start with the number of
+    background pixels, which is 0 when the first pixel is set.
+    """
+    arr = np.asarray(mask) > 0
+    if arr.ndim != 2:
+        raise ValueError("Expected a 2-D mask, got shape {}".format(arr.shape))
+    flat = arr.ravel(order="F")
+    changes = np.flatnonzero(flat[1:] != flat[:-1]) + 1
+    bounds = np.concatenate(([0], changes, [flat.size]))
+    counts = np.diff(bounds).tolist()
+    if flat.size and flat[0]:
+        counts.insert(0, 0)
+    return {"size": [int(arr.shape[0]), int(arr.shape[1])], "counts": counts}
+
+
+def rle_to_mask(rle: Dict[str, Any]) -> np.ndarray:
+    """Decode ``mask_to_rle`` output back to an ``(H, W)`` bool mask."""
+    height, width = (int(value) for value in rle["size"])
+    counts = np.asarray(rle["counts"], dtype=np.int64)
+    values = np.arange(counts.size) % 2 == 1
+    flat = np.repeat(values, counts)
+    if flat.size != height * width:
+        raise ValueError("RLE counts do not match size {}x{}".format(height, width))
+    return flat.reshape((height, width), order="F")
+
+
+def masks_to_rle(masks: Any) -> List[Dict[str, Any]]:
+    """Run-length encode each mask of an ``(N, H, W)`` stack."""
+    if _is_tensor(masks):
+        masks = (masks > 0).cpu().numpy()
+    arr = np.asarray(masks)
+    if arr.ndim == 2:
+        arr = arr[None, ...]
+    return [mask_to_rle(mask) for mask in arr]
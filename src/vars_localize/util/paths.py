@@ -0,0 +1,31 @@
+"""Locations of files the application keeps in its data directory."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from PyQt6.QtCore import QStandardPaths
+
+
+def _app_data_dir() -> Path:
+    data_dir = QStandardPaths.writableLocation(
+        QStandardPaths.StandardLocation.AppLocalDataLocation
+    )
+    return Path(data_dir or ".")
+
+
+def journal_path() -> Path:
+    """Location of the offline edit journal, overridable for testing."""
+    override = os.getenv("VARS_LOCALIZE_JOURNAL_FILE")
+    if override:
+        return Path(override).expanduser()
+    return _app_data_dir() / "edit-journal.sqlite3"
+
+
+def sam_feature_dir() -> Path:
+    """Location of the SAM feature store, overridable to share it between users."""
+    override = os.getenv("VARS_LOCALIZE_SAM_FEATURE_DIR")
+    if override:
+        return Path(override).expanduser()
+    return _app_data_dir() / "sam-features"
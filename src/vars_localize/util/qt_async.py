@@ -1,9 +1,54 @@
 """Qt helpers for running blocking tasks off the UI thread."""
 
+import time
 import weakref
-from typing import Callable, Optional
+from functools import partial
+from typing import Callable, Dict, Mapping, Optional
 
-from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+from PyQt6 import sip
+from PyQt6.QtCore import (
+    QObject,
+    QRunnable,
+    QThread,
+    QThreadPool,
+    QTimer,
+    pyqtSignal,
+    pyqtSlot,
+)
+
+from vars_localize.util import tracing
+from vars_localize.util.cancellation import CancelToken, TaskCancelledError, bind_token
+from vars_localize.util.task_metrics import (
+    OUTCOME_CANCELLED,
+    OUTCOME_ERROR,
+    OUTCOME_OK,
+    TaskRecord,
+    task_metrics,
+    task_name as _task_name,
+)
+
+# Lanes, in order of urgency. Each lane has its own thread pool so a burst of
+# low-priority work can never occupy the threads the current image needs.
+LANE_INTERACTIVE = "interactive"  # direct responses to user input
+LANE_VISIBLE = "visible"  # content for what is on screen
+LANE_PREFETCH = "prefetch"  # work the user is likely to need next
+LANE_BACKGROUND = "background"  # reconciles, lookups, bulk writes
+
+LANES = (LANE_INTERACTIVE, LANE_VISIBLE, LANE_PREFETCH, LANE_BACKGROUND)
+
+DEFAULT_LANE_LIMITS: Dict[str, int] = {
+    LANE_INTERACTIVE: 4,
+    LANE_VISIBLE: 4,
+    LANE_PREFETCH: 2,
+    LANE_BACKGROUND: 2,
+}
+
+_LANE_THREAD_PRIORITY = {
+    LANE_INTERACTIVE: QThread.Priority.HighPriority,
+    LANE_VISIBLE: QThread.Priority.NormalPriority,
+    LANE_PREFETCH: QThread.Priority.LowPriority,
+    LANE_BACKGROUND: QThread.Priority.LowestPriority,
+}
 
 
 class WorkerSignals(QObject):
@@ -14,6 +59,11 @@ class WorkerSignals(QObject):
 
 _GLOBAL_ACTIVE_WORKERS = set()
 
+# owner -> {supersede key: TaskHandle}
+_KEYED_TASKS: "weakref.WeakKeyDictionary[object, Dict[str, TaskHandle]]" = (
+    weakref.WeakKeyDictionary()
+)
+
 
 class Worker(QRunnable):
     def __init__(self, fn: Callable, *args, **kwargs):
@@ -23,6 +73,15 @@ class Worker(QRunnable):
         self._args = args
         self._kwargs = kwargs
         self.signals = WorkerSignals()
+        self.token = CancelToken()
+        # perf_counter timestamps for task metrics.
+        self.submitted_at = time.perf_counter()
+        self.started_at: Optional[float] = None
+        self.ended_at: Optional[float] = None
+        self.delivered_at: Optional[float] = None
+        self.outcome = OUTCOME_CANCELLED
+        self.name = ""
+        self.lane = ""
 
     @staticmethod
     def _safe_emit(signal, *args):
@@ -34,14 +93,147 @@ class Worker(QRunnable):
 
     @pyqtSlot()
     def run(self):
+        # Cancelled tasks report neither a result nor an error, only finished.
+        self.started_at = time.perf_counter()
         try:
-            result = self._fn(*self._args, **self._kwargs)
-            self._safe_emit(self.signals.result, result)
+            self.token.raise_if_cancelled()
+            with (
+                bind_token(self.token),
+                tracing.span(
+                    self.name or "task",
+                    "task",
+                    lane=self.lane,
+                    queue_ms=round((self.started_at - self.submitted_at) * 1000.0, 3),
+                ),
+            ):
+                result = self._fn(*self._args, **self._kwargs)
+            self.ended_at = time.perf_counter()
+            if not self.token.cancelled:
+                self.outcome = OUTCOME_OK
+                self._safe_emit(self.signals.result, result)
+        except TaskCancelledError:
+            pass
         except Exception as exc:
-            self._safe_emit(self.signals.error, exc)
+            if not self.token.cancelled:
+                self.outcome = OUTCOME_ERROR
+                self._safe_emit(self.signals.error, exc)
         finally:
+            if self.ended_at is None:
+                self.ended_at = time.perf_counter()
             self._safe_emit(self.signals.finished)
 
+    def mark_delivered(self, *_args) -> None:
+        if self.delivered_at is None:
+            self.delivered_at = time.perf_counter()
+
+    def to_record(self, name: str, lane: str) -> TaskRecord:
+        delivered = self.delivered_at or time.perf_counter()
+        started = self.started_at if self.started_at is not None else delivered
+        ended = self.ended_at if self.ended_at is not None else started
+        return TaskRecord(
+            name=name,
+            lane=lane,
+            outcome=self.outcome,
+            submitted_at=time.time() - (delivered - self.submitted_at),
+            queue_secs=max(0.0, started - self.submitted_at),
+            run_secs=max(0.0, ended - started),
+            delivery_secs=max(0.0, delivered - ended),
+        )
+
+
+class TaskHandle:
+    """Handle returned by ``run_async`` for cancelling a task."""
+
+    def __init__(self, worker: Worker, pool: QThreadPool):
+        self._worker = worker
+        self._pool = pool
+
+    @property
+    def cancelled(self) -> bool:
+        return self._worker.token.cancelled
+
+    def cancel(self) -> bool:
+        """Cancel the task; return True if it was still queued and never runs.
+
+        A running task stops at its next cancellation check. Either way its
+        ``on_result`` and ``on_error`` callbacks are not called, while
+        ``on_finished`` still is, from the event loop.
+        """
+        self._worker.token.cancel()
+        if sip.isdeleted(self._pool) or not self._pool.tryTake(self._worker):
+            return False
+        QTimer.singleShot(0, partial(Worker._safe_emit, self._worker.signals.finished))
+        return True
+
+
+def cancel_tasks(owner, key: str) -> bool:
+    """Cancel the task ``owner`` started with ``supersede_key=key``, if any."""
+    handle = _KEYED_TASKS.get(owner, {}).pop(key, None)
+    if handle is None:
+        return False
+    handle.cancel()
+    return True
+
+
+class TaskScheduler:
+    """One QThreadPool per lane with its own concurrency limit.
+
+    Within a lane, queued tasks start in ``priority`` order (higher first).
+    """
+
+    def __init__(self, limits: Optional[Mapping[str, int]] = None):
+        self._limits: Dict[str, int] = dict(DEFAULT_LANE_LIMITS)
+        self._pools: Dict[str, QThreadPool] = {}
+        self.configure(limits or {})
+
+    def pool(self, lane: str) -> QThreadPool:
+        if lane not in self._limits:
+            raise ValueError("Unknown task lane: {!r}".format(lane))
+        pool = self._pools.get(lane)
+        # Pools made before a QApplication are deleted along with it.
+        if pool is None or sip.isdeleted(pool):
+            pool = QThreadPool()
+            pool.setThreadPriority(_LANE_THREAD_PRIORITY[lane])
+            pool.setMaxThreadCount(self._limits[lane])
+            self._pools[lane] = pool
+        return pool
+
+    def configure(self, limits: Mapping[str, int]) -> None:
+        """Set the maximum number of threads for the given lanes.
+
+        Lowering a limit does not interrupt running tasks; it takes effect as
+        they finish.
+        """
+        for lane, limit in limits.items():
+            pool = self.pool(lane)
+            self._limits[lane] = max(1, int(limit))
+            pool.setMaxThreadCount(self._limits[lane])
+
+    def limits(self) -> Dict[str, int]:
+        return dict(self._limits)
+
+    def active_counts(self) -> Dict[str, int]:
+        return {lane: self.pool(lane).activeThreadCount() for lane in LANES}
+
+    def wait_for_done(self, msecs: int = -1) -> bool:
+        return all([self.pool(lane).waitForDone(msecs) for lane in LANES])
+
+
+_SCHEDULER: Optional[TaskScheduler] = None
+
+
+def task_scheduler() -> TaskScheduler:
+    """Return the process-wide scheduler, creating it on first use."""
+    global _SCHEDULER
+    if _SCHEDULER is None:
+        _SCHEDULER = TaskScheduler()
+    return _SCHEDULER
+
+
+def configure_lanes(limits: Mapping[str, int]) -> None:
+    """Apply per-lane thread limits, e.g. from ``AppSettings.lane_limits``."""
+    task_scheduler().configure(limits)
+
 
 def run_async(
     owner,
@@ -50,12 +242,32 @@ def run_async(
     on_result: Optional[Callable] = None,
     on_error: Optional[Callable] = None,
     on_finished: Optional[Callable] = None,
+    lane: str = LANE_INTERACTIVE,
+    priority: int = 0,
+    supersede_key: Optional[str] = None,
+    task_name: Optional[str] = None,
     thread_pool: Optional[QThreadPool] = None,
     **kwargs,
-):
-    """Run a function in the global QThreadPool with optional callbacks."""
+) -> TaskHandle:
+    """Run a function on a scheduler lane with optional callbacks.
+
+    With ``supersede_key``, an earlier task the same owner started with that
+    key is cancelled first, so only the latest request of a kind runs.
+    Timings are recorded in ``task_metrics()`` under ``task_name``, which
+    defaults to the qualified name of ``fn``.
+    ``thread_pool`` bypasses the scheduler and runs on the given pool.
+    """
+    pool = thread_pool if thread_pool is not None else task_scheduler().pool(lane)
     worker = Worker(fn, *args, **kwargs)
+    handle = TaskHandle(worker, pool)
+    name = task_name or _task_name(fn)
+    worker.name = name
+    worker.lane = lane
 
+    # Connected first so the delivery time excludes the callbacks themselves.
+    worker.signals.result.connect(worker.mark_delivered)
+    worker.signals.error.connect(worker.mark_delivered)
+    worker.signals.finished.connect(worker.mark_delivered)
     if on_result is not None:
         worker.signals.result.connect(on_result)
     if on_error is not None:
@@ -70,18 +282,48 @@ def run_async(
     owner._active_workers.add(worker)
     _GLOBAL_ACTIVE_WORKERS.add(worker)
 
+    if supersede_key is not None:
+        cancel_tasks(owner, supersede_key)
+        _KEYED_TASKS.setdefault(owner, {})[supersede_key] = handle
+
     owner_ref = weakref.ref(owner)
 
     def _cleanup():
         owner_obj = owner_ref()
         if owner_obj is not None and hasattr(owner_obj, "_active_workers"):
             owner_obj._active_workers.discard(worker)
+        if owner_obj is not None and supersede_key is not None:
+            keyed = _KEYED_TASKS.get(owner_obj, {})
+            if keyed.get(supersede_key) is handle:
+                del keyed[supersede_key]
         _GLOBAL_ACTIVE_WORKERS.discard(worker)
+        task_metrics().record(worker.to_record(name, lane))
 
     worker.signals.finished.connect(_cleanup)
-    pool = thread_pool if thread_pool is not None else QThreadPool.globalInstance()
-    if pool is None:
-        worker.run()
-        return
+    pool.start(worker, priority)
+    return handle
+
+
+class MainThreadRelay(QObject):
+    """Run callables on the thread that owns the relay, usually the UI thread.
+
+    Background services report through plain callbacks that may fire on any
+    thread; posting them through a relay queues them onto the Qt event loop.
+    """
+
+    _invoke = pyqtSignal(object)
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._invoke.connect(self._dispatch)
+
+    def post(self, fn: Callable, *args) -> None:
+        try:
+            self._invoke.emit(partial(fn, *args))
+        except RuntimeError:
+            # Relay may be torn down during app shutdown.
+            pass
 
-    pool.start(worker)
+    @pyqtSlot(object)
+    def _dispatch(self, call) -> None:
+        call()
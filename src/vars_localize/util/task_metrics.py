@@ -0,0 +1,159 @@
+"""Per-task timing collected from ``run_async`` workers.
+
+Every task records three intervals: time spent waiting in its lane's queue,
+time spent running, and the delay between the worker finishing and its
+callbacks running on the UI thread. Totals are kept per task name; the most
+recent individual records are kept in a bounded buffer for export.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Union
+
+OUTCOME_OK = "ok"
+OUTCOME_ERROR = "error"
+OUTCOME_CANCELLED = "cancelled"
+
+DEFAULT_RECORD_LIMIT = 5000
+
+
+@dataclass(frozen=True)
+class TaskRecord:
+    name: str
+    lane: str
+    outcome: str
+    submitted_at: float
+    queue_secs: float
+    run_secs: float
+    delivery_secs: float
+
+
+@dataclass
+class TaskStats:
+    name: str
+    lane: str
+    count: int = 0
+    errors: int = 0
+    cancelled: int = 0
+    queue_total_secs: float = 0.0
+    queue_max_secs: float = 0.0
+    run_total_secs: float = 0.0
+    run_max_secs: float = 0.0
+    delivery_total_secs: float = 0.0
+    delivery_max_secs: float = 0.0
+
+    @property
+    def queue_mean_secs(self) -> float:
+        return self.queue_total_secs / self.count if self.count else 0.0
+
+    @property
+    def run_mean_secs(self) -> float:
+        return self.run_total_secs / self.count if self.count else 0.0
+
+    @property
+    def delivery_mean_secs(self) -> float:
+        return self.delivery_total_secs / self.count if self.count else 0.0
+
+    def add(self, record: TaskRecord) -> None:
+        self.count += 1
+        if record.outcome == OUTCOME_ERROR:
+            self.errors += 1
+        elif record.outcome == OUTCOME_CANCELLED:
+            self.cancelled += 1
+        self.queue_total_secs += record.queue_secs
+        self.queue_max_secs = max(self.queue_max_secs, record.queue_secs)
+        self.run_total_secs += record.run_secs
+        self.run_max_secs = max(self.run_max_secs, record.run_secs)
+        self.delivery_total_secs += record.delivery_secs
+        self.delivery_max_secs = max(self.delivery_max_secs, record.delivery_secs)
+
+
+class TaskMetrics:
+    """Thread-safe collector of task records and per-name totals.
+
+    Args:
+        record_limit: Number of individual records kept for export.
+    """
+
+    def __init__(self, record_limit: int = DEFAULT_RECORD_LIMIT):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, TaskStats] = {}
+        self._records: Deque[TaskRecord] = deque(maxlen=max(1, int(record_limit)))
+
+    def record(self, record: TaskRecord) -> None:
+        with self._lock:
+            stats = self._stats.get(record.name)
+            if stats is None:
+                stats = self._stats[record.name] = TaskStats(record.name, record.lane)
+            stats.add(record)
+            self._records.append(record)
+
+    def summary(self) -> List[TaskStats]:
+        """Return a copy of the per-name totals, slowest total run time first."""
+        with self._lock:
+            stats = [TaskStats(**asdict(item)) for item in self._stats.values()]
+        return sorted(stats, key=lambda item: item.run_total_secs, reverse=True)
+
+    def records(self) -> List[TaskRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._records.clear()
+
+    def dump(self, path: Union[str, Path]) -> Path:
+        """Write the records to ``path`` as CSV (``.csv``) or JSON (otherwise).
+
+        The JSON form also carries the per-name summary.
+        """
+        target = Path(path)
+        records = self.records()
+        if target.suffix.lower() == ".csv":
+            with target.open("w", newline="", encoding="utf-8") as handle:
+                writer = csv.writer(handle)
+                writer.writerow([field.name for field in fields(TaskRecord)])
+                for record in records:
+                    writer.writerow(list(asdict(record).values()))
+            return target
+
+        summary = []
+        for stats in self.summary():
+            item = asdict(stats)
+            item["queue_mean_secs"] = stats.queue_mean_secs
+            item["run_mean_secs"] = stats.run_mean_secs
+            item["delivery_mean_secs"] = stats.delivery_mean_secs
+            summary.append(item)
+        payload = {
+            "summary": summary,
+            "records": [asdict(record) for record in records],
+        }
+        target.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        return target
+
+
+_METRICS: Optional[TaskMetrics] = None
+
+
+def task_metrics() -> TaskMetrics:
+    """Return the process-wide collector, creating it on first use."""
+    global _METRICS
+    if _METRICS is None:
+        _METRICS = TaskMetrics()
+    return _METRICS
+
+
+def task_name(fn) -> str:
+    """Readable name for a task callable, e.g. ``ImageView._m3_fetch_image``."""
+    target = getattr(fn, "func", fn)  # functools.partial
+    name = getattr(target, "__qualname__", None) or getattr(target, "__name__", None)
+    if not name:
+        return type(target).__name__
+    return name.replace(".<locals>", "")
@@ -0,0 +1,196 @@
+"""Chrome trace-event recording for service calls, tasks, decoding and SAM.
+
+Tracing is off unless ``start_tracing`` is called (``vars-localize --trace
+FILE``). While off, ``span`` returns a shared no-op context manager and
+``traced`` functions call straight through, so instrumented code pays for a
+single global check. The trace file is JSON in the Chrome trace-event format
+and opens in Perfetto (https://ui.perfetto.dev) or ``chrome://tracing``.
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar, Union
+
+from vars_localize.util.logging import get_logger
+
+logger = get_logger("Tracing")
+
+DEFAULT_MAX_EVENTS = 1_000_000
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+class ChromeTracer:
+    """Collect complete ("X") events in memory and write them as JSON.
+
+    Args:
+        path: Output file, written by ``write``.
+        max_events: Events beyond this count are dropped and counted.
+    """
+
+    def __init__(self, path: Union[str, Path], max_events: int = DEFAULT_MAX_EVENTS):
+        self._path = Path(path)
+        self._max_events = max(1, int(max_events))
+        self._lock = threading.Lock()
+        self._events: List[Dict[str, Any]] = []
+        self._thread_names: Dict[int, str] = {}
+        self._dropped = 0
+        self._origin_ns = time.perf_counter_ns()
+        self._pid = os.getpid()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def now_us(self) -> float:
+        return (time.perf_counter_ns() - self._origin_ns) / 1000.0
+
+    def add_complete(
+        self,
+        name: str,
+        category: str,
+        start_us: float,
+        duration_us: float,
+        args: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start_us,
+            "dur": duration_us,
+            "pid": self._pid,
+            "tid": thread.ident,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            if len(self._events) >= self._max_events:
+                self._dropped += 1
+                return
+            self._events.append(event)
+            if thread.ident not in self._thread_names:
+                self._thread_names[thread.ident] = thread.name
+
+    def write(self) -> Path:
+        with self._lock:
+            events = list(self._events)
+            thread_names = dict(self._thread_names)
+            dropped = self._dropped
+        metadata = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self._pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in thread_names.items()
+        ]
+        payload = {
+            "traceEvents": metadata + events,
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped_events": dropped},
+        }
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._path.write_text(json.dumps(payload), encoding="utf-8")
+        return self._path
+
+
+_TRACER: Optional[ChromeTracer] = None
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> Dict[str, Any]:
+        return {}
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def tracing_enabled() -> bool:
+    return _TRACER is not None
+
+
+def start_tracing(path: Union[str, Path]) -> ChromeTracer:
+    """Start recording; the trace is written at ``stop_tracing`` or exit."""
+    global _TRACER
+    stop_tracing()
+    _TRACER = ChromeTracer(path)
+    atexit.register(stop_tracing)
+    logger.info("Recording trace to {}", _TRACER.path)
+    return _TRACER
+
+
+def stop_tracing() -> Optional[Path]:
+    """Stop recording and write the trace file, if tracing was on."""
+    global _TRACER
+    tracer, _TRACER = _TRACER, None
+    if tracer is None:
+        return None
+    try:
+        path = tracer.write()
+    except OSError as exc:
+        logger.error("Could not write trace {}: {}", tracer.path, exc)
+        return None
+    logger.info("Wrote trace to {}", path)
+    return path
+
+
+@contextmanager
+def _record_span(
+    tracer: ChromeTracer, name: str, category: str, args: Dict[str, Any]
+) -> Iterator[Dict[str, Any]]:
+    start = tracer.now_us()
+    try:
+        yield args
+    except BaseException as exc:
+        args["error"] = type(exc).__name__
+        raise
+    finally:
+        tracer.add_complete(name, category, start, tracer.now_us() - start, args)
+
+
+def span(name: str, category: str = "app", **args: Any):
+    """Context manager recording the enclosed block as one trace event.
+
+    The yielded dict can be filled with extra ``args`` (sizes, status codes)
+    before the block ends. Exceptions are recorded by type and re-raised.
+    """
+    tracer = _TRACER
+    if tracer is None:
+        return _NOOP_SPAN
+    return _record_span(tracer, name, category, args)
+
+
+def traced(name: Optional[str] = None, category: str = "app") -> Callable[[_F], _F]:
+    """Decorator recording each call of a function as a trace event."""
+
+    def _decorate(fn: _F) -> _F:
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def _wrapper(*args, **kwargs):
+            tracer = _TRACER
+            if tracer is None:
+                return fn(*args, **kwargs)
+            with _record_span(tracer, label, category, {}):
+                return fn(*args, **kwargs)
+
+        return _wrapper  # type: ignore[return-value]
+
+    return _decorate
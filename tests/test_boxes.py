@@ -0,0 +1,45 @@
+import numpy as np
+
+from vars_localize.util.boxes import (
+    as_box_array,
+    filter_candidates,
+    iou_matrix,
+    nms,
+)
+
+
+def _iou(a, b):
+    ix = max(0, min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0]))
+    iy = max(0, min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1]))
+    inter = ix * iy
+    union = a[2] * a[3] + b[2] * b[3] - inter
+    return inter / union if inter > 0 and union > 0 else 0.0
+
+
+def test_iou_matrix_matches_pairwise_iou():
+    rng = np.random.default_rng(3)
+    a = rng.integers(0, 50, (7, 4)).tolist() + [[5, 5, 0, 0]]
+    b = rng.integers(0, 50, (5, 4)).tolist()
+
+    expected = [[_iou(box_a, box_b) for box_b in b] for box_a in a]
+
+    np.testing.assert_allclose(iou_matrix(as_box_array(a), as_box_array(b)), expected)
+
+
+def test_nms_keeps_the_first_of_overlapping_boxes():
+    boxes = as_box_array(
+        [(0, 0, 10, 10), (1, 0, 10, 10), (30, 30, 5, 5), (0, 1, 10, 10)]
+    )
+
+    assert nms(boxes, 0.5).tolist() == [0, 2]
+
+
+def test_filter_candidates_drops_small_overlapping_and_duplicate_boxes():
+    boxes = as_box_array(
+        [(0, 0, 5, 5), (100, 100, 20, 20), (40, 40, 20, 20), (41, 40, 20, 20)]
+    )
+    existing = as_box_array([(100, 100, 20, 21)])
+
+    assert filter_candidates(boxes, 25, existing, 0.2).tolist() == [2, 3]
+    assert filter_candidates(boxes, 25, existing, 0.2, nms_iou=0.5).tolist() == [2]
+    assert filter_candidates(boxes, 25, as_box_array([]), 0.2).tolist() == [1, 2, 3]
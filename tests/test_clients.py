@@ -191,3 +191,22 @@ def test_vampire_squid_methods_success():
     assert client.get_media_by_video_reference_uuid("vr-1") == {
         "video_sequence_name": "dive-42"
     }
+
+
+def test_annosaurus_observation_paths_and_health(annosaurus_endpoint, fake_session):
+    fake_session.push("post", FakeResponse(payload={"access_token": "jwt"}))
+    fake_session.push("get", FakeResponse(payload={"uuid": "obs-1"}))
+    fake_session.push("delete", FakeResponse(status_code=204))
+    fake_session.push("get", FakeResponse(status_code=200))
+    client = clients.AnnosaurusClient(annosaurus_endpoint)
+
+    client.authenticate()
+    client.get_observation("obs-1")
+    client.delete_observation("obs-1")
+    client.check_health()
+
+    assert [(method, url) for method, url, _ in fake_session.calls[1:]] == [
+        ("get", "https://annosaurus.example/observations/obs-1"),
+        ("delete", "https://annosaurus.example/observations/obs-1"),
+        ("get", "https://annosaurus.example/health"),
+    ]
@@ -24,6 +24,12 @@ class _FakeButton:
     def isVisible(self) -> bool:
         return self._visible
 
+    def setChecked(self, checked: bool):
+        self._checked = bool(checked)
+
+    def isChecked(self) -> bool:
+        return getattr(self, "_checked", False)
+
 
 def _make_panel():
     from vars_localize.ui.DisplayPanel import DisplayPanel
@@ -32,6 +38,9 @@ def _make_panel():
     panel.sam_accept = _FakeButton()
     panel.sam_reject = _FakeButton()
     panel.sam_find_similar = _FakeButton()
+    panel.sam_select = _FakeButton()
+    panel.sam_accept_selected = _FakeButton()
+    panel.sam_accept_all = _FakeButton()
     panel.sam_label = SimpleNamespace(setText=lambda _text: None)
     panel.sam_status_label = SimpleNamespace(setText=lambda _text: None)
     return panel
@@ -66,7 +75,10 @@ def test_set_sam_status_syncs_find_similar_enabled():
 def test_set_sam_candidate_state_syncs_find_similar_and_leaves_accept_reject_independent():
     panel = _make_panel()
 
-    panel.image_view = SimpleNamespace(can_find_similar=lambda: False)
+    panel.image_view = SimpleNamespace(
+        can_find_similar=lambda: False,
+        sam_candidate_selection=lambda: (0, False),
+    )
     panel._set_sam_candidate_state(True, 0, 1)
     assert panel.sam_accept.isEnabled() is True
     assert panel.sam_reject.isEnabled() is True
@@ -77,3 +89,24 @@ def test_set_sam_candidate_state_syncs_find_similar_and_leaves_accept_reject_ind
     assert panel.sam_accept.isEnabled() is False
     assert panel.sam_reject.isEnabled() is False
     assert panel.sam_find_similar.isEnabled() is True
+
+
+def test_set_sam_candidate_state_reflects_candidate_selection():
+    panel = _make_panel()
+    labels = []
+    panel.sam_label = SimpleNamespace(setText=labels.append)
+    panel.image_view = SimpleNamespace(
+        can_find_similar=lambda: False,
+        sam_candidate_selection=lambda: (2, True),
+    )
+
+    panel._set_sam_candidate_state(True, 1, 5)
+
+    assert panel.sam_select.isChecked() is True
+    assert panel.sam_accept_selected.isEnabled() is True
+    assert panel.sam_accept_all.isEnabled() is True
+    assert labels[-1] == "SAM candidate 2/5 (2 selected)"
+
+    panel._set_sam_candidate_state(False, 0, 0)
+    assert panel.sam_accept_selected.isEnabled() is False
+    assert panel.sam_accept_all.isVisible() is False
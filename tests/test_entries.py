@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from vars_localize.models import (
+    AssociationEntry,
+    BoxEntry,
+    ImagedMomentEntry,
+    ObservationEntry,
+)
+
+
+def _moment_payload() -> dict:
+    return {
+        "uuid": "im-1",
+        "video_reference_uuid": "vr-1",
+        "image_references": [
+            {"uuid": "ir-1", "url": "https://img/1.png", "format": "image/png"}
+        ],
+        "observations": [
+            {
+                "uuid": "obs-1",
+                "concept": "fish",
+                "observer": "u",
+                "associations": [
+                    {
+                        "uuid": "assoc-1",
+                        "link_name": "bounding box",
+                        "to_concept": "self",
+                        "link_value": json.dumps(
+                            {
+                                "x": 1,
+                                "y": 2,
+                                "width": 3,
+                                "height": 4,
+                                "image_reference_uuid": "ir-1",
+                            }
+                        ),
+                        "mime_type": "application/json",
+                    }
+                ],
+            }
+        ],
+    }
+
+
+def test_entries_use_slots():
+    moment = ImagedMomentEntry.from_dict(_moment_payload())
+    observation = moment.observations[0]
+
+    for entry in (moment, observation, observation.associations[0]):
+        assert not hasattr(entry, "__dict__")
+    assert isinstance(observation.boxes[0], BoxEntry)
+    assert not hasattr(observation.boxes[0], "__dict__")
+
+
+def test_raw_is_read_only_view_over_payload():
+    payload = _moment_payload()
+    moment = ImagedMomentEntry.from_dict(payload)
+
+    assert moment.raw["uuid"] == "im-1"
+    with pytest.raises(TypeError):
+        moment.raw["uuid"] = "other"  # type: ignore[index]
+
+    payload["extra"] = "late"
+    assert moment.raw["extra"] == "late"
+
+    data = moment.to_dict()
+    data["uuid"] = "copy"
+    assert payload["uuid"] == "im-1"
+
+
+def test_boxes_parse_into_compact_records():
+    moment = ImagedMomentEntry.from_dict(_moment_payload())
+    box = moment.observations[0].boxes[0]
+
+    assert (box.x, box.y, box.width, box.height) == (1, 2, 3, 4)
+    assert box.association_uuid == "assoc-1"
+    assert box.observation_uuid == "obs-1"
+    assert box.concept == "fish"
+    assert BoxEntry.from_dict(box.to_dict()) == box
+
+
+def test_hand_built_entries_keep_keyword_construction():
+    association = AssociationEntry(
+        uuid="a", link_name="color", to_concept="self", link_value="red", mime_type=None
+    )
+    observation = ObservationEntry(
+        uuid="obs", concept="fish", observer="u", associations=[association]
+    )
+
+    assert association.to_dict()["link_value"] == "red"
+    assert observation.to_dict()["associations"][0]["uuid"] == "a"
+    assert observation.raw == {}
+
+
+def test_observations_materialize_on_first_access():
+    payload = _moment_payload()
+    payload["observations"].append(
+        {"uuid": "obs-2", "concept": "crab", "observer": "u", "associations": []}
+    )
+    moment = ImagedMomentEntry.from_dict(payload)
+
+    assert not moment.is_materialized
+    assert moment.observation_count == 2
+    assert moment.localized_count == 1
+
+    observation = moment.observations[0]
+    assert moment.is_materialized
+    assert not observation.is_materialized
+    assert observation.box_count == 1
+
+    assert len(observation.boxes) == 1
+    assert observation.is_materialized
+    assert moment.localized_count == 1
+
+
+def test_prescan_is_replaced_by_parsed_counts():
+    payload = _moment_payload()
+    payload["observations"][0]["associations"][0]["link_value"] = (
+        '{"image_reference_uuid": "ir-1"}'
+    )
+    moment = ImagedMomentEntry.from_dict(payload)
+
+    assert moment.localized_count == 1
+    assert moment.observations[0].boxes == []
+    assert moment.localized_count == 0
+
+
+def test_moment_without_image_reference_parses_eagerly():
+    payload = _moment_payload()
+    payload["image_references"] = []
+    moment = ImagedMomentEntry.from_dict(payload)
+
+    assert moment.is_materialized
+    assert moment.observation_count == 1
+    assert moment.localized_count == 0
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import json
+from typing import Any, cast
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+
+def _moment_payload(index: int) -> dict:
+    return {
+        "uuid": "im-{}".format(index),
+        "recorded_timestamp": "2020-01-01T00:00:00Z",
+        "image_references": [
+            {"uuid": "ir-{}".format(index), "url": "u", "format": "image/png"}
+        ],
+        "observations": [
+            {
+                "uuid": "obs-{}-a".format(index),
+                "concept": "fish",
+                "observer": "u",
+                "associations": [
+                    {
+                        "uuid": "assoc-{}".format(index),
+                        "link_name": "bounding box",
+                        "link_value": json.dumps(
+                            {
+                                "x": 1,
+                                "y": 2,
+                                "width": 3,
+                                "height": 4,
+                                "image_reference_uuid": "ir-{}".format(index),
+                            }
+                        ),
+                    }
+                ],
+            },
+            {
+                "uuid": "obs-{}-b".format(index),
+                "concept": "crab",
+                "observer": "u",
+                "associations": [],
+            },
+        ],
+    }
+
+
+@pytest.fixture
+def tree():
+    from PyQt6.QtWidgets import QApplication
+
+    from vars_localize.ui.EntryTree import ImagedMomentTree
+
+    app = QApplication.instance() or QApplication([])
+    widget = ImagedMomentTree(cast(Any, object()))
+    yield widget
+    widget.deleteLater()
+    app.processEvents()
+
+
+def test_large_page_loads_into_models_without_widgets(tree):
+    from PyQt6.QtCore import Qt
+
+    from vars_localize.models import ImagedMomentEntry
+
+    moments = [ImagedMomentEntry.from_dict(_moment_payload(i)) for i in range(600)]
+    tree.load_page_data(moments)
+
+    assert tree.moments_table.rowCount() == 600
+    assert tree.moments_table.currentRow() == 0
+    assert tree.currentItem().imaged_moment is moments[0]
+    assert not moments[599].is_materialized
+
+    model = tree.moments_model
+    last = model.index(599, 4)
+    assert model.data(model.index(599, 0)) == "600"
+    assert model.data(model.index(599, 1)) == "2"
+    assert model.data(last) == "Partial (1/2)"
+    assert model.data(last, Qt.ItemDataRole.ToolTipRole).startswith("1 of 2")
+
+
+def test_set_current_item_selects_rows_by_identity(tree):
+    from vars_localize.models import ImagedMomentEntry
+
+    moments = [ImagedMomentEntry.from_dict(_moment_payload(i)) for i in range(5)]
+    tree.load_page_data(moments)
+
+    moment_item = tree.moments_model.row_payload(3)
+    tree.setCurrentItem(moment_item)
+    assert tree.moments_table.currentRow() == 3
+    assert tree.observations_table.rowCount() == 2
+
+    obs_item = moment_item.child(1)
+    tree.setCurrentItem(obs_item)
+    assert tree.currentItem() is obs_item
+    assert tree.selectedItems() == [obs_item]
+    assert tree.associations_table.rowCount() == 0
+
+    tree.setCurrentItem(moment_item.child(0))
+    assert tree.associations_table.rowCount() == 1
+    assoc_model = tree.associations_model
+    assert assoc_model.data(assoc_model.index(0, 1)) == "Bounding Box"
+    assert assoc_model.data(assoc_model.index(0, 3)) == "3x4 @ (1,2)"
+
+
+def test_concept_filter_limits_observation_rows(tree):
+    from vars_localize.models import ImagedMomentEntry
+
+    tree.load_page_data([ImagedMomentEntry.from_dict(_moment_payload(0))])
+    idx = tree.concept_filter_combo.findData("crab")
+    tree.concept_filter_combo.setCurrentIndex(idx)
+
+    assert tree.observations_table.rowCount() == 1
+    assert tree.observations_model.row_payload(0).observation.concept == "crab"
+
+
+def test_reloaded_moment_patches_only_changed_rows(tree):
+    from vars_localize.models import ImagedMomentEntry
+
+    tree.load_page_data([ImagedMomentEntry.from_dict(_moment_payload(0))])
+    moment_item = tree.moments_model.row_payload(0)
+    tree.setCurrentItem(moment_item)
+    fish_item = moment_item.child(0)
+    crab_item = moment_item.child(1)
+    tree.setCurrentItem(fish_item)
+
+    resets = []
+    changed_rows = []
+    inserted = []
+    model = tree.observations_model
+    model.modelReset.connect(lambda: resets.append(True))
+    model.dataChanged.connect(
+        lambda top, bottom, roles: changed_rows.append((top.row(), bottom.row()))
+    )
+    model.rowsInserted.connect(lambda _parent, first, last: inserted.append(first))
+
+    payload = _moment_payload(0)
+    payload["observations"][1]["concept"] = "octopus"
+    payload["observations"].append(
+        {"uuid": "obs-0-c", "concept": "fish", "observer": "u", "associations": []}
+    )
+    tree._apply_loaded_imaged_moment_entry(
+        moment_item,
+        ImagedMomentEntry.from_dict(payload),
+        selected_observation_uuid="obs-0-a",
+    )
+
+    assert resets == []
+    assert inserted == [2]
+    assert (0, 0) not in changed_rows
+    assert (1, 1) in changed_rows
+    assert moment_item.child(0) is fish_item
+    assert moment_item.child(1) is crab_item
+    assert crab_item.observation.concept == "octopus"
+    assert tree.observations_table.rowCount() == 3
+    assert tree.observations_table.currentRow() == 0
+    assert tree.currentItem() is fish_item
+    assert tree.associations_table.rowCount() == 1
+
+
+def test_add_observation_item_appends_row_without_reset(tree):
+    from vars_localize.models import ImagedMomentEntry, ObservationEntry
+
+    tree.load_page_data([ImagedMomentEntry.from_dict(_moment_payload(0))])
+    moment_item = tree.moments_model.row_payload(0)
+    tree.setCurrentItem(moment_item)
+    resets = []
+    tree.observations_model.modelReset.connect(lambda: resets.append(True))
+
+    obs_item = tree.add_observation_item(
+        moment_item, ObservationEntry("obs-new", "squid", "u")
+    )
+
+    assert resets == []
+    assert moment_item.childCount() == 3
+    assert tree.observations_model.row_of(obs_item) == 2
+    assert moment_item.imaged_moment.observation_count == 3
+    assert tree.concept_filter_combo.findData("squid") >= 0
+
+
+class _ObservationService:
+    def __init__(self, fail=()):
+        import threading
+
+        self.calls = []
+        self.fail = set(fail)
+        self._lock = threading.Lock()
+
+    def _record(self, op, observation_uuid):
+        from vars_localize.services.errors import ServiceRequestError
+
+        with self._lock:
+            self.calls.append((op, observation_uuid))
+        if observation_uuid in self.fail:
+            raise ServiceRequestError("rejected", "put", "/annotations", 400)
+        return {"uuid": observation_uuid}
+
+    def delete_observation(self, observation_uuid):
+        return self._record("delete_observation", observation_uuid)
+
+    def rename_observation(self, observation_uuid, new_concept, observer):
+        return self._record("rename_observation", observation_uuid)
+
+
+def _drain(tree, queue):
+    from PyQt6.QtWidgets import QApplication
+
+    assert queue.wait_idle(timeout=5)
+    QApplication.processEvents()
+
+
+def test_delete_observation_items_updates_rows_before_queued_deletes(tree):
+    from vars_localize.models import ImagedMomentEntry
+    from vars_localize.services.mutations import MutationQueue
+
+    service = _ObservationService()
+    tree.mutation_queue = MutationQueue(service, backoff_secs=0)
+    tree.load_page_data(
+        [ImagedMomentEntry.from_dict(_moment_payload(i)) for i in range(2)]
+    )
+    first = tree.moments_model.row_payload(0)
+    second = tree.moments_model.row_payload(1)
+    tree.setCurrentItem(first)
+    service_calls_before = list(service.calls)
+
+    tree.delete_observation_items([first.child(1), second.child(0), second.child(1)])
+
+    assert service_calls_before == []
+    assert tree.observations_table.rowCount() == 1
+    assert first.imaged_moment.status == "Localized (1/1)"
+    assert second.childCount() == 0
+    assert second.imaged_moment.status == "Empty"
+
+    _drain(tree, tree.mutation_queue)
+    assert sorted(service.calls) == [
+        ("delete_observation", "obs-0-b"),
+        ("delete_observation", "obs-1-a"),
+        ("delete_observation", "obs-1-b"),
+    ]
+    tree.mutation_queue.close()
+
+
+def test_failed_rename_restores_affected_moments(tree, monkeypatch):
+    from PyQt6.QtWidgets import QMessageBox
+
+    from vars_localize.models import ImagedMomentEntry
+    from vars_localize.services.mutations import MutationQueue
+
+    service = _ObservationService(fail={"obs-0-b"})
+    tree.mutation_queue = MutationQueue(service, backoff_secs=0)
+    tree.load_page_data([ImagedMomentEntry.from_dict(_moment_payload(0))])
+    moment_item = tree.moments_model.row_payload(0)
+    tree.setCurrentItem(moment_item)
+    warnings = []
+    reloads = []
+    monkeypatch.setattr(
+        QMessageBox, "warning", lambda *args, **kwargs: warnings.append(args)
+    )
+    monkeypatch.setattr(
+        tree,
+        "load_imaged_moment_entry_async",
+        lambda entry, **kwargs: reloads.append(entry),
+    )
+
+    tree.rename_observation_items(list(moment_item.children()), "squid", "u")
+
+    assert [c.observation.concept for c in moment_item.children()] == ["squid", "squid"]
+    assert tree.concept_filter_combo.findData("squid") >= 0
+    assert tree.concept_filter_combo.findData("crab") < 0
+
+    _drain(tree, tree.mutation_queue)
+    assert len(service.calls) == 2
+    assert len(warnings) == 1
+    assert reloads == [moment_item]
+    tree.mutation_queue.close()
+
+
+def test_observation_edits_skip_the_queue_when_optimistic_updates_are_off(
+    tree, monkeypatch
+):
+    from vars_localize.models import ImagedMomentEntry
+    from vars_localize.services.mutations import MutationQueue
+
+    service = _ObservationService()
+    queue = MutationQueue(service, backoff_secs=0)
+    tree.mutation_queue = queue
+    tree.set_optimistic_updates(False)
+    batches = []
+    monkeypatch.setattr(
+        "vars_localize.ui.EntryTree.run_async",
+        lambda owner, fn, *args, **kwargs: batches.append(args),
+    )
+    tree.load_page_data([ImagedMomentEntry.from_dict(_moment_payload(0))])
+    moment_item = tree.moments_model.row_payload(0)
+    tree.setCurrentItem(moment_item)
+
+    tree.delete_observation_items([moment_item.child(0)])
+
+    assert batches == [(["obs-0-a"],)]
+    assert queue.pending_count == 0
+    queue.close()
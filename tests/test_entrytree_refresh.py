@@ -11,13 +11,13 @@ class DummyTree:
     def __init__(self):
         self._selected_moment = None
         self.refreshed = False
-        self.repopulated = False
+        self.patched = []
 
     def _refresh_moment_row(self, entry):
         self.refreshed = True
 
-    def _populate_observations(self, entry):
-        self.repopulated = True
+    def _patch_observation_rows(self, entry, changed_items):
+        self.patched = list(changed_items)
 
 
 def test_update_imaged_moment_entry_recomputes_status_and_refreshes_tree():
@@ -60,7 +60,7 @@ def test_update_imaged_moment_entry_recomputes_status_and_refreshes_tree():
     assert moment.status == "Partial (1/2)"
     assert len(moment.observations) == 2
     assert tree.refreshed is True
-    assert tree.repopulated is True
+    assert tree.patched == [obs1, obs2]
 
 
 def test_hydrate_imaged_moment_data_populates_video_sequence_name_from_media():
@@ -97,8 +97,17 @@ def test_load_page_data_preserves_concept_filter(monkeypatch):
         def selectRow(self, row):
             self.selected_rows.append(row)
 
+    class DummyMomentsModel:
+        def __init__(self):
+            self.rows = None
+
+        def set_rows(self, rows):
+            self.rows = list(rows)
+
     tree = ImagedMomentTree.__new__(ImagedMomentTree)
     tree.moments_table = DummyMomentsTable()
+    tree.moments_model = DummyMomentsModel()
+    tree._moment_items = []
     tree._active_concept_filter = "fish"
 
     clear_calls = []
@@ -112,3 +121,5 @@ def test_load_page_data_preserves_concept_filter(monkeypatch):
     tree.load_page_data([object()])
 
     assert clear_calls == [False]
+    assert tree.moments_model.rows == []
+    assert tree.moments_table.selected_rows == [0]
@@ -0,0 +1,46 @@
+import gc
+
+import numpy as np
+import pytest
+
+pytest.importorskip("PyQt6")
+
+
+def _image(width: int, height: int):
+    from PyQt6.QtGui import QColor, QImage
+
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(QColor(10, 20, 30))
+    image.setPixelColor(width - 1, height - 1, QColor(200, 100, 50))
+    return image
+
+
+def test_rgb_array_handles_padded_scanlines_and_outlives_the_image():
+    from vars_localize.util.images import qimage_to_rgb_array
+
+    # 5 px * 3 bytes = 15, padded to 16 bytes per line.
+    array = qimage_to_rgb_array(_image(5, 3))[1:]
+    gc.collect()
+
+    assert array.shape == (2, 5, 3)
+    assert array[0, 0].tolist() == [10, 20, 30]
+    assert array[-1, -1].tolist() == [200, 100, 50]
+    assert not array.flags.writeable
+
+
+def test_frame_array_shares_the_image_pixels():
+    from PyQt6.QtGui import QImage
+
+    from vars_localize.util.images import RGBFrame, qimage_to_rgb_array
+
+    frame = RGBFrame.from_qimage(_image(4, 2))
+
+    assert frame.image.format() == QImage.Format.Format_RGB888
+    assert np.shares_memory(frame.array, qimage_to_rgb_array(frame.image))
+
+
+def test_decode_image_rgb_rejects_undecodable_bytes():
+    from vars_localize.util.images import decode_image_rgb
+
+    assert decode_image_rgb(b"") is None
+    assert decode_image_rgb(b"not an image") is None
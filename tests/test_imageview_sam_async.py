@@ -945,3 +945,625 @@ def test_box_item_at_skips_non_box_overlays_to_find_real_box():
     # actual corner of the real box.
     corner_scene_pos = box_item.mapToScene(box_item.rect().bottomRight())
     assert view._is_resize_handle_at(viewport_pos=corner_scene_pos) is True
+
+
+def _optimistic_view(observation, calls):
+    from vars_localize.ui.ImageView import ImageView
+
+    tree = SimpleNamespace(
+        refresh_observation_item=lambda item: calls["refresh"].append(item),
+        reconcile_imaged_moment_entry_async=lambda entry, matches, **kwargs: calls[
+            "reconcile"
+        ].append((matches, kwargs)),
+    )
+    obs_item = SimpleNamespace(observation=observation, treeWidget=lambda: tree)
+
+    view = ImageView.__new__(ImageView)
+    view.optimistic_box_updates = True
+    view.moment = SimpleNamespace(
+        imaged_moment=SimpleNamespace(uuid="im-1"), treeWidget=lambda: tree
+    )
+    view.observation_map = {observation.uuid: obs_item}
+    view._box_reconcile_generation = 0
+    view._pending_box_writes = {}
+    view._pending_box_generation = {}
+    view._inflight_writes = {}
+    view.reload_moment = lambda preserve_sam_state=False: calls["reload"].append(
+        preserve_sam_state
+    )
+    view.redraw = lambda: calls.__setitem__("redraw", calls["redraw"] + 1)
+    return view, obs_item
+
+
+def _server_moment(link_value):
+    from vars_localize.models import ImagedMomentEntry
+
+    associations = []
+    if link_value is not None:
+        associations.append(
+            {"uuid": "assoc-1", "link_name": "bounding box", "link_value": link_value}
+        )
+    return ImagedMomentEntry.from_dict(
+        {
+            "uuid": "im-1",
+            "image_references": [{"uuid": "img-1", "url": "u"}],
+            "observations": [
+                {
+                    "uuid": "obs-1",
+                    "concept": "fish",
+                    "observer": "tester",
+                    "associations": associations,
+                }
+            ],
+        }
+    )
+
+
+def test_box_write_applies_locally_and_reconciles_in_background():
+    import json
+
+    from vars_localize.models import ObservationEntry
+    from vars_localize.ui.BoundingBox import SourceBoundingBox
+
+    box = SourceBoundingBox(
+        {"x": 10, "y": 20, "width": 30, "height": 40, "image_reference_uuid": "img-1"},
+        label="fish",
+        observer="tester",
+        observation_uuid="obs-1",
+        association_uuid="assoc-1",
+        part="self",
+    )
+    observation = ObservationEntry("obs-1", "fish", "tester")
+    calls = {"refresh": [], "reconcile": [], "reload": [], "redraw": 0}
+    view, obs_item = _optimistic_view(observation, calls)
+
+    view._commit_box_write(box, {"uuid": "assoc-1"})
+
+    assert calls["reload"] == []
+    assert calls["redraw"] == 1
+    assert calls["refresh"] == [obs_item]
+    assert observation.boxes == [box]
+    assert [assoc.uuid for assoc in observation.associations] == ["assoc-1"]
+    assert observation.associations[0].link_name == "bounding box"
+
+    matches, _kwargs = calls["reconcile"][0]
+    same = json.dumps(
+        {"x": 10, "y": 20, "width": 30, "height": 40, "image_reference_uuid": "img-1"}
+    )
+    assert matches(_server_moment(same)) is True
+
+    box.setWidth(35)
+    view._commit_box_write(box, None)
+    assert len(observation.associations) == 1
+    stale_matches, _kwargs = calls["reconcile"][0]
+    latest_matches, kwargs = calls["reconcile"][1]
+    # Superseded checks defer to the newest one, which sees the conflict.
+    assert stale_matches(_server_moment(same)) is True
+    assert latest_matches(_server_moment(same)) is False
+    assert "on_conflict" in kwargs
+
+
+def test_box_write_falls_back_to_reload_when_optimistic_updates_disabled():
+    from vars_localize.models import ObservationEntry
+    from vars_localize.ui.BoundingBox import SourceBoundingBox
+
+    box = SourceBoundingBox(
+        {"x": 1, "y": 2, "width": 3, "height": 4, "image_reference_uuid": "img-1"},
+        label="fish",
+        observation_uuid="obs-1",
+        association_uuid="assoc-1",
+    )
+    observation = ObservationEntry("obs-1", "fish", "tester")
+    calls = {"refresh": [], "reconcile": [], "reload": [], "redraw": 0}
+    view, _obs_item = _optimistic_view(observation, calls)
+    view.set_optimistic_box_updates(False)
+
+    view._commit_box_write(box, {"uuid": "assoc-1"}, preserve_sam_state=True)
+
+    assert calls["reload"] == [True]
+    assert calls["reconcile"] == []
+    assert observation.associations == []
+
+
+def test_server_match_treats_deleted_boxes_as_expected_absent():
+    from vars_localize.ui.ImageView import _server_matches_box_writes
+
+    assert _server_matches_box_writes(_server_moment(None), {"assoc-1": None})
+    assert not _server_matches_box_writes(_server_moment("{}"), {"assoc-1": None})
+
+
+def _queued_view(service):
+    import queue as queue_mod
+
+    from vars_localize.services.mutations import MutationQueue
+    from vars_localize.ui.ImageView import ImageView
+
+    posted = queue_mod.Queue()
+    children = []
+    reconciles = []
+    tree = SimpleNamespace(editable_uuids=set())
+
+    def add_observation_item(_moment, observation):
+        item = SimpleNamespace(
+            observation=observation, is_observation=True, treeWidget=lambda: tree
+        )
+        children.append(item)
+        return item
+
+    tree.add_observation_item = add_observation_item
+    tree.refresh_observation_item = lambda _item: None
+    tree.reconcile_imaged_moment_entry_async = (
+        lambda entry, matches, **kwargs: reconciles.append(matches)
+    )
+
+    view = ImageView.__new__(ImageView)
+    view.optimistic_box_updates = True
+    view.mutation_queue = MutationQueue(service, backoff_secs=0)
+    view._write_relay = SimpleNamespace(post=lambda fn, *args: posted.put((fn, args)))
+    view._placeholder_refs = {}
+    view._inflight_writes = {}
+    view._pending_box_writes = {}
+    view._pending_box_generation = {}
+    view._box_reconcile_generation = 0
+    view.observer = "tester"
+    view.observation_uuid = None
+    view._active_annotation_concept = "fish"
+    view.observation_map = {}
+    view.enabled_observations = {}
+    view.moment = SimpleNamespace(
+        imaged_moment=SimpleNamespace(
+            uuid="im-1",
+            video_reference_uuid="vr-1",
+            timecode=None,
+            elapsed_time_millis=123,
+            recorded_timestamp=None,
+        ),
+        treeWidget=lambda: tree,
+        children=lambda: children,
+    )
+    view.redraw = lambda: None
+
+    def drain(count):
+        for _ in range(count):
+            fn, args = posted.get(timeout=5)
+            fn(*args)
+
+    return view, tree, children, reconciles, drain
+
+
+def test_queued_box_on_new_observation_resolves_placeholders():
+    from vars_localize.ui.BoundingBox import SourceBoundingBox
+
+    class Service:
+        def __init__(self):
+            self.calls = []
+
+        def create_observation(self, **kwargs):
+            self.calls.append(("create_observation", kwargs))
+            return {"observation_uuid": "obs-real"}
+
+        def create_box(self, **kwargs):
+            self.calls.append(("create_box", kwargs))
+            return {"uuid": "assoc-real"}
+
+    service = Service()
+    view, tree, children, reconciles, drain = _queued_view(service)
+
+    box = SourceBoundingBox(
+        {"x": 1, "y": 2, "width": 3, "height": 4, "image_reference_uuid": "img-1"},
+        label=None,
+        part="self",
+    )
+    assert view.handle_new_box(box) is None
+
+    # Applied locally before any write lands.
+    placeholder_obs = box.observation_uuid
+    assert placeholder_obs.startswith("pending-observation-")
+    assert box.association_uuid.startswith("pending-association-")
+    assert [item.observation.concept for item in children] == ["fish"]
+    assert placeholder_obs in view.observation_map
+
+    drain(2)
+
+    assert [op for op, _ in service.calls] == ["create_observation", "create_box"]
+    assert service.calls[0][1]["elapsed_time_millis"] == 123
+    assert service.calls[1][1]["observation_uuid"] == "obs-real"
+    assert box.observation_uuid == "obs-real"
+    assert box.association_uuid == "assoc-real"
+    assert children[0].observation.uuid == "obs-real"
+    assert [a.uuid for a in children[0].observation.associations] == ["assoc-real"]
+    assert "obs-real" in view.observation_map
+    assert tree.editable_uuids == {"obs-real"}
+    assert view._placeholder_refs == {}
+    assert len(reconciles) == 1
+    view.mutation_queue.close()
+
+
+def test_accept_selected_sam_candidates_queues_one_batch_and_reconciles_once():
+    import itertools
+    import threading
+
+    from vars_localize.ui.BoundingBox import SourceBoundingBox
+
+    class Service:
+        def __init__(self):
+            self.ids = itertools.count(1)
+            self.lock = threading.Lock()
+            self.calls = []
+
+        def create_observation(self, **kwargs):
+            with self.lock:
+                self.calls.append("create_observation")
+                return {"observation_uuid": "obs-{}".format(next(self.ids))}
+
+        def create_box(self, **kwargs):
+            with self.lock:
+                self.calls.append("create_box")
+                return {"uuid": "assoc-for-{}".format(kwargs["observation_uuid"])}
+
+    service = Service()
+    view, _tree, children, reconciles, drain = _queued_view(service)
+    candidates = [
+        SourceBoundingBox(
+            {
+                "x": i,
+                "y": i,
+                "width": 20,
+                "height": 20,
+                "image_reference_uuid": "img-1",
+            },
+            label="fish",
+            part="self",
+        )
+        for i in range(3)
+    ]
+    view._sam_candidate_boxes = list(candidates)
+    view._sam_candidate_index = 0
+    view._sam_selected_candidates = []
+    view._sam_candidate_concept = "fish"
+    view._notify_sam_candidate_state = lambda: None
+
+    view.toggle_sam_candidate_selected()
+    view._sam_candidate_index = 2
+    view.toggle_sam_candidate_selected()
+    assert view.sam_candidate_selection() == (2, True)
+
+    view.accept_selected_sam_candidates()
+
+    assert view._sam_candidate_boxes == [candidates[1]]
+    assert view._sam_candidate_index == 0
+    assert view.sam_candidate_selection() == (0, False)
+    assert len(children) == 2
+
+    drain(4)
+
+    assert sorted(service.calls) == ["create_box"] * 2 + ["create_observation"] * 2
+    accepted = [candidates[0], candidates[2]]
+    assert len({box.observation_uuid for box in accepted}) == 2
+    for box in accepted:
+        assert box.association_uuid == "assoc-for-{}".format(box.observation_uuid)
+    assert len(reconciles) == 1
+    view.mutation_queue.close()
+
+
+def test_sam_prefetch_encodes_upcoming_images_on_prefetch_lane(monkeypatch):
+    import numpy as np
+
+    from vars_localize.ui.ImageView import ImageView
+    from vars_localize.util.qt_async import LANE_PREFETCH
+
+    lanes = []
+
+    def fake_run_async(
+        _owner, fn, *args, on_result=None, on_finished=None, lane=None, **kwargs
+    ):
+        lanes.append(lane)
+        on_result(fn(*args))
+        on_finished()
+
+    monkeypatch.setattr("vars_localize.ui.ImageView.run_async", fake_run_async)
+
+    def _moment(uuid, url=None, cached_image=None):
+        imaged_moment = SimpleNamespace(
+            uuid=uuid,
+            image_reference_uuid="ref-" + uuid,
+            image_url=url,
+            cached_image=cached_image,
+        )
+        return SimpleNamespace(imaged_moment=imaged_moment)
+
+    upcoming = [
+        _moment("m2", cached_image="pixmap-2"),
+        _moment("m3"),  # no image
+        _moment("m4", cached_image="pixmap-4"),
+    ]
+    current = _moment("m1")
+    tree = SimpleNamespace(upcoming_moments=lambda item, count: upcoming[:count])
+    current.treeWidget = lambda: tree
+    encoded = []
+
+    class _Service:
+        available = True
+
+        def has_cached_features(self, key):
+            return key in encoded
+
+        def encode_to_cache(self, image_rgb, key):
+            encoded.append(key)
+            return True
+
+    view = ImageView.__new__(ImageView)
+    view._sam_assist_enabled = True
+    view.moment = current
+    view._sam_ready_image_uuid = "m1"
+    view._sam_embedding_busy = False
+    view._sam_prefetch_busy = False
+    view._sam_prefetch_count = 3
+    view._sam_prefetch_skipped = set()
+    view.sam3_service = _Service()
+    view._pixmap_to_rgb_ndarray = lambda _pixmap: np.zeros((2, 2, 3), np.uint8)
+
+    view._maybe_start_sam_prefetch()
+
+    assert encoded == ["ref-m2", "ref-m4"]
+    assert lanes == [LANE_PREFETCH, LANE_PREFETCH]
+    assert view._sam_prefetch_busy is False
+
+
+def test_sam_prefetch_waits_for_the_current_image(monkeypatch):
+    from vars_localize.ui.ImageView import ImageView
+
+    calls = []
+    monkeypatch.setattr(
+        "vars_localize.ui.ImageView.run_async", lambda *a, **k: calls.append(a)
+    )
+    view = ImageView.__new__(ImageView)
+    view._sam_assist_enabled = True
+    view.moment = SimpleNamespace(imaged_moment=SimpleNamespace(uuid="m1"))
+    view._sam_ready_image_uuid = None
+
+    view._maybe_start_sam_prefetch()
+
+    assert calls == []
+
+
+def test_sam_embedding_encodes_the_decoded_frame_without_pixmap_conversion(
+    monkeypatch,
+):
+    import numpy as np
+
+    from vars_localize.ui.ImageView import ImageView
+
+    def fake_run_async(_owner, fn, *args, on_result=None, on_finished=None, **kw):
+        on_result(fn(*args))
+        on_finished()
+
+    monkeypatch.setattr("vars_localize.ui.ImageView.run_async", fake_run_async)
+    frame = SimpleNamespace(array=np.zeros((2, 2, 3), np.uint8))
+    encoded = []
+
+    class _Service:
+        available = True
+
+        def restore_image(self, key):
+            return False
+
+        def set_image(self, image_rgb, image_key=None):
+            encoded.append(image_rgb)
+
+    view = ImageView.__new__(ImageView)
+    view._sam_assist_enabled = True
+    view.moment = SimpleNamespace(
+        imaged_moment=SimpleNamespace(
+            uuid="m1", image_reference_uuid="ref-1", image_url=None
+        )
+    )
+    view.pixmap_src = object()
+    view._image_frame = ("m1", frame)
+    view.sam3_service = _Service()
+    view._sam_ready_image_uuid = None
+    view._sam_embedding_busy = False
+    view._sam_failed_image_uuid = None
+    view._sam_pending_concept = None
+    view._sam_pending_exemplar_concept = None
+    view._sam_prefetch_busy = False
+    view._sam_prefetch_count = 0
+    view._notify_sam_status = lambda _status: None
+    view._build_sam_status = lambda: "status"
+    view._pixmap_to_rgb_ndarray = lambda _pixmap: pytest.fail("pixmap converted")
+
+    view._maybe_start_sam_embedding()
+
+    assert encoded == [frame.array]
+    assert view._sam_ready_image_uuid == "m1"
+
+
+def _hover_view(monkeypatch, queries):
+    from PyQt6.QtCore import QPointF
+
+    from vars_localize.ui.ImageView import ImageView
+
+    def fake_run_async(_owner, _fn, x, y, on_result=None, on_finished=None, **kw):
+        queries.append({"point": (x, y), "result": on_result, "done": on_finished})
+
+    monkeypatch.setattr("vars_localize.ui.ImageView.run_async", fake_run_async)
+
+    view = ImageView.__new__(ImageView)
+    view._sam_assist_enabled = True
+    view._sam_point_enabled = True
+    view.pixmap_src = SimpleNamespace(width=lambda: 100, height=lambda: 100)
+    view.moment = SimpleNamespace(imaged_moment=SimpleNamespace(uuid="m1"))
+    view.resize_type = None
+    view._sam_ready_image_uuid = "m1"
+    view._sam_last_hover_point = None
+    view._sam_hover_inflight = False
+    view._sam_hover_pending = None
+    view._sam_hover_coalesced = 0
+    view._sam_hover_debounce_ms = 0
+    view._mouse_in_view = True
+    view.sam3_service = None
+    view._notify_sam_status = lambda _status: None
+    view._filter_point_prompt_boxes = lambda boxes: []
+    view.redraw = lambda: None
+    view.get_im_rel_point = lambda pos: QPointF(pos)
+    return view
+
+
+def _hover_event(x, y):
+    from PyQt6.QtCore import QPoint, Qt
+
+    return SimpleNamespace(
+        modifiers=lambda: Qt.KeyboardModifier.NoModifier,
+        buttons=lambda: Qt.MouseButton.NoButton,
+        pos=lambda: QPoint(x, y),
+    )
+
+
+def test_hover_queries_keep_only_the_latest_point_while_one_is_running(monkeypatch):
+    queries = []
+    view = _hover_view(monkeypatch, queries)
+
+    for x in (10, 11, 12, 40):
+        view._maybe_update_hover_candidate(_hover_event(x, 10))
+
+    assert [q["point"] for q in queries] == [(10, 10)]
+    queries[0]["done"]()
+    assert [q["point"] for q in queries] == [(10, 10), (40, 10)]
+    queries[1]["done"]()
+    assert len(queries) == 2
+
+
+def test_hover_latency_is_recorded_when_the_suggestion_is_shown(monkeypatch):
+    records = []
+    monkeypatch.setattr(
+        "vars_localize.ui.ImageView.log_perf",
+        lambda kind, op, ms, **fields: records.append((op, ms, fields)),
+    )
+    queries = []
+    view = _hover_view(monkeypatch, queries)
+
+    for x in (10, 20, 30):
+        view._maybe_update_hover_candidate(_hover_event(x, 10))
+    queries[0]["result"]([])
+    queries[0]["done"]()
+    queries[1]["result"]([])
+
+    assert [(op, fields["coalesced"]) for op, _ms, fields in records] == [
+        ("hover latency", 0),
+        ("hover latency", 1),
+    ]
+    assert all(ms >= fields["query_ms"] for _op, ms, fields in records)
+
+
+def test_make_candidate_boxes_filters_against_existing_boxes_once():
+    from vars_localize.ui.ImageView import ImageView
+
+    view = ImageView.__new__(ImageView)
+    view.moment = SimpleNamespace(
+        imaged_moment=SimpleNamespace(image_reference_uuid="im")
+    )
+    view.observer = "me"
+    view._sam_min_area = 100
+    view._sam_overlap_iou = 0.2
+    view._sam_nms_iou = 0.5
+    calls = {"existing": 0}
+
+    def _existing():
+        calls["existing"] += 1
+        return [_make_box(0, 0, 40, 40)]
+
+    view._all_existing_boxes = _existing
+    boxes = [(1.7, 0, 40, 40), (100, 100, 5, 5), (200, 10, 30, 30), (202, 10, 30, 30)]
+
+    candidates = view._make_candidate_boxes(boxes, None, "fish")
+    hover = view._make_candidate_boxes(
+        boxes, "obs-1", "fish", apply_overlap_filter=False
+    )
+
+    assert [(c.x(), c.y(), c.width(), c.height()) for c in candidates] == [
+        (200, 10, 30, 30)
+    ]
+    assert [c.x() for c in hover] == [1, 200]
+    assert hover[0].observation_uuid == "obs-1"
+    assert hover[0].image_reference_uuid == "im"
+    assert calls["existing"] == 1
+
+
+def test_bulk_box_creation_runs_on_the_background_lane(monkeypatch):
+    import vars_localize.ui.ImageView as image_view_module
+    from vars_localize.ui.ImageView import ImageView
+    from vars_localize.util.qt_async import LANE_BACKGROUND
+
+    calls = []
+    monkeypatch.setattr(
+        image_view_module,
+        "run_async",
+        lambda owner, fn, *args, **kwargs: calls.append((fn, kwargs)),
+    )
+    service = SimpleNamespace(create_boxed_observations=lambda *a, **k: [])
+    view = ImageView.__new__(ImageView)
+    view.moment = SimpleNamespace(
+        imaged_moment=SimpleNamespace(
+            video_reference_uuid="vr-1",
+            timecode=None,
+            elapsed_time_millis=None,
+            recorded_timestamp=None,
+        )
+    )
+    view.observer = "me"
+    view._require_m3_service = lambda: service
+    view._notify_sam_status = lambda _msg: None
+
+    view._create_boxed_observations_now("fish", [_make_box(0, 0, 20, 20)])
+
+    assert [(fn, kwargs["lane"]) for fn, kwargs in calls] == [
+        (service.create_boxed_observations, LANE_BACKGROUND)
+    ]
+
+
+def test_bulk_box_creation_without_queue_marks_new_observations_editable(
+    monkeypatch,
+):
+    from PyQt6.QtWidgets import QMessageBox
+
+    import vars_localize.ui.ImageView as image_view_module
+    from vars_localize.ui.ImageView import ImageView
+
+    calls = []
+    warnings = []
+    monkeypatch.setattr(
+        image_view_module,
+        "run_async",
+        lambda owner, fn, *args, **kwargs: calls.append(kwargs),
+    )
+    monkeypatch.setattr(
+        QMessageBox, "warning", lambda *args, **kwargs: warnings.append(args)
+    )
+    tree = SimpleNamespace(editable_uuids=set())
+    reloaded = []
+    view = ImageView.__new__(ImageView)
+    view.moment = SimpleNamespace(
+        imaged_moment=SimpleNamespace(
+            video_reference_uuid="vr-1",
+            timecode=None,
+            elapsed_time_millis=None,
+            recorded_timestamp=None,
+        ),
+        treeWidget=lambda: tree,
+    )
+    view.observer = "me"
+    view._require_m3_service = lambda: SimpleNamespace(
+        create_boxed_observations=lambda *a, **k: []
+    )
+    view._notify_sam_status = lambda _msg: None
+    view._build_sam_status = lambda: "status"
+    view._reload_entry = lambda entry: reloaded.append(set(tree.editable_uuids))
+
+    view._create_boxed_observations_now(
+        "fish", [_make_box(0, 0, 20, 20), _make_box(30, 30, 20, 20)]
+    )
+    calls[0]["on_result"]([{"observation_uuid": "obs-1"}, RuntimeError("denied")])
+
+    assert tree.editable_uuids == {"obs-1"}
+    assert reloaded == [{"obs-1"}]
+    assert len(warnings) == 1
@@ -353,3 +353,66 @@ def test_fetch_image_bytes_success_and_failure(monkeypatch):
     assert service.fetch_image_bytes("https://img") == b"fake-image"
     with pytest.raises(ServiceRequestError):
         service.fetch_image_bytes("https://img")
+
+
+def test_create_boxed_observations_reports_per_pair_results():
+    service = m3mod.M3Service("https://m3.example")
+
+    class BatchAnnoClient(StubAnnoClient):
+        def __init__(self):
+            super().__init__()
+            self.deleted = []
+
+        def create_observation(self, *args, **kwargs):
+            self.called.append("create_observation")
+            return {"observation_uuid": "obs-{}".format(len(self.called))}
+
+        def create_box(self, box_json, observation_uuid, to_concept=None):
+            if box_json.get("reject"):
+                raise ServiceRequestError("rejected", "post", "/associations", 400)
+            return {"uuid": "assoc-" + observation_uuid}
+
+        def delete_observation(self, observation_uuid: str):
+            self.deleted.append(observation_uuid)
+
+    anno = BatchAnnoClient()
+    service._annosaurus = cast(Any, anno)
+    service._oni = cast(Any, StubOniClient())
+    service._vampire_squid = cast(Any, StubVsClient())
+
+    results = service.create_boxed_observations(
+        "vr-1",
+        "fish",
+        "user",
+        [{"x": 1}, {"reject": True}, {"x": 3}],
+        elapsed_time_millis=5,
+        max_workers=1,
+    )
+
+    assert results[0] == {"uuid": "assoc-obs-1", "observation_uuid": "obs-1"}
+    assert isinstance(results[1], ServiceRequestError)
+    assert anno.deleted == ["obs-2"]
+    assert results[2]["observation_uuid"] == "obs-3"
+    assert service.create_boxed_observations("vr-1", "fish", "user", []) == []
+
+
+def test_batch_observation_edits_keep_order_and_errors():
+    service = m3mod.M3Service("https://m3.example")
+
+    class FlakyAnnoClient(StubAnnoClient):
+        def rename_observation(self, observation_uuid, new_concept, observer):
+            if observation_uuid == "obs-2":
+                raise ServiceRequestError("rejected", "put", "/annotations", 400)
+            return {"uuid": observation_uuid, "concept": new_concept}
+
+    service._annosaurus = cast(Any, FlakyAnnoClient())
+    service._oni = cast(Any, StubOniClient())
+    service._vampire_squid = cast(Any, StubVsClient())
+
+    renamed = service.rename_observations(["obs-1", "obs-2", "obs-3"], "crab", "u")
+    assert renamed[0] == {"uuid": "obs-1", "concept": "crab"}
+    assert isinstance(renamed[1], ServiceRequestError)
+    assert renamed[2]["uuid"] == "obs-3"
+
+    deleted = service.delete_observations(["obs-1", "obs-2"])
+    assert [response.status_code for response in deleted] == [200, 200]
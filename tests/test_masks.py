@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from vars_localize.util.masks import mask_boxes, mask_to_rle, masks_to_rle, rle_to_mask
+
+
+def _reference_boxes(masks):
+    boxes = []
+    for mask in masks:
+        ys, xs = np.where(mask > 0)
+        if xs.size == 0:
+            continue
+        w = int(xs.max()) - int(xs.min()) + 1
+        h = int(ys.max()) - int(ys.min()) + 1
+        if w > 1 and h > 1:
+            boxes.append((int(xs.min()), int(ys.min()), w, h))
+    return boxes
+
+
+def test_mask_boxes_match_per_mask_scan():
+    rng = np.random.default_rng(7)
+    masks = np.zeros((6, 40, 60), dtype=np.float32)
+    for mask in masks[:4]:
+        y, x = rng.integers(0, 30, 2)
+        mask[y : y + rng.integers(2, 10), x : x + rng.integers(2, 25)] = 0.9
+    masks[4, 5, 10:20] = 1.0  # one pixel tall
+    masks[2, 39, 59] = 0.5
+
+    assert mask_boxes(masks) == _reference_boxes(masks)
+    assert mask_boxes(masks > 0) == _reference_boxes(masks)
+
+
+def test_mask_boxes_accepts_a_single_mask_and_rejects_other_shapes():
+    mask = np.zeros((10, 10), dtype=np.uint8)
+    mask[2:5, 3:9] = 1
+
+    assert mask_boxes(mask) == [(3, 2, 6, 3)]
+    assert mask_boxes(np.zeros((2, 2, 2, 2))) == []
+    assert mask_boxes(None) == []
+
+
+def test_rle_round_trips_masks():
+    masks = np.zeros((3, 5, 7), dtype=bool)
+    masks[0, 1:4, 2:6] = True
+    masks[1, 0, 0] = True
+    masks[1, 4, 6] = True
+
+    rles = masks_to_rle(masks)
+
+    assert rles[0]["size"] == [5, 7]
+    assert rles[1]["counts"][0] == 0
+    assert rles[2]["counts"] == [35]
+    for rle, mask in zip(rles, masks):
+        np.testing.assert_array_equal(rle_to_mask(rle), mask)
+
+
+def test_rle_rejects_mismatched_counts():
+    rle = mask_to_rle(np.ones((2, 2), dtype=bool))
+
+    with pytest.raises(ValueError):
+        rle_to_mask({"size": [3, 3], "counts": rle["counts"]})
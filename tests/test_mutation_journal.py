@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+import requests
+
+from vars_localize.services.clients import AnnosaurusClient
+from vars_localize.services.journal import MutationJournal
+from vars_localize.services.mutations import (
+    MutationConflictError,
+    MutationQueue,
+    ResultRef,
+)
+
+
+class StandInAnnosaurus(ThreadingHTTPServer):
+    """Minimal in-process annosaurus with a switch to simulate an outage."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.down = False
+        self.observations = {}
+        self.associations = {}
+        self.writes = []
+        self._ids = iter(range(1, 10_000))
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return "http://127.0.0.1:{}".format(self.server_address[1])
+
+    def next_uuid(self, prefix: str) -> str:
+        return "{}-{}".format(prefix, next(self._ids))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StandInAnnosaurus
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, payload=None):
+        body = json.dumps(payload if payload is not None else {}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _form(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        fields = parse_qs(self.rfile.read(length).decode())
+        return {name: values[0] for name, values in fields.items()}
+
+    def _handle(self, method: str):
+        server = self.server
+        if server.down:
+            self._reply(503)
+            return
+        form = self._form() if method in ("POST", "PUT") else {}
+        parts = self.path.strip("/").split("/")
+        with server.lock:
+            if parts == ["health"] or parts == ["auth"]:
+                self._reply(200, {"access_token": "jwt"})
+            elif method == "POST" and parts == ["annotations"]:
+                uuid = server.next_uuid("obs")
+                server.observations[uuid] = {"uuid": uuid, "concept": form["concept"]}
+                server.writes.append(("create_observation", uuid))
+                self._reply(200, {"observation_uuid": uuid})
+            elif parts[0] == "associations" and method == "POST":
+                if form["observation_uuid"] not in server.observations:
+                    self._reply(400)
+                    return
+                uuid = server.next_uuid("assoc")
+                server.associations[uuid] = dict(form, uuid=uuid)
+                server.writes.append(("create_box", uuid))
+                self._reply(200, server.associations[uuid])
+            elif parts[0] == "associations" and len(parts) == 2:
+                association = server.associations.get(parts[1])
+                if association is None:
+                    self._reply(404)
+                elif method == "GET":
+                    self._reply(200, association)
+                elif method == "PUT":
+                    association.update(form)
+                    server.writes.append(("modify_box", parts[1]))
+                    self._reply(200, association)
+                else:
+                    del server.associations[parts[1]]
+                    server.writes.append(("delete_box", parts[1]))
+                    self._reply(200)
+            else:
+                self._reply(404)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+@pytest.fixture
+def stand_in():
+    server = StandInAnnosaurus()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client(server: StandInAnnosaurus) -> AnnosaurusClient:
+    client = AnnosaurusClient({"url": server.url, "secret": "s"})
+    client.authenticate()
+    return client
+
+
+def _queue(server: StandInAnnosaurus, client: AnnosaurusClient, **kwargs):
+    def probe():
+        requests.get(server.url + "/health", timeout=2).raise_for_status()
+
+    return MutationQueue(
+        client,
+        retries=0,
+        backoff_secs=0,
+        probe=probe,
+        probe_interval_secs=0.05,
+        **kwargs,
+    )
+
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def _queue_new_box(queue: MutationQueue):
+    obs = queue.submit(
+        "create_observation",
+        key="im-1",
+        video_reference_uuid="vr",
+        concept="fish",
+        observer="u",
+        elapsed_time_millis=0,
+    )
+    box = queue.submit(
+        "create_box",
+        key="im-1",
+        box_json={"x": 1},
+        observation_uuid=ResultRef(obs.id, ("observation_uuid", "uuid")),
+    )
+    return obs, box
+
+
+def test_offline_edits_replay_in_order_when_server_returns(stand_in):
+    client = _client(stand_in)
+    queue = _queue(stand_in, client)
+    stand_in.down = True
+
+    _obs, box = _queue_new_box(queue)
+
+    assert _wait_for(lambda: queue.offline)
+    assert queue.pending_count == 2
+    assert queue.failed_count == 0
+    assert not box.future.done()
+
+    stand_in.down = False
+    created = box.future.result(timeout=5)
+
+    assert queue.wait_idle(timeout=5)
+    assert not queue.offline
+    assert [op for op, _ in stand_in.writes] == ["create_observation", "create_box"]
+    assert stand_in.associations[created["uuid"]]["observation_uuid"] in (
+        stand_in.observations
+    )
+    queue.close()
+
+
+def test_journal_replays_edits_from_a_previous_session(stand_in, tmp_path):
+    client = _client(stand_in)
+    path = tmp_path / "journal.sqlite3"
+    stand_in.down = True
+    first = _queue(stand_in, client, journal=MutationJournal(path))
+    _queue_new_box(first)
+    assert _wait_for(lambda: first.offline and first.pending_count == 2)
+    first.close()
+
+    stand_in.down = False
+    second = _queue(stand_in, client, journal=MutationJournal(path))
+    assert second.pending_count == 2
+    assert stand_in.writes == []
+
+    assert second.replay() == 2
+    assert second.wait_idle(timeout=5)
+    assert [op for op, _ in stand_in.writes] == ["create_observation", "create_box"]
+    later = second.submit("delete_box", association_uuid=stand_in.writes[1][1])
+    assert later.id > 2
+    later.future.result(timeout=5)
+    second.close()
+
+    journal = MutationJournal(path)
+    assert journal.load() == ([], [], {})
+    journal.close()
+
+
+def test_replayed_edit_reports_conflict_instead_of_overwriting(stand_in):
+    client = _client(stand_in)
+    stand_in.observations["obs-0"] = {"uuid": "obs-0", "concept": "fish"}
+    stand_in.associations["assoc-0"] = {
+        "uuid": "assoc-0",
+        "observation_uuid": "obs-0",
+        "link_value": json.dumps({"x": 1}),
+    }
+    queue = _queue(stand_in, client)
+    stand_in.down = True
+
+    edit = queue.submit(
+        "modify_box",
+        key="obs-0",
+        expected=json.dumps({"x": 1}),
+        box_json={"x": 2},
+        observation_uuid="obs-0",
+        association_uuid="assoc-0",
+    )
+    assert _wait_for(lambda: queue.offline)
+
+    # Someone else moves the box while this client is offline.
+    stand_in.associations["assoc-0"]["link_value"] = json.dumps({"x": 3})
+    stand_in.down = False
+
+    with pytest.raises(MutationConflictError):
+        edit.future.result(timeout=5)
+    assert json.loads(stand_in.associations["assoc-0"]["link_value"]) == {"x": 3}
+
+    # Retrying a conflicted edit applies it over the server's version.
+    assert queue.retry_failed() == 1
+    assert queue.wait_idle(timeout=5)
+    assert json.loads(stand_in.associations["assoc-0"]["link_value"]) == {"x": 2}
+    queue.close()
+
+
+def test_replayed_delete_of_missing_association_is_skipped(stand_in):
+    client = _client(stand_in)
+    queue = _queue(stand_in, client)
+    stand_in.down = True
+
+    delete = queue.submit("delete_box", expected="{}", association_uuid="gone")
+    assert _wait_for(lambda: queue.offline)
+    stand_in.down = False
+
+    assert delete.future.result(timeout=5) is None
+    assert stand_in.writes == []
+    queue.close()
+
+
+def test_journal_prune_keeps_results_referenced_by_pending_edits(tmp_path):
+    journal = MutationJournal(tmp_path / "journal.sqlite3")
+    queue = MutationQueue(object(), journal=journal)
+    queue.set_offline(True)
+    done = queue.submit("create_observation", concept="fish")
+    orphan = queue.submit("create_observation", concept="crab")
+    queue.submit(
+        "create_box", box_json={}, observation_uuid=ResultRef(done.id, ("uuid",))
+    )
+    journal.complete(done.id, {"uuid": "obs-1"})
+    journal.complete(orphan.id, {"uuid": "obs-2"})
+
+    assert journal.prune() == 1
+    pending, failed, results = journal.load()
+    assert [m.op for m in pending] == ["create_box"]
+    assert failed == []
+    assert results == {done.id: {"uuid": "obs-1"}}
+    queue.close()
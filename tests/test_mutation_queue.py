@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from vars_localize.services.errors import ServiceRequestError, ServiceValidationError
+from vars_localize.services.mutations import (
+    Mutation,
+    MutationDependencyError,
+    MutationQueue,
+    ResultRef,
+)
+
+
+class RecordingService:
+    def __init__(self):
+        self.calls = []
+        self.failures = {}
+        self.gate = threading.Event()
+        self.gate.set()
+        self._lock = threading.Lock()
+
+    def _record(self, op, **kwargs):
+        self.gate.wait(5)
+        with self._lock:
+            self.calls.append((op, kwargs))
+            remaining = self.failures.get(op)
+            if remaining:
+                self.failures[op] = remaining[1:]
+                raise remaining[0]
+
+    def create_observation(self, **kwargs):
+        self._record("create_observation", **kwargs)
+        return {"observation_uuid": "obs-{}".format(kwargs["concept"])}
+
+    def create_box(self, **kwargs):
+        self._record("create_box", **kwargs)
+        return {"uuid": "assoc-for-{}".format(kwargs["observation_uuid"])}
+
+    def modify_box(self, **kwargs):
+        self._record("modify_box", **kwargs)
+        return {"uuid": kwargs["association_uuid"]}
+
+
+def _queue(service, **kwargs):
+    kwargs.setdefault("backoff_secs", 0)
+    return MutationQueue(service, **kwargs)
+
+
+def test_dependent_box_uses_created_observation_uuid():
+    service = RecordingService()
+    queue = _queue(service)
+    counts = []
+    queue.add_listener(lambda pending, failed: counts.append((pending, failed)))
+
+    obs = queue.submit(
+        "create_observation",
+        key="im-1",
+        video_reference_uuid="vr",
+        concept="fish",
+        observer="u",
+    )
+    box = queue.submit(
+        "create_box",
+        key="im-1",
+        box_json={"x": 1},
+        observation_uuid=ResultRef(obs.id, ("observation_uuid", "uuid")),
+    )
+
+    assert box.future.result(timeout=5) == {"uuid": "assoc-for-obs-fish"}
+    assert [op for op, _ in service.calls] == ["create_observation", "create_box"]
+    assert queue.wait_idle(timeout=5)
+    assert counts[-1] == (0, 0)
+    queue.close()
+
+
+def test_queued_modifications_coalesce_into_latest_geometry():
+    service = RecordingService()
+    service.gate.clear()
+    queue = _queue(service, max_workers=1)
+
+    first = queue.submit(
+        "modify_box", key="obs-1", box_json={"x": 0}, association_uuid="a-0"
+    )
+    second = queue.submit(
+        "modify_box",
+        key="obs-1",
+        coalesce_key="a-1",
+        box_json={"x": 1},
+        association_uuid="a-1",
+    )
+    third = queue.submit(
+        "modify_box",
+        key="obs-1",
+        coalesce_key="a-1",
+        box_json={"x": 2},
+        association_uuid="a-1",
+    )
+    assert third is second
+    assert queue.pending_count == 2
+
+    service.gate.set()
+    first.future.result(timeout=5)
+    second.future.result(timeout=5)
+    assert [kwargs["box_json"] for _, kwargs in service.calls] == [
+        {"x": 0},
+        {"x": 2},
+    ]
+    queue.close()
+
+
+def test_transient_failures_retry_and_permanent_failures_skip_dependents():
+    service = RecordingService()
+    service.failures["create_observation"] = [
+        ServiceRequestError("down", "post", "/annotations", status_code=503),
+        ServiceRequestError("bad", "post", "/annotations", status_code=400),
+    ]
+    queue = _queue(service, retries=3)
+
+    obs = queue.submit(
+        "create_observation", video_reference_uuid="vr", concept="a", observer="u"
+    )
+    box = queue.submit(
+        "create_box",
+        box_json={},
+        observation_uuid=ResultRef(obs.id, ("observation_uuid",)),
+    )
+
+    with pytest.raises(ServiceRequestError):
+        obs.future.result(timeout=5)
+    with pytest.raises(MutationDependencyError):
+        box.future.result(timeout=5)
+    assert len(service.calls) == 2
+    assert queue.failed_count == 2
+
+    assert queue.retry_failed() == 2
+    assert queue.wait_idle(timeout=5)
+    assert queue.failed_count == 0
+    assert [op for op, _ in service.calls][-2:] == ["create_observation", "create_box"]
+    queue.close()
+
+
+def test_independent_keys_run_concurrently():
+    service = RecordingService()
+    started = threading.Barrier(2, timeout=5)
+
+    def modify_box(**kwargs):
+        started.wait()
+        return {"uuid": kwargs["association_uuid"]}
+
+    service.modify_box = modify_box
+    queue = _queue(service, max_workers=2)
+
+    a = queue.submit("modify_box", key="obs-1", box_json={}, association_uuid="a")
+    b = queue.submit("modify_box", key="obs-2", box_json={}, association_uuid="b")
+
+    assert a.future.result(timeout=5) == {"uuid": "a"}
+    assert b.future.result(timeout=5) == {"uuid": "b"}
+    queue.close()
+
+
+def test_mutation_round_trips_and_rejects_unknown_ops():
+    mutation = Mutation(
+        id=3,
+        op="create_box",
+        key="k",
+        kwargs={"observation_uuid": ResultRef(2, ("observation_uuid",)), "x": 1},
+    )
+    restored = Mutation.from_dict(mutation.to_dict())
+    assert restored.kwargs == mutation.kwargs
+    assert restored.depends_on == {2}
+
+    queue = _queue(RecordingService())
+    with pytest.raises(ServiceValidationError):
+        queue.submit("get_imaged_moment", imaged_moment_uuid="x")
+    queue.close()
+
+
+def test_completed_results_stay_while_a_queued_mutation_refers_to_them(monkeypatch):
+    from vars_localize.services import mutations
+
+    monkeypatch.setattr(mutations, "_COMPLETED_HISTORY", 2)
+    queue = _queue(RecordingService())
+    waiting = Mutation(
+        id=10, op="create_box", kwargs={"observation_uuid": ResultRef(1)}
+    )
+    queue._pending[waiting.id] = waiting
+    queue._completed.update({1: {"uuid": "obs-1"}, 2: None, 3: None})
+
+    with queue._lock:
+        queue._trim_completed()
+
+    assert list(queue._completed) == [1, 3]
+
+
+def test_refs_to_completed_mutations_resolve_on_submit():
+    service = RecordingService()
+    queue = _queue(service)
+    obs = queue.submit("create_observation", video_reference_uuid="vr", concept="A")
+    obs.future.result(5)
+
+    box = queue.submit(
+        "create_box",
+        observation_uuid=ResultRef(obs.id, ("observation_uuid",)),
+        box_json={},
+    )
+
+    assert box.kwargs["observation_uuid"] == "obs-A"
+    assert box.depends_on == set()
+    box.future.result(5)
+    queue.close()
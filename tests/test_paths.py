@@ -0,0 +1,20 @@
+from pathlib import Path
+
+from vars_localize.util.paths import journal_path, sam_feature_dir
+
+
+def test_paths_honour_environment_overrides(monkeypatch, tmp_path):
+    monkeypatch.setenv("VARS_LOCALIZE_JOURNAL_FILE", str(tmp_path / "j.sqlite3"))
+    monkeypatch.setenv("VARS_LOCALIZE_SAM_FEATURE_DIR", str(tmp_path / "features"))
+
+    assert journal_path() == tmp_path / "j.sqlite3"
+    assert sam_feature_dir() == tmp_path / "features"
+
+
+def test_paths_default_to_the_app_data_directory(monkeypatch):
+    monkeypatch.delenv("VARS_LOCALIZE_JOURNAL_FILE", raising=False)
+    monkeypatch.delenv("VARS_LOCALIZE_SAM_FEATURE_DIR", raising=False)
+
+    assert journal_path().name == "edit-journal.sqlite3"
+    assert sam_feature_dir().name == "sam-features"
+    assert journal_path().parent == sam_feature_dir().parent != Path("")
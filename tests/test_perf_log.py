@@ -0,0 +1,94 @@
+import json
+import sys
+
+import pytest
+from loguru import logger
+
+from vars_localize.services.http import _operation_name
+from vars_localize.util import logging as logging_module
+from vars_localize.util.logging import (
+    PERF_KIND_NETWORK,
+    _PerfChannel,
+    configure_logging,
+    get_logger,
+    log_perf,
+    perf_timer,
+)
+
+
+@pytest.fixture
+def perf_log(tmp_path, monkeypatch):
+    monkeypatch.setenv("VARS_LOCALIZE_LOG_FILE", str(tmp_path / "app.log"))
+    monkeypatch.setenv("VARS_LOCALIZE_PERF_RATE_LIMIT", "1000")
+    monkeypatch.setattr(sys, "excepthook", sys.excepthook)
+    path = tmp_path / "perf.jsonl"
+    configure_logging(perf_log=path)
+    yield path
+    logger.remove()
+    logger.add(sys.stderr)
+    logging_module._PERF = None
+
+
+def _read_lines(path):
+    logger.complete()
+    return [json.loads(line) for line in path.read_text().splitlines() if line]
+
+
+def test_perf_records_go_only_to_the_perf_sink(perf_log, tmp_path):
+    get_logger("Test").info("regular message")
+    log_perf(PERF_KIND_NETWORK, "GET /anno/v1/fast/{uuid}", 12.5, bytes=2048)
+    with perf_timer("decode", "decode image", bytes=10) as fields:
+        fields["width"] = 4
+
+    records = _read_lines(perf_log)
+    assert [(r["kind"], r["op"]) for r in records] == [
+        ("network", "GET /anno/v1/fast/{uuid}"),
+        ("decode", "decode image"),
+    ]
+    assert records[0]["ms"] == 12.5
+    assert records[0]["bytes"] == 2048
+    assert records[1]["width"] == 4
+    regular = (tmp_path / "app.log").read_text()
+    assert "regular message" in regular
+    assert "fast" not in regular
+
+
+def test_perf_channel_rate_limits_and_reports_drops():
+    channel = _PerfChannel(sample_rate=1.0, rate_limit=2.0)
+
+    assert [channel._admit() for _ in range(4)] == [0, 0, None, None]
+
+    channel._updated -= 1.0  # one second later the bucket is full again
+    assert channel._admit() == 2
+
+
+def test_perf_channel_fractional_and_zero_rate_limits():
+    slow = _PerfChannel(sample_rate=1.0, rate_limit=0.5)
+
+    assert [slow._admit() for _ in range(2)] == [0, None]
+    slow._updated -= 2.0  # two seconds earn one token
+    assert slow._admit() == 1
+
+    unlimited = _PerfChannel(sample_rate=1.0, rate_limit=0.0)
+    assert all(unlimited._admit() == 0 for _ in range(100))
+
+
+def test_perf_channel_sampling_can_drop_everything():
+    channel = _PerfChannel(sample_rate=0.0, rate_limit=100.0)
+
+    assert all(channel._admit() is None for _ in range(10))
+
+
+def test_perf_helpers_are_noops_without_a_sink():
+    assert logging_module._PERF is None
+    log_perf(PERF_KIND_NETWORK, "GET /", 1.0)
+    with perf_timer(PERF_KIND_NETWORK, "GET /") as fields:
+        fields["ignored"] = True
+
+
+def test_network_operation_names_collapse_uuids():
+    url = (
+        "https://m3.example/anno/v1/fast/imagedmoment/"
+        "0f2b8c3e-1d2a-4b5c-9e8f-7a6b5c4d3e2f?limit=5"
+    )
+    assert _operation_name("get", url) == "GET /anno/v1/fast/imagedmoment/{uuid}"
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import uuid
+
+import pytest
+
+from vars_localize.models import ResultSet
+
+
+def _uuids(count: int) -> list[str]:
+    return [str(uuid.uuid4()) for _ in range(count)]
+
+
+def test_packs_canonical_uuids_into_fixed_width_storage():
+    values = _uuids(1000)
+    result_set = ResultSet(values)
+
+    assert len(result_set) == 1000
+    assert result_set.nbytes == 16 * 1000
+    assert list(result_set) == values
+    assert result_set[0] == values[0]
+    assert result_set[-1] == values[-1]
+    with pytest.raises(IndexError):
+        result_set[1000]
+
+
+def test_slices_return_page_lists():
+    values = _uuids(25)
+    result_set = ResultSet(values)
+
+    assert result_set[10:20] == values[10:20]
+    assert result_set[20:40] == values[20:]
+    assert result_set[slice(0, 0)] == []
+
+
+def test_membership_and_index_use_sorted_index():
+    values = _uuids(200)
+    result_set = ResultSet(values)
+
+    assert values[123] in result_set
+    assert result_set.index(values[123]) == 123
+    assert str(uuid.uuid4()) not in result_set
+    assert "not-a-uuid" not in result_set
+    with pytest.raises(ValueError):
+        result_set.index("missing")
+
+
+def test_non_canonical_values_fall_back_to_strings():
+    values = ["im-1", "im-2", "im-2"]
+    result_set = ResultSet(values)
+
+    assert list(result_set) == values
+    assert "im-2" in result_set
+    assert result_set.index("im-2") == 1
+    assert result_set[1:] == ["im-2", "im-2"]
+
+    upper = str(uuid.uuid4()).upper()
+    assert list(ResultSet([upper])) == [upper]
+
+
+def test_coerce_shares_existing_instances():
+    result_set = ResultSet(_uuids(3))
+
+    assert ResultSet.coerce(result_set) is result_set
+    assert ResultSet.coerce(None) == ResultSet()
+    assert ResultSet.coerce(list(result_set)) == result_set
+
+
+def test_app_state_shares_result_set_by_reference():
+    pytest.importorskip("PyQt6")
+    from vars_localize.state import AppStateStore
+
+    store = AppStateStore()
+    emitted = []
+    store.uuidsChanged.connect(emitted.append)
+    result_set = ResultSet(_uuids(5))
+
+    store.uuids = result_set
+    store.uuids = result_set
+
+    assert store.uuids is result_set
+    assert emitted == [result_set]
+    assert emitted[0] is result_set
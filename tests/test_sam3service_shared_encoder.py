@@ -0,0 +1,101 @@
+import numpy as np
+
+from vars_localize.services.SAM3Service import SAM3Service
+
+
+class _SemanticPredictor:
+    imgsz = [8, 8]
+
+    def __init__(self):
+        self.features = None
+
+    def set_image(self, image_rgb):
+        self.features = {
+            "vision_features": np.ones(4),
+            "sam2_backbone_out": {
+                "vision_features": np.full(4, 2.0),
+                "vision_pos_enc": [np.zeros(2), np.zeros(2)],
+                "backbone_fpn": [np.zeros(2), np.zeros(2)],
+            },
+        }
+
+
+class _Encoder:
+    def __init__(self):
+        self.calls = 0
+
+    def forward_image_sam2(self, samples):
+        self.calls += 1
+        return {
+            "vision_features": np.full(4, 9.0),
+            "vision_pos_enc": [np.zeros(2), np.zeros(2)],
+            "backbone_fpn": [np.zeros(2), np.zeros(2)],
+        }
+
+
+class _PointPredictor:
+    def __init__(self, encoder):
+        self.model = type("Model", (), {})()
+        self.model.image_encoder = encoder
+        self.features = None
+        self.inference_calls = []
+        self.masks = None
+
+    def set_image(self, image_rgb):
+        # Mirrors SAM3Model.forward_image, which projects FPN levels in place.
+        out = self.model.image_encoder.forward_image_sam2(image_rgb)
+        out["backbone_fpn"][0] = out["backbone_fpn"][0] + 1
+        self.features = {"image_embed": out["vision_features"]}
+
+    def inference_features(self, features, src_shape, dst_shape=None, **kwargs):
+        self.inference_calls.append((src_shape, dst_shape, kwargs["points"]))
+        return self.masks, None
+
+
+def _service(encoder):
+    service = SAM3Service(model_path="/tmp/model.pt")
+    service._semantic_predictor = _SemanticPredictor()
+    service._point_predictor = _PointPredictor(encoder)
+    return service
+
+
+def test_point_features_reuse_the_semantic_backbone_pass():
+    encoder = _Encoder()
+    service = _service(encoder)
+
+    service.set_image(np.zeros((4, 16, 3), dtype=np.uint8), image_key="ref-a")
+
+    backbone = service._semantic_features["sam2_backbone_out"]
+    assert encoder.calls == 0
+    np.testing.assert_array_equal(service._point_features["image_embed"], 2.0)
+    np.testing.assert_array_equal(backbone["backbone_fpn"][0], 0.0)
+    assert "forward_image_sam2" not in vars(encoder)
+    assert service.feature_cache.get("ref-a").point_stretch_size == 8
+
+
+def test_point_query_maps_shared_features_from_the_stretched_square():
+    service = _service(_Encoder())
+    service.set_image(np.zeros((4, 16, 3), dtype=np.uint8))
+    predictor = service._point_predictor
+    masks = np.zeros((1, 8, 8), dtype=bool)
+    masks[0, 2:6, 4:8] = True
+    predictor.masks = masks
+
+    boxes = service.query_point(12, 2)
+
+    assert predictor.inference_calls == [((8, 8), (8, 8), [[6.0, 4.0]])]
+    assert boxes == [(8, 1, 8, 2)]
+
+
+def test_point_predictor_encodes_itself_without_semantic_backbone_levels():
+    encoder = _Encoder()
+    service = _service(encoder)
+    service._semantic_predictor.set_image = lambda image_rgb: None
+    service._semantic_predictor.features = {"vision_features": np.ones(4)}
+
+    service.set_image(np.zeros((4, 4, 3), dtype=np.uint8), image_key="ref-a")
+    service.set_image(np.zeros((4, 4, 3), dtype=np.uint8), image_key="ref-b")
+
+    assert encoder.calls == 2
+    assert service._share_image_encoder is False
+    assert service.feature_cache.get("ref-b").point_stretch_size is None
@@ -0,0 +1,107 @@
+import numpy as np
+
+from vars_localize.services.SAM3Service import SAM3Service
+from vars_localize.services.sam_features import (
+    CachedFeatures,
+    FeatureCache,
+    feature_nbytes,
+)
+
+MB = 1024 * 1024
+
+
+class _EncodingPredictor:
+    def __init__(self):
+        self.set_image_calls = 0
+        self.features = None
+
+    def set_image(self, image_rgb):
+        self.set_image_calls += 1
+        self.features = {"embed": np.zeros(1024, dtype=np.float32)}
+
+
+def _entry(mb: int) -> CachedFeatures:
+    return CachedFeatures.create(np.zeros(mb * MB, dtype=np.uint8), None, (1, 1))
+
+
+def test_feature_nbytes_sums_nested_arrays():
+    value = {"a": np.zeros(10, dtype=np.float32), "b": [np.zeros(4, np.uint8), 3]}
+
+    assert feature_nbytes(value) == 44
+
+
+def test_feature_cache_evicts_least_recently_used_past_budget():
+    cache = FeatureCache(budget_mb=2)
+    cache.put("a", _entry(1))
+    cache.put("b", _entry(1))
+    cache.get("a")
+    cache.put("c", _entry(1))
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.nbytes == 2 * MB
+
+
+def test_feature_cache_skips_entries_larger_than_budget():
+    cache = FeatureCache(budget_mb=0)
+
+    assert cache.put("a", _entry(1)) is False
+    assert len(cache) == 0
+
+
+def test_set_image_reuses_cached_features_for_a_revisited_image():
+    service = SAM3Service(model_path="/tmp/model.pt")
+    predictor = _EncodingPredictor()
+    service._point_predictor = predictor
+    image_a = np.zeros((8, 6, 3), dtype=np.uint8)
+    image_b = np.zeros((4, 4, 3), dtype=np.uint8)
+
+    service.set_image(image_a, image_key="ref-a")
+    features_a = service._point_features
+    service.set_image(image_b, image_key="ref-b")
+    service.set_image(image_a, image_key="ref-a")
+
+    assert predictor.set_image_calls == 2
+    assert service._point_features is features_a
+    assert service._src_shape == (8, 6)
+    assert service.image_key == "ref-a"
+    assert service.point_predictor_ready
+
+
+def test_restore_image_misses_after_model_change():
+    service = SAM3Service(model_path="/tmp/model.pt")
+    service._point_predictor = _EncodingPredictor()
+    service.set_image(np.zeros((4, 4, 3), dtype=np.uint8), image_key="ref-a")
+    assert service.has_cached_features("ref-a")
+
+    service.configure_runtime(imgsz=1008)
+
+    assert not service.has_cached_features("ref-a")
+    assert service.restore_image("ref-a") is False
+
+
+def test_encode_to_cache_keeps_the_active_image():
+    service = SAM3Service(model_path="/tmp/model.pt")
+    predictor = _EncodingPredictor()
+    service._point_predictor = predictor
+    service.set_image(np.zeros((8, 6, 3), dtype=np.uint8), image_key="ref-a")
+    active = service._point_features
+
+    assert service.encode_to_cache(np.zeros((4, 4, 3), np.uint8), "ref-b")
+
+    assert service._point_features is active
+    assert service.image_key == "ref-a"
+    assert service.has_cached_features("ref-b")
+    assert service.restore_image("ref-b")
+    assert predictor.set_image_calls == 2
+
+
+def test_encode_to_cache_yields_to_waiting_interactive_calls():
+    service = SAM3Service(model_path="/tmp/model.pt")
+    predictor = _EncodingPredictor()
+    service._point_predictor = predictor
+
+    with service._interactive():
+        assert not service.encode_to_cache(np.zeros((4, 4, 3), np.uint8), "ref-b")
+
+    assert predictor.set_image_calls == 0
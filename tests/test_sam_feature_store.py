@@ -0,0 +1,175 @@
+import threading
+
+import numpy as np
+import pytest
+
+from vars_localize.services.SAM3Service import SAM3Service
+from vars_localize.services.sam_features import (
+    CachedFeatures,
+    FeatureStore,
+    feature_store_key,
+)
+from vars_localize.services.sam_precompute import precompute_features
+
+MB = 1024 * 1024
+
+
+class _EncodingPredictor:
+    def __init__(self):
+        self.set_image_calls = 0
+        self.features = None
+
+    def set_image(self, image_rgb):
+        self.set_image_calls += 1
+        self.features = {
+            "embed": np.full(16, float(image_rgb.mean()), dtype=np.float32),
+            "sizes": [(4, 4), (2, 2)],
+        }
+
+
+def _entry(fill: int, mb: int = 1) -> CachedFeatures:
+    features = {"embed": np.full(mb * MB, fill, dtype=np.uint8)}
+    return CachedFeatures.create(features, features, (6, 8))
+
+
+def _service(tmp_path, model_path):
+    service = SAM3Service(
+        model_path=str(model_path), feature_store=FeatureStore(tmp_path, 64)
+    )
+    predictor = _EncodingPredictor()
+    service._point_predictor = predictor
+    return service, predictor
+
+
+def test_store_round_trips_features_memory_mapped(tmp_path):
+    store = FeatureStore(tmp_path, budget_mb=8)
+    features = {"a": [np.arange(6, dtype=np.float32).reshape(2, 3), None], "n": 3}
+    entry = CachedFeatures.create(features, features, (2, 3), point_stretch_size=644)
+
+    assert store.save("k1", entry)
+    loaded = FeatureStore(tmp_path, budget_mb=8).load("k1")
+
+    assert loaded.src_shape == (2, 3)
+    assert loaded.point_stretch_size == 644
+    assert loaded.point is loaded.semantic
+    assert isinstance(loaded.semantic["a"][0], np.memmap)
+    np.testing.assert_array_equal(loaded.semantic["a"][0], features["a"][0])
+    assert loaded.semantic["a"][1] is None
+    assert loaded.semantic["n"] == 3
+
+
+def test_store_evicts_least_recently_used_entries(tmp_path):
+    store = FeatureStore(tmp_path, budget_mb=2)
+    store.save("a", _entry(1))
+    store.save("b", _entry(2))
+    store.load("a")
+    store.save("c", _entry(3))
+
+    assert store.contains("a") and store.contains("c")
+    assert not store.contains("b")
+    assert len(FeatureStore(tmp_path, budget_mb=2)) == 2
+
+
+def test_save_async_waits_while_too_many_writes_are_queued(tmp_path):
+    store = FeatureStore(tmp_path, budget_mb=8, max_pending=1)
+    release = threading.Event()
+    original_save = store.save
+    store.save = lambda key, entry: release.wait(5) and original_save(key, entry)
+    queued = []
+
+    store.save_async("a", _entry(1))
+    second = threading.Thread(
+        target=lambda: queued.append(store.save_async("b", _entry(2)))
+    )
+    second.start()
+    second.join(0.2)
+
+    assert second.is_alive() and not queued
+    release.set()
+    second.join(5)
+    store.flush()
+    assert store.contains("a") and store.contains("b")
+
+
+def test_store_key_depends_on_model_and_image_size():
+    assert feature_store_key("ref", "model-a", 644) != feature_store_key(
+        "ref", "model-b", 644
+    )
+    assert feature_store_key("ref", "model-a", 644) != feature_store_key(
+        "ref", "model-a", 1008
+    )
+
+
+def test_new_session_restores_features_from_disk(tmp_path):
+    model = tmp_path / "model.pt"
+    model.write_bytes(b"weights")
+    image = np.full((6, 8, 3), 7, dtype=np.uint8)
+    first, _ = _service(tmp_path / "store", model)
+    first.set_image(image, image_key="ref-a")
+    first.feature_store.flush()
+
+    second, predictor = _service(tmp_path / "store", model)
+    assert second.has_cached_features("ref-a")
+    assert second.restore_image("ref-a")
+
+    assert predictor.set_image_calls == 0
+    assert second._src_shape == (6, 8)
+    assert second._point_features["sizes"] == [(4, 4), (2, 2)]
+    np.testing.assert_array_equal(second._point_features["embed"], np.full(16, 7.0))
+
+
+def test_store_misses_after_the_model_file_changes(tmp_path):
+    model = tmp_path / "model.pt"
+    model.write_bytes(b"weights")
+    first, _ = _service(tmp_path / "store", model)
+    first.set_image(np.zeros((4, 4, 3), dtype=np.uint8), image_key="ref-a")
+    first.feature_store.flush()
+
+    model.write_bytes(b"retrained weights")
+    second, _ = _service(tmp_path / "store", model)
+
+    assert not second.has_cached_features("ref-a")
+
+
+def test_precompute_encodes_missing_images_only(tmp_path):
+    model = tmp_path / "model.pt"
+    model.write_bytes(b"weights")
+    service, predictor = _service(tmp_path / "store", model)
+    moments = {
+        "m1": {"uuid": "m1", "image_references": [_ref("r1")]},
+        "m2": {"uuid": "m2", "image_references": [_ref("r2")]},
+        "m3": {"uuid": "m3", "image_references": []},
+    }
+
+    class _M3:
+        def get_imaged_moment(self, uuid):
+            return moments[uuid]
+
+        def fetch_image_bytes(self, url):
+            return url.encode()
+
+    def _decode(data):
+        return np.zeros((4, 4, 3), dtype=np.uint8)
+
+    first = precompute_features(_M3(), service, ["m1", "m3"], _decode)
+    second = precompute_features(_M3(), service, ["m1", "m2"], _decode)
+
+    assert (first.encoded, first.no_image, first.failed) == (1, 1, 0)
+    assert (second.encoded, second.already_stored) == (1, 1)
+    assert predictor.set_image_calls == 2
+
+
+def test_cli_parses_precompute_command():
+    pytest.importorskip("PyQt6")
+    from vars_localize.__main__ import _build_arg_parser
+
+    args, _ = _build_arg_parser().parse_known_args(
+        ["precompute-sam", "Aegina", "--username", "me", "--limit", "50"]
+    )
+    assert (args.command, args.concept, args.limit) == ("precompute-sam", "Aegina", 50)
+    assert args.store_mb is None
+
+
+def _ref(uuid):
+    url = "http://images/{}.png".format(uuid)
+    return {"uuid": uuid, "url": url, "format": "image/png"}
@@ -0,0 +1,87 @@
+import numpy as np
+
+from vars_localize.services.SAM3Service import SAM3Service
+from vars_localize.services.sam_point_cache import PointResultCache
+
+
+class _PointPredictor:
+    def __init__(self, masks):
+        self.masks = masks
+        self.features = None
+        self.queries = []
+
+    def set_image(self, image_rgb):
+        self.features = {"image_embed": np.zeros(4)}
+
+    def inference_features(self, features, src_shape, dst_shape=None, **kwargs):
+        self.queries.append(kwargs["points"][0])
+        return self.masks, None
+
+
+def _mask(shape, top, bottom, left, right):
+    mask = np.zeros(shape, dtype=bool)
+    mask[top:bottom, left:right] = True
+    return mask
+
+
+def test_lookup_returns_the_newest_result_whose_mask_covers_the_point():
+    cache = PointResultCache()
+    cache.add("ref-a", _mask((20, 20), 0, 20, 0, 20), [(0, 0, 20, 20)])
+    cache.add("ref-a", _mask((20, 20), 5, 8, 3, 13), [(3, 5, 10, 3)])
+
+    assert cache.lookup("ref-a", 12, 7) == [(3, 5, 10, 3)]
+    assert cache.lookup("ref-a", 13, 7) == [(0, 0, 20, 20)]
+    assert cache.lookup("ref-b", 12, 7) is None
+    assert cache.lookup(None, 12, 7) is None
+
+
+def test_lookup_maps_points_into_a_resized_mask():
+    cache = PointResultCache()
+    # Mask of a 4x16 image stretched to an 8x8 square.
+    cache.add("ref-a", _mask((8, 8), 2, 6, 4, 8), [(8, 1, 8, 2)], scale=(0.5, 2.0))
+
+    assert cache.lookup("ref-a", 9, 1) == [(8, 1, 8, 2)]
+    assert cache.lookup("ref-a", 7, 1) is None
+
+
+def test_cache_drops_the_least_recently_used_image():
+    cache = PointResultCache(max_images=2)
+    for key in ("a", "b"):
+        cache.add(key, _mask((4, 4), 0, 2, 0, 2), [(0, 0, 2, 2)])
+    cache.lookup("a", 1, 1)
+    cache.add("c", _mask((4, 4), 0, 2, 0, 2), [(0, 0, 2, 2)])
+
+    assert cache.lookup("b", 1, 1) is None
+    assert cache.lookup("a", 1, 1) is not None
+
+
+def test_points_inside_an_earlier_mask_skip_the_decoder():
+    predictor = _PointPredictor(_mask((30, 40), 10, 20, 5, 25)[None])
+    service = SAM3Service(model_path="/tmp/model.pt")
+    service._point_predictor = predictor
+    service.set_image(np.zeros((30, 40, 3), dtype=np.uint8), image_key="ref-a")
+
+    first = service.query_point(10, 12)
+    again = service.query_point(24, 19)
+    outside = service.query_point(30, 12)
+
+    assert first == again == outside == [(5, 10, 20, 10)]
+    assert predictor.queries == [[10, 12], [30, 12]]
+
+
+def test_cached_results_follow_the_active_image_and_model():
+    predictor = _PointPredictor(_mask((30, 40), 10, 20, 5, 25)[None])
+    service = SAM3Service(model_path="/tmp/model.pt")
+    service._point_predictor = predictor
+    service.set_image(np.zeros((30, 40, 3), dtype=np.uint8), image_key="ref-a")
+    service.query_point(10, 12)
+
+    service.set_image(np.ones((30, 40, 3), dtype=np.uint8), image_key="ref-b")
+    service.query_point(10, 12)
+    service.set_image(np.zeros((30, 40, 3), dtype=np.uint8), image_key="ref-a")
+    service.query_point(11, 12)
+    service.configure_runtime(imgsz=1008)
+    service.set_image(np.zeros((30, 40, 3), dtype=np.uint8), image_key="ref-a")
+    service.query_point(11, 12)
+
+    assert predictor.queries == [[10, 12], [10, 12], [11, 12]]
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from vars_localize.services.SAM3Service import SAM3Service
+from vars_localize.services.sam_features import FeatureStore
+from vars_localize.services.sam_worker import (
+    SAM3WorkerService,
+    SAMWorkerError,
+    SharedImageBuffer,
+    handle_request,
+    read_shared_image,
+)
+
+
+class _EncodingPredictor:
+    def __init__(self):
+        self.images = []
+        self.features = None
+
+    def set_image(self, image_rgb):
+        self.images.append(image_rgb)
+        self.features = {"embed": np.zeros(4, dtype=np.float32)}
+
+
+def test_shared_image_buffer_round_trips_and_grows():
+    buffer = SharedImageBuffer()
+    try:
+        small = np.arange(12, dtype=np.uint8).reshape(2, 2, 3)
+        large = np.arange(300, dtype=np.uint8).reshape(10, 10, 3)
+
+        np.testing.assert_array_equal(read_shared_image(buffer.put(small)), small)
+        np.testing.assert_array_equal(read_shared_image(buffer.put(large)), large)
+    finally:
+        buffer.close()
+
+
+def test_worker_handler_passes_shared_images_to_the_service():
+    service = SAM3Service(model_path="/tmp/model.pt")
+    predictor = _EncodingPredictor()
+    service._point_predictor = predictor
+    image = np.full((4, 6, 3), 5, dtype=np.uint8)
+    buffer = SharedImageBuffer()
+    try:
+        handle_request(service, "set_image", [buffer.put(image)], {"image_key": "a"})
+    finally:
+        buffer.close()
+
+    np.testing.assert_array_equal(predictor.images[0], image)
+    assert handle_request(service, "has_cached_features", ["a"], {}) is True
+    with pytest.raises(ValueError):
+        handle_request(service, "_cleanup_predictors", [], {})
+
+
+def test_worker_reports_errors_and_restarts_after_a_crash(tmp_path):
+    service = SAM3WorkerService(model_path=str(tmp_path / "missing.pt"))
+    try:
+        with pytest.raises(SAMWorkerError):
+            service.ensure_loaded()
+        assert not service.available
+        assert "missing.pt" in service.availability_error
+
+        service._process.kill()
+        service._process.join()
+
+        assert service.has_cached_features("ref-a") is False
+        assert service._starts == 1
+        with pytest.raises(SAMWorkerError, match="unavailable"):
+            service.restore_image("ref-a")
+        assert service._starts == 2
+    finally:
+        service.shutdown()
+
+    with pytest.raises(SAMWorkerError):
+        service.restore_image("ref-a")
+
+
+def test_cached_features_are_answered_from_the_last_reply(tmp_path, monkeypatch):
+    service = SAM3WorkerService(model_path=str(tmp_path / "model.pt"))
+    calls = []
+
+    def _call(method, *args, **kwargs):
+        calls.append(method)
+        service._apply_state({"point": True, "cached": ["ref-a"]})
+        return True
+
+    monkeypatch.setattr(service, "_call", _call)
+    image = np.zeros((4, 6, 3), dtype=np.uint8)
+
+    service.set_image(image, image_key="ref-a")
+    assert service.has_cached_features("ref-a") is True
+    assert service.has_cached_features("ref-b") is False
+
+    service.set_feature_store(FeatureStore(tmp_path / "features", 16))
+    assert service.encode_to_cache(image, "ref-b") is True
+    # ref-b was evicted from the worker's memory but is on disk.
+    assert service.has_cached_features("ref-b") is True
+    assert calls == ["set_image", "encode_to_cache"]
+
+    service.configure_runtime(imgsz=1008)
+    service._apply_state({"cached": []})
+    assert service.has_cached_features("ref-a") is False
+    assert service.has_cached_features("ref-b") is False
+    assert service._process is None
@@ -0,0 +1,120 @@
+import csv
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from vars_localize.util import task_metrics as task_metrics_module  # noqa: E402
+from vars_localize.util.qt_async import run_async  # noqa: E402
+from vars_localize.util.task_metrics import (  # noqa: E402
+    OUTCOME_ERROR,
+    OUTCOME_OK,
+    TaskMetrics,
+    TaskRecord,
+    task_name,
+)
+
+
+class _Owner:
+    pass
+
+
+@pytest.fixture
+def app():
+    from PyQt6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    collector = TaskMetrics()
+    monkeypatch.setattr(task_metrics_module, "_METRICS", collector)
+    return collector
+
+
+def _process_until(app, condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        app.processEvents()
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def _fail():
+    raise ValueError("boom")
+
+
+def test_run_async_records_timings_and_outcomes(app, metrics):
+    owner = _Owner()
+    release = threading.Event()
+
+    run_async(owner, release.wait, 5, task_name="wait")
+    run_async(owner, _fail, on_error=lambda _: None)
+    release.set()
+
+    assert _process_until(app, lambda: len(metrics.records()) == 2)
+    by_name = {record.name: record for record in metrics.records()}
+    assert by_name["wait"].outcome == OUTCOME_OK
+    assert by_name["wait"].run_secs > 0
+    assert by_name["_fail"].outcome == OUTCOME_ERROR
+    assert {stats.name: stats.errors for stats in metrics.summary()} == {
+        "wait": 0,
+        "_fail": 1,
+    }
+
+
+def test_dump_writes_json_summary_and_csv_records(tmp_path):
+    metrics = TaskMetrics(record_limit=2)
+    for run_secs in (0.1, 0.3, 0.2):
+        metrics.record(
+            TaskRecord(
+                name="fetch",
+                lane="interactive",
+                outcome=OUTCOME_OK,
+                submitted_at=0.0,
+                queue_secs=0.01,
+                run_secs=run_secs,
+                delivery_secs=0.002,
+            )
+        )
+
+    payload = json.loads(metrics.dump(tmp_path / "trace.json").read_text())
+    (summary,) = payload["summary"]
+    assert summary["count"] == 3
+    assert summary["run_max_secs"] == pytest.approx(0.3)
+    assert summary["run_mean_secs"] == pytest.approx(0.2)
+    assert len(payload["records"]) == 2
+
+    with metrics.dump(tmp_path / "trace.csv").open() as handle:
+        rows = list(csv.DictReader(handle))
+    assert [float(row["run_secs"]) for row in rows] == [0.3, 0.2]
+
+
+def test_task_name_strips_locals():
+    def _fetch_page_data():
+        return None
+
+    assert task_name(_fetch_page_data) == (
+        "test_task_name_strips_locals._fetch_page_data"
+    )
+
+
+def test_dock_lists_recorded_tasks(app, metrics):
+    from vars_localize.ui.TaskMetricsDock import TaskMetricsDock
+
+    metrics.record(
+        TaskRecord("fetch", "interactive", OUTCOME_OK, 0.0, 0.004, 0.25, 0.001)
+    )
+    dock = TaskMetricsDock(metrics)
+    dock.refresh()
+
+    assert dock.table.rowCount() == 1
+    assert dock.table.item(0, 0).text() == "fetch"
+    assert dock.table.item(0, 7).text() == "250.0"
+    dock.deleteLater()
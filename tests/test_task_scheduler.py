@@ -0,0 +1,202 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from vars_localize.services.http import request_with_policy  # noqa: E402
+from vars_localize.util import cancellation, qt_async  # noqa: E402
+from vars_localize.util.cancellation import (  # noqa: E402
+    CancelToken,
+    TaskCancelledError,
+    bind_token,
+)
+from vars_localize.util.qt_async import (  # noqa: E402
+    LANE_BACKGROUND,
+    LANE_INTERACTIVE,
+    LANE_PREFETCH,
+    TaskScheduler,
+    run_async,
+)
+
+
+class _Owner:
+    pass
+
+
+@pytest.fixture
+def app():
+    from PyQt6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+def _process_until(app, condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        app.processEvents()
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_lanes_take_configured_limits():
+    scheduler = TaskScheduler({LANE_PREFETCH: 3})
+
+    assert scheduler.limits()[LANE_PREFETCH] == 3
+    assert (
+        scheduler.limits()[LANE_INTERACTIVE]
+        == qt_async.DEFAULT_LANE_LIMITS[LANE_INTERACTIVE]
+    )
+
+    scheduler.configure({LANE_PREFETCH: 0})
+    assert scheduler.limits()[LANE_PREFETCH] == 1
+
+
+def test_busy_background_lane_does_not_delay_interactive_work(monkeypatch):
+    scheduler = TaskScheduler({LANE_BACKGROUND: 1})
+    monkeypatch.setattr(qt_async, "_SCHEDULER", scheduler)
+    owner = _Owner()
+    release = threading.Event()
+    interactive_done = threading.Event()
+
+    for _ in range(3):
+        run_async(owner, release.wait, 5, lane=LANE_BACKGROUND)
+    run_async(owner, interactive_done.set)
+
+    try:
+        assert interactive_done.wait(timeout=2)
+        assert scheduler.active_counts()[LANE_BACKGROUND] == 1
+    finally:
+        release.set()
+    assert scheduler.wait_for_done(5000)
+
+
+def test_queued_tasks_in_a_lane_start_by_priority():
+    scheduler = TaskScheduler({LANE_PREFETCH: 1})
+    pool = scheduler.pool(LANE_PREFETCH)
+    owner = _Owner()
+    release = threading.Event()
+    started = []
+
+    run_async(owner, release.wait, 5, thread_pool=pool)
+    run_async(owner, started.append, "low", thread_pool=pool, priority=0)
+    run_async(owner, started.append, "high", thread_pool=pool, priority=5)
+    release.set()
+
+    assert scheduler.wait_for_done(5000)
+    assert started == ["high", "low"]
+
+
+def test_unknown_lane_is_rejected_before_queueing():
+    owner = _Owner()
+
+    with pytest.raises(ValueError):
+        run_async(owner, lambda: None, lane="urgent")
+    assert not getattr(owner, "_active_workers", set())
+
+
+def test_superseded_queued_task_never_runs(app):
+    scheduler = TaskScheduler({LANE_PREFETCH: 1})
+    pool = scheduler.pool(LANE_PREFETCH)
+    owner = _Owner()
+    release = threading.Event()
+    ran = []
+    events = []
+
+    run_async(owner, release.wait, 5, thread_pool=pool)
+    first = run_async(
+        owner,
+        ran.append,
+        "first",
+        on_result=lambda _: events.append("first result"),
+        on_finished=lambda: events.append("first finished"),
+        supersede_key="page",
+        thread_pool=pool,
+    )
+    run_async(
+        owner,
+        ran.append,
+        "second",
+        on_finished=lambda: events.append("second finished"),
+        supersede_key="page",
+        thread_pool=pool,
+    )
+    release.set()
+
+    assert first.cancelled
+    assert _process_until(app, lambda: "second finished" in events)
+    assert ran == ["second"]
+    assert "first result" not in events
+    assert "first finished" in events
+
+
+def test_cancelled_running_task_stops_and_reports_no_result(app):
+    owner = _Owner()
+    started = threading.Event()
+    stopped = threading.Event()
+    events = []
+
+    def _poll():
+        started.set()
+        try:
+            while True:
+                cancellation.sleep(0.01)
+        finally:
+            stopped.set()
+
+    handle = run_async(
+        owner,
+        _poll,
+        on_result=lambda _: events.append("result"),
+        on_error=lambda _: events.append("error"),
+        on_finished=lambda: events.append("finished"),
+    )
+    assert started.wait(timeout=2)
+
+    assert handle.cancel() is False
+    assert stopped.wait(timeout=2)
+    assert _process_until(app, lambda: events == ["finished"])
+
+
+def test_request_with_policy_stops_for_cancelled_task():
+    class _Session:
+        calls = 0
+
+        def request(self, *args, **kwargs):
+            self.calls += 1
+            raise AssertionError("should not be called")
+
+    session = _Session()
+    token = CancelToken()
+    token.cancel()
+
+    with bind_token(token), pytest.raises(TaskCancelledError):
+        request_with_policy(session, "get", "https://m3.example")
+    assert session.calls == 0
+
+
+def test_request_with_policy_returns_writes_sent_before_cancellation():
+    class _Response:
+        status_code = 201
+        content = b"{}"
+
+        def raise_for_status(self):
+            pass
+
+    def _send(method):
+        token = CancelToken()
+
+        class _Session:
+            def request(self, *args, **kwargs):
+                token.cancel()
+                return _Response()
+
+        with bind_token(token):
+            return request_with_policy(_Session(), method, "https://m3.example")
+
+    assert _send("post").status_code == 201
+    with pytest.raises(TaskCancelledError):
+        _send("get")
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from vars_localize.services.http import request_with_policy
+from vars_localize.util import tracing
+
+
+class _Response:
+    status_code = 200
+    content = b"12345"
+
+    def raise_for_status(self):
+        return None
+
+
+class _Session:
+    def request(self, method, url, **kwargs):
+        return _Response()
+
+
+@pytest.fixture(autouse=True)
+def _stop_tracing():
+    yield
+    tracing.stop_tracing()
+
+
+@tracing.traced(category="sam")
+def _query(fail: bool = False):
+    if fail:
+        raise RuntimeError("no features")
+    return [(1, 2, 3, 4)]
+
+
+def test_tracing_is_a_passthrough_when_off():
+    assert not tracing.tracing_enabled()
+    with tracing.span("noop") as args:
+        args["ignored"] = True
+    assert _query() == [(1, 2, 3, 4)]
+    assert tracing.stop_tracing() is None
+
+
+def test_trace_file_has_complete_events_for_calls(tmp_path):
+    path = tmp_path / "trace.json"
+    tracing.start_tracing(path)
+
+    request_with_policy(_Session(), "get", "https://m3.example/anno/v1/fast/1")
+    _query()
+    with pytest.raises(RuntimeError):
+        _query(fail=True)
+
+    assert tracing.stop_tracing() == path
+    payload = json.loads(path.read_text())
+    events = [e for e in payload["traceEvents"] if e["ph"] == "X"]
+    assert [(e["name"], e["cat"]) for e in events] == [
+        ("GET /anno/v1/fast/1", "http"),
+        ("_query", "sam"),
+        ("_query", "sam"),
+    ]
+    assert events[0]["args"]["status"] == 200
+    assert events[0]["args"]["bytes"] == 5
+    assert events[2]["args"] == {"error": "RuntimeError"}
+    assert all(e["dur"] >= 0 for e in events)
+    assert any(e["ph"] == "M" for e in payload["traceEvents"])
+
+
+def test_trace_drops_events_past_the_limit(tmp_path):
+    tracer = tracing.ChromeTracer(tmp_path / "trace.json", max_events=1)
+    tracer.add_complete("a", "app", 0.0, 1.0)
+    tracer.add_complete("b", "app", 1.0, 1.0)
+
+    payload = json.loads(tracer.write().read_text())
+    assert [e["name"] for e in payload["traceEvents"] if e["ph"] == "X"] == ["a"]
+    assert payload["otherData"]["dropped_events"] == 1
+
+
+def test_cli_accepts_trace_file():
+    pytest.importorskip("PyQt6")
+    from vars_localize.__main__ import _build_arg_parser
+
+    args, _ = _build_arg_parser().parse_known_args(["--trace", "out.json"])
+    assert args.trace == "out.json"